@@ -0,0 +1,899 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.arrays
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Got a lot of geometries?  Keep them in columns!
+"""
+
+from . import hashing
+from .geometry import (EnvelopeTuple, Geometry, GeometryCollection, GeometryException, GeometryType, Point,
+                       Projector, SpatialReference, _flip_columns, _geometry_factory_functions, _shapely_from_parts,
+                       _shapely_from_rings, _shapely_geom_type_map, _shapely_rings)
+import math
+import numpy as np
+from shapely.geometry.base import BaseGeometry
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+_WKB_POINT: int = 1  #: the WKB geometry type code for a point
+_WKB_LINESTRING: int = 2  #: the WKB geometry type code for a linestring
+_WKB_POLYGON: int = 3  #: the WKB geometry type code for a polygon
+_WKB_MULTIPOINT: int = 4  #: the WKB geometry type code for a multipoint
+_WKB_MULTILINESTRING: int = 5  #: the WKB geometry type code for a multilinestring
+_WKB_MULTIPOLYGON: int = 6  #: the WKB geometry type code for a multipolygon
+_WKB_GEOMETRYCOLLECTION: int = 7  #: the WKB geometry type code for a geometry collection
+
+_wkb_geom_type_map = {
+    _WKB_POINT: GeometryType.POINT,
+    _WKB_LINESTRING: GeometryType.POLYLINE,
+    _WKB_POLYGON: GeometryType.POLYGON,
+    _WKB_MULTIPOINT: GeometryType.MULTIPOINT,
+    _WKB_MULTILINESTRING: GeometryType.MULTIPOLYLINE,
+    _WKB_MULTIPOLYGON: GeometryType.MULTIPOLYGON
+}  #: a mapping of WKB geometry type codes to djio geometry types
+
+_djio_wkb_type_map = {
+    **{geometry_type: type_code for type_code, geometry_type in _wkb_geom_type_map.items()},
+    GeometryType.COLLECTION: _WKB_GEOMETRYCOLLECTION
+}  #: a mapping of djio geometry types to WKB geometry type codes
+
+_EWKB_Z_FLAG: int = 0x80000000  #: the EWKB flag that indicates the geometry has Z values
+_EWKB_M_FLAG: int = 0x40000000  #: the EWKB flag that indicates the geometry has M values
+_EWKB_SRID_FLAG: int = 0x20000000  #: the EWKB flag that indicates an SRID follows the type
+
+
+class _WkbRings(object):
+    """
+    This is a small accumulator that collects the rings read from WKB so they can be concatenated in a single pass.
+    """
+    def __init__(self):
+        self.geometry_types: List[int] = []  #: the djio geometry type of each geometry
+        self.rings: List[np.ndarray] = []  #: the coordinate blocks of each ring
+        self.ring_counts: List[int] = []  #: the number of rings in each part
+        self.part_counts: List[int] = []  #: the number of parts in each geometry
+        self.ndim: int or None = None  #: the coordinate dimension (once we know it)
+
+
+def _read_wkb_header(wkb: bytes, offset: int) -> Tuple[str, int, int, int or None, int]:
+    """
+    Read the header (the byte order, type and, for EWKB, the SRID) of a WKB geometry.
+
+    :param wkb: the well-known binary
+    :param offset: the offset at which the geometry starts
+    :return: the byte order, the WKB type code (without flags), the coordinate dimension, the SRID (if there is one)
+        and the offset at which the body of the geometry starts
+    :raises GeometryException: if the geometry has M values
+    """
+    byte_order = '<' if wkb[offset] == 1 else '>'
+    (type_code,) = struct.unpack_from(byte_order + 'I', wkb, offset + 1)
+    offset += 5
+    srid = None
+    # Sort out the EWKB flags (if there are any).
+    has_z = bool(type_code & _EWKB_Z_FLAG)
+    has_m = bool(type_code & _EWKB_M_FLAG)
+    if type_code & _EWKB_SRID_FLAG:
+        (srid,) = struct.unpack_from(byte_order + 'I', wkb, offset)
+        offset += 4
+    type_code = type_code & 0x0fffffff
+    # ISO WKB expresses the dimensionality in the thousands.
+    if type_code >= 1000:
+        has_z = has_z or (type_code // 1000) in (1, 3)
+        has_m = has_m or (type_code // 1000) in (2, 3)
+        type_code = type_code % 1000
+    if has_m:
+        raise GeometryException('Geometries with M values are not supported.')
+    return byte_order, type_code, 3 if has_z else 2, srid, offset
+
+
+def _read_wkb_rings(wkb: bytes, offset: int, byte_order: str, type_code: int, ndim: int, acc: _WkbRings) -> int:
+    """
+    Read the rings of a single-part WKB geometry (a point, linestring or polygon) into a ring accumulator.
+
+    :param wkb: the well-known binary
+    :param offset: the offset at which the body of the geometry starts
+    :param byte_order: the byte order
+    :param type_code: the WKB type code
+    :param ndim: the coordinate dimension
+    :param acc: the accumulator that receives the rings
+    :return: the offset at which the geometry ends
+    """
+    dtype = np.dtype(byte_order + 'f8')
+    if type_code == _WKB_POINT:
+        acc.rings.append(np.frombuffer(wkb, dtype=dtype, count=ndim, offset=offset).reshape(1, ndim))
+        acc.ring_counts.append(1)
+        return offset + ndim * 8
+    elif type_code == _WKB_LINESTRING:
+        (count,) = struct.unpack_from(byte_order + 'I', wkb, offset)
+        acc.rings.append(np.frombuffer(wkb, dtype=dtype, count=count * ndim, offset=offset + 4).reshape(count, ndim))
+        acc.ring_counts.append(1)
+        return offset + 4 + count * ndim * 8
+    (ring_count,) = struct.unpack_from(byte_order + 'I', wkb, offset)
+    offset += 4
+    for _ in range(ring_count):
+        (count,) = struct.unpack_from(byte_order + 'I', wkb, offset)
+        acc.rings.append(np.frombuffer(wkb, dtype=dtype, count=count * ndim, offset=offset + 4).reshape(count, ndim))
+        offset += 4 + count * ndim * 8
+    acc.ring_counts.append(ring_count)
+    return offset
+
+
+def _read_wkb(wkb: bytes, acc: _WkbRings) -> int or None:
+    """
+    Read a single WKB (or EWKB) geometry directly into a ring accumulator without building a Shapely geometry.
+
+    :param wkb: the well-known binary
+    :param acc: the accumulator that receives the rings
+    :return: the SRID embedded in the WKB (if this is EWKB), otherwise `None`
+    :raises GeometryException: if the WKB describes a geometry type that isn't supported
+    """
+    byte_order, type_code, ndim, srid, offset = _read_wkb_header(wkb, 0)
+    if acc.ndim is None:
+        acc.ndim = ndim
+    elif acc.ndim != ndim:
+        raise GeometryException('All of the geometries in an array must have the same coordinate dimension.')
+    try:
+        geometry_type = _wkb_geom_type_map[type_code]
+    except KeyError:
+        raise GeometryException('Unsupported WKB geometry type: {type_code}.'.format(type_code=type_code))
+    if geometry_type & GeometryType.COLLECTION:
+        # A multi-part geometry is a count followed by complete (single-part) WKB geometries.
+        (part_count,) = struct.unpack_from(byte_order + 'I', wkb, offset)
+        offset += 4
+        for _ in range(part_count):
+            part_byte_order, part_type_code, part_ndim, _, offset = _read_wkb_header(wkb, offset)
+            if part_type_code != type_code - 3 or part_ndim != ndim:
+                raise GeometryException('The parts of a multi-part WKB geometry must match the geometry.')
+            offset = _read_wkb_rings(wkb, offset, part_byte_order, part_type_code, ndim, acc)
+        acc.part_counts.append(part_count)
+    else:
+        _read_wkb_rings(wkb, offset, byte_order, type_code, ndim, acc)
+        acc.part_counts.append(1)
+    acc.geometry_types.append(int(geometry_type))
+    return srid
+
+
+def _write_wkb(geometry_type: GeometryType or int,
+               coordinates: np.ndarray,
+               ring_offsets: np.ndarray,
+               part_offsets: np.ndarray,
+               part_types: np.ndarray = None,
+               srid: int = None) -> bytes:
+    """
+    Write a single geometry as (little-endian) WKB directly from a block of coordinates, without building a Shapely
+    geometry.  Geometries with Z values carry the EWKB Z flag (which OGR, GEOS and PostGIS all understand).
+
+    :param geometry_type: the :py:class:`GeometryType` of the geometry
+    :param coordinates: the coordinates
+    :param ring_offsets: the ring offsets
+    :param part_offsets: the offsets (into the ring offsets) of the geometry's parts (plus a final offset for the end)
+    :param part_types: the type of each part (This is only needed for geometry collections.)
+    :param srid: the spatial reference ID to embed (which makes the result EWKB)
+    :return: the WKB
+    :raises GeometryException: if the geometry type isn't supported
+    """
+    ndim = coordinates.shape[1]
+    stride = ndim * 8
+    z_flag = _EWKB_Z_FLAG if ndim == 3 else 0
+    _ring_offsets = ring_offsets.tolist()
+    _part_offsets = [int(offset) for offset in part_offsets]
+    # We'll convert the geometry's coordinates to bytes in one go and then slice out each ring.
+    first = _ring_offsets[_part_offsets[0]]
+    data = np.ascontiguousarray(coordinates[first:_ring_offsets[_part_offsets[-1]]], dtype='<f8').tobytes()
+    pieces: List[bytes] = []
+
+    def header(type_code: int, embed_srid: bool):
+        if embed_srid and srid is not None:
+            pieces.append(struct.pack('<BII', 1, type_code | z_flag | _EWKB_SRID_FLAG, srid))
+        else:
+            pieces.append(struct.pack('<BI', 1, type_code | z_flag))
+
+    def part(part_type: int, ring_start: int, ring_end: int, embed_srid: bool):
+        header(_djio_wkb_type_map[part_type], embed_srid)
+        if part_type == GeometryType.POINT:
+            if ring_end == ring_start or _ring_offsets[ring_start] == _ring_offsets[ring_start + 1]:
+                pieces.append(struct.pack('<' + 'd' * ndim, *([math.nan] * ndim)))  # This is an empty point.
+            else:
+                start = (_ring_offsets[ring_start] - first) * stride
+                pieces.append(data[start:start + stride])
+            return
+        if part_type == GeometryType.POLYGON:
+            pieces.append(struct.pack('<I', ring_end - ring_start))
+        elif ring_end == ring_start:
+            pieces.append(struct.pack('<I', 0))  # This is an empty linestring.
+        for ring in range(ring_start, ring_end):
+            start, end = _ring_offsets[ring] - first, _ring_offsets[ring + 1] - first
+            pieces.append(struct.pack('<I', end - start))
+            pieces.append(data[start * stride:end * stride])
+
+    _geometry_type = int(geometry_type)
+    try:
+        if _geometry_type & GeometryType.COLLECTION:
+            header(_djio_wkb_type_map[GeometryType(_geometry_type)], True)
+            pieces.append(struct.pack('<I', len(_part_offsets) - 1))
+            for i in range(len(_part_offsets) - 1):
+                part_type = (int(part_types[i]) if part_types is not None
+                             else _geometry_type & ~GeometryType.COLLECTION)
+                part(part_type, _part_offsets[i], _part_offsets[i + 1], False)
+        else:
+            part(_geometry_type, _part_offsets[0], _part_offsets[-1], True)
+    except (KeyError, ValueError):
+        raise GeometryException('Unsupported geometry type: {type}.'.format(type=geometry_type))
+    return b''.join(pieces)
+
+
+def _geometry_wkb(geometry: Geometry, srid: int = None) -> bytes:
+    """
+    Write a djio geometry as (little-endian) WKB directly from its coordinate block.
+
+    :param geometry: the geometry
+    :param srid: the spatial reference ID to embed (which makes the result EWKB)
+    :return: the WKB
+    """
+    return _write_wkb(geometry.geometry_type, geometry.coords_array, geometry.ring_offsets, geometry.part_offsets,
+                      part_types=geometry.part_types if isinstance(geometry, GeometryCollection) else None,
+                      srid=srid)
+
+
+def _counts_to_offsets(counts: Iterable[int] or np.ndarray) -> np.ndarray:
+    """
+    Convert a sequence of counts to a sequence of offsets (which will be one element longer than the counts).
+
+    :param counts: the counts
+    :return: the offsets
+    """
+    _counts = np.asarray(counts, dtype=np.int64)
+    offsets = np.zeros(len(_counts) + 1, dtype=np.int64)
+    np.cumsum(_counts, out=offsets[1:])
+    return offsets
+
+
+def _segment_mask(vertices: int, ring_offsets: np.ndarray) -> np.ndarray:
+    """
+    Figure out which pairs of consecutive vertices in a coordinate block are actually segments (that is to say, both
+    vertices are in the same ring).
+
+    :param vertices: the number of vertices
+    :param ring_offsets: the ring offsets
+    :return: a mask with an element for each pair of consecutive vertices
+    """
+    mask = np.ones(max(vertices - 1, 0), dtype=bool)
+    # The pair that ends at the first vertex of a ring spans two rings.
+    starts = ring_offsets[1:-1]
+    mask[starts[(starts > 0) & (starts < vertices)] - 1] = False
+    return mask
+
+
+def _ring_sums(values: np.ndarray, ring_offsets: np.ndarray) -> np.ndarray:
+    """
+    Add up per-segment values for each ring.
+
+    :param values: a value for each pair of consecutive vertices (with zeros for pairs that aren't segments)
+    :param ring_offsets: the ring offsets
+    :return: the sum for each ring
+    """
+    totals = np.concatenate([[0.0], np.cumsum(values)])
+    # The segments of a ring that starts at vertex `s` and ends before vertex `e` are `s` through `e - 2`.
+    starts = ring_offsets[:-1]
+    ends = np.maximum(ring_offsets[1:] - 1, starts)
+    return totals[ends] - totals[starts]
+
+
+class GeometryArray(object):
+    """
+    A geometry array holds a collection of geometries that share a spatial reference in a columnar layout: a single
+    block of coordinates along with the offsets that describe where each ring, part and geometry begins.  This lets us
+    work with very large numbers of geometries without paying for one Python object (and one set of caches) per
+    geometry.
+    """
+
+    def __init__(self,
+                 geometry_types: np.ndarray,
+                 coordinates: np.ndarray,
+                 ring_offsets: np.ndarray,
+                 part_offsets: np.ndarray,
+                 geometry_offsets: np.ndarray,
+                 spatial_reference: SpatialReference or int):
+        """
+
+        :param geometry_types: the :py:class:`GeometryType` code of each geometry
+        :param coordinates: an (N, D) array of all the coordinates in all the geometries
+        :param ring_offsets: the offset of the first coordinate in each ring (plus a final offset for the end)
+        :param part_offsets: the offset of the first ring in each part (plus a final offset for the end)
+        :param geometry_offsets: the offset of the first part in each geometry (plus a final offset for the end)
+        :param spatial_reference: the spatial reference shared by all the geometries
+        """
+        self._geometry_types: np.ndarray = np.asarray(geometry_types, dtype=np.uint8)
+        self._coordinates: np.ndarray = np.asarray(coordinates, dtype=np.float64)
+        self._ring_offsets: np.ndarray = np.asarray(ring_offsets, dtype=np.int64)
+        self._part_offsets: np.ndarray = np.asarray(part_offsets, dtype=np.int64)
+        self._geometry_offsets: np.ndarray = np.asarray(geometry_offsets, dtype=np.int64)
+        self._spatial_reference: SpatialReference = (spatial_reference
+                                                     if isinstance(spatial_reference, SpatialReference)
+                                                     else SpatialReference.from_srid(srid=spatial_reference))
+        self._caches: Dict[str, Any] = {}  #: a repository for cached and lazily-initialized objects
+        # Sanity check:  Do the offsets line up with what they describe?
+        if len(self._geometry_offsets) != len(self._geometry_types) + 1:
+            raise GeometryException('The geometry offsets do not match the number of geometries.')
+
+    def __len__(self) -> int:
+        return len(self._geometry_types)
+
+    def __getitem__(self, index: int) -> Geometry:
+        """
+        Get a single djio geometry from the array.
+
+        :param index: the index of the geometry
+        :return: the geometry
+        """
+        _index = index if index >= 0 else len(self) + index
+        if _index < 0 or _index >= len(self):
+            raise IndexError('The geometry index is out of range.')
+        geometry_type = GeometryType(int(self._geometry_types[_index]))
+        return _geometry_factory_functions[geometry_type](self.get_shapely(_index), self._spatial_reference)
+
+    def __iter__(self) -> Iterator[Geometry]:
+        for i in range(0, len(self)):
+            yield self[i]
+
+    @property
+    def geometry_types(self) -> np.ndarray:
+        """
+        Get the :py:class:`GeometryType` code of each geometry.
+
+        :return: the geometry type codes
+        """
+        return self._geometry_types
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """
+        Get the (N, D) array of all the coordinates in all the geometries.
+
+        :return: the coordinates
+        """
+        return self._coordinates
+
+    @property
+    def ring_offsets(self) -> np.ndarray:
+        """
+        Get the offsets of the first coordinate in each ring.  (The last element marks the end of the final ring.)
+
+        :return: the ring offsets
+        """
+        return self._ring_offsets
+
+    @property
+    def part_offsets(self) -> np.ndarray:
+        """
+        Get the offsets of the first ring in each part.  (The last element marks the end of the final part.)
+
+        :return: the part offsets
+        """
+        return self._part_offsets
+
+    @property
+    def geometry_offsets(self) -> np.ndarray:
+        """
+        Get the offsets of the first part in each geometry.  (The last element marks the end of the final geometry.)
+
+        :return: the geometry offsets
+        """
+        return self._geometry_offsets
+
+    @property
+    def spatial_reference(self) -> SpatialReference:
+        """
+        Get the spatial reference shared by all the geometries in the array.
+
+        :return: the spatial reference
+        """
+        return self._spatial_reference
+
+    @property
+    def ndim(self) -> int:
+        """
+        Get the coordinate dimension (2 or 3) of the geometries in the array.
+
+        :return: the coordinate dimension
+        """
+        return self._coordinates.shape[1]
+
+    @property
+    def vertex_offsets(self) -> np.ndarray:
+        """
+        Get the offsets of the first coordinate in each geometry.  (The last element marks the end of the final
+        geometry.)
+
+        :return: the vertex offsets
+        """
+        return self._ring_offsets[self._part_offsets[self._geometry_offsets]]
+
+    def djiohashes(self) -> np.ndarray:
+        """
+        Get the hash value of every geometry in the array.
+
+        :return: a (G, 15) array of bytes in which each row is the hash value of a geometry
+
+        .. seealso::
+
+            :py:func:`djio.hashing.djiohash_v1_many`
+        """
+        try:
+            return self._caches['djiohashes']
+        except KeyError:
+            hashes = hashing.djiohash_v1_many(geometry_type_codes=self._geometry_types,
+                                              srid=self._spatial_reference.srid,
+                                              coordinates=self._coordinates,
+                                              vertex_offsets=self.vertex_offsets)
+            self._caches['djiohashes'] = hashes
+            return hashes
+
+    def envelopes(self) -> np.ndarray:
+        """
+        Get the envelope (bounding box) of every geometry in the array.
+
+        :return: a (G, 4) array in which each row is the (min_x, min_y, max_x, max_y) of a geometry (Empty geometries
+            have `NaN` envelopes.)
+        """
+        try:
+            return self._caches['envelopes']
+        except KeyError:
+            envelopes = np.full((len(self), 4), np.nan, dtype=np.float64)
+            vertex_offsets = self.vertex_offsets
+            # reduceat doesn't cope with empty geometries, so we only reduce the ones that have coordinates.
+            non_empty = np.diff(vertex_offsets) > 0
+            if non_empty.any():
+                starts = vertex_offsets[:-1][non_empty]
+                xy = self._coordinates[:, :2]
+                envelopes[non_empty, 0:2] = np.minimum.reduceat(xy, starts, axis=0)
+                envelopes[non_empty, 2:4] = np.maximum.reduceat(xy, starts, axis=0)
+            self._caches['envelopes'] = envelopes
+            return envelopes
+
+    def envelope_tuple(self) -> EnvelopeTuple:
+        """
+        Get the envelope that contains every geometry in the array.
+
+        :return: the envelope tuple
+        """
+        return EnvelopeTuple.from_bounds_many(self.envelopes(), srid=self._spatial_reference.srid)
+
+    def _sum_rings(self, ring_values: np.ndarray) -> np.ndarray:
+        """
+        Add up per-ring values for each geometry in the array.
+
+        :param ring_values: a value for each ring in the array
+        :return: the sum for each geometry
+        """
+        ring_totals = np.concatenate([[0.0], np.cumsum(ring_values)])
+        ring_bounds = self._part_offsets[self._geometry_offsets]
+        return ring_totals[ring_bounds[1:]] - ring_totals[ring_bounds[:-1]]
+
+    def _sum_polygon_rings(self, ring_areas: np.ndarray) -> np.ndarray:
+        """
+        Figure out the area of each geometry in the array from the (unsigned) areas enclosed by its rings.  The first
+        ring in each part is the exterior and the rest are holes.  Points and polylines have no area.
+
+        :param ring_areas: the area enclosed by each ring in the array
+        :return: the area of each geometry
+        """
+        exteriors = np.zeros(len(ring_areas), dtype=bool)
+        part_starts = self._part_offsets[:-1]
+        exteriors[part_starts[part_starts < len(ring_areas)]] = True
+        areas = np.where(exteriors, ring_areas, -ring_areas)
+        ring_types = np.repeat(np.repeat(self._geometry_types, np.diff(self._geometry_offsets)),
+                               np.diff(self._part_offsets))
+        areas[(ring_types & int(GeometryType.POLYGON)) == 0] = 0.0
+        return self._sum_rings(areas)
+
+    def _coordinates_in(self, spatial_reference: SpatialReference or int or None) -> np.ndarray:
+        """
+        Get the coordinates expressed in another spatial reference.  (They're transformed in a single call.)
+
+        :param spatial_reference: the spatial reference (If none is supplied, the array's own coordinates are
+            returned.)
+        :return: the coordinates
+        """
+        if spatial_reference is None or self._spatial_reference.is_same_as(spatial_reference):
+            return self._coordinates
+        return self._spatial_reference.transform_coordinates(self._coordinates, spatial_reference)
+
+    def lengths(self, spatial_reference: SpatialReference or int = None) -> np.ndarray:
+        """
+        Measure the planar length of every geometry in the array.  (Points have no length, and the length of a polygon
+        is the length of all its rings.)
+
+        :param spatial_reference: the spatial reference in which the lengths are measured (If none is supplied, they're
+            measured in the array's own spatial reference.)
+        :return: the length of each geometry (in the units of the spatial reference)
+        """
+        coordinates = self._coordinates_in(spatial_reference)
+        if len(coordinates) < 2:
+            return np.zeros(len(self), dtype=np.float64)
+        segments = np.hypot(np.diff(coordinates[:, 0]), np.diff(coordinates[:, 1]))
+        segments[~_segment_mask(len(coordinates), self._ring_offsets)] = 0.0
+        return self._sum_rings(_ring_sums(segments, self._ring_offsets))
+
+    def areas(self, spatial_reference: SpatialReference or int = None) -> np.ndarray:
+        """
+        Measure the planar area of every geometry in the array.  (Points and polylines have no area.)
+
+        :param spatial_reference: the spatial reference in which the areas are measured (If none is supplied, they're
+            measured in the array's own spatial reference.)
+        :return: the area of each geometry (in the square units of the spatial reference)
+        """
+        coordinates = self._coordinates_in(spatial_reference)
+        if len(coordinates) < 2:
+            return np.zeros(len(self), dtype=np.float64)
+        # Use the shoelace formula, one ring at a time (but all at once).
+        x, y = coordinates[:, 0], coordinates[:, 1]
+        cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+        cross[~_segment_mask(len(coordinates), self._ring_offsets)] = 0.0
+        return self._sum_polygon_rings(np.abs(_ring_sums(cross, self._ring_offsets)) / 2.0)
+
+    def flip_coordinates(self) -> 'GeometryArray':
+        """
+        Create a geometry array based on this one, but with the X and Y axis of every geometry reversed.  (All of the
+        coordinates are swapped at once.  The offsets are shared with this array.)
+
+        :return: the new geometry array
+        """
+        return GeometryArray(geometry_types=self._geometry_types,
+                             coordinates=_flip_columns(self._coordinates),
+                             ring_offsets=self._ring_offsets,
+                             part_offsets=self._part_offsets,
+                             geometry_offsets=self._geometry_offsets,
+                             spatial_reference=self._spatial_reference)
+
+    def get_shapely(self, index: int) -> BaseGeometry:
+        """
+        Build the Shapely geometry for a single geometry in the array.
+
+        :param index: the index of the geometry
+        :return: the Shapely geometry
+        """
+        # Figure out which parts (and rings) belong to this geometry.
+        geometry_type = int(self._geometry_types[index])
+        part_start, part_end = self._geometry_offsets[index], self._geometry_offsets[index + 1]
+        ring_start, ring_end = self._part_offsets[part_start], self._part_offsets[part_end]
+        if geometry_type & GeometryType.COLLECTION:
+            return _shapely_from_parts(geometry_type & ~GeometryType.COLLECTION,
+                                       self._coordinates,
+                                       self._ring_offsets[ring_start:ring_end + 1],
+                                       self._part_offsets[part_start:part_end + 1] - ring_start,
+                                       multi=True)
+        return _shapely_from_rings(geometry_type,
+                                   self._coordinates,
+                                   self._ring_offsets[ring_start:ring_end + 1])
+
+    def iter_wkb(self, ewkb: bool = False, spatial_reference: SpatialReference or int = None) -> Iterator[bytes]:
+        """
+        Write each geometry in the array as (little-endian) WKB, straight from the coordinate block.  (No Shapely
+        geometries are created.)
+
+        :param ewkb: `True` to embed the SRID (which makes the results EWKB)
+        :param spatial_reference: the spatial reference in which the geometries are written (If you don't supply
+            one, they're written in the array's spatial reference.  Otherwise, all the coordinates are transformed
+            at once.)
+        :return: an iteration of WKB values
+        """
+        sr = self._spatial_reference if spatial_reference is None else (
+            spatial_reference if isinstance(spatial_reference, SpatialReference)
+            else SpatialReference.from_srid(srid=spatial_reference))
+        coordinates = self._coordinates_in(sr)
+        srid = sr.srid if ewkb else None
+        for geometry_type, part_start, part_end in zip(self._geometry_types.tolist(),
+                                                       self._geometry_offsets[:-1].tolist(),
+                                                       self._geometry_offsets[1:].tolist()):
+            yield _write_wkb(geometry_type, coordinates, self._ring_offsets,
+                             self._part_offsets[part_start:part_end + 1], srid=srid)
+
+    def to_geometries(self) -> List[Geometry]:
+        """
+        Create a djio geometry for every geometry in the array.
+
+        :return: the geometries
+        """
+        return list(iter(self))
+
+    @staticmethod
+    def from_shapely(shapely_geometries: Iterable[BaseGeometry],
+                     spatial_reference: SpatialReference or int) -> 'GeometryArray':
+        """
+        Create a geometry array from Shapely geometries.
+
+        :param shapely_geometries: the Shapely geometries
+        :param spatial_reference: the spatial reference (or spatial reference ID) shared by all the geometries
+        :return: the new geometry array
+        :raises GeometryException: if one of the geometries is of an unsupported type (Geometry collections can't
+            go into arrays, though multi-part geometries can.), or the coordinate dimensions are mixed
+        """
+        acc = _WkbRings()
+        for shapely_geometry in shapely_geometries:
+            try:
+                geometry_type = _shapely_geom_type_map[shapely_geometry.geom_type.lower()]
+            except KeyError:
+                raise GeometryException('Unsupported geometry type: {type}.'.format(type=shapely_geometry.geom_type))
+            if geometry_type == GeometryType.COLLECTION:
+                raise GeometryException('Geometry collections are not supported.')
+            parts = list(shapely_geometry.geoms) if geometry_type & GeometryType.COLLECTION else [shapely_geometry]
+            ndim = 3 if shapely_geometry.has_z else 2
+            if acc.ndim is None:
+                acc.ndim = ndim
+            elif acc.ndim != ndim:
+                raise GeometryException('All of the geometries in an array must have the same coordinate dimension.')
+            for part in parts:
+                rings = _shapely_rings(part)
+                acc.rings.extend(np.asarray(ring, dtype=np.float64).reshape(-1, ndim) for ring in rings)
+                acc.ring_counts.append(len(rings))
+            acc.part_counts.append(len(parts))
+            acc.geometry_types.append(int(geometry_type))
+        return GeometryArray._from_accumulator(acc, spatial_reference)
+
+    @staticmethod
+    def from_geometries(geometries: Iterable[Geometry],
+                        spatial_reference: SpatialReference or int = None) -> 'GeometryArray':
+        """
+        Create a geometry array from djio geometries.  Geometries that aren't in the array's spatial reference are
+        transformed.
+
+        :param geometries: the geometries
+        :param spatial_reference: the spatial reference for the array (If none is supplied the spatial reference of
+            the first geometry is used.)
+        :return: the new geometry array
+        """
+        _geometries = list(geometries)
+        sr = spatial_reference
+        if sr is None:
+            if len(_geometries) == 0:
+                raise GeometryException('A spatial reference is required to create an empty array.')
+            sr = _geometries[0].spatial_reference
+        elif not isinstance(sr, SpatialReference):
+            sr = SpatialReference.from_srid(srid=sr)
+        return GeometryArray.from_shapely(
+            shapely_geometries=(g.transform(spatial_reference=sr).shapely_geometry for g in _geometries),
+            spatial_reference=sr
+        )
+
+    @staticmethod
+    def from_wkb(wkbs: Iterable[bytes],
+                 spatial_reference: SpatialReference or int) -> 'GeometryArray':
+        """
+        Create a geometry array from well-known binary (WKB).  The WKB is decoded directly into the coordinate
+        array, so no intermediate Shapely geometries are created.
+
+        :param wkbs: the well-known binary values
+        :param spatial_reference: the spatial reference (or spatial reference ID) shared by all the geometries
+        :return: the new geometry array
+        """
+        acc = _WkbRings()
+        for wkb in wkbs:
+            _read_wkb(wkb, acc)
+        return GeometryArray._from_accumulator(acc, spatial_reference)
+
+    @staticmethod
+    def _from_accumulator(acc: _WkbRings,
+                          spatial_reference: SpatialReference or int) -> 'GeometryArray':
+        """
+        Assemble a geometry array from the rings collected in an accumulator.
+
+        :param acc: the accumulator
+        :param spatial_reference: the spatial reference
+        :return: the new geometry array
+        """
+        ndim = acc.ndim if acc.ndim is not None else 2
+        coordinates = (np.concatenate(acc.rings).astype(np.float64, copy=False) if len(acc.rings) != 0
+                       else np.empty((0, ndim), dtype=np.float64))
+        return GeometryArray(
+            geometry_types=np.asarray(acc.geometry_types, dtype=np.uint8),
+            coordinates=coordinates,
+            ring_offsets=_counts_to_offsets([len(ring) for ring in acc.rings]),
+            part_offsets=_counts_to_offsets(acc.ring_counts),
+            geometry_offsets=_counts_to_offsets(acc.part_counts),
+            spatial_reference=spatial_reference
+        )
+
+
+def _conform(geometry: Geometry, spatial_reference: SpatialReference) -> Geometry:
+    """
+    Make sure a geometry is in a given spatial reference (projecting it if necessary).
+
+    :param geometry: the geometry
+    :param spatial_reference: the spatial reference
+    :return: the original geometry, or a projected one
+    """
+    if geometry.spatial_reference.srid == spatial_reference.srid:
+        return geometry
+    return Projector.get_instance().project(geometry=geometry, preferred_spatial_reference=spatial_reference)
+
+
+def _point_coordinates(points: np.ndarray or GeometryArray or Iterable[Point],
+                       spatial_reference: SpatialReference or int or None) -> Tuple[np.ndarray, SpatialReference]:
+    """
+    Get the (x, y) coordinates of a collection of points as an array.
+
+    :param points: an (N, 2) array of coordinates, a geometry array of points, or point geometries
+    :param spatial_reference: the spatial reference of the coordinates (This is required for plain arrays.  Point
+        geometries in other spatial references are projected.)
+    :return: the coordinates and their spatial reference (Empty points have NaN coordinates.)
+    """
+    sr = spatial_reference
+    if sr is not None and not isinstance(sr, SpatialReference):
+        sr = SpatialReference.from_srid(srid=sr)
+    if isinstance(points, GeometryArray):
+        if np.any(points.geometry_types != GeometryType.POINT):
+            raise GeometryException('The geometry array contains geometries that are not points.')
+        if sr is not None and sr.srid != points.spatial_reference.srid:
+            raise GeometryException('The points are not in the requested spatial reference.')
+        if len(points.coordinates) == len(points):
+            return points.coordinates[:, 0:2], points.spatial_reference
+        # Some of the points are empty (so they have no coordinates).
+        rings = points.part_offsets[points.geometry_offsets[:-1]]
+        starts = points.ring_offsets[rings]
+        present = points.ring_offsets[rings + 1] > starts
+        coordinates = np.full((len(points), 2), np.nan, dtype=np.float64)
+        coordinates[present] = points.coordinates[starts[present], 0:2]
+        return coordinates, points.spatial_reference
+    if isinstance(points, np.ndarray):
+        if sr is None:
+            raise GeometryException('A spatial reference is required for an array of coordinates.')
+        return np.asarray(points, dtype=np.float64)[:, 0:2], sr
+    _points = list(points)
+    if sr is None:
+        if len(_points) == 0:
+            raise GeometryException('A spatial reference is required for an empty collection.')
+        sr = _points[0].spatial_reference
+    coordinates = np.array([(p.x, p.y) if not p.shapely_geometry.is_empty else (np.nan, np.nan)
+                            for p in (_conform(p, sr) for p in _points)], dtype=np.float64)
+    return coordinates.reshape(-1, 2), sr
+
+
+def _measure_many(geometries: Iterable[Geometry],
+                  spatial_reference: SpatialReference,
+                  measure: str) -> np.ndarray:
+    """
+    Measure a batch of geometries in a given spatial reference.  The geometries are grouped by their spatial
+    references and each group is gathered into a :py:class:`GeometryArray` and transformed in a single call.  (Nothing
+    is cached on the geometries.)
+
+    :param geometries: the geometries
+    :param spatial_reference: the spatial reference in which they're measured
+    :param measure: the name of the :py:class:`GeometryArray` measurement method (`lengths` or `areas`)
+    :return: the measurement of each geometry
+    """
+    _geometries = list(geometries)
+    # Arrays can't mix coordinate dimensions either, so we group by that too.
+    groups: Dict[Tuple[int, bool], List[int]] = {}
+    for i, geometry in enumerate(_geometries):
+        groups.setdefault((geometry.spatial_reference.srid, geometry.shapely_geometry.has_z), []).append(i)
+    measurements = np.zeros(len(_geometries), dtype=np.float64)
+    for (srid, _), indexes in groups.items():
+        array = GeometryArray.from_shapely((_geometries[i].shapely_geometry for i in indexes),
+                                           spatial_reference=srid)
+        measurements[indexes] = getattr(array, measure)(spatial_reference=spatial_reference)
+    return measurements
+
+
+_BUFFER_HEADER: struct.Struct = struct.Struct('<4sBBxxiqqqq')  #: magic, version, ndim, SRID, counts (G, P, R, V)
+_BUFFER_VERSION: int = 1  #: the version of the buffer layout
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    """
+    Round an offset up to the next multiple of the alignment.
+
+    :param offset: the offset
+    :param alignment: the alignment
+    :return: the aligned offset
+    """
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _buffer_layout(ndim: int, geometries: int, parts: int, rings: int,
+                   vertices: int) -> Tuple[List[Tuple[str, np.dtype, Tuple[int, ...], int]], int]:
+    """
+    Figure out where each of a geometry array's columns lives within a flat buffer (like a shared memory segment or a
+    memory-mapped file).  The buffer starts with a header followed by each column, aligned to eight (8) bytes.
+
+    :param ndim: the coordinate dimension
+    :param geometries: the number of geometries
+    :param parts: the number of parts
+    :param rings: the number of rings
+    :param vertices: the number of vertices
+    :return: a list of (name, dtype, shape, offset) tuples, and the total size of the buffer
+    """
+    specs = [
+        ('coordinates', np.dtype('<f8'), (vertices, ndim)),
+        ('ring_offsets', np.dtype('<i8'), (rings + 1,)),
+        ('part_offsets', np.dtype('<i8'), (parts + 1,)),
+        ('geometry_offsets', np.dtype('<i8'), (geometries + 1,)),
+        ('envelopes', np.dtype('<f8'), (geometries, 4)),
+        ('geometry_types', np.dtype(np.uint8), (geometries,)),
+        ('djiohashes', np.dtype(np.uint8), (geometries, 15))
+    ]
+    layout = []
+    offset = _align(_BUFFER_HEADER.size)
+    for name, dtype, shape in specs:
+        layout.append((name, dtype, shape, offset))
+        offset = _align(offset + dtype.itemsize * int(np.prod(shape)))
+    return layout, offset
+
+
+def _buffer_sections(array: GeometryArray,
+                     magic: bytes) -> Tuple[bytes, List[Tuple[np.ndarray, int, np.dtype]], int]:
+    """
+    Get everything we need to lay a geometry array out in a flat buffer.
+
+    :param array: the geometry array
+    :param magic: the bytes that identify the kind of buffer
+    :return: the packed header, a list of (column, offset, dtype) tuples, and the total size of the buffer
+    """
+    geometries, parts, rings, vertices = (len(array), len(array.part_offsets) - 1, len(array.ring_offsets) - 1,
+                                          len(array.coordinates))
+    layout, size = _buffer_layout(array.ndim, geometries, parts, rings, vertices)
+    header = _BUFFER_HEADER.pack(magic, _BUFFER_VERSION, array.ndim, array.spatial_reference.srid,
+                                 geometries, parts, rings, vertices)
+    columns = {
+        'coordinates': array.coordinates,
+        'ring_offsets': array.ring_offsets,
+        'part_offsets': array.part_offsets,
+        'geometry_offsets': array.geometry_offsets,
+        'envelopes': array.envelopes(),
+        'geometry_types': array.geometry_types,
+        'djiohashes': array.djiohashes()
+    }
+    return header, [(columns[name], offset, dtype) for name, dtype, _, offset in layout], size
+
+
+def _write_buffer(buffer: memoryview, array: GeometryArray, magic: bytes):
+    """
+    Lay a geometry array out in a writable flat buffer.
+
+    :param buffer: the buffer (which must be at least as large as the layout requires)
+    :param array: the geometry array
+    :param magic: the bytes that identify the kind of buffer
+    """
+    header, sections, _ = _buffer_sections(array, magic)
+    buffer[0:len(header)] = header
+    for column, offset, dtype in sections:
+        target = np.ndarray(shape=column.shape, dtype=dtype, buffer=buffer, offset=offset)
+        target[...] = column
+        del target  # (Whoever owns the buffer can't release it while there are views into it.)
+
+
+def _read_buffer(buffer: memoryview, magic: bytes) -> GeometryArray:
+    """
+    Create a geometry array whose columns are views into a flat buffer.
+
+    :param buffer: the buffer
+    :param magic: the bytes that identify the kind of buffer
+    :return: the geometry array
+    :raises GeometryException: if the buffer doesn't contain the expected kind of geometry array
+    """
+    _magic, version, ndim, srid, geometries, parts, rings, vertices = _BUFFER_HEADER.unpack_from(buffer, 0)
+    if _magic != magic:
+        raise GeometryException('The buffer does not contain djio geometries.')
+    if version != _BUFFER_VERSION:
+        raise GeometryException('Unsupported buffer version: {version}.'.format(version=version))
+    layout, _ = _buffer_layout(ndim, geometries, parts, rings, vertices)
+    views = {}
+    for name, dtype, shape, offset in layout:
+        view = np.ndarray(shape=shape, dtype=dtype, buffer=buffer, offset=offset)
+        view.flags.writeable = False
+        views[name] = view
+    array = GeometryArray(geometry_types=views['geometry_types'],
+                          coordinates=views['coordinates'],
+                          ring_offsets=views['ring_offsets'],
+                          part_offsets=views['part_offsets'],
+                          geometry_offsets=views['geometry_offsets'],
+                          spatial_reference=SpatialReference.from_srid(srid))
+    # The envelopes and hash values were computed when the buffer was written, so there's no need to compute them
+    # again.
+    array._caches['envelopes'] = views['envelopes']
+    array._caches['djiohashes'] = views['djiohashes']
+    return array
+
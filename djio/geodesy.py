@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.geodesy
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+How far is it, really?  Measure lengths, distances and areas on the ellipsoid without projecting anything.
+
+All of the functions in this module work on longitudes and latitudes (in degrees) on the WGS84 ellipsoid
+(`EPSG:4326 <http://epsg.io/4326>`_) and return plain floats (or arrays of floats) in meters or square meters.
+"""
+
+from .arrays import GeometryArray, _ring_sums, _segment_mask
+from .geometry import Geometry, GeometryException, GeometryType, SpatialReference
+import numpy as np
+from typing import Iterable, Tuple
+
+
+WGS84_A: float = 6378137.0  #: the semi-major axis of the WGS84 ellipsoid (in meters)
+WGS84_F: float = 1.0 / 298.257223563  #: the flattening of the WGS84 ellipsoid
+WGS84_B: float = WGS84_A * (1.0 - WGS84_F)  #: the semi-minor axis of the WGS84 ellipsoid (in meters)
+WGS84_E: float = np.sqrt(WGS84_F * (2.0 - WGS84_F))  #: the (first) eccentricity of the WGS84 ellipsoid
+
+_VINCENTY_TOLERANCE: float = 1e-12  #: the change in longitude (radians) at which Vincenty's iteration has converged
+_VINCENTY_ITERATIONS: int = 200  #: the most iterations Vincenty's formula gets before we give up on it
+
+
+def _q(sin_lat: np.ndarray or float) -> np.ndarray or float:
+    """
+    Calculate the `q` function used to convert geodetic latitudes to authalic latitudes.
+
+    :param sin_lat: the sine of the geodetic latitude
+    :return: `q`
+    """
+    e_sin_lat = WGS84_E * sin_lat
+    return (1.0 - WGS84_E ** 2) * (
+        sin_lat / (1.0 - e_sin_lat ** 2) - np.log((1.0 - e_sin_lat) / (1.0 + e_sin_lat)) / (2.0 * WGS84_E)
+    )
+
+
+_QP: float = float(_q(1.0))  #: `q` at the pole
+AUTHALIC_RADIUS: float = WGS84_A * np.sqrt(_QP / 2.0)  #: the radius of the sphere with the ellipsoid's surface area
+
+
+def _authalic_latitudes(latitudes: np.ndarray) -> np.ndarray:
+    """
+    Convert geodetic latitudes to authalic latitudes (the latitudes on a sphere of the same surface area at which
+    areas are preserved).
+
+    :param latitudes: the geodetic latitudes (in radians)
+    :return: the authalic latitudes (in radians)
+    """
+    return np.arcsin(np.clip(_q(np.sin(latitudes)) / _QP, -1.0, 1.0))
+
+
+def geodesic_distances(lon1: np.ndarray or float,
+                       lat1: np.ndarray or float,
+                       lon2: np.ndarray or float,
+                       lat2: np.ndarray or float) -> np.ndarray:
+    """
+    Calculate the geodesic distances between pairs of points on the ellipsoid using Vincenty's inverse formula.  The
+    whole batch is iterated at once.  (Nearly antipodal pairs, for which the iteration doesn't converge, fall back to
+    the great-circle distance on the authalic sphere.)
+
+    :param lon1: the longitudes of the first points (in degrees)
+    :param lat1: the latitudes of the first points (in degrees)
+    :param lon2: the longitudes of the second points (in degrees)
+    :param lat2: the latitudes of the second points (in degrees)
+    :return: the distances (in meters)
+    """
+    lon1, lat1, lon2, lat2 = np.broadcast_arrays(*[np.radians(np.asarray(v, dtype=np.float64))
+                                                   for v in (lon1, lat1, lon2, lat2)])
+    shape = lon1.shape
+    # Work with flat arrays (even if we were handed scalars) and put the shape back at the end.
+    lon1, lat1, lon2, lat2 = (v.reshape(-1) for v in (lon1, lat1, lon2, lat2))
+    # Work with the reduced latitudes.
+    u1 = np.arctan((1.0 - WGS84_F) * np.tan(lat1))
+    u2 = np.arctan((1.0 - WGS84_F) * np.tan(lat2))
+    sin_u1, cos_u1, sin_u2, cos_u2 = np.sin(u1), np.cos(u1), np.sin(u2), np.cos(u2)
+    big_l = lon2 - lon1
+    lam = big_l.copy()
+    # These are filled in by the iteration.
+    sin_sigma = cos_sigma = sigma = cos2_alpha = cos_2sigma_m = np.zeros_like(lam)
+    active = np.ones(lam.shape, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(_VINCENTY_ITERATIONS):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt((cos_u2 * sin_lam) ** 2 + (cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam) ** 2)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0.0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos2_alpha = 1.0 - sin_alpha ** 2
+            # Points on the equator have no meaningful 2σm, so we use zero.
+            cos_2sigma_m = np.where(cos2_alpha == 0.0, 0.0, cos_sigma - 2.0 * sin_u1 * sin_u2 / cos2_alpha)
+            c = WGS84_F / 16.0 * cos2_alpha * (4.0 + WGS84_F * (4.0 - 3.0 * cos2_alpha))
+            lam_next = big_l + (1.0 - c) * WGS84_F * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2))
+            )
+            active = np.abs(lam_next - lam) > _VINCENTY_TOLERANCE
+            lam = lam_next
+            if not active.any():
+                break
+    u_sq = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    big_a = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+    big_b = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+    delta_sigma = big_b * sin_sigma * (
+        cos_2sigma_m + big_b / 4.0 * (
+            cos_sigma * (-1.0 + 2.0 * cos_2sigma_m ** 2) -
+            big_b / 6.0 * cos_2sigma_m * (-3.0 + 4.0 * sin_sigma ** 2) * (-3.0 + 4.0 * cos_2sigma_m ** 2)
+        )
+    )
+    distances = WGS84_B * big_a * (sigma - delta_sigma)
+    if active.any():
+        # Vincenty gave up on these, so we'll settle for the great-circle distance.
+        b1 = _authalic_latitudes(lat1[active])
+        b2 = _authalic_latitudes(lat2[active])
+        h = (np.sin((b2 - b1) / 2.0) ** 2 +
+             np.cos(b1) * np.cos(b2) * np.sin((lon2[active] - lon1[active]) / 2.0) ** 2)
+        distances[active] = 2.0 * AUTHALIC_RADIUS * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+    return distances.reshape(shape)
+
+
+def ring_lengths(coordinates: np.ndarray, ring_offsets: np.ndarray) -> np.ndarray:
+    """
+    Calculate the geodesic length of every ring (or line) in a block of coordinates.
+
+    :param coordinates: an (N, 2) or (N, 3) array of (longitude, latitude) coordinates (in degrees)
+    :param ring_offsets: the offset of the first coordinate in each ring (plus a final offset for the end)
+    :return: the length of each ring (in meters)
+    """
+    _coordinates = np.asarray(coordinates, dtype=np.float64)
+    _ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+    if len(_coordinates) < 2:
+        return np.zeros(len(_ring_offsets) - 1, dtype=np.float64)
+    lengths = geodesic_distances(_coordinates[:-1, 0], _coordinates[:-1, 1], _coordinates[1:, 0], _coordinates[1:, 1])
+    lengths[~_segment_mask(len(_coordinates), _ring_offsets)] = 0.0
+    return _ring_sums(lengths, _ring_offsets)
+
+
+def ring_areas(coordinates: np.ndarray, ring_offsets: np.ndarray) -> np.ndarray:
+    """
+    Calculate the area enclosed by every ring in a block of coordinates.  The coordinates are moved onto the authalic
+    sphere (which preserves area) and the area of each ring is the sum of the spherical excesses of the triangles each
+    edge makes with the pole.  The smaller of the two areas a ring divides the earth into is the one reported.
+
+    :param coordinates: an (N, 2) or (N, 3) array of (longitude, latitude) coordinates (in degrees)
+    :param ring_offsets: the offset of the first coordinate in each (closed) ring (plus a final offset for the end)
+    :return: the (unsigned) area of each ring (in square meters)
+    """
+    _coordinates = np.asarray(coordinates, dtype=np.float64)
+    _ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+    if len(_coordinates) < 2:
+        return np.zeros(len(_ring_offsets) - 1, dtype=np.float64)
+    lon = np.radians(_coordinates[:, 0])
+    t = np.tan(_authalic_latitudes(np.radians(_coordinates[:, 1])) / 2.0)
+    # Wrap the change in longitude along each edge into [-π, π) so edges that cross the antimeridian come out right.
+    delta_lon = np.mod(lon[1:] - lon[:-1] + np.pi, 2.0 * np.pi) - np.pi
+    excess = 2.0 * np.arctan2(np.tan(delta_lon / 2.0) * (t[:-1] + t[1:]), 1.0 + t[:-1] * t[1:])
+    excess[~_segment_mask(len(_coordinates), _ring_offsets)] = 0.0
+    totals = np.abs(_ring_sums(excess, _ring_offsets))
+    return np.minimum(totals, 4.0 * np.pi - totals) * AUTHALIC_RADIUS ** 2
+
+
+def _lonlat(coordinates: np.ndarray, spatial_reference: SpatialReference) -> np.ndarray:
+    """
+    Make sure a block of coordinates is expressed in longitudes and latitudes.
+
+    :param coordinates: the coordinates
+    :param spatial_reference: the spatial reference of the coordinates
+    :return: the coordinates in `EPSG:4326`
+    """
+    return (coordinates if spatial_reference.srid == 4326
+            else spatial_reference.transform_coordinates(coordinates, 4326))
+
+
+def _to_array(geometries: GeometryArray or Iterable[Geometry]) -> GeometryArray:
+    """
+    Make sure we're working with a geometry array.  (If all the geometries share a spatial reference, they're left in
+    it so the coordinates can be transformed all at once.)
+
+    :param geometries: a geometry array, or geometries
+    :return: the geometry array
+    """
+    if isinstance(geometries, GeometryArray):
+        return geometries
+    _geometries = list(geometries)
+    srids = {geometry.spatial_reference.srid for geometry in _geometries}
+    if len(srids) == 1:
+        return GeometryArray.from_shapely((geometry.shapely_geometry for geometry in _geometries),
+                                          spatial_reference=_geometries[0].spatial_reference)
+    return GeometryArray.from_geometries(_geometries, spatial_reference=4326)
+
+
+def geodesic_lengths(geometries: GeometryArray or Iterable[Geometry]) -> np.ndarray:
+    """
+    Calculate the geodesic lengths of a batch of geometries.  (Points have no length, and the length of a polygon is
+    the length of all its rings.)
+
+    :param geometries: a geometry array, or geometries
+    :return: the length of each geometry (in meters)
+    """
+    array = _to_array(geometries)
+    coordinates = _lonlat(array.coordinates, array.spatial_reference)
+    return array._sum_rings(ring_lengths(coordinates, array.ring_offsets))
+
+
+def geodesic_areas(geometries: GeometryArray or Iterable[Geometry]) -> np.ndarray:
+    """
+    Calculate the geodesic areas of a batch of geometries.  (Points and polylines have no area.)
+
+    :param geometries: a geometry array, or geometries
+    :return: the area of each geometry (in square meters)
+    """
+    array = _to_array(geometries)
+    coordinates = _lonlat(array.coordinates, array.spatial_reference)
+    return array._sum_polygon_rings(ring_areas(coordinates, array.ring_offsets))
+
+
+def geodesic_distance(geometry1: Geometry, geometry2: Geometry) -> float:
+    """
+    Calculate the geodesic distance between two points.
+
+    :param geometry1: the first point
+    :param geometry2: the second point
+    :return: the distance (in meters)
+    :raises GeometryException: if either geometry isn't a point
+    """
+    coordinates: Tuple[np.ndarray, ...] = ()
+    for geometry in (geometry1, geometry2):
+        if geometry.geometry_type != GeometryType.POINT:
+            raise GeometryException('Geodesic distances are measured between points.')
+        coordinates += (_lonlat(np.asarray(geometry.shapely_geometry.coords, dtype=np.float64)[:, 0:2],
+                                geometry.spatial_reference),)
+    return float(geodesic_distances(coordinates[0][0, 0], coordinates[0][0, 1],
+                                    coordinates[1][0, 0], coordinates[1][0, 1]))
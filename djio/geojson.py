@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.geojson
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Talking to a web map?  Speak GeoJSON.
+"""
+
+from .arrays import GeometryArray
+from .geometry import Geometry, GeometryCollection, GeometryException, GeometryType, SpatialReference
+from io import StringIO
+import json
+import numpy as np
+import re
+from shapely.geometry import shape
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+
+_geojson_type_names: Dict[GeometryType, str] = {
+    GeometryType.POINT: 'Point',
+    GeometryType.POLYLINE: 'LineString',
+    GeometryType.POLYGON: 'Polygon',
+    GeometryType.MULTIPOINT: 'MultiPoint',
+    GeometryType.MULTIPOLYLINE: 'MultiLineString',
+    GeometryType.MULTIPOLYGON: 'MultiPolygon',
+    GeometryType.COLLECTION: 'GeometryCollection'
+}  #: a mapping of djio geometry types to GeoJSON geometry type names
+
+# This regex matches the zeros (and, if there's nothing left behind it, the decimal point) at the end of a number
+# that was formatted with a fixed number of decimal places.
+_trailing_zeros_re = re.compile(r'\.?0+(?=[,\]])')  #: a regex that matches superfluous trailing zeros
+
+_crs_name_re = re.compile(r'EPSG:{1,2}(?P<srid>\d+)', flags=re.IGNORECASE)  #: a regex that matches an EPSG CRS name
+
+_CHUNK_SIZE: int = 65536  #: the default number of coordinates (or characters) handled at a time
+
+
+class Feature(NamedTuple):
+    """
+    A feature is a geometry with some properties (and maybe an ID).
+    """
+    geometry: Optional[Geometry]  #: the feature's geometry (which may be `None`)
+    properties: Dict[str, Any]  #: the feature's properties
+    id: Any = None  #: the feature's ID
+
+
+def _write_positions(write: Callable[[str], Any], coordinates: np.ndarray, precision: int,
+                     chunk_size: int = _CHUNK_SIZE):
+    """
+    Write a block of coordinates as comma-separated GeoJSON positions (without the surrounding brackets).  Each chunk
+    of coordinates is formatted in a single call straight from the array.
+
+    :param write: the function that writes text
+    :param coordinates: an (n, D) array of coordinates
+    :param precision: the number of decimal places
+    :param chunk_size: the largest number of coordinates formatted at a time
+    """
+    ndim = coordinates.shape[1]
+    position = '[' + ','.join(['%.{precision}f'.format(precision=precision)] * ndim) + ']'
+    for start in range(0, len(coordinates), chunk_size):
+        chunk = coordinates[start:start + chunk_size]
+        text = ','.join([position] * len(chunk)) % tuple(chunk.ravel().tolist())
+        if start != 0:
+            write(',')
+        write(_trailing_zeros_re.sub('', text) if precision > 0 else text)
+
+
+def _write_part(write: Callable[[str], Any],
+                part_type: int,
+                coordinates: np.ndarray,
+                ring_offsets: np.ndarray,
+                ring_start: int,
+                ring_end: int,
+                precision: int):
+    """
+    Write the GeoJSON coordinates of a single part.
+
+    :param write: the function that writes text
+    :param part_type: the :py:class:`GeometryType` of the part
+    :param coordinates: the coordinates
+    :param ring_offsets: the ring offsets
+    :param ring_start: the index of the part's first ring
+    :param ring_end: the index just past the part's last ring
+    :param precision: the number of decimal places
+    """
+    if part_type == GeometryType.POINT:
+        if ring_end == ring_start or ring_offsets[ring_start] == ring_offsets[ring_start + 1]:
+            write('[]')  # This is an empty point.
+        else:
+            _write_positions(write, coordinates[ring_offsets[ring_start]:ring_offsets[ring_start] + 1], precision)
+        return
+    # A polygon's coordinates are a list of rings.
+    if part_type == GeometryType.POLYGON:
+        write('[')
+    for ring in range(ring_start, ring_end):
+        write('[' if ring == ring_start else ',[')
+        _write_positions(write, coordinates[ring_offsets[ring]:ring_offsets[ring + 1]], precision)
+        write(']')
+    if part_type == GeometryType.POLYGON:
+        write(']')
+    elif ring_end == ring_start:
+        write('[]')  # This is an empty line.
+
+
+def _write_geometry(write: Callable[[str], Any],
+                    geometry_type: int,
+                    coordinates: np.ndarray,
+                    ring_offsets: np.ndarray,
+                    part_offsets: np.ndarray,
+                    part_types: Optional[np.ndarray],
+                    precision: int):
+    """
+    Write a GeoJSON geometry from a block of coordinates and the offsets that describe it.
+
+    :param write: the function that writes text
+    :param geometry_type: the :py:class:`GeometryType` of the geometry
+    :param coordinates: the coordinates
+    :param ring_offsets: the ring offsets
+    :param part_offsets: the offsets (into the ring offsets) of the geometry's parts (plus a final offset for the end)
+    :param part_types: the type of each part (This is only needed for geometry collections.)
+    :param precision: the number of decimal places
+    """
+    _geometry_type = int(geometry_type)
+    if _geometry_type == GeometryType.COLLECTION:
+        write('{"type":"GeometryCollection","geometries":[')
+        for i, part_type in enumerate(part_types):
+            if i != 0:
+                write(',')
+            _write_geometry(write, int(part_type), coordinates, ring_offsets, part_offsets[i:i + 2], None, precision)
+        write(']}')
+        return
+    try:
+        write('{{"type":"{name}","coordinates":'.format(name=_geojson_type_names[GeometryType(_geometry_type)]))
+    except (KeyError, ValueError):
+        raise GeometryException('Unsupported geometry type: {type}.'.format(type=geometry_type))
+    part_type = _geometry_type & ~GeometryType.COLLECTION
+    if _geometry_type & GeometryType.COLLECTION:
+        write('[')
+        for i in range(len(part_offsets) - 1):
+            if i != 0:
+                write(',')
+            _write_part(write, part_type, coordinates, ring_offsets, part_offsets[i], part_offsets[i + 1], precision)
+        write(']')
+    else:
+        _write_part(write, part_type, coordinates, ring_offsets, part_offsets[0], part_offsets[-1], precision)
+    write('}')
+
+
+def _resolve(spatial_reference: SpatialReference or int or None) -> Optional[SpatialReference]:
+    """
+    Resolve a spatial reference (or SRID).
+
+    :param spatial_reference: the spatial reference, SRID or `None`
+    :return: the spatial reference (or `None`)
+    """
+    if spatial_reference is None or isinstance(spatial_reference, SpatialReference):
+        return spatial_reference
+    return SpatialReference.from_srid(srid=spatial_reference)
+
+
+def write_geometry(stream: TextIO,
+                   geometry: Geometry,
+                   precision: int = 6,
+                   spatial_reference: SpatialReference or int or None = 4326):
+    """
+    Write a geometry to a text stream as GeoJSON.  The coordinates are formatted straight from the geometry's
+    coordinate block (see :py:attr:`djio.geometry.Geometry.coords_array`).
+
+    :param stream: the text stream
+    :param geometry: the geometry
+    :param precision: the number of decimal places written for each ordinate
+    :param spatial_reference: the spatial reference in which the coordinates are written (GeoJSON coordinates are
+        WGS84 longitudes and latitudes, but you can pass `None` to write the coordinates just as they are.)
+    """
+    sr = _resolve(spatial_reference)
+    coordinates = geometry.coords_array
+    if sr is not None and not geometry.spatial_reference.is_same_as(sr):
+        coordinates = geometry.spatial_reference.transform_coordinates(coordinates, sr)
+    _write_geometry(stream.write, geometry.geometry_type, coordinates, geometry.ring_offsets, geometry.part_offsets,
+                    geometry.part_types if isinstance(geometry, GeometryCollection) else None, precision)
+
+
+def dumps_geometry(geometry: Geometry,
+                   precision: int = 6,
+                   spatial_reference: SpatialReference or int or None = 4326) -> str:
+    """
+    Get a geometry as GeoJSON.
+
+    :param geometry: the geometry
+    :param precision: the number of decimal places written for each ordinate
+    :param spatial_reference: the spatial reference in which the coordinates are written (or `None` to write the
+        coordinates just as they are)
+    :return: the GeoJSON
+    """
+    stream = StringIO()
+    write_geometry(stream, geometry, precision=precision, spatial_reference=spatial_reference)
+    return stream.getvalue()
+
+
+def loads_geometry(geojson: str or Dict[str, Any],
+                   spatial_reference: SpatialReference or int = 4326) -> Geometry:
+    """
+    Create a geometry from GeoJSON.
+
+    :param geojson: the GeoJSON geometry (as text, or as the object you'd get from parsing the text)
+    :param spatial_reference: the spatial reference of the coordinates
+    :return: the geometry
+    :raises GeometryException: if the GeoJSON isn't a geometry
+    """
+    mapping = json.loads(geojson) if isinstance(geojson, str) else geojson
+    if not isinstance(mapping, dict) or mapping.get('type') not in _geojson_type_names.values():
+        raise GeometryException('The GeoJSON is not a geometry.')
+    return Geometry.from_shapely(shapely_geometry=shape(mapping), spatial_reference=spatial_reference)
+
+
+class FeatureCollectionWriter(object):
+    """
+    A feature collection writer writes a GeoJSON feature collection to a text stream a feature at a time, so the
+    whole collection never has to be in memory.  (Use it as a context manager, or remember to call
+    :py:func:`FeatureCollectionWriter.close`.)
+    """
+
+    def __init__(self,
+                 stream: TextIO,
+                 precision: int = 6,
+                 spatial_reference: SpatialReference or int or None = 4326):
+        """
+
+        :param stream: the text stream
+        :param precision: the number of decimal places written for each ordinate
+        :param spatial_reference: the spatial reference in which coordinates are written (If it isn't WGS84, the
+            collection names it in a (pre-RFC 7946) `crs` member.  Pass `None` to write every geometry's coordinates
+            just as they are.)
+        """
+        self._stream: TextIO = stream
+        self._precision: int = precision
+        self._spatial_reference: Optional[SpatialReference] = _resolve(spatial_reference)
+        self._count: int = 0  #: the number of features written so far
+        self._closed: bool = False
+        stream.write('{"type":"FeatureCollection",')
+        if self._spatial_reference is not None and self._spatial_reference.srid != 4326:
+            stream.write('"crs":{{"type":"name","properties":{{"name":"urn:ogc:def:crs:EPSG::{srid}"}}}},'.format(
+                srid=self._spatial_reference.srid))
+        stream.write('"features":[')
+
+    def __enter__(self) -> 'FeatureCollectionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _begin_feature(self, properties: Optional[Dict[str, Any]], id: Any):
+        """
+        Write everything in a feature that comes before the geometry.
+
+        :param properties: the feature's properties
+        :param id: the feature's ID
+        """
+        if self._closed:
+            raise GeometryException('The feature collection has been closed.')
+        write = self._stream.write
+        write('\n{"type":"Feature",' if self._count == 0 else ',\n{"type":"Feature",')
+        if id is not None:
+            write('"id":')
+            write(json.dumps(id))
+            write(',')
+        write('"properties":')
+        write(json.dumps(properties if properties is not None else {}, separators=(',', ':')))
+        write(',"geometry":')
+
+    def write(self, geometry: Optional[Geometry], properties: Dict[str, Any] = None, id: Any = None):
+        """
+        Write a feature.
+
+        :param geometry: the feature's geometry (or `None`)
+        :param properties: the feature's properties
+        :param id: the feature's ID
+        """
+        self._begin_feature(properties, id)
+        if geometry is None:
+            self._stream.write('null')
+        else:
+            write_geometry(self._stream, geometry, precision=self._precision,
+                           spatial_reference=self._spatial_reference)
+        self._stream.write('}')
+        self._count += 1
+
+    def write_many(self, features: Iterable[Feature or Geometry]):
+        """
+        Write a number of features.
+
+        :param features: the features (or plain geometries)
+        """
+        for feature in features:
+            if isinstance(feature, Feature):
+                self.write(feature.geometry, properties=feature.properties, id=feature.id)
+            else:
+                self.write(feature)
+
+    def write_array(self,
+                    array: GeometryArray,
+                    properties: Iterable[Dict[str, Any]] = None,
+                    ids: Iterable[Any] = None):
+        """
+        Write every geometry in a geometry array as a feature.  The coordinates are formatted straight from the
+        array (so no djio geometries are created), and they're transformed (if necessary) a single time.
+
+        :param array: the geometry array
+        :param properties: the properties of each feature
+        :param ids: the ID of each feature
+        """
+        coordinates = array.coordinates
+        if self._spatial_reference is not None and not array.spatial_reference.is_same_as(self._spatial_reference):
+            coordinates = array.spatial_reference.transform_coordinates(coordinates, self._spatial_reference)
+        _properties = iter(properties) if properties is not None else None
+        _ids = iter(ids) if ids is not None else None
+        geometry_offsets, part_offsets = array.geometry_offsets, array.part_offsets
+        for i, geometry_type in enumerate(array.geometry_types.tolist()):
+            self._begin_feature(next(_properties) if _properties is not None else None,
+                                next(_ids) if _ids is not None else None)
+            _write_geometry(self._stream.write, geometry_type, coordinates, array.ring_offsets,
+                            part_offsets[geometry_offsets[i]:geometry_offsets[i + 1] + 1], None, self._precision)
+            self._stream.write('}')
+            self._count += 1
+
+    def close(self):
+        """
+        Finish the feature collection.  (The stream itself is left open.)
+        """
+        if not self._closed:
+            self._stream.write('\n]}\n')
+            self._closed = True
+
+
+class _Scanner(object):
+    """
+    This is a small, forgiving scanner that finds the objects in the `features` array of a GeoJSON feature collection
+    as the text streams in, so that each feature can be parsed on its own.
+    """
+    _token_re = re.compile(r'[{}\[\]"]')  #: a regex that matches the characters that change the structure
+    _string_re = re.compile(r'(?:[^"\\]|\\.)*"', flags=re.DOTALL)  #: a regex that matches the rest of a string
+    _colon_re = re.compile(r'\s*(:?)')  #: a regex that matches the colon that follows a key (if there is one)
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self._stream: TextIO = stream
+        self._chunk_size: int = chunk_size
+        self._buffer: str = ''
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _more(self) -> bool:
+        """
+        Read the next chunk of text into the buffer.
+
+        :return: `False` if the stream has nothing left
+        """
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _discard(self, keep: int):
+        """
+        Drop the part of the buffer we're done with.
+
+        :param keep: the position of the first character that must be kept
+        """
+        self._buffer = self._buffer[keep:]
+        self._pos -= keep
+
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        """
+        Scan the stream.
+
+        :return: an iteration of the top-level members the reader cares about (`crs` objects and features)
+        """
+        depth = 0  # This is how deeply nested (in objects and arrays) we are.
+        key: Optional[str] = None  # This is the most recent key in the top-level object.
+        in_features = False
+        start: Optional[int] = None  # This is where the object we're capturing started.
+        while True:
+            match = self._token_re.search(self._buffer, self._pos)
+            if match is None:
+                # Keep whatever we're capturing, and drop the rest.
+                self._discard(start if start is not None else len(self._buffer))
+                start = 0 if start is not None else None
+                if not self._more():
+                    return
+                continue
+            token, self._pos = match.group(), match.end()
+            if token == '"':
+                end = self._string_re.match(self._buffer, self._pos)
+                colon = self._colon_re.match(self._buffer, end.end()) if end is not None else None
+                # If the string (or whatever follows it) runs past the end of the buffer, read some more.
+                if end is None or colon.end() == len(self._buffer):
+                    self._pos -= 1
+                    if start is None:
+                        self._discard(self._pos)
+                    if not self._more():
+                        return
+                    continue
+                if depth == 1 and colon.group(1) == ':':
+                    key = json.loads(self._buffer[self._pos - 1:end.end()])
+                self._pos = end.end()
+            elif token in '{[':
+                depth += 1
+                if token == '{' and ((in_features and depth == 3) or (depth == 2 and key == 'crs')):
+                    start = self._pos - 1
+                elif token == '[' and depth == 2 and key == 'features':
+                    in_features = True
+            else:
+                depth -= 1
+                if start is not None and ((in_features and depth == 2) or (not in_features and depth == 1)):
+                    member = json.loads(self._buffer[start:self._pos])
+                    start = None
+                    self._discard(self._pos)
+                    yield member if in_features else {'crs': member}
+                elif in_features and depth == 1:
+                    in_features = False
+
+
+def _crs_spatial_reference(crs: Dict[str, Any]) -> Optional[int]:
+    """
+    Get the SRID named by a (pre-RFC 7946) GeoJSON `crs` member.
+
+    :param crs: the `crs` member
+    :return: the SRID (or `None` if we can't tell)
+    """
+    name = (crs.get('properties') or {}).get('name', '') if isinstance(crs, dict) else ''
+    match = _crs_name_re.search(name)
+    if match is not None:
+        return int(match.group('srid'))
+    return 4326 if 'CRS84' in name.upper() else None
+
+
+def read_features(stream: TextIO,
+                  spatial_reference: SpatialReference or int = None,
+                  chunk_size: int = _CHUNK_SIZE) -> Iterator[Feature]:
+    """
+    Read the features in a GeoJSON feature collection from a text stream, one feature at a time.  The stream is read
+    in chunks, and only the feature being parsed is ever held in memory.
+
+    :param stream: the text stream
+    :param spatial_reference: the spatial reference of the coordinates (If you don't supply one, the collection's
+        `crs` member is used if it has one, otherwise the coordinates are WGS84 longitudes and latitudes.)
+    :param chunk_size: the number of characters read at a time
+    :return: an iteration of features
+    """
+    sr = _resolve(spatial_reference)
+    for member in _Scanner(stream, chunk_size=chunk_size).scan():
+        if 'crs' in member and member.get('type') != 'Feature':
+            if spatial_reference is None:
+                srid = _crs_spatial_reference(member['crs'])
+                sr = _resolve(srid) if srid is not None else None
+            continue
+        if sr is None:
+            sr = _resolve(4326)
+        geometry = member.get('geometry')
+        yield Feature(geometry=loads_geometry(geometry, spatial_reference=sr) if geometry is not None else None,
+                      properties=member.get('properties') or {},
+                      id=member.get('id'))
+
+
+def loads_features(geojson: str, spatial_reference: SpatialReference or int = None) -> List[Feature]:
+    """
+    Read the features in a GeoJSON feature collection.
+
+    :param geojson: the GeoJSON feature collection
+    :param spatial_reference: the spatial reference of the coordinates (If you don't supply one, the collection's
+        `crs` member is used if it has one, otherwise the coordinates are WGS84 longitudes and latitudes.)
+    :return: the features
+    """
+    return list(read_features(StringIO(geojson), spatial_reference=spatial_reference))
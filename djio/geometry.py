@@ -12,18 +12,26 @@ from . import hashing
 from .errors import DjioException
 from abc import ABCMeta, abstractmethod
 from enum import Enum, IntFlag
+import itertools
 from osgeo import ogr
 from geoalchemy2.types import WKBElement, WKTElement
 from geoalchemy2.shape import to_shape as to_shapely
 import math
 from measurement.measures import Area
+import numpy as np
 import re
 import shapely.errors
-from shapely.geometry import box, Point as ShapelyPoint, LineString, LinearRing, Polygon as ShapelyPolygon
+from shapely.geometry import (box, Point as ShapelyPoint, LineString, LinearRing, Polygon as ShapelyPolygon,
+                              MultiPoint as ShapelyMultiPoint, MultiLineString, MultiPolygon as ShapelyMultiPolygon,
+                              GeometryCollection as ShapelyGeometryCollection)
 from shapely.geometry.base import BaseGeometry
+from shapely.prepared import prep, PreparedGeometry
 from shapely.wkb import loads as loads_wkb
 from shapely.wkt import loads as loads_wkt
-from typing import Any, Dict, Callable, Iterable, List, NamedTuple, Optional, Set, Tuple
+from typing import Any, Dict, Callable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+
+_TRANSFORM_CHUNK_SIZE: int = 65536  #: the number of coordinates OGR transforms at a time
 
 
 class SpatialReferenceException(DjioException):
@@ -56,6 +64,143 @@ class LatLonTuple(NamedTuple):
     longitude: float
 
 
+class EnvelopeTuple(NamedTuple):
+    """
+    This is a lightweight tuple that represents an envelope (a bounding box).  It's just four floats and an SRID, so
+    it's cheap to create and fast to test.  (If you need a geometry, use :py:func:`EnvelopeTuple.to_envelope`.)
+    """
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+    srid: int
+
+    @property
+    def width(self) -> float:
+        """
+        Get the width of the envelope.
+
+        :return: the width
+        """
+        return self.max_x - self.min_x
+
+    @property
+    def height(self) -> float:
+        """
+        Get the height of the envelope.
+
+        :return: the height
+        """
+        return self.max_y - self.min_y
+
+    @property
+    def area(self) -> float:
+        """
+        Get the (planar) area of the envelope, in the square units of its spatial reference.
+
+        :return: the area
+        """
+        return (self.max_x - self.min_x) * (self.max_y - self.min_y)
+
+    def intersects(self, other: 'EnvelopeTuple') -> bool:
+        """
+        Does this envelope intersect (or touch) another envelope?
+
+        :param other: the other envelope
+        :return: `True` if the envelopes intersect, otherwise `False`
+        """
+        return not (other.min_x > self.max_x or other.max_x < self.min_x or
+                    other.min_y > self.max_y or other.max_y < self.min_y)
+
+    def contains(self, other: 'EnvelopeTuple' or PointTuple) -> bool:
+        """
+        Does this envelope contain another envelope (or a point)?
+
+        :param other: the other envelope, or a point tuple
+        :return: `True` if this envelope contains the other envelope (or the point), otherwise `False`
+        """
+        if isinstance(other, PointTuple):
+            return self.min_x <= other.x <= self.max_x and self.min_y <= other.y <= self.max_y
+        return (self.min_x <= other.min_x and other.max_x <= self.max_x and
+                self.min_y <= other.min_y and other.max_y <= self.max_y)
+
+    def union(self, other: 'EnvelopeTuple') -> 'EnvelopeTuple':
+        """
+        Get the smallest envelope that contains both this envelope and another one.
+
+        :param other: the other envelope
+        :return: the combined envelope
+        """
+        return EnvelopeTuple(min_x=min(self.min_x, other.min_x),
+                             min_y=min(self.min_y, other.min_y),
+                             max_x=max(self.max_x, other.max_x),
+                             max_y=max(self.max_y, other.max_y),
+                             srid=self.srid)
+
+    def expand(self, dx: float, dy: float = None) -> 'EnvelopeTuple':
+        """
+        Get a copy of this envelope grown (or, with negative distances, shrunk) on every side.
+
+        :param dx: the distance by which the envelope grows to the left and right
+        :param dy: the distance by which the envelope grows up and down (If you don't supply it, it's the same as
+            `dx`.)
+        :return: the expanded envelope
+        """
+        _dy = dy if dy is not None else dx
+        return EnvelopeTuple(min_x=self.min_x - dx,
+                             min_y=self.min_y - _dy,
+                             max_x=self.max_x + dx,
+                             max_y=self.max_y + _dy,
+                             srid=self.srid)
+
+    def to_envelope(self) -> 'Envelope':
+        """
+        Get an :py:class:`Envelope` geometry for this envelope tuple.
+
+        :return: the envelope geometry
+        """
+        return Envelope(min_x=self.min_x, min_y=self.min_y, max_x=self.max_x, max_y=self.max_y,
+                        spatial_reference=self.srid)
+
+    @staticmethod
+    def from_bounds_many(bounds: np.ndarray or Iterable[Tuple[float, float, float, float]],
+                         srid: int) -> 'EnvelopeTuple':
+        """
+        Get the envelope that contains a whole collection of bounding boxes (in a single, vectorized reduction).
+
+        :param bounds: an (N, 4) array (or an iteration) of (min_x, min_y, max_x, max_y) bounding boxes (Boxes with
+            `NaN` values, like those of empty geometries, are ignored.)
+        :param srid: the spatial reference ID of the bounding boxes
+        :return: the envelope tuple (which is all `NaN` if there were no boxes)
+        """
+        _bounds = np.asarray(bounds if isinstance(bounds, np.ndarray) else list(bounds), dtype=np.float64)
+        _bounds = _bounds.reshape(-1, 4)
+        _bounds = _bounds[~np.isnan(_bounds).any(axis=1)]
+        if len(_bounds) == 0:
+            return EnvelopeTuple(min_x=math.nan, min_y=math.nan, max_x=math.nan, max_y=math.nan, srid=srid)
+        mins = _bounds[:, 0:2].min(axis=0)
+        maxes = _bounds[:, 2:4].max(axis=0)
+        return EnvelopeTuple(min_x=float(mins[0]), min_y=float(mins[1]),
+                             max_x=float(maxes[0]), max_y=float(maxes[1]),
+                             srid=srid)
+
+    @staticmethod
+    def from_geometries(geometries: Iterable['Geometry']) -> 'EnvelopeTuple':
+        """
+        Get the envelope that contains a whole collection of geometries.
+
+        :param geometries: the geometries (which must all share a spatial reference)
+        :return: the envelope tuple
+        :raises SpatialReferenceException: if the geometries are in different spatial references
+        """
+        _geometries = list(geometries)
+        srids = {geometry.spatial_reference.srid for geometry in _geometries}
+        if len(srids) > 1:
+            raise SpatialReferenceException('The geometries are in different spatial references.')
+        return EnvelopeTuple.from_bounds_many([geometry.bounds for geometry in _geometries],
+                                              srid=srids.pop() if len(srids) != 0 else 0)
+
+
 class LateralSides(Enum):
     """
     This is a simple enumeration that identifies the lateral side of line (left or right).
@@ -114,6 +259,8 @@ class SpatialReference(object):
             if self._utm_zone is None:
                 _ogr_srs_utm_zone = self._ogr_srs.GetUTMZone()
                 self._utm_zone = _ogr_srs_utm_zone if _ogr_srs_utm_zone != 0 else None
+            #: the coordinate transformations (to other spatial references) we've created so far
+            self._transformations: Dict[int, ogr.osr.CoordinateTransformation] = {}
 
     def __new__(cls, srid: int):
         # If this spatial reference has already been created...
@@ -127,6 +274,13 @@ class SpatialReference(object):
             # That's that.
             return new_sr
 
+    def __reduce__(self):
+        """
+        Pickle the spatial reference as its SRID.  (The OGR spatial reference can't be pickled, and this way the
+        spatial reference is looked up in the registry when it's loaded.)
+        """
+        return SpatialReference.from_srid, (self._srid,)
+
     @property
     def srid(self) -> int:
         """
@@ -197,6 +351,48 @@ class SpatialReference(object):
         else:
             return other == self.srid
 
+    def get_transformation(self, spatial_reference: 'SpatialReference' or int) -> ogr.osr.CoordinateTransformation:
+        """
+        Get the OGR coordinate transformation from this spatial reference to another one.
+
+        :param spatial_reference: the target spatial reference (or SRID)
+        :return: the OGR coordinate transformation
+        """
+        sr: SpatialReference = (spatial_reference if isinstance(spatial_reference, SpatialReference)
+                                else SpatialReference.from_srid(srid=spatial_reference))
+        # If we've created this transformation before, we can use it again.
+        try:
+            return self._transformations[sr.srid]
+        except KeyError:
+            transformation = ogr.osr.CoordinateTransformation(self._ogr_srs, sr.ogr_sr)
+            self._transformations[sr.srid] = transformation
+            return transformation
+
+    def transform_coordinates(self,
+                              coordinates: np.ndarray,
+                              spatial_reference: 'SpatialReference' or int) -> np.ndarray:
+        """
+        Transform a whole block of coordinates from this spatial reference to another one in a single call.
+
+        :param coordinates: an (N, 2) or (N, 3) array of coordinates in this spatial reference
+        :param spatial_reference: the target spatial reference (or SRID)
+        :return: a new array (of the same shape) containing the transformed coordinates
+        """
+        _coordinates = np.asarray(coordinates, dtype=np.float64)
+        if self.is_same_as(spatial_reference) or len(_coordinates) == 0:
+            return _coordinates.copy()
+        ndim = _coordinates.shape[1]
+        transformation = self.get_transformation(spatial_reference)
+        # OGR reads the points straight out of a contiguous array (so there's no need to build a list of tuples for
+        # it), but it hands them back as a list, so we go a chunk at a time to keep that list from getting too big.
+        _coordinates = np.ascontiguousarray(_coordinates)
+        transformed = np.empty(_coordinates.shape, dtype=np.float64)
+        for start in range(0, len(_coordinates), _TRANSFORM_CHUNK_SIZE):
+            chunk = _coordinates[start:start + _TRANSFORM_CHUNK_SIZE]
+            transformed[start:start + len(chunk)] = np.array(transformation.TransformPoints(chunk),
+                                                             dtype=np.float64)[:, 0:ndim]
+        return transformed
+
     @staticmethod
     def _ogr_is_metric(ogr_sr: ogr.osr.SpatialReference) -> bool:
         # If the coordinate system isn't projected...
@@ -287,20 +483,31 @@ class GeometryType(IntFlag):
     POINT: int = 1  #: a point geometry
     POLYLINE: int = 2  #: a polyline geometry
     POLYGON: int = 4  #: a polygon geometry
+    COLLECTION: int = 8  #: a collection of geometries (This is also the flag that marks the multi-part types.)
+    MULTIPOINT: int = 9  #: a collection of points
+    MULTIPOLYLINE: int = 10  #: a collection of polylines
+    MULTIPOLYGON: int = 12  #: a collection of polygons
 
 
 _shapely_geom_type_map: Dict[str, GeometryType] = {
     'point': GeometryType.POINT,
     'linestring': GeometryType.POLYLINE,
     'linearring': GeometryType.POLYLINE,
-    'polygon': GeometryType.POLYGON
+    'polygon': GeometryType.POLYGON,
+    'multipoint': GeometryType.MULTIPOINT,
+    'multilinestring': GeometryType.MULTIPOLYLINE,
+    'multipolygon': GeometryType.MULTIPOLYGON,
+    'geometrycollection': GeometryType.COLLECTION
 }  #: a mapping Shapely geometry types strings to Djio geometry types
 
 _shapely_geom_dimensions_map: Dict[str, int] = {
     'point': 0,
     'linestring': 1,
     'linearring': 1,
-    'polygon': 2
+    'polygon': 2,
+    'multipoint': 0,
+    'multilinestring': 1,
+    'multipolygon': 2
 }  #: a mapping Shapely geometry types strings to their respective dimensionalities
 
 _geometry_factory_functions: Dict[GeometryType, Callable[[BaseGeometry, SpatialReference], 'Geometry']] = {
@@ -308,6 +515,147 @@ _geometry_factory_functions: Dict[GeometryType, Callable[[BaseGeometry, SpatialR
 }  #: a hash of GeometryTypes to functions that can create that type from a base geometry
 
 
+def _srid_from_ogr_srs(ogr_srs: ogr.osr.SpatialReference) -> int:
+    """
+    Get the spatial reference ID (SRID) of an OGR spatial reference.
+
+    :param ogr_srs: the OGR spatial reference
+    :return: the SRID
+    :raises SpatialReferenceException: if the spatial reference has no EPSG authority code (and OGR can't work one
+        out)
+    """
+    authority_code = ogr_srs.GetAttrValue('AUTHORITY', 1)
+    # If the spatial reference doesn't name its authority (as is often the case with .prj files), OGR may be able to
+    # figure it out.
+    if authority_code is None and ogr_srs.AutoIdentifyEPSG() == 0:
+        authority_code = ogr_srs.GetAttrValue('AUTHORITY', 1)
+    if authority_code is None:
+        raise SpatialReferenceException('The spatial reference has no EPSG authority code.')
+    return int(authority_code)
+
+
+def _spatial_element_srid(spatial_element: WKBElement or WKTElement) -> Optional[int]:
+    """
+    Get the spatial reference ID (SRID) a GeoAlchemy2 spatial element carries.  (GeoAlchemy2 reads it from the data
+    when the element holds EWKB.)
+
+    :param spatial_element: the spatial element
+    :return: the SRID (or `None` if the element doesn't have one)
+    """
+    srid = getattr(spatial_element, 'srid', None)
+    return int(srid) if srid is not None and srid > 0 else None
+
+
+def _flip_columns(coordinates: np.ndarray) -> np.ndarray:
+    """
+    Swap the X and Y columns of a block of coordinates.  (Any other columns are left alone.)
+
+    :param coordinates: an (N, D) array of coordinates
+    :return: a new array with the X and Y columns swapped
+    """
+    flipped = np.array(coordinates, dtype=np.float64)
+    flipped[:, [0, 1]] = flipped[:, [1, 0]]
+    return flipped
+
+
+def _is_empty_bounds(bounds: Tuple[float, ...]) -> bool:
+    """
+    Do a geometry's bounds say that it's empty?  (Shapely gives empty geometries empty bounds, and empty collections
+    have NaN bounds.)
+
+    :param bounds: the (min_x, min_y, max_x, max_y) bounds
+    :return: `True` if the bounds belong to an empty geometry
+    """
+    return len(bounds) == 0 or math.isnan(bounds[0])
+
+
+_empty_wkts: Dict[GeometryType, str] = {
+    GeometryType.POINT: 'POINT EMPTY',
+    GeometryType.POLYLINE: 'LINESTRING EMPTY',
+    GeometryType.POLYGON: 'POLYGON EMPTY'
+}  #: the WKT of an empty geometry of each single-part type
+
+
+def _shapely_from_rings(geometry_type: GeometryType or int,
+                        coordinates: np.ndarray,
+                        ring_offsets: np.ndarray or Iterable[int]) -> BaseGeometry:
+    """
+    Build a Shapely geometry from a block of coordinates and the offsets of its rings.
+
+    :param geometry_type: the type of the geometry
+    :param coordinates: an (N, D) array of coordinates
+    :param ring_offsets: the offset of the first coordinate in each ring (plus a final offset for the end)
+    :return: the Shapely geometry
+    :raises GeometryException: if the geometry type isn't supported
+    """
+    _ring_offsets = [int(offset) for offset in ring_offsets]
+    rings = [coordinates[start:end] for start, end in zip(_ring_offsets[:-1], _ring_offsets[1:])]
+    if geometry_type not in _empty_wkts:
+        raise GeometryException('Unsupported geometry type: {type}.'.format(type=geometry_type))
+    # (Shapely's empty constructors make empty geometry collections, so we build empty geometries from WKT.)
+    if len(rings) == 0 or len(rings[0]) == 0:
+        return loads_wkt(_empty_wkts[geometry_type])
+    if geometry_type == GeometryType.POINT:
+        return ShapelyPoint(rings[0][0])
+    elif geometry_type == GeometryType.POLYLINE:
+        return LineString(rings[0])
+    return ShapelyPolygon(rings[0], rings[1:])
+
+
+def _shapely_rings(shapely_geometry: BaseGeometry) -> List[Iterable[Tuple[float, float] or Tuple[float, float, float]]]:
+    """
+    Get the coordinate sequences of a single-part Shapely geometry's rings (a polygon's exterior first, then its
+    interiors).
+
+    :param shapely_geometry: the Shapely point, linestring or polygon
+    :return: the coordinate sequences
+    """
+    if shapely_geometry.geom_type != 'Polygon':
+        return [shapely_geometry.coords]
+    if shapely_geometry.is_empty:
+        return []
+    return [shapely_geometry.exterior.coords] + [interior.coords for interior in shapely_geometry.interiors]
+
+
+_shapely_multi_types: Dict[GeometryType, type] = {
+    GeometryType.POINT: ShapelyMultiPoint,
+    GeometryType.POLYLINE: MultiLineString,
+    GeometryType.POLYGON: ShapelyMultiPolygon
+}  #: a mapping of part types to the Shapely types that collect them
+
+
+def _shapely_from_parts(geometry_type: GeometryType or int,
+                        coordinates: np.ndarray,
+                        ring_offsets: np.ndarray or Iterable[int],
+                        part_offsets: np.ndarray or Iterable[int],
+                        multi: bool = False) -> BaseGeometry:
+    """
+    Build a Shapely geometry from a block of coordinates and the offsets of its rings and parts.  (If there's more than
+    one part, the result is a multi-part Shapely geometry.)
+
+    :param geometry_type: the type of each part
+    :param coordinates: an (N, D) array of coordinates
+    :param ring_offsets: the offset of the first coordinate in each ring (plus a final offset for the end)
+    :param part_offsets: the offset of the first ring in each part (plus a final offset for the end)
+    :param multi: `True` to get a multi-part Shapely geometry even if there's only one part (or none at all)
+    :return: the Shapely geometry
+    :raises GeometryException: if the geometry type isn't supported
+    """
+    _ring_offsets = [int(offset) for offset in ring_offsets]
+    _part_offsets = [int(offset) for offset in part_offsets]
+    parts = [
+        _shapely_from_rings(geometry_type, coordinates, _ring_offsets[start:end + 1])
+        for start, end in zip(_part_offsets[:-1], _part_offsets[1:])
+    ]
+    if len(parts) == 1 and not multi:
+        return parts[0]
+    try:
+        shapely_type = _shapely_multi_types[GeometryType(int(geometry_type))]
+    except (KeyError, ValueError):
+        raise GeometryException('Unsupported multi-part geometry type: {type}.'.format(type=geometry_type))
+    return shapely_type(parts) if len(parts) != 0 else shapely_type()
+
+
 class Geometry(object):
     """
     This is the common base class for all of the geometry types.
@@ -323,6 +671,10 @@ class Geometry(object):
     # This is the function we use to hash geometries.
     _djiohash: Callable = hashing.djiohash_v1
 
+    # This is the number of times a geometry may be tested (with a predicate like `intersects`) before it goes to the
+    # trouble of preparing itself.
+    _prepare_after: int = 2  #: the number of predicate tests after which a geometry is prepared
+
     def __init__(self,
                  shapely_geometry: BaseGeometry,
                  spatial_reference: SpatialReference or int = None):
@@ -340,6 +692,12 @@ class Geometry(object):
                                                      else SpatialReference.from_srid(srid=spatial_reference))
         self._caches: Dict[str, Any] = {}  #: a repository for cached and lazily-initialized objects
 
+    def __reduce__(self):
+        """
+        Pickle the geometry as its type, SRID and well-known binary (WKB).  Nothing in the caches is pickled.
+        """
+        return _unpickle_geometry, (type(self), self._spatial_reference.srid, self._shapely_geometry.wkb)
+
     @property
     def geometry_type(self) -> GeometryType:
         """
@@ -398,18 +756,157 @@ class Geometry(object):
             # ...just return it.
             return self._caches['envelope']
         except KeyError:
-            # Otherwise, it looks like we need to create it now.
-            bounds = self.shapely_geometry.bounds
-            envelope = Envelope(min_x=bounds[0],
-                                min_y=bounds[1],
-                                max_x=bounds[2],
-                                max_y=bounds[3],
+            # Otherwise, it looks like we need to create it now.  (The envelope doesn't build its own Shapely polygon
+            # until somebody actually needs it.)
+            envelope_tuple = self.envelope_tuple
+            envelope = Envelope(min_x=envelope_tuple.min_x,
+                                min_y=envelope_tuple.min_y,
+                                max_x=envelope_tuple.max_x,
+                                max_y=envelope_tuple.max_y,
                                 spatial_reference=self.spatial_reference)
             # Cache it for next time.
             self._caches['envelope'] = envelope
             # Now we can give it to the caller.
             return envelope
 
+    @property
+    def envelope_tuple(self) -> EnvelopeTuple:
+        """
+        Get a lightweight tuple representation of the geometry's envelope (bounding box).  (An empty geometry's
+        envelope tuple is all NaNs.)
+
+        :return: the envelope tuple
+        """
+        try:
+            return self._caches['envelope_tuple']
+        except KeyError:
+            bounds = self.bounds
+            min_x, min_y, max_x, max_y = bounds if not _is_empty_bounds(bounds) else (math.nan,) * 4
+            envelope_tuple = EnvelopeTuple(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y,
+                                           srid=self._spatial_reference.srid)
+            self._caches['envelope_tuple'] = envelope_tuple
+            return envelope_tuple
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the bounds of the geometry.
+
+        :return: a (min_x, min_y, max_x, max_y) tuple
+        """
+        try:
+            return self._caches['bounds']
+        except KeyError:
+            bounds = self._shapely_geometry.bounds
+            self._caches['bounds'] = bounds
+            return bounds
+
+    def _get_predicate_geometry(self) -> BaseGeometry or PreparedGeometry:
+        """
+        Get the Shapely geometry we should use to evaluate predicates.  Once this geometry has been tested often enough
+        to make it worthwhile, this is a prepared geometry (which is kept in the caches).
+
+        :return: the Shapely geometry (or prepared geometry)
+        """
+        try:
+            return self._caches['prepared_geometry']
+        except KeyError:
+            pass  # This is OK.  It's just a cache miss.
+        # Count this use.
+        uses = self._caches.get('predicate_uses', 0) + 1
+        self._caches['predicate_uses'] = uses
+        # If we haven't been tested enough times to make preparation worthwhile, just use the plain geometry.
+        if uses <= Geometry._prepare_after:
+            return self._shapely_geometry
+        prepared_geometry = prep(self._shapely_geometry)
+        self._caches['prepared_geometry'] = prepared_geometry
+        return prepared_geometry
+
+    def _conform_other(self, other: 'Geometry') -> 'Geometry':
+        """
+        Get another geometry in this geometry's spatial reference (transforming it if necessary).
+
+        :param other: the other geometry
+        :return: the other geometry (or a transformed copy of it)
+        """
+        if other.spatial_reference.srid == self._spatial_reference.srid:
+            return other
+        return other.transform(spatial_reference=self._spatial_reference)
+
+    def intersects(self, other: 'Geometry') -> bool:
+        """
+        Does this geometry intersect another geometry?  (If the other geometry is in another spatial reference, it is
+        transformed to this geometry's spatial reference first.)
+
+        :param other: the other geometry
+        :return: `True` if the geometries intersect, otherwise `False`
+        """
+        _other = self._conform_other(other)
+        a, b = self.bounds, _other.bounds
+        # Empty geometries don't intersect anything.
+        if _is_empty_bounds(a) or _is_empty_bounds(b):
+            return False
+        # If the envelopes don't intersect, the geometries can't either.
+        if a[0] > b[2] or a[2] < b[0] or a[1] > b[3] or a[3] < b[1]:
+            return False
+        return self._get_predicate_geometry().intersects(_other.shapely_geometry)
+
+    def contains(self, other: 'Geometry') -> bool:
+        """
+        Does this geometry contain another geometry?  (If the other geometry is in another spatial reference, it is
+        transformed to this geometry's spatial reference first.)
+
+        :param other: the other geometry
+        :return: `True` if this geometry contains the other geometry, otherwise `False`
+        """
+        _other = self._conform_other(other)
+        a, b = self.bounds, _other.bounds
+        # Empty geometries don't contain anything (and aren't contained by anything).
+        if _is_empty_bounds(a) or _is_empty_bounds(b):
+            return False
+        # If our envelope doesn't contain the other envelope, this geometry can't contain the other geometry.
+        if b[0] < a[0] or b[2] > a[2] or b[1] < a[1] or b[3] > a[3]:
+            return False
+        return self._get_predicate_geometry().contains(_other.shapely_geometry)
+
+    def within(self, other: 'Geometry') -> bool:
+        """
+        Is this geometry within another geometry?  (If the other geometry is in another spatial reference, it is
+        transformed to this geometry's spatial reference first.)
+
+        :param other: the other geometry
+        :return: `True` if this geometry is within the other geometry, otherwise `False`
+        """
+        _other = self._conform_other(other)
+        a, b = self.bounds, _other.bounds
+        # Empty geometries aren't within anything (and nothing is within them).
+        if _is_empty_bounds(a) or _is_empty_bounds(b):
+            return False
+        # If our envelope isn't within the other envelope, this geometry can't be within the other geometry.
+        if a[0] < b[0] or a[2] > b[2] or a[1] < b[1] or a[3] > b[3]:
+            return False
+        # The other geometry is the one that does the containing, so let it use its own prepared geometry.
+        return _other._get_predicate_geometry().contains(self._shapely_geometry)
+
+    def distance(self, other: 'Geometry') -> float:
+        """
+        Get the distance between this geometry and another geometry, measured in this geometry's spatial reference.
+        (If the other geometry is in another spatial reference, it is transformed to this geometry's spatial reference
+        first.)
+
+        :param other: the other geometry
+        :return: the distance
+        """
+        _other = self._conform_other(other)
+        a, b = self.bounds, _other.bounds
+        # If the envelopes are disjoint, the distance is not zero, so there's no point in testing for intersection.
+        # (Empty geometries have no envelopes, so we leave them to Shapely.)
+        empty = _is_empty_bounds(a) or _is_empty_bounds(b)
+        if not empty and not (a[0] > b[2] or a[2] < b[0] or a[1] > b[3] or a[3] < b[1]):
+            if self._get_predicate_geometry().intersects(_other.shapely_geometry):
+                return 0.0
+        return self._shapely_geometry.distance(_other.shapely_geometry)
+
     @property
     def representative_point(self) -> 'Point':
         try:
@@ -423,6 +920,123 @@ class Geometry(object):
             # That's that.
             return rp
 
+    def _get_rings(self) -> List[Iterable[Tuple[float, float] or Tuple[float, float, float]]]:
+        """
+        Subclasses can override this method to supply the coordinate sequences of each of the geometry's rings (in
+        order).  Unless they do, the geometry has a single ring that holds all of its coordinates.
+
+        :return: the coordinate sequences
+        """
+        return [self._shapely_geometry.coords]
+
+    def _get_part_ring_counts(self, ring_count: int) -> List[int]:
+        """
+        Subclasses can override this method to say how many of the geometry's rings belong to each of its parts.
+        Unless they do, the geometry has a single part that holds all of its rings.
+
+        :param ring_count: the number of rings in the geometry
+        :return: the number of rings in each part
+        """
+        return [ring_count]
+
+    def _get_coords_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the geometry's coordinates as a single block, along with the ring and part offsets that describe it.
+
+        :return: the coordinates, the ring offsets and the part offsets
+        """
+        try:
+            return self._caches['coords_arrays']
+        except KeyError:
+            ndim = 3 if self._shapely_geometry.has_z else 2
+            rings = [np.asarray(ring, dtype=np.float64).reshape(-1, ndim) for ring in self._get_rings()]
+            coordinates = (np.concatenate(rings) if len(rings) > 1
+                           else rings[0] if len(rings) == 1
+                           else np.empty((0, ndim), dtype=np.float64))
+            # Nobody gets to change the coordinates out from under the Shapely geometry (or the other caches).
+            coordinates.flags.writeable = False
+            ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+            np.cumsum([len(ring) for ring in rings], out=ring_offsets[1:])
+            ring_offsets.flags.writeable = False
+            part_ring_counts = self._get_part_ring_counts(len(rings))
+            part_offsets = np.zeros(len(part_ring_counts) + 1, dtype=np.int64)
+            np.cumsum(part_ring_counts, out=part_offsets[1:])
+            part_offsets.flags.writeable = False
+            coords_arrays = (coordinates, ring_offsets, part_offsets)
+            self._caches['coords_arrays'] = coords_arrays
+            return coords_arrays
+
+    def iter_coords_chunks(self, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+        """
+        Stream the geometry's coordinates (in the same order as :py:func:`Geometry.iter_coords`) as a series of
+        read-only blocks.  Unlike :py:func:`Geometry.iter_coords` and :py:attr:`Geometry.coords_array` nothing is
+        cached, so this is the way to go through the coordinates of very large geometries.
+
+        :param chunk_size: the largest number of coordinates in a block (Blocks don't span rings, so some may be
+            smaller.)
+        :return: an iteration of (n, D) arrays of coordinates
+        """
+        # If we already have all the coordinates in a block, we can just hand out views of it.
+        coords_arrays = self._caches.get('coords_arrays')
+        if coords_arrays is not None:
+            for start in range(0, len(coords_arrays[0]), chunk_size):
+                yield coords_arrays[0][start:start + chunk_size]
+            return
+        # Otherwise, we'll have to go through the rings.
+        ndim = 3 if self._shapely_geometry.has_z else 2
+        for ring in self._get_rings():
+            # Only one ring's coordinates (and no tuples) are held at a time.
+            coordinates = np.asarray(ring, dtype=np.float64).reshape(-1, ndim)
+            coordinates.flags.writeable = False
+            for start in range(0, len(coordinates), chunk_size):
+                yield coordinates[start:start + chunk_size]
+            del coordinates
+
+    @property
+    def coords_array(self) -> np.ndarray:
+        """
+        Get all of the geometry's coordinates (in the same order as :py:func:`Geometry.iter_coords`) as a single,
+        read-only block.  No tuples are created along the way.
+
+        :return: an (N, D) array of coordinates
+        """
+        return self._get_coords_arrays()[0]
+
+    @property
+    def ring_offsets(self) -> np.ndarray:
+        """
+        Get the offsets of the first coordinate of each ring in :py:attr:`coords_array`.  (The last element marks the
+        end of the final ring.)  Points and polylines have a single ring, and a polygon's exterior is its first ring.
+
+        :return: the read-only ring offsets
+        """
+        return self._get_coords_arrays()[1]
+
+    @property
+    def part_offsets(self) -> np.ndarray:
+        """
+        Get the offsets of the first ring of each part in :py:attr:`ring_offsets`.  (The last element marks the end
+        of the final part.)  Only collections have more than one part.
+
+        :return: the read-only part offsets
+        """
+        return self._get_coords_arrays()[2]
+
+    def _from_coords_array(self,
+                           coordinates: np.ndarray,
+                           spatial_reference: SpatialReference or int) -> 'Geometry':
+        """
+        Create a new geometry that has this geometry's shape (its type, rings and parts) but different coordinates.
+
+        :param coordinates: an (N, D) array of coordinates laid out just like :py:attr:`coords_array`
+        :param spatial_reference: the spatial reference of the new geometry
+        :return: the new geometry
+        """
+        return Geometry.from_shapely(
+            shapely_geometry=_shapely_from_rings(self.geometry_type, coordinates, self.ring_offsets),
+            spatial_reference=spatial_reference
+        )
+
     @abstractmethod
     def iter_coords(self) -> Iterable[Tuple[float, float] or Tuple[float, float, float]]:
         """
@@ -452,12 +1066,34 @@ class Geometry(object):
         # do to it once we send it back.)
         return self._get_ogr_geometry(from_cache=False)
 
-    def djiohash(self):
+    def djiohash(self, chunk_size: int = None):
         """
         Get this geometry's hash value.
 
+        :param chunk_size: If you supply a chunk size, the coordinates are streamed (in blocks of this size) by
+            :py:func:`Geometry.iter_coords_chunks` and nothing is cached, which keeps memory use down for very large
+            geometries.
         :return: the hash value
         """
+        if chunk_size is not None:
+            chunks = self.iter_coords_chunks(chunk_size=chunk_size)
+            if Geometry._djiohash is hashing.djiohash_v1:
+                return hashing.djiohash_v1_stream(geometry_type_code=self.geometry_type,
+                                                  srid=self.spatial_reference.srid,
+                                                  blocks=chunks)
+            # Other hash functions get the coordinates one at a time.
+            return Geometry._djiohash(
+                geometry_type_code=self.geometry_type,
+                srid=self.spatial_reference.srid,
+                coordinates=itertools.chain.from_iterable(chunks))
+        # The standard hash function can work directly against the coordinates array.
+        if Geometry._djiohash is hashing.djiohash_v1:
+            coordinates = self.coords_array
+            return bytearray(hashing.djiohash_v1_many(
+                geometry_type_codes=[self.geometry_type],
+                srid=self.spatial_reference.srid,
+                coordinates=coordinates,
+                vertex_offsets=[0, len(coordinates)])[0].tobytes())
         return Geometry._djiohash(
             geometry_type_code=self.geometry_type,
             srid=self.spatial_reference.srid,
@@ -560,12 +1196,10 @@ class Geometry(object):
             # ...just return the previous product.
             return cached_transforms[sr.srid]
         else:
-            # We need the OGR geometry.
-            ogr_geometry = self._get_ogr_geometry(from_cache=True)
-            # Transform the OGR geometry to the new coordinate system...
-            ogr_geometry.TransformTo(sr.ogr_sr)
-            # ...and build the new djio geometry from it.
-            transformed_geometry: Geometry = Geometry.from_ogr(ogr_geom=ogr_geometry)
+            # Transform all of the coordinates at once...
+            coordinates = self._spatial_reference.transform_coordinates(self.coords_array, sr)
+            # ...and build the new djio geometry from them.
+            transformed_geometry: Geometry = self._from_coords_array(coordinates, spatial_reference=sr)
             # Cache the shapely geometry in case somebody comes calling again.
             cached_transforms[sr.srid] = transformed_geometry
             # Now we can return it.
@@ -583,6 +1217,32 @@ class Geometry(object):
             'FORMAT=GML{version}'.format(version=version)
         ])
 
+    def to_geojson(self, precision: int = 6, spatial_reference: SpatialReference or int or None = 4326) -> str:
+        """
+        Export the geometry to GeoJSON.
+
+        :param precision: the number of decimal places written for each ordinate
+        :param spatial_reference: the spatial reference in which the coordinates are written (GeoJSON coordinates are
+            WGS84 longitudes and latitudes, but you can pass `None` to write the coordinates just as they are.)
+        :return: the GeoJSON representation of the geometry
+        """
+        # (Imported here because the geojson module depends upon this one.)
+        from .geojson import dumps_geometry
+        return dumps_geometry(self, precision=precision, spatial_reference=spatial_reference)
+
+    @staticmethod
+    def from_geojson(geojson: str or Dict[str, Any], spatial_reference: SpatialReference or int = 4326) -> 'Geometry':
+        """
+        Create a geometry from GeoJSON.
+
+        :param geojson: the GeoJSON geometry (as text, or as the object you'd get from parsing the text)
+        :param spatial_reference: the spatial reference of the coordinates
+        :return: the geometry
+        """
+        # (Imported here because the geojson module depends upon this one.)
+        from .geojson import loads_geometry
+        return loads_geometry(geojson, spatial_reference=spatial_reference)
+
     @abstractmethod
     def flip_coordinates(self) -> 'Geometry':
         """
@@ -629,7 +1289,7 @@ class Geometry(object):
             # Now, if the geometry didn't bring it's own spatial reference, we have a problem
             if ogr_srs is None:
                 raise SpatialReferenceException('The geometry has no spatial reference, and no SRID was supplied.')
-            _sr = int(ogr_srs.GetAttrValue('AUTHORITY', 1))
+            _sr = _srid_from_ogr_srs(ogr_srs)
         return Geometry.from_wkb(wkb=ogr_geom.ExportToWkb(), spatial_reference=_sr)
 
     @staticmethod
@@ -664,14 +1324,141 @@ class Geometry(object):
         return Geometry.from_shapely(shapely_geometry=_shapely, spatial_reference=spatial_reference)
 
     @staticmethod
-    def from_gml(gml: str) -> 'Geometry':
-        raise NotImplementedError('Coming soon...')
+    def from_shapely_many(shapely_geometries: Iterable[BaseGeometry],
+                          spatial_reference: SpatialReference or int,
+                          columnar: bool = False) -> List['Geometry'] or 'GeometryArray':
+        """
+        Create new geometries from a collection of Shapely geometries that share a spatial reference.
+
+        :param shapely_geometries: the Shapely base geometries
+        :param spatial_reference: the spatial reference (or spatial reference ID) shared by all the geometries
+        :param columnar: `True` to return a columnar :py:class:`djio.arrays.GeometryArray` instead of a list
+        :return: the new geometries
+        """
+        # Resolve the spatial reference once, up front, so we don't have to do it for every geometry.
+        sr: SpatialReference = (spatial_reference if isinstance(spatial_reference, SpatialReference)
+                                else SpatialReference.from_srid(srid=spatial_reference))
+        if columnar:
+            from .arrays import GeometryArray  # (Imported here because the arrays module depends upon this one.)
+            return GeometryArray.from_shapely(shapely_geometries=shapely_geometries, spatial_reference=sr)
+        # We'll keep the factory function for each Shapely geometry type we've seen so we only look it up once.
+        factories: Dict[str, Callable[[BaseGeometry, SpatialReference], Geometry]] = {}
+        geometries: List[Geometry] = []
+        for shapely_geometry in shapely_geometries:
+            geom_type = shapely_geometry.geom_type
+            try:
+                factory = factories[geom_type]
+            except KeyError:
+                factory = _geometry_factory_functions[_shapely_geom_type_map[geom_type.lower()]]
+                factories[geom_type] = factory
+            geometries.append(factory(shapely_geometry, sr))
+        return geometries
+
+    @staticmethod
+    def from_wkt_many(wkts: Iterable[str],
+                      spatial_reference: SpatialReference or int,
+                      columnar: bool = False) -> List['Geometry'] or 'GeometryArray':
+        """
+        Create new geometries from a collection of well-known text (WKT) strings that share a spatial reference.
+
+        :param wkts: the well-known text strings
+        :param spatial_reference: the spatial reference (or spatial reference ID) shared by all the geometries
+        :param columnar: `True` to return a columnar :py:class:`djio.arrays.GeometryArray` instead of a list
+        :return: the new geometries
+        """
+        return Geometry.from_shapely_many(shapely_geometries=(loads_wkt(wkt) for wkt in wkts),
+                                          spatial_reference=spatial_reference,
+                                          columnar=columnar)
+
+    @staticmethod
+    def from_wkb_many(wkbs: Iterable[bytes],
+                      spatial_reference: SpatialReference or int,
+                      columnar: bool = False) -> List['Geometry'] or 'GeometryArray':
+        """
+        Create new geometries from a collection of well-known binary (WKB) values that share a spatial reference.
+
+        :param wkbs: the well-known binary values
+        :param spatial_reference: the spatial reference (or spatial reference ID) shared by all the geometries
+        :param columnar: `True` to return a columnar :py:class:`djio.arrays.GeometryArray` instead of a list (The
+            WKB is decoded straight into the coordinate array without creating Shapely geometries.)
+        :return: the new geometries
+        """
+        if columnar:
+            from .arrays import GeometryArray  # (Imported here because the arrays module depends upon this one.)
+            return GeometryArray.from_wkb(wkbs=wkbs, spatial_reference=spatial_reference)
+        return Geometry.from_shapely_many(shapely_geometries=(loads_wkb(wkb) for wkb in wkbs),
+                                          spatial_reference=spatial_reference)
+
+    @staticmethod
+    def from_gml(gml: str, spatial_reference: SpatialReference or int = None) -> 'Geometry':
+        """
+        Create a geometry from GML (like the GML :py:func:`Geometry.to_gml` returns).  The spatial reference is taken
+        from the geometry's `srsName` and, if the name puts the axes in the authority's order (as the
+        `urn:ogc:def:crs:EPSG::` names do), geographic coordinates are read latitude first.
+
+        :param gml: the GML geometry
+        :param spatial_reference: the spatial reference of the geometry if the GML doesn't name one
+        :return: the geometry
+        :raises SpatialReferenceException: if the GML names no spatial reference and none is supplied
+        """
+        # (Imported here because the gml module depends upon this one.)
+        from .gml import loads_geometry
+        return loads_geometry(gml, spatial_reference=spatial_reference)
 
     @staticmethod
     def from_geoalchemy2(spatial_element: WKBElement or WKTElement,
-                         spatial_reference: SpatialReference or int) -> 'Geometry':
+                         spatial_reference: SpatialReference or int = None) -> 'Geometry':
+        """
+        Create a djio geometry from a GeoAlchemy2 spatial element.
+
+        :param spatial_element: the spatial element
+        :param spatial_reference: the spatial reference (If you don't supply one, the element's SRID is used.)
+        :return: a djio geometry based on the spatial element
+        :raises SpatialReferenceException: if the element has no SRID and no spatial reference is supplied
+        """
+        # Grab the spatial reference from the arguments.
+        _sr = spatial_reference
+        # If the caller didn't provide one, the element probably knows.
+        if _sr is None:
+            _sr = _spatial_element_srid(spatial_element)
+            if _sr is None:
+                raise SpatialReferenceException('The spatial element has no SRID, and no SRID was supplied.')
         shapely_geometry = to_shapely(spatial_element)
-        return Geometry.from_shapely(shapely_geometry=shapely_geometry, spatial_reference=spatial_reference)
+        return Geometry.from_shapely(shapely_geometry=shapely_geometry, spatial_reference=_sr)
+
+
+def _unpickle_geometry(cls: type, srid: int, wkb: bytes) -> Geometry:
+    """
+    Re-create a pickled geometry.
+
+    :param cls: the geometry's type
+    :param srid: the spatial reference ID
+    :param wkb: the well-known binary (WKB)
+    :return: the geometry
+    """
+    # We go around the subclass constructor (which may expect other arguments) and let the base class set things up.
+    geometry = cls.__new__(cls)
+    Geometry.__init__(geometry, shapely_geometry=loads_wkb(wkb), spatial_reference=SpatialReference.from_srid(srid))
+    return geometry
+
+
+def _metric_spatial_reference(spatial_reference: Optional[SpatialReference or int]) -> SpatialReference:
+    """
+    Get the spatial reference in which a measurement should be made.
+
+    :param spatial_reference: the requested spatial reference (If none is supplied, we'll use the default.)
+    :return: the spatial reference
+    :raises GeometryException: if the spatial reference isn't projected, or isn't metric
+    """
+    sr = spatial_reference
+    if sr is None:
+        sr = SpatialReference.from_srid(3857)  # TODO: We can apply a more sophisticated mechanism here.
+    elif not isinstance(spatial_reference, SpatialReference):
+        sr = SpatialReference.from_srid(srid=spatial_reference)
+    # Do a sanity check:  If the spatial reference isn't projected and measured in meters...
+    if not sr.is_metric:
+        raise GeometryException('The requested spatial reference is not projected, or is not metric.')
+    return sr
 
 
 def _register_geometry_factory(geometry_type: GeometryType,
@@ -763,7 +1550,10 @@ class Point(Geometry):
 
         :return: a new :py:class:`Geometry` with reversed ordinals.
         """
-        _shapely: ShapelyPoint = ShapelyPoint(self._shapely_geometry.y, self._shapely_geometry.x)
+        _shapely: ShapelyPoint = (ShapelyPoint(self._shapely_geometry.y, self._shapely_geometry.x)
+                                  if not self._shapely_geometry.has_z
+                                  else ShapelyPoint(self._shapely_geometry.y, self._shapely_geometry.x,
+                                                    self._shapely_geometry.z))
         return Point(shapely_geometry=_shapely, spatial_reference=self.spatial_reference)
 
     def to_point_tuple(self) -> PointTuple:
@@ -818,6 +1608,17 @@ class Point(Geometry):
             # Now give it back to the caller.
             return latlon_tuple
 
+    def get_geodesic_distance(self, other: 'Point') -> float:
+        """
+        Measure the distance to another point along the surface of the WGS84 ellipsoid.  (Neither point is projected.)
+
+        :param other: the other point
+        :return: the distance (in meters)
+        :seealso: :py:func:`djio.geodesy.geodesic_distances`
+        """
+        from .geodesy import geodesic_distance  # (Imported here because the geodesy module depends upon this one.)
+        return geodesic_distance(self, other)
+
     @staticmethod
     def from_point_tuple(point_tuple: PointTuple) -> 'Point':
         """
@@ -937,6 +1738,40 @@ class Polyline(Geometry):
             self._caches['iter_coords'] = _tuples
             return _tuples
 
+    def get_geodesic_length(self) -> float:
+        """
+        Measure the length of this line along the surface of the WGS84 ellipsoid.  (The line isn't projected.)
+
+        :return: the length (in meters)
+        :seealso: :py:func:`djio.geodesy.geodesic_lengths`
+        """
+        from .geodesy import geodesic_lengths  # (Imported here because the geodesy module depends upon this one.)
+        return float(geodesic_lengths([self])[0])
+
+    def flip_coordinates(self) -> 'Polyline':
+        """
+        Create a polyline based on this one, but with the X and Y axis reversed.  (All of the coordinates are swapped at
+        once.)
+
+        :return: a new :py:class:`Geometry` with reversed ordinals.
+        """
+        return self._from_coords_array(_flip_columns(self.coords_array), spatial_reference=self.spatial_reference)
+
+    @staticmethod
+    def get_length_many(geometries: Iterable['Geometry'],
+                        spatial_reference: Optional[SpatialReference or int] = None) -> np.ndarray:
+        """
+        Measure the lengths of a batch of geometries.  Geometries are grouped by spatial reference and transformed
+        (if necessary) a whole group at a time, and nothing is cached on the geometries themselves.
+
+        :param geometries: the geometries (The length of a polygon is the length of all its rings.)
+        :param spatial_reference: the metric spatial reference in which the lengths are measured
+        :return: the length of each geometry (in meters)
+        :raises GeometryException: if the spatial reference isn't projected, or isn't metric
+        """
+        from .arrays import _measure_many  # (Imported here because the arrays module depends upon this one.)
+        return _measure_many(geometries, _metric_spatial_reference(spatial_reference), 'lengths')
+
     # TODO: Start adding Polyline-specific methods and properties.
 
 
@@ -997,35 +1832,76 @@ class Polygon(Geometry):
             self._caches['iter_coords'] = _tuples
             return _tuples
 
+    def _get_rings(self) -> List[Iterable[Tuple[float, float] or Tuple[float, float, float]]]:
+        """
+        Get the coordinate sequences of the polygon's rings:  the exterior first, then the interiors.
+
+        :return: the coordinate sequences
+        """
+        if self._shapely_geometry.is_empty:
+            return []
+        return [self._shapely_geometry.exterior.coords] + [interior.coords
+                                                           for interior in self._shapely_geometry.interiors]
+
     def get_area(self, spatial_reference: Optional[SpatialReference or int] = None) -> Area:
         # TODO: This method is *ripe* for refactoring!
-        sr = spatial_reference
-        if sr is None:
-            sr = SpatialReference.from_srid(3857)  # TODO: We can apply a more sophisticated mechanism here.
-        elif not isinstance(spatial_reference, SpatialReference):
-            sr = SpatialReference.from_srid(srid=spatial_reference)
-        # Do a sanity check:  If the spatial reference isn't projected and measured in meters...
-        if not sr.is_metric:
-            raise GeometryException('The requested spatial reference is not projected, or is not metric.')
+        sr = _metric_spatial_reference(spatial_reference)
         # At this point, we know we're dealing with a metric projected coordinate system, so...
         if sr.srid == self.spatial_reference.srid:
             # ...we can just create the area.
             return Area(sq_m=self.shapely_geometry.area)
         else:
             # Otherwise, we need to transform the geometry to the target spatial reference, then get the area.
-            return Area(sq_m=self.transform(spatial_reference).shapely_geometry.area)
+            return Area(sq_m=self.transform(sr).shapely_geometry.area)
 
-    # TODO: Start adding Polygon-specific methods and properties.
+    def get_geodesic_area(self) -> float:
+        """
+        Measure the area of this polygon on the surface of the WGS84 ellipsoid.  (The polygon isn't projected.)
 
+        :return: the area (in square meters)
+        :seealso: :py:func:`djio.geodesy.geodesic_areas`
+        """
+        from .geodesy import geodesic_areas  # (Imported here because the geodesy module depends upon this one.)
+        return float(geodesic_areas([self])[0])
 
-# Register the geometry factory function (which is just the constructor).
-_register_geometry_factory(GeometryType.POLYGON, Polygon)
+    def flip_coordinates(self) -> 'Polygon':
+        """
+        Create a polygon based on this one, but with the X and Y axis reversed.  (All of the coordinates are swapped at
+        once, and the interior rings are kept.)
 
+        :return: a new :py:class:`Geometry` with reversed ordinals.
+        """
+        return self._from_coords_array(_flip_columns(self.coords_array), spatial_reference=self.spatial_reference)
 
-class Envelope(Polygon):
-    """
-    An envelope represents the minimum bounding rectangle (minimum x and y values, along with maximum x and y values)
+    @staticmethod
+    def get_area_many(polygons: Iterable['Polygon'],
+                      spatial_reference: Optional[SpatialReference or int] = None) -> np.ndarray:
+        """
+        Measure the areas of a batch of polygons.  This is much cheaper than calling :py:func:`Polygon.get_area` for
+        each polygon:  polygons are grouped by spatial reference and transformed (if necessary) a whole group at a
+        time, no :py:class:`measurement.measures.Area` objects are created, and nothing is cached on the polygons.
+
+        :param polygons: the polygons
+        :param spatial_reference: the metric spatial reference in which the areas are measured
+        :return: the area of each polygon (in square meters)
+        :raises GeometryException: if the spatial reference isn't projected, or isn't metric
+        """
+        from .arrays import _measure_many  # (Imported here because the arrays module depends upon this one.)
+        return _measure_many(polygons, _metric_spatial_reference(spatial_reference), 'areas')
+
+    # TODO: Start adding Polygon-specific methods and properties.
+
+
+# Register the geometry factory function (which is just the constructor).
+_register_geometry_factory(GeometryType.POLYGON, Polygon)
+
+
+class Envelope(Polygon):
+    """
+    An envelope represents the minimum bounding rectangle (minimum x and y values, along with maximum x and y values)
     defined by coordinate pairs of a geometry. All coordinates for the geometry fall within the envelope.
+
+    An envelope only holds on to its :py:class:`EnvelopeTuple` until something asks for the Shapely polygon.
     """
 
     def __init__(self,
@@ -1042,9 +1918,392 @@ class Envelope(Polygon):
         :param max_y: the maximum Y coordinate
         :param spatial_reference: the spatial reference (or spatial reference ID) in which the coordinates are expressed
         """
-        # Construct a Shapely polygon using the box() function, and let the parent take it from here.
-        super().__init__(shapely_geometry=box(minx=min_x, miny=min_y, maxx=max_x, maxy=max_y),
-                         spatial_reference=spatial_reference)
+        # Let the parent set things up without a Shapely polygon.  We'll build it when (and if) it's needed.
+        super().__init__(shapely_geometry=None, spatial_reference=spatial_reference)
+        self._caches['envelope_tuple'] = EnvelopeTuple(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y,
+                                                       srid=self._spatial_reference.srid)
+
+    @property
+    def _shapely_geometry(self) -> ShapelyPolygon:
+        """
+        Get the Shapely polygon, building it from the envelope tuple the first time it's needed.
+        """
+        _box = self.__dict__.get('_box')
+        if _box is None:
+            envelope_tuple: EnvelopeTuple = self._caches['envelope_tuple']
+            # Construct a Shapely polygon using the box() function.
+            _box = box(minx=envelope_tuple.min_x, miny=envelope_tuple.min_y,
+                       maxx=envelope_tuple.max_x, maxy=envelope_tuple.max_y)
+            self.__dict__['_box'] = _box
+        return _box
+
+    @_shapely_geometry.setter
+    def _shapely_geometry(self, shapely_geometry: ShapelyPolygon):
+        self.__dict__['_box'] = shapely_geometry
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the bounds of the envelope.
+
+        :return: a (min_x, min_y, max_x, max_y) tuple
+        """
+        try:
+            return tuple(self._caches['envelope_tuple'][0:4])
+        except KeyError:
+            return super().bounds
+
+    def flip_coordinates(self) -> 'Envelope':
+        """
+        Create an envelope based on this one, but with the X and Y axis reversed.
+
+        :return: a new :py:class:`Envelope` with reversed ordinals.
+        """
+        envelope_tuple = self.envelope_tuple
+        return Envelope(min_x=envelope_tuple.min_y, min_y=envelope_tuple.min_x,
+                        max_x=envelope_tuple.max_y, max_y=envelope_tuple.max_x,
+                        spatial_reference=self.spatial_reference)
+
+    @property
+    def envelope(self) -> 'Envelope':
+        """
+        An envelope is its own envelope.
+
+        :return: this envelope
+        """
+        return self
+
+    def intersects(self, other: 'Geometry') -> bool:
+        """
+        Does this envelope intersect another geometry?  (Two envelopes in the same spatial reference are compared
+        without involving Shapely.)
+
+        :param other: the other geometry
+        :return: `True` if the geometries intersect, otherwise `False`
+        """
+        if isinstance(other, Envelope) and other.spatial_reference.srid == self._spatial_reference.srid:
+            return self.envelope_tuple.intersects(other.envelope_tuple)
+        return super().intersects(other)
+
+    def contains(self, other: 'Geometry') -> bool:
+        """
+        Does this envelope contain another geometry?  (Two envelopes in the same spatial reference are compared
+        without involving Shapely.)
+
+        :param other: the other geometry
+        :return: `True` if this envelope contains the other geometry, otherwise `False`
+        """
+        if isinstance(other, Envelope) and other.spatial_reference.srid == self._spatial_reference.srid:
+            return self.envelope_tuple.contains(other.envelope_tuple)
+        return super().contains(other)
+
+
+class GeometryCollection(Geometry):
+    """
+    A geometry collection is a single geometry made up of any number of other (single-part) geometries, which are its
+    parts.  The parts aren't kept as separate djio geometries:  all of their coordinates live in a single block (see
+    :py:attr:`Geometry.coords_array`), described by the ring and part offsets, so envelopes, hashes, transformations
+    and areas are worked out for every part in one pass.
+
+    .. note::
+
+        Nested collections (collections within collections) are not supported.
+    """
+    _shapely_type: type = ShapelyGeometryCollection  #: the Shapely type of the collection
+
+    def __init__(self,
+                 shapely_geometry: BaseGeometry,
+                 spatial_reference: SpatialReference or int = None):
+        """
+
+        :param shapely_geometry: a Shapely geometry collection (or multi-part geometry)
+        :param spatial_reference: the geometry's spatial reference
+        """
+        super().__init__(shapely_geometry=shapely_geometry, spatial_reference=spatial_reference)
+
+    @property
+    def geometry_type(self) -> GeometryType:
+        """
+        Get the geometry type.
+
+        :return:  :py:attr:`GeometryType.COLLECTION`
+        """
+        return GeometryType.COLLECTION
+
+    @property
+    def dimensions(self) -> int:
+        """
+        A collection has the dimensionality of its highest-dimensional part.
+
+        :return: the dimensionality of the collection
+        """
+        try:
+            return self._caches['dimensions']
+        except KeyError:
+            dimensions = max((_shapely_geom_dimensions_map[part.geom_type.lower()]
+                              for part in self._get_shapely_parts()), default=0)
+            self._caches['dimensions'] = dimensions
+            return dimensions
+
+    def _get_shapely_parts(self) -> List[BaseGeometry]:
+        """
+        Get the Shapely geometries that make up the collection.
+
+        :return: the Shapely parts
+        :raises GeometryException: if the collection contains another collection
+        """
+        try:
+            return self._caches['shapely_parts']
+        except KeyError:
+            parts = list(self._shapely_geometry.geoms)
+            for part in parts:
+                if _shapely_geom_type_map[part.geom_type.lower()] & GeometryType.COLLECTION:
+                    raise GeometryException('Nested collections are not supported.')
+            self._caches['shapely_parts'] = parts
+            return parts
+
+    @property
+    def part_count(self) -> int:
+        """
+        Get the number of parts in the collection.
+
+        :return: the number of parts
+        """
+        return len(self._get_shapely_parts())
+
+    @property
+    def part_types(self) -> np.ndarray:
+        """
+        Get the :py:class:`GeometryType` code of each part.
+
+        :return: the read-only part type codes
+        """
+        try:
+            return self._caches['part_types']
+        except KeyError:
+            part_types = np.array([_shapely_geom_type_map[part.geom_type.lower()]
+                                   for part in self._get_shapely_parts()], dtype=np.uint8)
+            part_types.flags.writeable = False
+            self._caches['part_types'] = part_types
+            return part_types
+
+    def iter_parts(self) -> Iterator[Geometry]:
+        """
+        Get each of the collection's parts as a djio geometry.  (The geometries are created as you go, and aren't
+        cached.)
+
+        :return: an iteration of the parts
+        """
+        for part in self._get_shapely_parts():
+            yield Geometry.from_shapely(shapely_geometry=part, spatial_reference=self._spatial_reference)
+
+    def _get_rings(self) -> List[Iterable[Tuple[float, float] or Tuple[float, float, float]]]:
+        """
+        Get the coordinate sequences of the rings of every part, in order.
+
+        :return: the coordinate sequences
+        """
+        return [ring for part in self._get_shapely_parts() for ring in _shapely_rings(part)]
+
+    def _get_part_ring_counts(self, ring_count: int) -> List[int]:
+        """
+        Get the number of rings in each part.
+
+        :param ring_count: the number of rings in the collection
+        :return: the number of rings in each part
+        """
+        return [len(_shapely_rings(part)) for part in self._get_shapely_parts()]
+
+    def iter_coords(self) -> Iterable[Tuple[float, float] or Tuple[float, float, float]]:
+        """
+        Retrieve the coordinates of every part as a flattened enumeration.
+        :return: an iteration containing the collection's coordinates
+        """
+        try:
+            return self._caches['iter_coords']
+        except KeyError:
+            _tuples = [tuple(coordinate) for coordinate in self.coords_array.tolist()]
+            self._caches['iter_coords'] = _tuples
+            return _tuples
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the bounds of the collection (taken directly from the coordinates of all the parts at once).
+
+        :return: a (min_x, min_y, max_x, max_y) tuple
+        """
+        try:
+            return self._caches['bounds']
+        except KeyError:
+            xy = self.coords_array[:, 0:2]
+            bounds = ((math.nan, math.nan, math.nan, math.nan) if len(xy) == 0
+                      else tuple(float(b) for b in itertools.chain(xy.min(axis=0), xy.max(axis=0))))
+            self._caches['bounds'] = bounds
+            return bounds
+
+    def _from_coords_array(self,
+                           coordinates: np.ndarray,
+                           spatial_reference: SpatialReference or int) -> 'Geometry':
+        """
+        Create a new collection that has the same parts as this one but different coordinates.
+
+        :param coordinates: an (N, D) array of coordinates laid out just like :py:attr:`coords_array`
+        :param spatial_reference: the spatial reference of the new collection
+        :return: the new collection
+        """
+        ring_offsets, part_offsets = self.ring_offsets, self.part_offsets
+        parts = [
+            _shapely_from_rings(part_type, coordinates, ring_offsets[part_offsets[i]:part_offsets[i + 1] + 1])
+            for i, part_type in enumerate(self.part_types)
+        ]
+        _shapely = self._shapely_type(parts) if len(parts) != 0 else self._shapely_type()
+        return Geometry.from_shapely(shapely_geometry=_shapely, spatial_reference=spatial_reference)
+
+    def flip_coordinates(self) -> 'GeometryCollection':
+        """
+        Create a collection based on this one, but with the X and Y axis reversed.  (All of the coordinates in all of
+        the parts are swapped at once.)
+
+        :return: a new :py:class:`Geometry` with reversed ordinals.
+        """
+        return self._from_coords_array(_flip_columns(self.coords_array), spatial_reference=self.spatial_reference)
+
+    def to_geometry_array(self) -> 'GeometryArray':
+        """
+        Get the parts of the collection as a :py:class:`djio.arrays.GeometryArray` (in which each part is a
+        geometry).  The array shares the collection's coordinates.
+
+        :return: the geometry array
+        """
+        from .arrays import GeometryArray  # (Imported here because the arrays module depends upon this one.)
+        coordinates, ring_offsets, part_offsets = self._get_coords_arrays()
+        return GeometryArray(geometry_types=self.part_types,
+                             coordinates=coordinates,
+                             ring_offsets=ring_offsets,
+                             part_offsets=part_offsets,
+                             geometry_offsets=np.arange(len(part_offsets), dtype=np.int64),
+                             spatial_reference=self._spatial_reference)
+
+    def get_area(self, spatial_reference: Optional[SpatialReference or int] = None) -> Area:
+        """
+        Get the area of the collection (the area of all of its polygons).  The coordinates of every part are
+        transformed (if necessary) and measured together.
+
+        :param spatial_reference: the metric spatial reference in which the area is measured
+        :return: the area
+        :raises GeometryException: if the spatial reference isn't projected, or isn't metric
+        """
+        sr = _metric_spatial_reference(spatial_reference)
+        return Area(sq_m=float(self.to_geometry_array().areas(spatial_reference=sr).sum()))
+
+
+# Register the geometry factory function (which is just the constructor).
+_register_geometry_factory(GeometryType.COLLECTION, GeometryCollection)
+
+
+class MultiPoint(GeometryCollection):
+    """
+    A multi-point is a collection of points.
+    """
+    _shapely_type: type = ShapelyMultiPoint  #: the Shapely type of the collection
+
+    @property
+    def geometry_type(self) -> GeometryType:
+        """
+        Get the geometry type.
+
+        :return:  :py:attr:`GeometryType.MULTIPOINT`
+        """
+        return GeometryType.MULTIPOINT
+
+    @property
+    def dimensions(self) -> int:
+        """
+        A multi-point is zero-dimensional (0)
+        :return: zero (0)
+        """
+        return 0
+
+
+# Register the geometry factory function (which is just the constructor).
+_register_geometry_factory(GeometryType.MULTIPOINT, MultiPoint)
+
+
+class MultiPolyline(GeometryCollection):
+    """
+    A multi-polyline is a collection of polylines (which need not be connected to one another).
+    """
+    _shapely_type: type = MultiLineString  #: the Shapely type of the collection
+
+    @property
+    def geometry_type(self) -> GeometryType:
+        """
+        Get the geometry type.
+
+        :return:  :py:attr:`GeometryType.MULTIPOLYLINE`
+        """
+        return GeometryType.MULTIPOLYLINE
+
+    @property
+    def dimensions(self) -> int:
+        """
+        A multi-polyline is one-dimensional (1)
+        :return: one (1)
+        """
+        return 1
+
+    def get_geodesic_length(self) -> float:
+        """
+        Measure the length of all the lines along the surface of the WGS84 ellipsoid.  (The lines aren't projected.)
+
+        :return: the length (in meters)
+        :seealso: :py:func:`djio.geodesy.geodesic_lengths`
+        """
+        from .geodesy import geodesic_lengths  # (Imported here because the geodesy module depends upon this one.)
+        return float(geodesic_lengths([self])[0])
+
+
+# Register the geometry factory function (which is just the constructor).
+_register_geometry_factory(GeometryType.MULTIPOLYLINE, MultiPolyline)
+
+
+class MultiPolygon(GeometryCollection):
+    """
+    A multi-polygon is a collection of polygons (which need not touch one another).
+    """
+    _shapely_type: type = ShapelyMultiPolygon  #: the Shapely type of the collection
+
+    @property
+    def geometry_type(self) -> GeometryType:
+        """
+        Get the geometry type.
+
+        :return:  :py:attr:`GeometryType.MULTIPOLYGON`
+        """
+        return GeometryType.MULTIPOLYGON
+
+    @property
+    def dimensions(self) -> int:
+        """
+        A multi-polygon is two-dimensional (2).
+        :return: two (2)
+        """
+        return 2
+
+    def get_geodesic_area(self) -> float:
+        """
+        Measure the area of all the polygons on the surface of the WGS84 ellipsoid.  (The polygons aren't projected.)
+
+        :return: the area (in square meters)
+        :seealso: :py:func:`djio.geodesy.geodesic_areas`
+        """
+        from .geodesy import geodesic_areas  # (Imported here because the geodesy module depends upon this one.)
+        return float(geodesic_areas([self])[0])
+
+
+# Register the geometry factory function (which is just the constructor).
+_register_geometry_factory(GeometryType.MULTIPOLYGON, MultiPolygon)
 
 
 class Projector(object):
@@ -1166,26 +2425,142 @@ Projector.set_instance(Projector())
 
 class ProtoGeometry(object):
     """
-    Use a proto-geometry build up a new geometry from individual coordinates.
+    Use a proto-geometry build up a new geometry from individual coordinates.  Points are added to the current ring
+    of the current part.  Call :py:func:`ProtoGeometry.start_interior` to start a hole in the current (polygon) part,
+    or :py:func:`ProtoGeometry.start_part` to start a whole new part.
     """
 
     def __init__(self,
                  spatial_reference: SpatialReference or int = 4326,
-                 projector: Projector = None):
+                 projector: Projector = None,
+                 capacity: int = 1024):
+        """
+        Create an empty proto-geometry.
+
+        :param spatial_reference: the spatial reference of the geometry being built (Points in other spatial
+            references are transformed as they're added.)
+        :param projector: the projector
+        :param capacity: the number of coordinates for which room is set aside up front (The buffer grows as needed.)
+        """
         self._projector = projector if projector is not None else Projector.get_instance()
         self._spatial_reference = (
             spatial_reference if isinstance(spatial_reference, SpatialReference)
             else SpatialReference(srid=spatial_reference)
         )  # the proto-geometry's spatial reference
-        self._exterior: List[PointTuple] = []  #: the exterior points
-        self._interiors: List['ProtoGeometry'] = []  #: the interior rings  #TODO: Deal with interiors.
+        # The exterior points live in a buffer of (x, y, z) rows.  (Points without Z values have NaN in that column.)
+        self._buffer: np.ndarray = np.empty((max(capacity, 1), 3), dtype=np.float64)  #: the coordinate buffer
+        self._count: int = 0  #: the number of coordinates in the buffer
+        # The rings (exteriors and interiors) and parts are just offsets into the buffer.
+        self._ring_starts: List[int] = [0]  #: the offset of the first coordinate of each ring
+        self._part_starts: List[int] = [0]  #: the offset of the first ring of each part
+
+    def __len__(self) -> int:
+        return self._count
 
     def clear(self):
         """
         Clear the current contents.
         """
-        self._exterior = []
-        self._interiors = []
+        self._count = 0
+        self._ring_starts = [0]
+        self._part_starts = [0]
+
+    def _start_ring(self, part: bool):
+        """
+        Start a new ring.
+
+        :param part: `True` if the ring is the exterior of a new part, `False` if it's an interior of the current part
+        """
+        # If nothing has been added to the current ring, we can just reuse it.
+        if self._ring_starts[-1] == self._count:
+            if part and self._part_starts[-1] != len(self._ring_starts) - 1:
+                self._part_starts.append(len(self._ring_starts) - 1)
+            elif not part and self._part_starts[-1] == len(self._ring_starts) - 1:
+                raise GeometryException('The current part has no exterior.')
+            return
+        self._ring_starts.append(self._count)
+        if part:
+            self._part_starts.append(len(self._ring_starts) - 1)
+
+    def start_interior(self):
+        """
+        Start a new interior ring (a hole) in the current part.  The points you add from now on go into the hole.
+        """
+        self._start_ring(part=False)
+
+    def start_part(self):
+        """
+        Start a new part.  The points you add from now on go into the new part's exterior.
+        """
+        self._start_ring(part=True)
+
+    @property
+    def ring_count(self) -> int:
+        """
+        Get the number of (non-empty) rings.
+
+        :return: the number of rings
+        """
+        return len(self.ring_offsets) - 1
+
+    @property
+    def part_count(self) -> int:
+        """
+        Get the number of (non-empty) parts.
+
+        :return: the number of parts
+        """
+        return len(self.part_offsets) - 1
+
+    @property
+    def ring_offsets(self) -> np.ndarray:
+        """
+        Get the offset of the first coordinate in each ring (plus a final offset for the end).  These are the same sort
+        of offsets you'd get from :py:attr:`Geometry.ring_offsets`.
+
+        :return: the ring offsets
+        """
+        # An empty ring at the end (the current one, if nothing's been added to it yet) doesn't count.
+        ring_starts = self._ring_starts if self._ring_starts[-1] != self._count else self._ring_starts[:-1]
+        return np.array(ring_starts + [self._count], dtype=np.int64)
+
+    @property
+    def part_offsets(self) -> np.ndarray:
+        """
+        Get the offset of the first ring in each part (plus a final offset for the end).  These are the same sort of
+        offsets you'd get from :py:attr:`Geometry.part_offsets`.
+
+        :return: the part offsets
+        """
+        ring_count = len(self._ring_starts) if self._ring_starts[-1] != self._count else len(self._ring_starts) - 1
+        # An empty part at the end doesn't count either.
+        part_starts = [start for start in self._part_starts if start < ring_count]
+        return np.array(part_starts + [ring_count], dtype=np.int64)
+
+    def _reserve(self, count: int):
+        """
+        Make sure there's room in the buffer for more coordinates.
+
+        :param count: the number of coordinates that are about to be added
+        """
+        required = self._count + count
+        if required <= len(self._buffer):
+            return
+        # Grow geometrically so that adding points one at a time doesn't copy the buffer every time.
+        capacity = max(required, 2 * len(self._buffer))
+        buffer = np.empty((capacity, 3), dtype=np.float64)
+        buffer[:self._count] = self._buffer[:self._count]
+        self._buffer = buffer
+
+    def _append(self, coordinates: np.ndarray):
+        """
+        Append a block of (x, y, z) coordinates (which already conform to this proto-geometry) to the buffer.
+
+        :param coordinates: an (N, 3) array of coordinates
+        """
+        self._reserve(len(coordinates))
+        self._buffer[self._count:self._count + len(coordinates)] = coordinates
+        self._count += len(coordinates)
 
     def add(self, p: Point or PointTuple or LatLonTuple):
         """
@@ -1193,8 +2568,82 @@ class ProtoGeometry(object):
         :param p: the new coordinate you want to add
         """
         pt: PointTuple = self._conform(p)
-        tup = (pt.x, pt.y, pt.z) if pt.z is not None else (pt.x, pt.y)
-        self._exterior.append(tup)
+        self._append_one(pt.x, pt.y, pt.z if pt.z is not None else math.nan)
+
+    def _append_one(self, x: float, y: float, z: float):
+        """
+        Append a single coordinate (which already conforms to this proto-geometry) to the buffer.
+
+        :param x: the X coordinate
+        :param y: the Y coordinate
+        :param z: the Z coordinate (or NaN)
+        """
+        self._reserve(1)
+        self._buffer[self._count] = (x, y, z)
+        self._count += 1
+
+    def add_many(self,
+                 points: np.ndarray or Iterable[Point or PointTuple or LatLonTuple],
+                 spatial_reference: SpatialReference or int = None):
+        """
+        Add a whole batch of points to the prototype's exterior.  The points are grouped by spatial reference and each
+        group is transformed in a single call (rather than one point at a time).
+
+        :param points: an (N, 2) or (N, 3) array of coordinates, or an iteration of points, point tuples and lat/lon
+            tuples
+        :param spatial_reference: the spatial reference of an array of coordinates (If you don't supply one, the
+            coordinates are assumed to be in the proto-geometry's spatial reference.)
+        """
+        self._append(self._conform_many(points, spatial_reference=spatial_reference))
+
+    def _conform_many(self,
+                      points: np.ndarray or Iterable[Point or PointTuple or LatLonTuple],
+                      spatial_reference: SpatialReference or int = None) -> np.ndarray:
+        """
+        Make sure a batch of points conforms to this proto-geometry.
+
+        :param points: an (N, 2) or (N, 3) array of coordinates, or an iteration of points, point tuples and lat/lon
+            tuples
+        :param spatial_reference: the spatial reference of an array of coordinates
+        :return: an (N, 3) array of conforming (x, y, z) coordinates (with NaN for missing Z values)
+        """
+        if isinstance(points, np.ndarray):
+            _points = np.asarray(points, dtype=np.float64)
+            coordinates = np.full((len(_points), 3), math.nan, dtype=np.float64)
+            coordinates[:, 0:min(_points.shape[1], 3)] = _points[:, 0:3]
+            srid = (self._spatial_reference.srid if spatial_reference is None
+                    else spatial_reference.srid if isinstance(spatial_reference, SpatialReference)
+                    else spatial_reference)
+            srids = np.full(len(coordinates), srid, dtype=np.int64)
+        else:
+            _points = list(points)
+            coordinates = np.full((len(_points), 3), math.nan, dtype=np.float64)
+            srids = np.empty(len(_points), dtype=np.int64)
+            for i, p in enumerate(_points):
+                if isinstance(p, PointTuple):
+                    coordinates[i] = (p.x, p.y, p.z if p.z is not None else math.nan)
+                    srids[i] = p.srid
+                elif isinstance(p, LatLonTuple):
+                    coordinates[i, 0:2] = (p.longitude, p.latitude)
+                    srids[i] = 4326
+                elif isinstance(p, Point):
+                    coordinates[i] = (p.x, p.y, p.z if p.z is not None else math.nan)
+                    srids[i] = p.spatial_reference.srid
+                else:
+                    # What?  None of the conditions above matched?!
+                    raise TypeError("Unsupported type: {type}.".format(type=type(p)))
+        # Transform each group of points that isn't in our spatial reference all at once.
+        for srid in np.unique(srids):
+            if self._spatial_reference.is_same_as(int(srid)):
+                continue
+            group = srids == srid
+            sr = SpatialReference.from_srid(srid=int(srid))
+            has_z = ~np.isnan(coordinates[group, 2])
+            if has_z.all():
+                coordinates[group] = sr.transform_coordinates(coordinates[group], self._spatial_reference)
+            else:
+                coordinates[group, 0:2] = sr.transform_coordinates(coordinates[group, 0:2], self._spatial_reference)
+        return coordinates
 
     def _conform(self, p: Point or PointTuple or LatLonTuple) -> PointTuple:
         """
@@ -1226,25 +2675,81 @@ class ProtoGeometry(object):
             # Now we can return it.
             return pt_proj.to_point_tuple()
 
+    def _get_coordinates(self) -> np.ndarray:
+        """
+        Get the coordinates that have been added so far.  (They only have Z values if every point had one.)
+
+        :return: an (N, 2) or (N, 3) array of coordinates
+        """
+        coordinates = self._buffer[:self._count]
+        return coordinates if not np.isnan(coordinates[:, 2]).any() else coordinates[:, 0:2]
+
+    def to_shapely(self, geometry_type: GeometryType = GeometryType.POLYGON) -> BaseGeometry:
+        """
+        Create a Shapely geometry from the contents of this proto-geometry.  The coordinates go to Shapely straight
+        from the buffer (without being turned into tuples first).  If there's more than one part, you get a multi-part
+        geometry.
+
+        :param geometry_type: the type of each part (:py:attr:`GeometryType.POLYLINE` or
+            :py:attr:`GeometryType.POLYGON`)
+        :return: the Shapely geometry
+        :raises GeometryException: if the proto-geometry is empty
+        """
+        if self._count == 0:
+            raise GeometryException('The collection is empty.')
+        return _shapely_from_parts(geometry_type, self._get_coordinates(), self.ring_offsets, self.part_offsets)
+
     def to_polyline(self) -> Polyline:
         """
         Create a :py:class:`Polyline` from the contents of this proto-geometry.
         :return: the :py:class:`Polyline`
         """
-        if len(self._exterior) == 0:
+        if self._count == 0:
             raise GeometryException('The collection is empty.')
-        _shapely = LineString(self._exterior)
+        if self.ring_count > 1:
+            raise GeometryException('The collection has {count} rings.'.format(count=self.ring_count))
+        _shapely = LineString(self._get_coordinates())
         # noinspection PyTypeChecker
         return Geometry.from_shapely(shapely_geometry=_shapely, spatial_reference=self._spatial_reference)
 
     def to_polygon(self) -> Polygon:
         """
-        Create a :py:class:`Polygon` from the contents of this proto-geometry.
+        Create a :py:class:`Polygon` (with its interior rings) from the contents of this proto-geometry.
         :return: the :py:class:`Polygon`
         """
-        if len(self._exterior) == 0:
+        if self.part_count > 1:
+            raise GeometryException('The collection has {count} parts.'.format(count=self.part_count))
+        _shapely = self.to_shapely(GeometryType.POLYGON)
+        # noinspection PyTypeChecker
+        return Geometry.from_shapely(shapely_geometry=_shapely, spatial_reference=self._spatial_reference)
+
+    def to_multipolyline(self) -> MultiPolyline:
+        """
+        Create a :py:class:`MultiPolyline` (with a polyline for each part) from the contents of this proto-geometry.
+        :return: the :py:class:`MultiPolyline`
+        """
+        if self.ring_count != self.part_count:
+            raise GeometryException('The parts of a multi-polyline cannot have interior rings.')
+        return self._to_multipart(GeometryType.POLYLINE)
+
+    def to_multipolygon(self) -> MultiPolygon:
+        """
+        Create a :py:class:`MultiPolygon` (with a polygon for each part) from the contents of this proto-geometry.
+        :return: the :py:class:`MultiPolygon`
+        """
+        return self._to_multipart(GeometryType.POLYGON)
+
+    def _to_multipart(self, geometry_type: GeometryType) -> GeometryCollection:
+        """
+        Create a multi-part geometry from the contents of this proto-geometry.
+
+        :param geometry_type: the type of each part
+        :return: the multi-part geometry
+        """
+        if self._count == 0:
             raise GeometryException('The collection is empty.')
-        _shapely = ShapelyPolygon(self._exterior)
+        _shapely = _shapely_from_parts(geometry_type, self._get_coordinates(), self.ring_offsets, self.part_offsets,
+                                       multi=True)
         # noinspection PyTypeChecker
         return Geometry.from_shapely(shapely_geometry=_shapely, spatial_reference=self._spatial_reference)
 
@@ -0,0 +1,671 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.gml
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Somebody sent you a WFS response the size of a small moon?  Read it a feature at a time.
+"""
+
+from .arrays import GeometryArray
+from .geojson import Feature
+from .geometry import (Geometry, GeometryCollection, GeometryException, GeometryType, SpatialReference,
+                       SpatialReferenceException, _flip_columns)
+from io import StringIO
+import numpy as np
+import re
+from shapely.geometry import (GeometryCollection as ShapelyGeometryCollection, LineString,
+                              MultiLineString, MultiPoint as ShapelyMultiPoint, MultiPolygon as ShapelyMultiPolygon,
+                              Point as ShapelyPoint, Polygon as ShapelyPolygon)
+from shapely.geometry.base import BaseGeometry
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
+
+
+GML_NAMESPACE: str = 'http://www.opengis.net/gml'  #: the GML (2 and 3.1) namespace
+GML32_NAMESPACE: str = 'http://www.opengis.net/gml/3.2'  #: the GML 3.2 namespace
+
+# These are the versions (and the names of the versions) that :py:func:`djio.geometry.Geometry.to_gml` can emit.
+_gml_versions: Dict[str, str] = {
+    '2': '2',
+    '3': '3',
+    '32': '32',
+    '3.2': '32'
+}  #: a mapping of the ways people write GML versions to the versions
+
+_srid_re = re.compile(r'(?P<srid>\d+)\s*$')  #: a regex that matches the SRID at the end of an SRS name
+_CHUNK_SIZE: int = 65536  #: the largest number of coordinates formatted at a time
+
+_member_tags = {
+    'pointMember', 'pointMembers', 'lineStringMember', 'curveMember', 'curveMembers', 'polygonMember',
+    'surfaceMember', 'surfaceMembers', 'geometryMember', 'geometryMembers'
+}  #: the local names of the elements that hold the parts of multi-part geometries
+
+_multi_tags: Dict[str, GeometryType] = {
+    'MultiPoint': GeometryType.MULTIPOINT,
+    'MultiLineString': GeometryType.MULTIPOLYLINE,
+    'MultiCurve': GeometryType.MULTIPOLYLINE,
+    'MultiPolygon': GeometryType.MULTIPOLYGON,
+    'MultiSurface': GeometryType.MULTIPOLYGON,
+    'MultiGeometry': GeometryType.COLLECTION
+}  #: a mapping of the local names of multi-part geometry elements to djio geometry types
+
+_geometry_tags = {'Point', 'LineString', 'LinearRing', 'Polygon'} | set(_multi_tags.keys())
+#: the local names of the geometry elements we understand
+
+_feature_member_tags = {'featureMember', 'featureMembers', 'member'}  #: the local names of feature containers
+
+
+def _local_name(tag: str) -> str:
+    """
+    Get the local name of an element's tag (without the namespace).
+
+    :param tag: the tag
+    :return: the local name
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+def _gml_version(version: int or str) -> str:
+    """
+    Normalize a GML version.
+
+    :param version: the version (2, 3 or 32)
+    :return: the normalized version
+    :raises GeometryException: if the version isn't supported
+    """
+    try:
+        return _gml_versions[str(version)]
+    except KeyError:
+        raise GeometryException('Unsupported GML version: {version}.'.format(version=version))
+
+
+def parse_srs_name(srs_name: str) -> Tuple[int, bool]:
+    """
+    Figure out the spatial reference ID named by a GML `srsName`, and whether or not the coordinates are in the
+    authority's axis order.  (The `urn:ogc:def:crs:EPSG::4326` and `http://www.opengis.net/def/crs/EPSG/0/4326`
+    forms use the authority's order, so a geographic spatial reference puts latitude first.  The older `EPSG:4326`
+    and `http://www.opengis.net/gml/srs/epsg.xml#4326` forms are always X, then Y.)
+
+    :param srs_name: the SRS name
+    :return: the spatial reference ID and `True` if the coordinates are in the authority's axis order
+    :raises SpatialReferenceException: if the SRS name doesn't name an SRID
+    """
+    if 'CRS84' in srs_name.upper():
+        return 4326, False
+    match = _srid_re.search(srs_name)
+    if match is None:
+        raise SpatialReferenceException('The SRS name does not identify a spatial reference: {srs_name}'.format(
+            srs_name=srs_name))
+    authority_order = srs_name.lower().startswith('urn:') or '/def/crs/' in srs_name
+    return int(match.group('srid')), authority_order
+
+
+class _GmlContext(object):
+    """
+    This is what we need to know (that isn't in the element itself) to read a GML geometry.
+    """
+
+    def __init__(self, spatial_reference: SpatialReference or None, swap: bool = False, dimensions: int = 2):
+        self.spatial_reference: SpatialReference or None = spatial_reference
+        self.swap: bool = swap  #: Do the X and Y axes need to be swapped?
+        self.dimensions: int = dimensions  #: the number of values in each coordinate (unless the element says so)
+
+    def inherit(self, element: ElementTree.Element) -> '_GmlContext':
+        """
+        Get the context for an element (which may name its own spatial reference or dimensions).
+
+        :param element: the element
+        :return: the context for the element
+        """
+        srs_name = element.get('srsName')
+        srs_dimension = element.get('srsDimension')
+        if srs_name is None and srs_dimension is None:
+            return self
+        context = _GmlContext(self.spatial_reference, self.swap,
+                              int(srs_dimension) if srs_dimension is not None else self.dimensions)
+        if srs_name is not None:
+            srid, authority_order = parse_srs_name(srs_name)
+            context.spatial_reference = SpatialReference.from_srid(srid=srid)
+            context.swap = authority_order and context.spatial_reference.is_geographic
+        return context
+
+
+def _read_coordinates(element: ElementTree.Element, context: _GmlContext) -> np.ndarray:
+    """
+    Read the coordinates of a point, linestring or linear ring element.
+
+    :param element: the element
+    :param context: the context
+    :return: an (N, D) array of coordinates
+    """
+    context = context.inherit(element)
+    blocks: List[np.ndarray] = []
+    for child in element:
+        name = _local_name(child.tag)
+        text = child.text or ''
+        if name == 'posList':
+            dimensions = int(child.get('srsDimension', context.dimensions))
+            blocks.append(np.fromstring(text, dtype=np.float64, sep=' ').reshape(-1, dimensions))
+        elif name == 'pos':
+            blocks.append(np.fromstring(text, dtype=np.float64, sep=' ').reshape(1, -1))
+        elif name == 'coordinates':
+            # GML 2 coordinates are tuples (separated by spaces) of values (separated by commas).
+            decimal, cs, ts = child.get('decimal', '.'), child.get('cs', ','), child.get('ts', ' ')
+            tuples = text.split(ts) if not ts.isspace() else text.split()
+            tuples = [t.strip() for t in tuples if t.strip()]
+            if len(tuples) == 0:
+                continue
+            dimensions = tuples[0].count(cs) + 1
+            values = ' '.join(tuples).replace(cs, ' ')
+            if decimal != '.':
+                values = values.replace(decimal, '.')
+            blocks.append(np.fromstring(values, dtype=np.float64, sep=' ').reshape(-1, dimensions))
+        elif name == 'coord':
+            blocks.append(np.array([[float(value.text) for value in child]], dtype=np.float64))
+    if len(blocks) == 0:
+        return np.empty((0, context.dimensions), dtype=np.float64)
+    coordinates = blocks[0] if len(blocks) == 1 else np.vstack(blocks)
+    return _flip_columns(coordinates) if context.swap else coordinates
+
+
+def _find_ring(element: ElementTree.Element) -> ElementTree.Element:
+    """
+    Find the linear ring in a polygon's boundary element.
+
+    :param element: the boundary element (`exterior`, `outerBoundaryIs` and so on)
+    :return: the linear ring element
+    :raises GeometryException: if there's no linear ring
+    """
+    for child in element:
+        if _local_name(child.tag) == 'LinearRing':
+            return child
+    raise GeometryException('The polygon boundary has no linear ring.')
+
+
+def _read_shapely(element: ElementTree.Element, context: _GmlContext) -> BaseGeometry:
+    """
+    Read a GML geometry element as a Shapely geometry.
+
+    :param element: the geometry element
+    :param context: the context
+    :return: the Shapely geometry
+    :raises GeometryException: if the element isn't a geometry we understand
+    """
+    context = context.inherit(element)
+    name = _local_name(element.tag)
+    if name == 'Point':
+        coordinates = _read_coordinates(element, context)
+        return ShapelyPoint(coordinates[0]) if len(coordinates) != 0 else ShapelyPoint()
+    elif name in ('LineString', 'LinearRing'):
+        return LineString(_read_coordinates(element, context))
+    elif name == 'Polygon':
+        exterior = None
+        interiors: List[np.ndarray] = []
+        for child in element:
+            boundary = _local_name(child.tag)
+            if boundary in ('exterior', 'outerBoundaryIs'):
+                exterior = _read_coordinates(_find_ring(child), context)
+            elif boundary in ('interior', 'innerBoundaryIs'):
+                interiors.append(_read_coordinates(_find_ring(child), context))
+        return ShapelyPolygon(exterior, interiors) if exterior is not None else ShapelyPolygon()
+    elif name in _multi_tags:
+        parts = [
+            _read_shapely(part, context)
+            for member in element if _local_name(member.tag) in _member_tags
+            for part in member
+        ]
+        geometry_type = _multi_tags[name]
+        if geometry_type == GeometryType.MULTIPOINT:
+            return ShapelyMultiPoint(parts) if len(parts) != 0 else ShapelyMultiPoint()
+        elif geometry_type == GeometryType.MULTIPOLYLINE:
+            return MultiLineString(parts) if len(parts) != 0 else MultiLineString()
+        elif geometry_type == GeometryType.MULTIPOLYGON:
+            return ShapelyMultiPolygon(parts) if len(parts) != 0 else ShapelyMultiPolygon()
+        return ShapelyGeometryCollection(parts)
+    raise GeometryException('Unsupported GML geometry: {name}.'.format(name=name))
+
+
+def read_geometry(element: ElementTree.Element, spatial_reference: SpatialReference or int = None) -> Geometry:
+    """
+    Read a GML geometry element.
+
+    :param element: the geometry element
+    :param spatial_reference: the spatial reference of the geometry if the element doesn't name one
+    :return: the djio geometry
+    :raises SpatialReferenceException: if the element names no spatial reference and none is supplied
+    """
+    return _read_geometry(element, _GmlContext(_resolve(spatial_reference)))
+
+
+def _read_geometry(element: ElementTree.Element, context: _GmlContext) -> Geometry:
+    """
+    Read a GML geometry element.
+
+    :param element: the geometry element
+    :param context: the context
+    :return: the djio geometry
+    """
+    context = context.inherit(element)
+    if context.spatial_reference is None:
+        raise SpatialReferenceException('The GML geometry has no srsName, and no SRID was supplied.')
+    return Geometry.from_shapely(shapely_geometry=_read_shapely(element, context),
+                                 spatial_reference=context.spatial_reference)
+
+
+def _resolve(spatial_reference: SpatialReference or int or None) -> Optional[SpatialReference]:
+    """
+    Resolve a spatial reference (or SRID).
+
+    :param spatial_reference: the spatial reference, SRID or `None`
+    :return: the spatial reference (or `None`)
+    """
+    if spatial_reference is None or isinstance(spatial_reference, SpatialReference):
+        return spatial_reference
+    return SpatialReference.from_srid(srid=spatial_reference)
+
+
+def loads_geometry(gml: str, spatial_reference: SpatialReference or int = None) -> Geometry:
+    """
+    Create a geometry from GML.  (The GML may use the `gml` prefix without declaring it, the way
+    :py:func:`djio.geometry.Geometry.to_gml` writes it.)
+
+    :param gml: the GML geometry
+    :param spatial_reference: the spatial reference of the geometry if the GML doesn't name one
+    :return: the geometry
+    :raises GeometryException: if the GML can't be parsed
+    """
+    # If the GML uses the 'gml' prefix without declaring it, we'll wrap it in an element that does.
+    text = gml if 'xmlns:gml' in gml or 'gml:' not in gml else '<djio xmlns:gml="{ns}">{gml}</djio>'.format(
+        ns=GML_NAMESPACE, gml=gml)
+    try:
+        root = ElementTree.fromstring(text)
+    except ElementTree.ParseError as ex:
+        raise GeometryException('The GML could not be parsed: {error}'.format(error=ex))
+    element = root if _local_name(root.tag) in _geometry_tags else next(
+        (child for child in root if _local_name(child.tag) in _geometry_tags), None)
+    if element is None:
+        raise GeometryException('The GML is not a geometry.')
+    return read_geometry(element, spatial_reference=spatial_reference)
+
+
+def _read_feature(element: ElementTree.Element, context: _GmlContext) -> Feature:
+    """
+    Read a GML feature element.
+
+    :param element: the feature element
+    :param context: the context
+    :return: the feature
+    """
+    geometry: Optional[Geometry] = None
+    properties: Dict[str, Any] = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name == 'boundedBy':
+            continue
+        value = next((grandchild for grandchild in child if _local_name(grandchild.tag) in _geometry_tags), None)
+        if value is None:
+            properties[name] = child.text
+        elif geometry is None:
+            geometry = _read_geometry(value, context)
+        else:
+            # The feature's first geometry is *the* geometry.  Any others are properties.
+            properties[name] = _read_geometry(value, context)
+    _id = next((v for k, v in element.attrib.items() if _local_name(k) in ('id', 'fid')), None)
+    return Feature(geometry=geometry, properties=properties, id=_id)
+
+
+def read_features(source: str or BinaryIO, spatial_reference: SpatialReference or int = None) -> Iterator[Feature]:
+    """
+    Read the features in a GML feature collection (like a WFS response) one feature at a time.  Each feature is
+    discarded once it's been read, so memory use doesn't grow with the size of the document.
+
+    :param source: the path to the document, or a binary file-like object
+    :param spatial_reference: the spatial reference of geometries that don't name their own
+    :return: an iteration of features
+    """
+    context = _GmlContext(_resolve(spatial_reference))
+    stack: List[ElementTree.Element] = []  # These are the elements we're inside of.
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(element)
+            continue
+        stack.pop()
+        parent = stack[-1] if len(stack) != 0 else None
+        if parent is not None and _local_name(parent.tag) in _feature_member_tags:
+            yield _read_feature(element, context)
+            # We're done with this feature, so let it go.
+            parent.remove(element)
+        elif _local_name(element.tag) in _feature_member_tags and parent is not None:
+            parent.remove(element)
+        elif _local_name(element.tag) == 'Envelope' and context.spatial_reference is None:
+            # If the collection's envelope names a spatial reference, we'll use it when a geometry doesn't.
+            srs_name = element.get('srsName')
+            if srs_name is not None:
+                context = context.inherit(element)
+
+
+def _format_coordinates(coordinates: np.ndarray, version: str, precision: int) -> Iterator[str]:
+    """
+    Format a block of coordinates as the text of a GML `coordinates` (GML 2) or `posList` (GML 3) element.
+
+    :param coordinates: an (N, D) array of coordinates
+    :param version: the GML version
+    :param precision: the number of significant digits
+    :return: an iteration of text chunks
+    """
+    ndim = coordinates.shape[1]
+    value = '%.{precision}g'.format(precision=precision)
+    position = (',' if version == '2' else ' ').join([value] * ndim)
+    for start in range(0, len(coordinates), _CHUNK_SIZE):
+        chunk = coordinates[start:start + _CHUNK_SIZE]
+        yield (' ' if start != 0 else '') + ' '.join([position] * len(chunk)) % tuple(chunk.ravel().tolist())
+
+
+_multi_elements: Dict[str, Dict[int, Tuple[str, str]]] = {
+    '2': {
+        GeometryType.MULTIPOINT: ('MultiPoint', 'pointMember'),
+        GeometryType.MULTIPOLYLINE: ('MultiLineString', 'lineStringMember'),
+        GeometryType.MULTIPOLYGON: ('MultiPolygon', 'polygonMember'),
+        GeometryType.COLLECTION: ('MultiGeometry', 'geometryMember')
+    },
+    '3': {
+        GeometryType.MULTIPOINT: ('MultiPoint', 'pointMember'),
+        GeometryType.MULTIPOLYLINE: ('MultiCurve', 'curveMember'),
+        GeometryType.MULTIPOLYGON: ('MultiSurface', 'surfaceMember'),
+        GeometryType.COLLECTION: ('MultiGeometry', 'geometryMember')
+    }
+}  #: the local names of the multi-part geometry elements (and their members) in each version of GML
+_multi_elements['32'] = _multi_elements['3']
+
+
+class _GmlWriter(object):
+    """
+    This writes GML geometries from a block of coordinates and the offsets that describe them.
+    """
+
+    def __init__(self, write: Callable[[str], Any], version: str, precision: int):
+        self.write: Callable[[str], Any] = write
+        self.version: str = version
+        self.precision: int = precision
+
+    def srs_attribute(self, spatial_reference: SpatialReference) -> str:
+        """
+        Get the `srsName` attribute for a geometry.
+
+        :param spatial_reference: the geometry's spatial reference
+        :return: the attribute (with a leading space)
+        """
+        if self.version == '2':
+            return ' srsName="EPSG:{srid}"'.format(srid=spatial_reference.srid)
+        return ' srsName="urn:ogc:def:crs:EPSG::{srid}"'.format(srid=spatial_reference.srid)
+
+    def swap(self, spatial_reference: SpatialReference) -> bool:
+        """
+        Do coordinates in a spatial reference need their X and Y axes swapped?  (GML 3 names spatial references with
+        URNs, so geographic coordinates are written latitude first.)
+
+        :param spatial_reference: the spatial reference
+        :return: `True` if the axes need to be swapped
+        """
+        return self.version != '2' and spatial_reference.is_geographic
+
+    def _ring(self, tag: str, coordinates: np.ndarray, srs: str = ''):
+        """
+        Write a point, linestring or linear ring.
+
+        :param tag: the geometry element's local name
+        :param coordinates: the coordinates
+        :param srs: the `srsName` attribute (if this is the whole geometry)
+        """
+        write = self.write
+        if self.version == '2':
+            element, dimension = 'coordinates', ''
+        else:
+            element = 'pos' if tag == 'Point' else 'posList'
+            dimension = ' srsDimension="3"' if coordinates.shape[1] == 3 else ''
+        write('<gml:{tag}{srs}><gml:{element}{dimension}>'.format(tag=tag, srs=srs, element=element,
+                                                                  dimension=dimension))
+        for text in _format_coordinates(coordinates, self.version, self.precision):
+            write(text)
+        write('</gml:{element}></gml:{tag}>'.format(tag=tag, element=element))
+
+    def part(self, part_type: int, coordinates: np.ndarray, ring_offsets: np.ndarray, ring_start: int,
+             ring_end: int, srs: str = ''):
+        """
+        Write a single-part geometry.
+
+        :param part_type: the :py:class:`GeometryType` of the part
+        :param coordinates: the coordinates
+        :param ring_offsets: the ring offsets
+        :param ring_start: the index of the part's first ring
+        :param ring_end: the index just past the part's last ring
+        :param srs: the `srsName` attribute (if the part is the whole geometry)
+        """
+        rings = [coordinates[ring_offsets[i]:ring_offsets[i + 1]] for i in range(ring_start, ring_end)]
+        if part_type == GeometryType.POINT:
+            self._ring('Point', rings[0][:1] if len(rings) != 0 else coordinates[0:0], srs=srs)
+        elif part_type == GeometryType.POLYLINE:
+            self._ring('LineString', rings[0] if len(rings) != 0 else coordinates[0:0], srs=srs)
+        elif part_type == GeometryType.POLYGON:
+            outer, inner = ('outerBoundaryIs', 'innerBoundaryIs') if self.version == '2' else ('exterior', 'interior')
+            self.write('<gml:Polygon{srs}>'.format(srs=srs))
+            for i, ring in enumerate(rings):
+                boundary = outer if i == 0 else inner
+                self.write('<gml:{boundary}>'.format(boundary=boundary))
+                self._ring('LinearRing', ring)
+                self.write('</gml:{boundary}>'.format(boundary=boundary))
+            self.write('</gml:Polygon>')
+        else:
+            raise GeometryException('Unsupported geometry type: {type}.'.format(type=part_type))
+
+    def geometry(self,
+                 geometry_type: int,
+                 coordinates: np.ndarray,
+                 ring_offsets: np.ndarray,
+                 part_offsets: np.ndarray,
+                 part_types: Optional[np.ndarray],
+                 srs: str):
+        """
+        Write a geometry.
+
+        :param geometry_type: the :py:class:`GeometryType` of the geometry
+        :param coordinates: the coordinates
+        :param ring_offsets: the ring offsets
+        :param part_offsets: the offsets (into the ring offsets) of the geometry's parts (plus a final offset)
+        :param part_types: the type of each part (This is only needed for geometry collections.)
+        :param srs: the `srsName` attribute
+        """
+        _geometry_type = int(geometry_type)
+        if not _geometry_type & GeometryType.COLLECTION:
+            self.part(_geometry_type, coordinates, ring_offsets, part_offsets[0], part_offsets[-1], srs=srs)
+            return
+        try:
+            tag, member = _multi_elements[self.version][_geometry_type]
+        except KeyError:
+            raise GeometryException('Unsupported geometry type: {type}.'.format(type=geometry_type))
+        self.write('<gml:{tag}{srs}>'.format(tag=tag, srs=srs))
+        for i in range(len(part_offsets) - 1):
+            part_type = int(part_types[i]) if part_types is not None else _geometry_type & ~GeometryType.COLLECTION
+            self.write('<gml:{member}>'.format(member=member))
+            self.part(part_type, coordinates, ring_offsets, part_offsets[i], part_offsets[i + 1])
+            self.write('</gml:{member}>'.format(member=member))
+        self.write('</gml:{tag}>'.format(tag=tag))
+
+
+def write_geometry(stream: TextIO, geometry: Geometry, version: int or str = 3, precision: int = 15):
+    """
+    Write a geometry to a text stream as GML.  The coordinates are formatted straight from the geometry's
+    coordinate block (see :py:attr:`djio.geometry.Geometry.coords_array`), so OGR isn't involved.
+
+    :param stream: the text stream
+    :param geometry: the geometry
+    :param version: the GML version (2, 3 or 32)
+    :param precision: the number of significant digits written for each ordinate
+    """
+    writer = _GmlWriter(stream.write, _gml_version(version), precision)
+    sr = geometry.spatial_reference
+    coordinates = geometry.coords_array
+    writer.geometry(geometry.geometry_type, _flip_columns(coordinates) if writer.swap(sr) else coordinates,
+                    geometry.ring_offsets, geometry.part_offsets,
+                    geometry.part_types if isinstance(geometry, GeometryCollection) else None,
+                    writer.srs_attribute(sr))
+
+
+def dumps_geometry(geometry: Geometry, version: int or str = 3, precision: int = 15) -> str:
+    """
+    Get a geometry as GML.
+
+    :param geometry: the geometry
+    :param version: the GML version (2, 3 or 32)
+    :param precision: the number of significant digits written for each ordinate
+    :return: the GML
+    """
+    stream = StringIO()
+    write_geometry(stream, geometry, version=version, precision=precision)
+    return stream.getvalue()
+
+
+class FeatureCollectionWriter(object):
+    """
+    A feature collection writer writes a GML feature collection to a text stream a feature at a time, so the whole
+    collection never has to be in memory.  (Use it as a context manager, or remember to call
+    :py:func:`FeatureCollectionWriter.close`.)
+    """
+
+    def __init__(self,
+                 stream: TextIO,
+                 version: int or str = 3,
+                 precision: int = 15,
+                 type_name: str = 'feature',
+                 geometry_name: str = 'geometry',
+                 prefix: str = 'djio',
+                 namespace: str = 'http://daburu.net/djio'):
+        """
+
+        :param stream: the text stream
+        :param version: the GML version (2, 3 or 32)
+        :param precision: the number of significant digits written for each ordinate
+        :param type_name: the local name of the feature elements
+        :param geometry_name: the local name of the geometry property
+        :param prefix: the namespace prefix of the feature elements (and their properties)
+        :param namespace: the namespace of the feature elements (and their properties)
+        """
+        self._stream: TextIO = stream
+        self._writer: _GmlWriter = _GmlWriter(stream.write, _gml_version(version), precision)
+        self._type_name: str = '{prefix}:{name}'.format(prefix=prefix, name=type_name)
+        self._geometry_name: str = '{prefix}:{name}'.format(prefix=prefix, name=geometry_name)
+        self._prefix: str = prefix
+        self._count: int = 0  #: the number of features written so far
+        self._closed: bool = False
+        stream.write('<?xml version="1.0" encoding="utf-8" ?>\n')
+        stream.write('<gml:FeatureCollection xmlns:gml="{gml}" xmlns:{prefix}={namespace}>\n'.format(
+            gml=GML32_NAMESPACE if self._writer.version == '32' else GML_NAMESPACE,
+            prefix=prefix, namespace=quoteattr(namespace)))
+
+    def __enter__(self) -> 'FeatureCollectionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _begin_feature(self, id: Any):
+        """
+        Write the start of a feature.
+
+        :param id: the feature's ID
+        """
+        if self._closed:
+            raise GeometryException('The feature collection has been closed.')
+        id_attribute = ''
+        if id is not None:
+            id_attribute = ' {name}={id}'.format(name='fid' if self._writer.version == '2' else 'gml:id',
+                                                 id=quoteattr(str(id)))
+        self._stream.write('<gml:featureMember><{type_name}{id}>'.format(type_name=self._type_name, id=id_attribute))
+
+    def _end_feature(self, properties: Optional[Dict[str, Any]]):
+        """
+        Write the properties and the end of a feature.
+
+        :param properties: the feature's properties
+        """
+        write = self._stream.write
+        for name, value in (properties or {}).items():
+            if value is None:
+                continue
+            write('<{prefix}:{name}>{value}</{prefix}:{name}>'.format(prefix=self._prefix, name=name,
+                                                                     value=escape(str(value))))
+        write('</{type_name}></gml:featureMember>\n'.format(type_name=self._type_name))
+        self._count += 1
+
+    def write(self, geometry: Optional[Geometry], properties: Dict[str, Any] = None, id: Any = None):
+        """
+        Write a feature.
+
+        :param geometry: the feature's geometry (or `None`)
+        :param properties: the feature's properties
+        :param id: the feature's ID
+        """
+        self._begin_feature(id)
+        if geometry is not None:
+            self._stream.write('<{name}>'.format(name=self._geometry_name))
+            sr = geometry.spatial_reference
+            coordinates = geometry.coords_array
+            self._writer.geometry(geometry.geometry_type,
+                                  _flip_columns(coordinates) if self._writer.swap(sr) else coordinates,
+                                  geometry.ring_offsets, geometry.part_offsets,
+                                  geometry.part_types if isinstance(geometry, GeometryCollection) else None,
+                                  self._writer.srs_attribute(sr))
+            self._stream.write('</{name}>'.format(name=self._geometry_name))
+        self._end_feature(properties)
+
+    def write_many(self, features: Iterable[Feature or Geometry]):
+        """
+        Write a number of features.
+
+        :param features: the features (or plain geometries)
+        """
+        for feature in features:
+            if isinstance(feature, Feature):
+                self.write(feature.geometry, properties=feature.properties, id=feature.id)
+            else:
+                self.write(feature)
+
+    def write_array(self,
+                    array: GeometryArray,
+                    properties: Iterable[Dict[str, Any]] = None,
+                    ids: Iterable[Any] = None):
+        """
+        Write every geometry in a geometry array as a feature.  The coordinates are formatted straight from the
+        array (so no djio geometries are created).
+
+        :param array: the geometry array
+        :param properties: the properties of each feature
+        :param ids: the ID of each feature
+        """
+        sr = array.spatial_reference
+        coordinates = _flip_columns(array.coordinates) if self._writer.swap(sr) else array.coordinates
+        srs = self._writer.srs_attribute(sr)
+        _properties = iter(properties) if properties is not None else None
+        _ids = iter(ids) if ids is not None else None
+        geometry_offsets, part_offsets = array.geometry_offsets, array.part_offsets
+        for i, geometry_type in enumerate(array.geometry_types.tolist()):
+            self._begin_feature(next(_ids) if _ids is not None else None)
+            self._stream.write('<{name}>'.format(name=self._geometry_name))
+            self._writer.geometry(geometry_type, coordinates, array.ring_offsets,
+                                  part_offsets[geometry_offsets[i]:geometry_offsets[i + 1] + 1], None, srs)
+            self._stream.write('</{name}>'.format(name=self._geometry_name))
+            self._end_feature(next(_properties) if _properties is not None else None)
+
+    def close(self):
+        """
+        Finish the feature collection.  (The stream itself is left open.)
+        """
+        if not self._closed:
+            self._stream.write('</gml:FeatureCollection>\n')
+            self._closed = True
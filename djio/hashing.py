@@ -9,6 +9,7 @@ Need to know at a glance if two geometries are the same?
 """
 
 import math
+import numpy as np
 from typing import Iterable, Tuple
 
 
@@ -84,6 +85,10 @@ def bytes_to_int(b: bytes):
     return i if not neg else i * -1
 
 
+_COLLECTION_FLAG: int = 8  #: the geometry type flag that marks a collection (see `djio.geometry.GeometryType`)
+_PART_TYPE_MASK: int = 7  #: a mask that covers the part type within a geometry type code
+
+
 def djiohash_v1(geometry_type_code: int,
                 srid: int,
                 coordinates: Iterable[Tuple[float, float] or Tuple[float, float, float]],
@@ -101,12 +106,13 @@ def djiohash_v1(geometry_type_code: int,
 
         :py:class:`djio.geometry.GeometryType`
     """
-    # The first byte will hold the geometry type in the highest 4 bits of the first byte.
+    # The first byte will hold the geometry type in the highest 4 bits of the first byte.  (For collections, this is
+    # the type of the parts.)
     # ☐☐☐☐0000
-    b1_geometry_type = geometry_type_code << 4
+    b1_geometry_type = (geometry_type_code & _PART_TYPE_MASK) << 4
     # The next bit tells us whether or not the geometry is a collection.
     # 0000☐000
-    b1_is_collection = 0 << 3  # TODO: Revisit this when collections are implemented.
+    b1_is_collection = geometry_type_code & _COLLECTION_FLAG
     # The next bit tells us whether or not this geometry has 3D coordinates (i.e. "M" values).
     # 00000☐00
     b1_has_m_values = 0 << 2  # TODO: Revisit this when we can determine this.
@@ -161,7 +167,179 @@ def djiohash_v1(geometry_type_code: int,
     return bytearray(bytes)
 
 
+def _rotate_ordinates(ordinates: np.ndarray, offsets: np.ndarray, max_bits: int = 64) -> np.ndarray:
+    """
+    Rotate the (integer) ordinates in an array by their respective offsets, just as :py:func:`djiohash_v1` does one
+    ordinate at a time.
+
+    :param ordinates: the integer ordinates
+    :param offsets: the offset (0 through `max_bits`) for each ordinate
+    :param max_bits: the maximum number of bits in the coordinate hash
+    :return: the lowest `max_bits` bits of each rotated ordinate
+    """
+    # NumPy won't shift by the full width of the type, so we shift in two steps (neither of which is that wide).
+    lo = offsets // 2
+    hi = max_bits - offsets
+    ordi_shift = (ordinates.view(np.uint64) << lo.astype(np.uint64)) << (offsets - lo).astype(np.uint64)
+    # Note that the right shift is arithmetic (just like Python's) since the ordinates are signed.
+    ordi_hi = ((ordinates >> (hi // 2)) >> (hi - hi // 2)).view(np.uint64)
+    return ordi_shift | ordi_hi
+
+
+def djiohash_v1_many(geometry_type_codes: np.ndarray or Iterable[int],
+                     srid: int,
+                     coordinates: np.ndarray,
+                     vertex_offsets: np.ndarray or Iterable[int],
+                     precision: int = 4) -> np.ndarray:
+    """
+    Hash many geometries at once.  This produces the same values as :py:func:`djiohash_v1` but works directly
+    against a block of coordinates (like the ones in a :py:class:`djio.arrays.GeometryArray`) without building any
+    tuples.
+
+    :param geometry_type_codes: an integer indicating the type of each geometry
+    :param srid: the numeric spatial reference ID shared by the geometries
+    :param coordinates: an (N, D) array of the coordinates in all of the geometries
+    :param vertex_offsets: the offset of each geometry's first coordinate (plus a final offset for the end)
+    :param precision: the maximum precision (points behind decimal places) to consider in the supplied coordinates
+    :return: a (G, 15) array of bytes in which each row is the hash value of a geometry
+    """
+    max_bits = 64  # the maximum number of bits in the coordinate hash
+    type_codes = np.asarray(geometry_type_codes, dtype=np.int64)
+    _coordinates = np.asarray(coordinates, dtype=np.float64)
+    ndim = _coordinates.shape[1] if _coordinates.ndim == 2 else 2
+    # Each geometry's ordinates start at these offsets in the flattened coordinates.
+    ordinate_offsets = np.asarray(vertex_offsets, dtype=np.int64) * ndim
+    ordinate_counts = np.diff(ordinate_offsets)
+    # Pull everything from the fractional part of the floating-point number into the whole part.
+    ordinates = np.trunc(_coordinates.reshape(-1) * math.pow(10, precision)).astype(np.int64)
+    # Figure out where each ordinate falls within its own geometry so we know how far to rotate it.
+    positions = np.arange(len(ordinates), dtype=np.int64) - np.repeat(ordinate_offsets[:-1], ordinate_counts)
+    rotated = _rotate_ordinates(ordinates, positions % (max_bits + 1), max_bits=max_bits)
+    # XOR all of the rotated ordinates in each geometry together.  (reduceat doesn't cope with empty geometries, so
+    # we only reduce the ones that have ordinates.)
+    coords_bits = np.zeros(len(type_codes), dtype=np.uint64)
+    non_empty = ordinate_counts > 0
+    if non_empty.any():
+        coords_bits[non_empty] = np.bitwise_xor.reduceat(rotated, ordinate_offsets[:-1][non_empty])
+    return _layout_v1(type_codes, srid, ordinate_counts, ~coords_bits, max_bits=max_bits)
+
+
+def _layout_v1(type_codes: np.ndarray,
+               srid: int,
+               ordinate_counts: np.ndarray,
+               coords_bits: np.ndarray,
+               max_bits: int = 64) -> np.ndarray:
+    """
+    Lay out the bytes of version 1 hash values.
+
+    :param type_codes: the geometry type code of each geometry
+    :param srid: the numeric spatial reference ID shared by the geometries
+    :param ordinate_counts: the number of ordinates in each geometry
+    :param coords_bits: the (final, inverted) coordinate hash bits of each geometry
+    :param max_bits: the maximum number of bits in the coordinate hash
+    :return: a (G, 15) array of bytes in which each row is the hash value of a geometry
+    """
+    hashes = np.zeros((len(type_codes), 7 + max_bits // 8), dtype=np.uint8)
+    hashes[:, 0] = ((type_codes & _PART_TYPE_MASK) << 4) | (type_codes & _COLLECTION_FLAG)
+    for idx, shift in enumerate((16, 8, 0)):
+        hashes[:, 1 + idx] = (srid >> shift) & 255
+        hashes[:, 4 + idx] = (ordinate_counts >> shift) & 255
+    # (The highest-order bit of each of the three-byte fields is the sign bit, which is always off.)
+    hashes[:, 1] &= 127
+    hashes[:, 4] &= 127
+    hashes[:, 7:] = coords_bits.astype('>u8').view(np.uint8).reshape(-1, max_bits // 8)
+    return hashes
+
+
+class DjiohashV1Accumulator(object):
+    """
+    An accumulator keeps the running state of a version 1 hash (see :py:func:`djiohash_v1`) so that coordinates can
+    be fed to it a block at a time.  The state is tiny (the coordinate bits and the ordinate count) no matter how
+    many coordinates go through it.
+    """
+    max_bits: int = 64  #: the maximum number of bits in the coordinate hash
+
+    def __init__(self, precision: int = 4):
+        """
+
+        :param precision: the maximum precision (points behind decimal places) to consider in the coordinates
+        """
+        self._precision: int = precision
+        self._coords_bits: np.uint64 = np.uint64(0)  #: the XOR of all the rotated ordinates so far
+        self._ordinate_count: int = 0  #: the number of ordinates so far
+
+    @property
+    def ordinate_count(self) -> int:
+        """
+        Get the number of ordinates that have gone into the hash so far.
+
+        :return: the number of ordinates
+        """
+        return self._ordinate_count
 
+    def copy(self) -> 'DjiohashV1Accumulator':
+        """
+        Get a copy of this accumulator (in its current state).
 
+        :return: the copy
+        """
+        accumulator = DjiohashV1Accumulator(precision=self._precision)
+        accumulator._coords_bits = self._coords_bits
+        accumulator._ordinate_count = self._ordinate_count
+        return accumulator
 
+    def update(self, coordinates: np.ndarray):
+        """
+        Feed the next block of coordinates into the hash.
 
+        :param coordinates: an (n, D) array of coordinates (or a single coordinate)
+        """
+        max_bits = self.max_bits
+        # Pull everything from the fractional part of the floating-point number into the whole part.
+        ordinates = np.trunc(
+            np.asarray(coordinates, dtype=np.float64).reshape(-1) * math.pow(10, self._precision)
+        ).astype(np.int64)
+        if len(ordinates) == 0:
+            return
+        # The rotation picks up where the last block left off.
+        positions = (self._ordinate_count + np.arange(len(ordinates), dtype=np.int64)) % (max_bits + 1)
+        self._coords_bits ^= np.bitwise_xor.reduce(_rotate_ordinates(ordinates, positions, max_bits=max_bits))
+        self._ordinate_count += len(ordinates)
+
+    def digest(self, geometry_type_code: int, srid: int) -> bytearray:
+        """
+        Get the hash value of everything that's gone into the accumulator so far.
+
+        :param geometry_type_code: an integer indicating the type of the geometry
+        :param srid: the numeric spatial reference ID
+        :return: the hash value
+        """
+        hashes = _layout_v1(np.array([geometry_type_code], dtype=np.int64), srid,
+                            np.array([self._ordinate_count], dtype=np.int64),
+                            np.array([~self._coords_bits], dtype=np.uint64),
+                            max_bits=self.max_bits)
+        return bytearray(hashes[0].tobytes())
+
+
+def djiohash_v1_stream(geometry_type_code: int,
+                       srid: int,
+                       blocks: Iterable[np.ndarray],
+                       precision: int = 4) -> bytearray:
+    """
+    Hash a geometry whose coordinates arrive in blocks.  This produces the same value as :py:func:`djiohash_v1` but
+    only ever needs to hold one block of coordinates at a time.
+
+    :param geometry_type_code: an integer indicating the type of the geometry
+    :param srid: the numeric spatial reference ID
+    :param blocks: the geometry's coordinates, in order, as a series of (n, D) arrays
+    :param precision: the maximum precision (points behind decimal places) to consider in the supplied coordinates
+    :return: a hash value for the geometry
+
+    .. seealso::
+
+        :py:func:`djio.geometry.Geometry.iter_coords_chunks`
+    """
+    accumulator = DjiohashV1Accumulator(precision=precision)
+    for block in blocks:
+        accumulator.update(block)
+    return accumulator.digest(geometry_type_code=geometry_type_code, srid=srid)
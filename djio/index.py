@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.index
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Need to find geometries in a hurry?  Index them!
+"""
+
+from .arrays import GeometryArray
+from .geometry import Geometry, Point, SpatialReference, SpatialReferenceException
+import heapq
+import math
+import numpy as np
+from shapely.geometry import Point as ShapelyPoint
+from typing import List, Sequence, Tuple
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Expand a set of (start, end) ranges into a single array of all the indexes they contain.
+
+    :param starts: the starts of the ranges
+    :param ends: the ends of the ranges (exclusive)
+    :return: the indexes
+    """
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # Each index is its position in the output, shifted so that every range begins at its own start.
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(total, dtype=np.int64) + shifts
+
+
+def _str_order(envelopes: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Figure out the Sort-Tile-Recursive (STR) order of a set of envelopes: sort them into vertical slices by the X
+    coordinates of their centers, then sort each slice by the Y coordinates of their centers.
+
+    :param envelopes: an (N, 4) array of envelopes
+    :param capacity: the maximum number of entries in a node
+    :return: the permutation that puts the envelopes in STR order
+    """
+    count = len(envelopes)
+    leaves = int(math.ceil(count / capacity))
+    slice_size = int(math.ceil(math.sqrt(leaves))) * capacity
+    center_x = (envelopes[:, 0] + envelopes[:, 2]) / 2.0
+    center_y = (envelopes[:, 1] + envelopes[:, 3]) / 2.0
+    by_x = np.argsort(center_x, kind='stable')
+    slices = np.empty(count, dtype=np.int64)
+    slices[by_x] = np.arange(count, dtype=np.int64) // slice_size
+    return np.lexsort((center_y, slices))
+
+
+def _intersects(envelopes: np.ndarray, bounds: Sequence[float]) -> np.ndarray:
+    """
+    Test a set of envelopes to see which of them intersect a bounding box.
+
+    :param envelopes: an (N, 4) array of envelopes
+    :param bounds: the (min_x, min_y, max_x, max_y) bounding box
+    :return: a mask indicating which envelopes intersect
+    """
+    return ((envelopes[:, 0] <= bounds[2]) & (envelopes[:, 2] >= bounds[0]) &
+            (envelopes[:, 1] <= bounds[3]) & (envelopes[:, 3] >= bounds[1]))
+
+
+def _min_distances(envelopes: np.ndarray, x: float, y: float) -> np.ndarray:
+    """
+    Get the minimum distance from a point to each of a set of envelopes.
+
+    :param envelopes: an (N, 4) array of envelopes
+    :param x: the X coordinate of the point
+    :param y: the Y coordinate of the point
+    :return: the distances (which are zero for envelopes that contain the point)
+    """
+    dx = np.maximum(np.maximum(envelopes[:, 0] - x, x - envelopes[:, 2]), 0.0)
+    dy = np.maximum(np.maximum(envelopes[:, 1] - y, y - envelopes[:, 3]), 0.0)
+    return np.hypot(dx, dy)
+
+
+class SpatialIndex(object):
+    """
+    A spatial index is a packed R-tree, built in bulk using the Sort-Tile-Recursive (STR) algorithm, over the
+    envelopes of a collection of geometries.
+
+    Every entry in the index must be in the index's spatial reference.  When the index is built from geometries in
+    other spatial references it will either raise a :py:class:`SpatialReferenceException` or (if you ask it to)
+    transform them.  Geometries used to query the index are always transformed into the index's spatial reference;
+    bare coordinates and bounding boxes are assumed to be in the index's spatial reference already.
+    """
+
+    def __init__(self,
+                 envelopes: np.ndarray,
+                 spatial_reference: SpatialReference or int,
+                 geometries: Sequence[Geometry] or GeometryArray = None,
+                 node_capacity: int = 16):
+        """
+
+        :param envelopes: an (N, 4) array in which each row is the (min_x, min_y, max_x, max_y) of an entry (Entries
+            with non-finite envelopes, like those of empty geometries, aren't indexed and are never found.)
+        :param spatial_reference: the spatial reference of the envelopes
+        :param geometries: the geometries described by the envelopes (if you want the index to be able to return
+            geometries rather than just their indexes)
+        :param node_capacity: the maximum number of entries in each node of the tree
+        """
+        self._spatial_reference: SpatialReference = (spatial_reference
+                                                     if isinstance(spatial_reference, SpatialReference)
+                                                     else SpatialReference.from_srid(srid=spatial_reference))
+        self._geometries: Sequence[Geometry] or GeometryArray = geometries
+        self._node_capacity: int = node_capacity
+        _envelopes = np.asarray(envelopes, dtype=np.float64).reshape(-1, 4)
+        self._size: int = len(_envelopes)
+        # Leave out entries whose envelopes aren't finite.  (A single NaN would spread to every node above it and
+        # nothing under those nodes could ever be found.)  We keep the original positions of the others.
+        finite = np.flatnonzero(np.isfinite(_envelopes).all(axis=1))
+        # Put the entries in STR order.
+        order = (finite[_str_order(_envelopes[finite], node_capacity)] if len(finite) != 0
+                 else np.empty(0, dtype=np.int64))
+        self._order: np.ndarray = order  #: the index of each (sorted) entry in the original collection
+        self._entries: np.ndarray = _envelopes[order]  #: the envelopes of the entries in STR order
+        # Now build the tree from the leaves up.  Each level has the envelopes of its nodes and the range of each
+        # node's children in the level below it.  (The level below the leaves is the entries themselves.)
+        self._levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        below = self._entries
+        while len(below) > 1 or len(self._levels) == 0:
+            if len(below) == 0:
+                break
+            starts = np.arange(0, len(below), node_capacity, dtype=np.int64)
+            ends = np.minimum(starts + node_capacity, len(below))
+            nodes = np.empty((len(starts), 4), dtype=np.float64)
+            nodes[:, 0:2] = np.minimum.reduceat(below[:, 0:2], starts, axis=0)
+            nodes[:, 2:4] = np.maximum.reduceat(below[:, 2:4], starts, axis=0)
+            # Pack this level, too.  (The children of each node stay together when we shuffle the nodes.)
+            if len(nodes) > 1:
+                node_order = _str_order(nodes, node_capacity)
+                nodes, starts, ends = nodes[node_order], starts[node_order], ends[node_order]
+            self._levels.append((nodes, starts, ends))
+            below = nodes
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def spatial_reference(self) -> SpatialReference:
+        """
+        Get the index's spatial reference.
+
+        :return: the spatial reference
+        """
+        return self._spatial_reference
+
+    @property
+    def node_capacity(self) -> int:
+        """
+        Get the maximum number of entries in each node of the tree.
+
+        :return: the node capacity
+        """
+        return self._node_capacity
+
+    @property
+    def envelopes(self) -> np.ndarray:
+        """
+        Get the envelopes of the entries in the index (in their original order).  Entries that weren't indexed
+        (because their envelopes weren't finite) have NaN envelopes.
+
+        :return: an (N, 4) array of envelopes
+        """
+        envelopes = np.full((self._size, 4), np.nan, dtype=np.float64)
+        envelopes[self._order] = self._entries
+        return envelopes
+
+    def _to_bounds(self, bounds: Geometry or Sequence[float]) -> Tuple[float, float, float, float]:
+        """
+        Get a bounding box in the index's spatial reference.
+
+        :param bounds: a geometry, or a (min_x, min_y, max_x, max_y) bounding box
+        :return: the bounding box (which is all NaNs if the geometry is empty)
+        """
+        if isinstance(bounds, Geometry):
+            return tuple(bounds.transform(spatial_reference=self._spatial_reference).envelope_tuple[0:4])
+        return tuple(bounds)
+
+    def _to_geometries(self, indexes: np.ndarray) -> List[Geometry]:
+        """
+        Get the geometries at a set of indexes.
+
+        :param indexes: the indexes
+        :return: the geometries
+        :raises ValueError: if the index was built without geometries
+        """
+        if self._geometries is None:
+            raise ValueError('The index was not built with geometries.')
+        return [self._geometries[int(i)] for i in indexes]
+
+    def query(self,
+              bounds: Geometry or Sequence[float],
+              as_geometries: bool = False) -> np.ndarray or List[Geometry]:
+        """
+        Find the entries whose envelopes intersect a bounding box.
+
+        :param bounds: a geometry (whose envelope is used), or a (min_x, min_y, max_x, max_y) bounding box in the
+            index's spatial reference
+        :param as_geometries: `True` to return geometries instead of indexes
+        :return: the (sorted) indexes of the entries, or the geometries
+        """
+        _bounds = self._to_bounds(bounds)
+        # An empty geometry (or any other box that isn't finite) can't intersect anything.
+        if len(self._levels) == 0 or not all(math.isfinite(b) for b in _bounds):
+            hits = np.empty(0, dtype=np.int64)
+        else:
+            # Start with every node at the top of the tree, and work our way down.
+            candidates = np.arange(len(self._levels[-1][0]), dtype=np.int64)
+            for nodes, starts, ends in reversed(self._levels):
+                candidates = candidates[_intersects(nodes[candidates], _bounds)]
+                candidates = _expand_ranges(starts[candidates], ends[candidates])
+            hits = np.sort(self._order[candidates[_intersects(self._entries[candidates], _bounds)]])
+        return hits if not as_geometries else self._to_geometries(hits)
+
+    def query_point(self,
+                    point: Point or Tuple[float, float],
+                    as_geometries: bool = False) -> np.ndarray or List[Geometry]:
+        """
+        Find the entries whose envelopes contain a point.
+
+        :param point: the point, or an (x, y) tuple in the index's spatial reference
+        :param as_geometries: `True` to return geometries instead of indexes
+        :return: the (sorted) indexes of the entries, or the geometries
+        """
+        x, y = self._to_bounds(point)[0:2] if isinstance(point, Geometry) else point[0:2]
+        return self.query((x, y, x, y), as_geometries=as_geometries)
+
+    def nearest(self,
+                point: Point or Tuple[float, float],
+                k: int = 1,
+                as_geometries: bool = False) -> Tuple[np.ndarray or List[Geometry], np.ndarray]:
+        """
+        Find the entries nearest to a point.  If the index was built with geometries, distances are measured to the
+        geometries themselves, otherwise they're measured to the entries' envelopes.
+
+        :param point: the point, or an (x, y) tuple in the index's spatial reference
+        :param k: the number of neighbors to find
+        :param as_geometries: `True` to return geometries instead of indexes
+        :return: the indexes of the nearest entries (or the geometries) ordered by distance, along with the distances
+        """
+        x, y = self._to_bounds(point)[0:2] if isinstance(point, Geometry) else point[0:2]
+        exact = self._geometries is not None
+        query_shape = ShapelyPoint(x, y) if exact else None
+        found: List[Tuple[int, float]] = []
+        # An empty point isn't near anything.
+        if len(self._levels) != 0 and math.isfinite(x) and math.isfinite(y):
+            # The heap holds (distance, kind, level, position) where kind is 0 for a node, 1 for an entry we've only
+            # measured by its envelope, and 2 for an entry we've measured exactly.
+            top = self._levels[-1][0]
+            heap = [(float(d), 0, len(self._levels) - 1, i) for i, d in enumerate(_min_distances(top, x, y))]
+            heapq.heapify(heap)
+            while len(heap) != 0 and len(found) < k:
+                distance, kind, level, position = heapq.heappop(heap)
+                if kind == 0:
+                    _, starts, ends = self._levels[level]
+                    children = np.arange(starts[position], ends[position], dtype=np.int64)
+                    below = self._levels[level - 1][0] if level > 0 else self._entries
+                    for child, d in zip(children, _min_distances(below[children], x, y)):
+                        heapq.heappush(heap, (float(d), 0 if level > 0 else 1, level - 1, int(child)))
+                elif kind == 1 and exact:
+                    geometry = self._geometries[int(self._order[position])]
+                    d = geometry.transform(self._spatial_reference).shapely_geometry.distance(query_shape)
+                    heapq.heappush(heap, (float(d), 2, level, position))
+                else:
+                    found.append((int(self._order[position]), distance))
+        indexes = np.array([i for i, _ in found], dtype=np.int64)
+        distances = np.array([d for _, d in found], dtype=np.float64)
+        return (indexes if not as_geometries else self._to_geometries(indexes)), distances
+
+    def save(self, path: str):
+        """
+        Save the index to a file (so it can be stored alongside the data).  The geometries aren't saved.
+
+        :param path: the path to the file
+        """
+        arrays = {
+            'srid': np.array([self._spatial_reference.srid], dtype=np.int64),
+            'node_capacity': np.array([self._node_capacity], dtype=np.int64),
+            'size': np.array([self._size], dtype=np.int64),
+            'order': self._order,
+            'entries': self._entries
+        }
+        for i, (nodes, starts, ends) in enumerate(self._levels):
+            arrays['nodes_{i}'.format(i=i)] = nodes
+            arrays['starts_{i}'.format(i=i)] = starts
+            arrays['ends_{i}'.format(i=i)] = ends
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @staticmethod
+    def load(path: str, geometries: Sequence[Geometry] or GeometryArray = None) -> 'SpatialIndex':
+        """
+        Load an index from a file.
+
+        :param path: the path to the file
+        :param geometries: the geometries that were indexed (if you want the index to be able to return geometries)
+        :return: the index
+        """
+        with np.load(path) as f:
+            index: SpatialIndex = SpatialIndex.__new__(SpatialIndex)
+            index._spatial_reference = SpatialReference.from_srid(int(f['srid'][0]))
+            index._geometries = geometries
+            index._node_capacity = int(f['node_capacity'][0])
+            index._order = f['order']
+            index._entries = f['entries']
+            index._size = int(f['size'][0]) if 'size' in f.files else len(index._order)
+            index._levels = []
+            while 'nodes_{i}'.format(i=len(index._levels)) in f.files:
+                i = len(index._levels)
+                index._levels.append((f['nodes_{i}'.format(i=i)],
+                                      f['starts_{i}'.format(i=i)],
+                                      f['ends_{i}'.format(i=i)]))
+        return index
+
+    @staticmethod
+    def from_envelopes(envelopes: np.ndarray,
+                       spatial_reference: SpatialReference or int,
+                       node_capacity: int = 16) -> 'SpatialIndex':
+        """
+        Build an index from an array of envelopes.
+
+        :param envelopes: an (N, 4) array in which each row is (min_x, min_y, max_x, max_y)
+        :param spatial_reference: the spatial reference of the envelopes
+        :param node_capacity: the maximum number of entries in each node of the tree
+        :return: the index
+        """
+        return SpatialIndex(envelopes=envelopes, spatial_reference=spatial_reference, node_capacity=node_capacity)
+
+    @staticmethod
+    def from_geometries(geometries: Sequence[Geometry] or GeometryArray,
+                        spatial_reference: SpatialReference or int = None,
+                        transform: bool = False,
+                        node_capacity: int = 16) -> 'SpatialIndex':
+        """
+        Build an index from a collection of geometries.
+
+        :param geometries: the geometries (or a geometry array)
+        :param spatial_reference: the index's spatial reference (If none is supplied, the spatial reference of the
+            first geometry is used.)
+        :param transform: `True` to transform geometries that aren't in the index's spatial reference, or `False` to
+            raise an exception if any such geometries are found
+        :param node_capacity: the maximum number of entries in each node of the tree
+        :return: the index
+        :raises SpatialReferenceException: if a geometry isn't in the index's spatial reference and `transform` is
+            `False`
+        """
+        sr = spatial_reference
+        if sr is not None and not isinstance(sr, SpatialReference):
+            sr = SpatialReference.from_srid(srid=sr)
+        # A geometry array already knows the envelopes of its geometries.
+        if isinstance(geometries, GeometryArray):
+            if sr is not None and sr.srid != geometries.spatial_reference.srid:
+                raise SpatialReferenceException('The geometry array is not in the index spatial reference.')
+            return SpatialIndex(envelopes=geometries.envelopes(), spatial_reference=geometries.spatial_reference,
+                                geometries=geometries, node_capacity=node_capacity)
+        _geometries = list(geometries)
+        if sr is None:
+            if len(_geometries) == 0:
+                raise SpatialReferenceException('A spatial reference is required to index an empty collection.')
+            sr = _geometries[0].spatial_reference
+        if any(g.spatial_reference.srid != sr.srid for g in _geometries):
+            if not transform:
+                raise SpatialReferenceException('All of the geometries must be in the index spatial reference.')
+            _geometries = [g.transform(spatial_reference=sr) for g in _geometries]
+        # (Empty geometries have no bounds, so they get NaN envelopes and aren't indexed.)
+        envelopes = np.array([g.shapely_geometry.bounds or (np.nan,) * 4 for g in _geometries],
+                             dtype=np.float64).reshape(-1, 4)
+        return SpatialIndex(envelopes=envelopes, spatial_reference=sr, geometries=_geometries,
+                            node_capacity=node_capacity)
@@ -0,0 +1,871 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.io
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Got shapefiles?  GeoPackages?  Read them a chunk at a time.
+"""
+
+from .arrays import GeometryArray, _conform, _geometry_wkb
+from .errors import DjioException
+from .geojson import Feature
+from .geometry import (EnvelopeTuple, Geometry, GeometryType, SpatialReference, SpatialReferenceException,
+                       _srid_from_ogr_srs)
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+import itertools
+import numpy as np
+import os
+from osgeo import ogr
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class DataSourceException(DjioException):
+    """
+    Raised when something goes wrong with an OGR data source.
+    """
+
+
+class FeatureChunk(NamedTuple):
+    """
+    A feature chunk is a block of consecutive features from a layer, kept in columns.
+    """
+    fids: np.ndarray  #: the feature IDs
+    geometries: List[Optional[Geometry]] or GeometryArray  #: the geometries
+    attributes: Dict[str, List[Any]]  #: the values of each attribute field
+
+
+def _open_layer(path: str, layer: str or int = 0, update: bool = False) -> Tuple[ogr.DataSource, ogr.Layer]:
+    """
+    Open a layer in an OGR data source.
+
+    :param path: the path to the data source
+    :param layer: the name or index of the layer
+    :param update: `True` to open the data source for writing
+    :return: the data source and the layer (Keep a reference to the data source for as long as you use the layer.)
+    :raises DataSourceException: if the data source (or the layer) can't be opened
+    """
+    datasource = ogr.Open(path, 1 if update else 0)
+    if datasource is None:
+        raise DataSourceException('The data source could not be opened: {path}'.format(path=path))
+    _layer = datasource.GetLayerByName(layer) if isinstance(layer, str) else datasource.GetLayerByIndex(layer)
+    if _layer is None:
+        raise DataSourceException('The data source has no layer {layer}: {path}'.format(layer=layer, path=path))
+    return datasource, _layer
+
+
+def _layer_spatial_reference(layer: ogr.Layer,
+                             spatial_reference: SpatialReference or int = None) -> SpatialReference:
+    """
+    Resolve the spatial reference of a layer's geometries.  (This follows the lead of
+    :py:func:`djio.geometry.Geometry.from_ogr`:  a spatial reference you supply wins, otherwise the layer's spatial
+    reference is used.)
+
+    :param layer: the layer
+    :param spatial_reference: the spatial reference (or SRID) supplied by the caller
+    :return: the spatial reference
+    :raises SpatialReferenceException: if the layer has no spatial reference and none is supplied
+    """
+    if spatial_reference is not None:
+        return (spatial_reference if isinstance(spatial_reference, SpatialReference)
+                else SpatialReference.from_srid(srid=spatial_reference))
+    ogr_srs = layer.GetSpatialRef()
+    if ogr_srs is None:
+        raise SpatialReferenceException('The layer has no spatial reference, and no SRID was supplied.')
+    return SpatialReference.from_srid(srid=_srid_from_ogr_srs(ogr_srs))
+
+
+def _ogr_wkb(ogr_geom: Optional[ogr.Geometry]) -> Optional[bytes]:
+    """
+    Get the (little-endian) well-known binary of an OGR geometry in a form djio can read.  (Curves are approximated
+    with line segments and M values are dropped.)
+
+    :param ogr_geom: the OGR geometry
+    :return: the WKB (or `None` if there is no geometry)
+    """
+    if ogr_geom is None:
+        return None
+    if ogr_geom.HasCurveGeometry():
+        ogr_geom = ogr_geom.GetLinearGeometry()
+    if ogr_geom.IsMeasured():
+        ogr_geom.SetMeasured(False)
+    return bytes(ogr_geom.ExportToWkb(ogr.wkbNDR))
+
+
+def _set_spatial_filter(layer: ogr.Layer,
+                        spatial_filter: Geometry or EnvelopeTuple or Tuple[float, float, float, float],
+                        spatial_reference: SpatialReference):
+    """
+    Set a layer's spatial filter so OGR only returns the features that intersect it.
+
+    :param layer: the layer
+    :param spatial_filter: a geometry, an envelope tuple, or a (min_x, min_y, max_x, max_y) tuple in the layer's
+        spatial reference
+    :param spatial_reference: the layer's spatial reference
+    """
+    if isinstance(spatial_filter, EnvelopeTuple):
+        if spatial_filter.srid is not None and spatial_filter.srid != spatial_reference.srid:
+            spatial_filter = spatial_filter.to_envelope().transform(spatial_reference).envelope_tuple
+        layer.SetSpatialFilterRect(spatial_filter.min_x, spatial_filter.min_y,
+                                   spatial_filter.max_x, spatial_filter.max_y)
+    elif isinstance(spatial_filter, Geometry):
+        if spatial_filter.spatial_reference.srid != spatial_reference.srid:
+            spatial_filter = spatial_filter.transform(spatial_reference)
+        layer.SetSpatialFilter(spatial_filter._get_ogr_geometry())
+    else:
+        min_x, min_y, max_x, max_y = spatial_filter
+        layer.SetSpatialFilterRect(min_x, min_y, max_x, max_y)
+
+
+def _chunk(fids: List[int],
+           wkbs: List[Optional[bytes]],
+           values: List[List[Any]],
+           field_names: List[str],
+           spatial_reference: SpatialReference,
+           columnar: bool) -> FeatureChunk:
+    """
+    Assemble a feature chunk.
+
+    :param fids: the feature IDs
+    :param wkbs: the well-known binary of each feature's geometry (or `None`)
+    :param values: the values of each field
+    :param field_names: the field names
+    :param spatial_reference: the spatial reference of the geometries
+    :param columnar: `True` for a :py:class:`djio.arrays.GeometryArray` of geometries (Features without geometries
+        are left out.)
+    :return: the feature chunk
+    """
+    present = [wkb is not None for wkb in wkbs]
+    if columnar:
+        if not all(present):
+            # Geometry arrays don't hold nulls, so the features without geometries are left out.
+            fids = [fid for fid, p in zip(fids, present) if p]
+            values = [[value for value, p in zip(column, present) if p] for column in values]
+            wkbs = [wkb for wkb in wkbs if wkb is not None]
+        geometries = GeometryArray.from_wkb(wkbs=wkbs, spatial_reference=spatial_reference)
+    else:
+        decoded = iter(Geometry.from_wkb_many(wkbs=(wkb for wkb in wkbs if wkb is not None),
+                                              spatial_reference=spatial_reference))
+        geometries = [next(decoded) if p else None for p in present]
+    return FeatureChunk(fids=np.asarray(fids, dtype=np.int64),
+                        geometries=geometries,
+                        attributes=dict(zip(field_names, values)))
+
+
+class OgrReader(object):
+    """
+    An OGR reader reads the features in an OGR layer (a shapefile, a GeoPackage table, and so on) in chunks.  The
+    layer's spatial reference is resolved once, the geometries are decoded a chunk at a time (without asking OGR for
+    spatial references feature by feature), and filters are handed to OGR so features that aren't wanted are never
+    read.  (Use it as a context manager, or remember to call :py:func:`OgrReader.close`.)
+    """
+
+    def __init__(self,
+                 path: str,
+                 layer: str or int = 0,
+                 spatial_reference: SpatialReference or int = None,
+                 fields: Iterable[str] = None,
+                 spatial_filter: Geometry or EnvelopeTuple or Tuple[float, float, float, float] = None,
+                 attribute_filter: str = None,
+                 chunk_size: int = 10000):
+        """
+
+        :param path: the path to the data source
+        :param layer: the name or index of the layer
+        :param spatial_reference: the spatial reference of the layer's geometries (If you don't supply one, the
+            layer's spatial reference is used.)
+        :param fields: the names of the attribute fields to read (If you don't supply any, all of them are read.)
+        :param spatial_filter: only read features that intersect this geometry or envelope
+        :param attribute_filter: only read features that satisfy this (OGR SQL) `WHERE` clause
+        :param chunk_size: the largest number of features in a chunk
+        :raises DataSourceException: if the data source or layer can't be opened, or a filter isn't valid
+        """
+        if chunk_size < 1:
+            raise ValueError('The chunk size must be at least one (1).')
+        self._path: str = path
+        self._datasource, self._layer = _open_layer(path, layer)
+        self._spatial_reference: SpatialReference = _layer_spatial_reference(self._layer, spatial_reference)
+        self._chunk_size: int = chunk_size
+        # Figure out which fields we're reading.
+        layer_defn = self._layer.GetLayerDefn()
+        layer_fields = [layer_defn.GetFieldDefn(i).GetName() for i in range(layer_defn.GetFieldCount())]
+        self._field_names: List[str] = list(fields) if fields is not None else layer_fields
+        unknown = [name for name in self._field_names if name not in layer_fields]
+        if len(unknown) != 0:
+            raise DataSourceException('The layer has no fields named {names}.'.format(names=', '.join(unknown)))
+        self._field_indexes: List[int] = [layer_fields.index(name) for name in self._field_names]
+        if fields is not None:
+            # OGR doesn't need to bother with the fields we don't want.
+            self._layer.SetIgnoredFields([name for name in layer_fields if name not in self._field_names] +
+                                         ['OGR_STYLE'])
+        # Push the filters down to OGR.
+        if spatial_filter is not None:
+            _set_spatial_filter(self._layer, spatial_filter, self._spatial_reference)
+        if attribute_filter is not None and self._layer.SetAttributeFilter(attribute_filter) != 0:
+            raise DataSourceException('The attribute filter is not valid: {filter}'.format(filter=attribute_filter))
+
+    def __enter__(self) -> 'OgrReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Get the number of features the reader will read (after filtering).
+
+        :return: the number of features
+        """
+        return self._layer.GetFeatureCount()
+
+    def __iter__(self) -> Iterator[Feature]:
+        """
+        Read the features one at a time.  (They're still decoded a chunk at a time.)
+
+        :return: an iteration of features
+        """
+        for chunk in self.iter_chunks():
+            for i, geometry in enumerate(chunk.geometries):
+                yield Feature(geometry=geometry,
+                              properties={name: values[i] for name, values in chunk.attributes.items()},
+                              id=int(chunk.fids[i]))
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path to the data source.
+
+        :return: the path
+        """
+        return self._path
+
+    @property
+    def spatial_reference(self) -> SpatialReference:
+        """
+        Get the spatial reference of the layer's geometries.
+
+        :return: the spatial reference
+        """
+        return self._spatial_reference
+
+    @property
+    def field_names(self) -> List[str]:
+        """
+        Get the names of the attribute fields the reader reads.
+
+        :return: the field names
+        """
+        return list(self._field_names)
+
+    def iter_chunks(self, columnar: bool = False) -> Iterator[FeatureChunk]:
+        """
+        Read the features in chunks.
+
+        :param columnar: `True` to get each chunk's geometries as a :py:class:`djio.arrays.GeometryArray` (which is
+            decoded straight from the WKB without creating Shapely geometries) instead of a list of djio geometries
+            (Features without geometries are left out of columnar chunks.)
+        :return: an iteration of feature chunks
+        :raises DataSourceException: if the reader has been closed
+        """
+        return self._iter_chunks(columnar=columnar)
+
+    def _iter_chunks(self,
+                     columnar: bool = False,
+                     accept: Callable[[Optional[ogr.Geometry]], bool] = None) -> Iterator[FeatureChunk]:
+        """
+        Read the features in chunks.
+
+        :param columnar: `True` to get each chunk's geometries as a :py:class:`djio.arrays.GeometryArray`
+        :param accept: a function that decides (from its OGR geometry) whether or not a feature belongs in the
+            results (If you don't supply one, every feature OGR returns does.)
+        :return: an iteration of feature chunks
+        :raises DataSourceException: if the reader has been closed
+        """
+        layer = self._layer
+        if layer is None:
+            raise DataSourceException('The reader has been closed.')
+        field_indexes, chunk_size = self._field_indexes, self._chunk_size
+        layer.ResetReading()
+        while True:
+            fids: List[int] = []
+            wkbs: List[Optional[bytes]] = []
+            values: List[List[Any]] = [[] for _ in field_indexes]
+            exhausted = True
+            for feature in iter(layer.GetNextFeature, None):
+                ogr_geom = feature.GetGeometryRef()
+                if accept is not None and not accept(ogr_geom):
+                    continue
+                fids.append(feature.GetFID())
+                wkbs.append(_ogr_wkb(ogr_geom))
+                for column, index in zip(values, field_indexes):
+                    column.append(feature.GetField(index))
+                if len(fids) == chunk_size:
+                    exhausted = False
+                    break
+            if len(fids) != 0:
+                yield _chunk(fids, wkbs, values, self._field_names, self._spatial_reference, columnar)
+            if exhausted:
+                return
+
+    def close(self):
+        """
+        Close the data source.
+        """
+        self._layer = None
+        self._datasource = None
+
+
+def read_chunks(path: str,
+                layer: str or int = 0,
+                columnar: bool = False,
+                **kwargs) -> Iterator[FeatureChunk]:
+    """
+    Read the features in an OGR layer in chunks.
+
+    :param path: the path to the data source
+    :param layer: the name or index of the layer
+    :param columnar: `True` to get each chunk's geometries as a :py:class:`djio.arrays.GeometryArray`
+    :param kwargs: the other arguments accepted by :py:class:`OgrReader`
+    :return: an iteration of feature chunks
+    """
+    with OgrReader(path, layer=layer, **kwargs) as reader:
+        yield from reader.iter_chunks(columnar=columnar)
+
+
+def partition_fids(path: str, layer: str or int = 0, partitions: int = 4) -> List[Tuple[int, int]]:
+    """
+    Split the features in an OGR layer into ranges of feature IDs (FIDs).  The ranges split the span of FIDs evenly,
+    so they hold about the same number of features when the FIDs are dense.  (Layers without a FID column, like
+    shapefiles, number their features from zero.)
+
+    :param path: the path to the data source
+    :param layer: the name or index of the layer
+    :param partitions: the number of partitions
+    :return: the (first, last + 1) FID of each partition
+    """
+    datasource, _layer = _open_layer(path, layer)
+    fid_column = _layer.GetFIDColumn()
+    if fid_column:
+        result = datasource.ExecuteSQL('SELECT MIN("{fid}"), MAX("{fid}") FROM "{layer}"'.format(
+            fid=fid_column, layer=_layer.GetName()))
+        try:
+            feature = result.GetNextFeature()
+            first, last = feature.GetField(0), feature.GetField(1)
+        finally:
+            datasource.ReleaseResultSet(result)
+    else:
+        first, last = 0, _layer.GetFeatureCount() - 1
+    if first is None or last is None or last < first:
+        return []
+    edges = np.unique(np.linspace(int(first), int(last) + 1, max(partitions, 1) + 1).round().astype(np.int64))
+    return [(int(start), int(end)) for start, end in zip(edges[:-1], edges[1:])]
+
+
+def partition_extent(path: str, layer: str or int = 0, partitions: int = 4) -> List[EnvelopeTuple]:
+    """
+    Split the extent of an OGR layer into a grid of tiles (with about as many columns as rows).
+
+    :param path: the path to the data source
+    :param layer: the name or index of the layer
+    :param partitions: the (smallest) number of partitions
+    :return: the tiles, row by row (The SRID of each tile is `None`:  the tiles are in the layer's spatial reference.)
+    """
+    _, _layer = _open_layer(path, layer)
+    if _layer.GetFeatureCount() == 0:
+        return []
+    min_x, max_x, min_y, max_y = _layer.GetExtent()
+    columns = max(int(np.ceil(np.sqrt(max(partitions, 1)))), 1)
+    rows = int(np.ceil(max(partitions, 1) / columns))
+    xs = np.linspace(min_x, max_x, columns + 1)
+    ys = np.linspace(min_y, max_y, rows + 1)
+    return [
+        EnvelopeTuple(min_x=float(xs[c]), min_y=float(ys[r]), max_x=float(xs[c + 1]), max_y=float(ys[r + 1]),
+                      srid=None)
+        for r in range(rows) for c in range(columns)
+    ]
+
+
+def _first_vertex(ogr_geom: ogr.Geometry) -> Optional[Tuple[float, float]]:
+    """
+    Get the first vertex of an OGR geometry (which, unlike the corners of its envelope, is always on the geometry).
+
+    :param ogr_geom: the OGR geometry
+    :return: the (x, y) coordinates of the first vertex (or `None` if the geometry is empty)
+    """
+    if ogr_geom.GetGeometryCount() == 0:
+        return (ogr_geom.GetX(0), ogr_geom.GetY(0)) if ogr_geom.GetPointCount() != 0 else None
+    # Polygons and collections keep their vertices in their rings and parts.  (The first ones may be empty.)
+    for i in range(ogr_geom.GetGeometryCount()):
+        vertex = _first_vertex(ogr_geom.GetGeometryRef(i))
+        if vertex is not None:
+            return vertex
+    return None
+
+
+def _tile_owner(tile: EnvelopeTuple, extent: Tuple[float, float]) -> Callable[[Optional[ogr.Geometry]], bool]:
+    """
+    Get a function that decides whether or not a feature belongs to a tile.  A feature belongs to the tile that holds
+    its first vertex, so features that cross tiles are only read once.  (OGR's spatial filter tests the geometry
+    itself, so the tile that owns a feature has to be one the geometry actually touches.  The corners of its envelope
+    won't do.)  Tiles hold their lower and left edges, and the tiles along the top and right of the grid hold their
+    upper and right edges too.
+
+    :param tile: the tile
+    :param extent: the largest X and Y values of the whole grid
+    :return: the function
+    """
+    max_x, max_y = extent
+    right_closed, top_closed = tile.max_x >= max_x, tile.max_y >= max_y
+
+    def owns(ogr_geom: Optional[ogr.Geometry]) -> bool:
+        vertex = _first_vertex(ogr_geom) if ogr_geom is not None else None
+        if vertex is None:
+            return False
+        x, y = vertex
+        return (tile.min_x <= x and (x < tile.max_x or (right_closed and x <= tile.max_x)) and
+                tile.min_y <= y and (y < tile.max_y or (top_closed and y <= tile.max_y)))
+    return owns
+
+
+def _read_partition(path: str,
+                    layer: str or int,
+                    partition: Tuple[int, int] or EnvelopeTuple,
+                    extent: Optional[Tuple[float, float]],
+                    srid: int,
+                    fields: Optional[List[str]],
+                    attribute_filter: Optional[str],
+                    chunk_size: int,
+                    columnar: bool) -> List[FeatureChunk]:
+    """
+    Read the features in a partition of an OGR layer.  (This is the unit of work handed to worker processes, each of
+    which opens its own data source.)
+
+    :param path: the path to the data source
+    :param layer: the name or index of the layer
+    :param partition: a (first, last + 1) range of FIDs, or a tile
+    :param extent: the largest X and Y values of the grid of tiles (if the partition is a tile)
+    :param srid: the spatial reference ID of the layer's geometries
+    :param fields: the names of the attribute fields to read
+    :param attribute_filter: an (OGR SQL) `WHERE` clause
+    :param chunk_size: the largest number of features in a chunk
+    :param columnar: `True` to get each chunk's geometries as a :py:class:`djio.arrays.GeometryArray`
+    :return: the partition's feature chunks
+    """
+    accept = None
+    spatial_filter = None
+    if isinstance(partition, EnvelopeTuple):
+        spatial_filter = partition
+        accept = _tile_owner(partition, extent)
+    else:
+        datasource, _layer = _open_layer(path, layer)
+        fid_column = _layer.GetFIDColumn()
+        fid = '"{fid}"'.format(fid=fid_column) if fid_column else 'FID'
+        datasource = None
+        fid_filter = '{fid} >= {first} AND {fid} < {end}'.format(fid=fid, first=partition[0], end=partition[1])
+        attribute_filter = ('({filter}) AND ({fids})'.format(filter=attribute_filter, fids=fid_filter)
+                            if attribute_filter else fid_filter)
+    with OgrReader(path, layer=layer, spatial_reference=srid, fields=fields, spatial_filter=spatial_filter,
+                   attribute_filter=attribute_filter, chunk_size=chunk_size) as reader:
+        return list(reader._iter_chunks(columnar=columnar, accept=accept))
+
+
+def read_parallel(path: str,
+                  layer: str or int = 0,
+                  processes: int = None,
+                  partition_by: str = 'fid',
+                  partitions: int = None,
+                  spatial_reference: SpatialReference or int = None,
+                  fields: Iterable[str] = None,
+                  attribute_filter: str = None,
+                  chunk_size: int = 10000,
+                  columnar: bool = True) -> Iterator[FeatureChunk]:
+    """
+    Read the features in an OGR layer with a pool of worker processes.  The layer is split into partitions (ranges of
+    FIDs, or tiles of the layer's extent) and each worker opens its own data source to read the partitions it's
+    handed.  The chunks come back in partition order (and, within each partition, in the order OGR reads them) no
+    matter how many workers there are, and only a few partitions are in flight at a time.
+
+    :param path: the path to the data source
+    :param layer: the name or index of the layer
+    :param processes: the number of worker processes (If you don't supply a number, the partitions are read in this
+        process.)
+    :param partition_by: 'fid' to partition by ranges of feature IDs or 'extent' to partition by tiles (Features that
+        have no geometry are only read when partitioning by FID.)
+    :param partitions: the number of partitions (If you don't supply a number, you'll get four per process.)
+    :param spatial_reference: the spatial reference of the layer's geometries (If you don't supply one, the layer's
+        spatial reference is used.)
+    :param fields: the names of the attribute fields to read (If you don't supply any, all of them are read.)
+    :param attribute_filter: only read features that satisfy this (OGR SQL) `WHERE` clause
+    :param chunk_size: the largest number of features in a chunk
+    :param columnar: `True` to get each chunk's geometries as a :py:class:`djio.arrays.GeometryArray`
+    :return: an iteration of feature chunks
+    :raises ValueError: if the partitioning scheme isn't 'fid' or 'extent'
+    """
+    if partition_by not in ('fid', 'extent'):
+        raise ValueError("Layers are partitioned by 'fid' or 'extent'.")
+    # Resolve the spatial reference once, so the workers don't have to.
+    datasource, _layer = _open_layer(path, layer)
+    srid = _layer_spatial_reference(_layer, spatial_reference).srid
+    extent = None
+    if partition_by == 'extent' and _layer.GetFeatureCount() != 0:
+        _, max_x, _, max_y = _layer.GetExtent()
+        extent = (max_x, max_y)
+    datasource = None
+    _partitions = partitions if partitions is not None else 4 * max(processes or 1, 1)
+    parts = (partition_fids(path, layer, _partitions) if partition_by == 'fid'
+             else partition_extent(path, layer, _partitions))
+    _fields = list(fields) if fields is not None else None
+    args = (extent, srid, _fields, attribute_filter, chunk_size, columnar)
+    if processes is None or processes <= 1 or len(parts) <= 1:
+        for part in parts:
+            yield from _read_partition(path, layer, part, *args)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # We keep a couple of partitions per worker in flight and hand the results back in order.
+        pending: Deque[Future] = deque()
+        remaining = iter(parts)
+        for part in itertools.islice(remaining, 2 * processes):
+            pending.append(executor.submit(_read_partition, path, layer, part, *args))
+        while len(pending) != 0:
+            chunks = pending.popleft().result()
+            for part in itertools.islice(remaining, 1):
+                pending.append(executor.submit(_read_partition, path, layer, part, *args))
+            yield from chunks
+
+
+_drivers: Dict[str, str] = {
+    '.gpkg': 'GPKG',
+    '.shp': 'ESRI Shapefile',
+    '.geojson': 'GeoJSON',
+    '.json': 'GeoJSON',
+    '.fgb': 'FlatGeobuf',
+    '.sqlite': 'SQLite',
+    '.gml': 'GML',
+    '.csv': 'CSV'
+}  #: a mapping of file extensions to the names of the OGR drivers that write them
+
+
+def _ogr_geometry_type(geometry_type: GeometryType, has_z: bool = False) -> int:
+    """
+    Get the OGR geometry type that corresponds to a djio geometry type.
+
+    :param geometry_type: the djio geometry type
+    :param has_z: `True` if the geometries have Z values
+    :return: the OGR geometry type
+    """
+    ogr_type = {
+        GeometryType.POINT: ogr.wkbPoint,
+        GeometryType.POLYLINE: ogr.wkbLineString,
+        GeometryType.POLYGON: ogr.wkbPolygon,
+        GeometryType.MULTIPOINT: ogr.wkbMultiPoint,
+        GeometryType.MULTIPOLYLINE: ogr.wkbMultiLineString,
+        GeometryType.MULTIPOLYGON: ogr.wkbMultiPolygon,
+        GeometryType.COLLECTION: ogr.wkbGeometryCollection
+    }.get(geometry_type, ogr.wkbUnknown)
+    return ogr.GT_SetZ(ogr_type) if has_z else ogr_type
+
+
+def _ogr_field_type(value: Any) -> Tuple[int, int]:
+    """
+    Figure out the OGR field type (and subtype) that fits a value.
+
+    :param value: the value
+    :return: the OGR field type and subtype
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return ogr.OFTInteger, ogr.OFSTBoolean
+    elif isinstance(value, (int, np.integer)):
+        return ogr.OFTInteger64, ogr.OFSTNone
+    elif isinstance(value, (float, np.floating)):
+        return ogr.OFTReal, ogr.OFSTNone
+    elif isinstance(value, (bytes, bytearray)):
+        return ogr.OFTBinary, ogr.OFSTNone
+    elif isinstance(value, datetime):
+        return ogr.OFTDateTime, ogr.OFSTNone
+    elif isinstance(value, date):
+        return ogr.OFTDate, ogr.OFSTNone
+    return ogr.OFTString, ogr.OFSTNone
+
+
+class OgrWriter(object):
+    """
+    An OGR writer writes features to a new OGR layer (a GeoPackage table, a shapefile, and so on) in bulk.  The layer's
+    spatial reference is set once, a single OGR feature is reused for every row, the geometries are handed to OGR as
+    WKB written straight from their coordinates, and the rows are committed in batches so that formats backed by
+    databases (like GeoPackage) don't pay for a transaction per feature.  (Use it as a context manager, or remember to
+    call :py:func:`OgrWriter.close`.  If the block exits with an exception, the batch that was in progress is rolled
+    back.)
+    """
+
+    def __init__(self,
+                 path: str,
+                 layer: str = None,
+                 spatial_reference: SpatialReference or int = None,
+                 geometry_type: GeometryType = None,
+                 fields: Dict[str, int] = None,
+                 driver: str = None,
+                 batch_size: int = 10000,
+                 options: Iterable[str] = None):
+        """
+
+        :param path: the path to the data source (If it already exists, the layer is added to it.)
+        :param layer: the name of the layer (If you don't supply one, the layer is named after the file.)
+        :param spatial_reference: the spatial reference of the layer (If you don't supply one, the layer takes the
+            spatial reference of the first geometry.  Geometries in other spatial references are transformed.)
+        :param geometry_type: the layer's geometry type (If you don't supply one, the layer takes the type of the
+            first geometry.)
+        :param fields: the OGR field type of each attribute field (If you don't supply them, the fields and their
+            types are taken from the first feature's properties.)
+        :param driver: the name of the OGR driver (If you don't supply one, it's picked by the file's extension.)
+        :param batch_size: the number of features written in each transaction
+        :param options: layer creation options (like `SPATIAL_INDEX=NO`)
+        :raises DataSourceException: if the data source can't be created
+        """
+        if batch_size < 1:
+            raise ValueError('The batch size must be at least one (1).')
+        extension = os.path.splitext(path)[1].lower()
+        _driver = driver if driver is not None else _drivers.get(extension)
+        if _driver is None:
+            raise DataSourceException('There is no driver for {extension} files.'.format(extension=extension))
+        self._path: str = path
+        ogr_driver = ogr.GetDriverByName(_driver)
+        if ogr_driver is None:
+            raise DataSourceException('The OGR driver is not available: {driver}'.format(driver=_driver))
+        self._datasource: ogr.DataSource = (ogr.Open(path, 1) if os.path.exists(path)
+                                            else ogr_driver.CreateDataSource(path))
+        if self._datasource is None:
+            raise DataSourceException('The data source could not be created: {path}'.format(path=path))
+        self._layer_name: str = layer if layer is not None else os.path.splitext(os.path.basename(path))[0]
+        self._spatial_reference: SpatialReference or None = (
+            spatial_reference if spatial_reference is None or isinstance(spatial_reference, SpatialReference)
+            else SpatialReference.from_srid(srid=spatial_reference))
+        self._geometry_type: GeometryType or None = geometry_type
+        self._fields: Dict[str, int] or None = dict(fields) if fields is not None else None
+        self._batch_size: int = batch_size
+        self._options: List[str] = list(options) if options is not None else []
+        # The layer (and the feature we reuse) are created when the first feature arrives.
+        self._layer: ogr.Layer or None = None
+        self._feature: ogr.Feature or None = None
+        self._field_indexes: Dict[str, int] = {}
+        self._transactions: bool = False  #: Does the layer support transactions?
+        self._pending: int = 0  #: the number of features written in the current transaction
+        self._count: int = 0  #: the number of features written
+
+    def __enter__(self) -> 'OgrWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.rollback()
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path to the data source.
+
+        :return: the path
+        """
+        return self._path
+
+    @property
+    def spatial_reference(self) -> SpatialReference or None:
+        """
+        Get the spatial reference of the layer.
+
+        :return: the spatial reference (or `None` if it isn't known yet)
+        """
+        return self._spatial_reference
+
+    def _create_layer(self,
+                      spatial_reference: SpatialReference,
+                      geometry_type: GeometryType,
+                      has_z: bool,
+                      properties: Optional[Dict[str, Any]]):
+        """
+        Create the layer (and the feature that's reused for every row).
+
+        :param spatial_reference: the spatial reference of the first geometry
+        :param geometry_type: the type of the first geometry
+        :param has_z: `True` if the first geometry has Z values
+        :param properties: the first feature's properties
+        """
+        if self._spatial_reference is None:
+            self._spatial_reference = spatial_reference
+        if self._geometry_type is None:
+            self._geometry_type = geometry_type
+        layer = self._datasource.CreateLayer(self._layer_name,
+                                             srs=self._spatial_reference.ogr_sr,
+                                             geom_type=_ogr_geometry_type(self._geometry_type, has_z),
+                                             options=self._options)
+        if layer is None:
+            raise DataSourceException('The layer could not be created: {layer}'.format(layer=self._layer_name))
+        fields = self._fields if self._fields is not None else {
+            name: _ogr_field_type(value) for name, value in (properties or {}).items()
+        }
+        for name, field_type in fields.items():
+            field_type, subtype = field_type if isinstance(field_type, tuple) else (field_type, ogr.OFSTNone)
+            field_defn = ogr.FieldDefn(name, field_type)
+            field_defn.SetSubType(subtype)
+            if layer.CreateField(field_defn) != 0:
+                raise DataSourceException('The field could not be created: {name}'.format(name=name))
+        layer_defn = layer.GetLayerDefn()
+        # (Some drivers launder field names, so we keep track of the fields by position rather than by the names the
+        # layer ends up with.)
+        self._field_indexes = {name: i for i, name in enumerate(fields.keys()) if i < layer_defn.GetFieldCount()}
+        self._layer = layer
+        self._feature = ogr.Feature(layer_defn)
+        self._transactions = bool(layer.TestCapability(ogr.OLCTransactions))
+
+    def _set_fields(self, properties: Optional[Dict[str, Any]]):
+        """
+        Set the attribute values of the reused feature.  (Every field is set, so nothing carries over from the
+        previous row.)
+
+        :param properties: the feature's properties
+        """
+        feature = self._feature
+        _properties = properties or {}
+        for name, index in self._field_indexes.items():
+            value = _properties.get(name)
+            if value is None:
+                feature.SetFieldNull(index)
+            elif isinstance(value, (bytes, bytearray)):
+                feature.SetFieldBinaryFromHexString(index, bytes(value).hex())
+            elif isinstance(value, (datetime, date)):
+                feature.SetField(index, value.isoformat())
+            elif isinstance(value, np.generic):
+                feature.SetField(index, value.item())
+            elif isinstance(value, bool):
+                feature.SetField(index, int(value))
+            else:
+                feature.SetField(index, value)
+
+    def _write_row(self, wkb: Optional[bytes], properties: Optional[Dict[str, Any]]):
+        """
+        Write a single row.
+
+        :param wkb: the geometry (as WKB in the layer's spatial reference)
+        :param properties: the feature's properties
+        """
+        if self._transactions and self._pending == 0:
+            self._layer.StartTransaction()
+        feature = self._feature
+        feature.SetFID(-1)  # Let the layer assign the next feature ID.
+        if wkb is not None:
+            feature.SetGeometryDirectly(ogr.CreateGeometryFromWkb(wkb))
+        else:
+            feature.SetGeometry(None)
+        self._set_fields(properties)
+        if self._layer.CreateFeature(feature) != 0:
+            raise DataSourceException('The feature could not be written.')
+        self._count += 1
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self.commit()
+
+    def write(self, geometry: Optional[Geometry], properties: Dict[str, Any] = None):
+        """
+        Write a feature.
+
+        :param geometry: the feature's geometry (or `None`)
+        :param properties: the feature's properties
+        :raises DataSourceException: if the writer has been closed
+        """
+        if self._datasource is None:
+            raise DataSourceException('The writer has been closed.')
+        if self._layer is None:
+            if geometry is None and (self._spatial_reference is None or self._geometry_type is None):
+                raise DataSourceException("The layer can't be created until the first geometry arrives.")
+            self._create_layer(geometry.spatial_reference if geometry is not None else None,
+                               geometry.geometry_type if geometry is not None else None,
+                               geometry is not None and geometry.coords_array.shape[1] == 3,
+                               properties)
+        if geometry is not None and geometry.spatial_reference.srid != self._spatial_reference.srid:
+            geometry = _conform(geometry, self._spatial_reference)
+        self._write_row(_geometry_wkb(geometry) if geometry is not None else None, properties)
+
+    def write_many(self, features: Iterable[Feature or Geometry]):
+        """
+        Write a number of features.
+
+        :param features: the features (or plain geometries)
+        """
+        for feature in features:
+            if isinstance(feature, Feature):
+                self.write(feature.geometry, properties=feature.properties)
+            else:
+                self.write(feature)
+
+    def write_array(self, array: GeometryArray, attributes: Dict[str, Iterable[Any]] = None):
+        """
+        Write every geometry in a geometry array as a feature.  The geometries are written straight from the array's
+        coordinates (which are transformed, if necessary, all at once) so no djio or Shapely geometries are created.
+
+        :param array: the geometry array
+        :param attributes: the values of each attribute field (one per geometry)
+        :raises DataSourceException: if the writer has been closed
+        """
+        if self._datasource is None:
+            raise DataSourceException('The writer has been closed.')
+        if len(array) == 0:
+            return
+        columns = {
+            name: values if hasattr(values, '__getitem__') else list(values)
+            for name, values in (attributes or {}).items()
+        }
+        if self._layer is None:
+            self._create_layer(array.spatial_reference, GeometryType(int(array.geometry_types[0])),
+                               array.coordinates.shape[1] == 3, {name: values[0] for name, values in columns.items()})
+        for i, wkb in enumerate(array.iter_wkb(spatial_reference=self._spatial_reference)):
+            self._write_row(wkb, {name: values[i] for name, values in columns.items()})
+
+    def write_chunk(self, chunk: FeatureChunk):
+        """
+        Write the features in a feature chunk (like the ones an :py:class:`OgrReader` reads).
+
+        :param chunk: the feature chunk
+        """
+        if isinstance(chunk.geometries, GeometryArray):
+            self.write_array(chunk.geometries, chunk.attributes)
+            return
+        names = list(chunk.attributes.keys())
+        for i, geometry in enumerate(chunk.geometries):
+            self.write(geometry, {name: chunk.attributes[name][i] for name in names})
+
+    def commit(self):
+        """
+        Commit the features written since the last commit.
+        """
+        if self._transactions and self._pending != 0:
+            if self._layer.CommitTransaction() != 0:
+                raise DataSourceException('The transaction could not be committed.')
+        self._pending = 0
+
+    def rollback(self):
+        """
+        Roll back the features written since the last commit.  (This only works for layers that support
+        transactions.)
+        """
+        if self._transactions and self._pending != 0:
+            self._layer.RollbackTransaction()
+            self._count -= self._pending
+        self._pending = 0
+
+    def close(self):
+        """
+        Commit whatever is left and close the data source.
+        """
+        if self._datasource is None:
+            return
+        self.commit()
+        self._datasource.FlushCache()
+        self._feature = None
+        self._layer = None
+        self._datasource = None
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.join
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Which points fall in which polygons?  Which polygons overlap?  Join them and find out.
+"""
+
+from .arrays import GeometryArray, _conform, _point_coordinates
+from .geometry import Point, Polygon, SpatialReference
+from .index import SpatialIndex, _expand_ranges
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from shapely import vectorized
+from shapely.geometry import Polygon as ShapelyPolygon
+from shapely.prepared import prep
+from typing import Iterable, List, Sequence, Tuple
+
+
+_MAX_BLOCK_SIZE: int = 1 << 22  #: the largest number of point/edge pairs we'll test at one time
+_EDGES_PER_BAND: int = 8  #: the (average) number of edges we'd like in each band of a polygon
+_MAX_BANDS: int = 1 << 16  #: the largest number of bands we'll cut a polygon into
+_PREPARE_AFTER_EDGES: int = 4096  #: the number of edges beyond which polygons are tested by a prepared geometry
+
+
+def _rings(polygon: Polygon) -> List[np.ndarray]:
+    """
+    Get the rings (exterior first) of a polygon as coordinate arrays.
+
+    :param polygon: the polygon
+    :return: the rings (There are none if the polygon is empty.)
+    """
+    shapely_polygon = polygon.shapely_geometry
+    if shapely_polygon.is_empty:
+        return []
+    return ([np.asarray(shapely_polygon.exterior.coords)[:, 0:2]] +
+            [np.asarray(interior.coords)[:, 0:2] for interior in shapely_polygon.interiors])
+
+
+def _contains_points(rings: List[np.ndarray], x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Test a set of points to see which of them fall within a polygon using the even-odd (crossing number) rule.
+    Because we count crossings of every ring, points in holes come out right.  (Points that lie exactly on the
+    boundary may fall either way.)
+
+    So that big polygons don't cost (points x edges), the polygon is cut into horizontal bands and each edge is
+    filed under the bands its Y range overlaps.  A point's ray can only cross the edges in its own band, so those
+    are the only (point, edge) pairs we test.  Polygons with a great many edges are handed to a prepared geometry
+    (which indexes its edges the same way, but does the testing in GEOS).
+
+    :param rings: the polygon's rings
+    :param x: the X coordinates of the points
+    :param y: the Y coordinates of the points
+    :return: a mask indicating which points fall within the polygon
+    """
+    inside = np.zeros(len(x), dtype=bool)
+    if len(rings) == 0:
+        return inside
+    if sum(len(ring) - 1 for ring in rings) > _PREPARE_AFTER_EDGES:
+        return vectorized.contains(ShapelyPolygon(rings[0], rings[1:]), x, y)
+    # Gather up all of the edges in all of the rings.  (Horizontal edges never straddle a ray, so we leave them out.)
+    starts = np.concatenate([ring[:-1] for ring in rings])
+    ends = np.concatenate([ring[1:] for ring in rings])
+    edges = starts[:, 1] != ends[:, 1]
+    x1, y1, x2, y2 = starts[edges, 0], starts[edges, 1], ends[edges, 0], ends[edges, 1]
+    if len(x1) == 0:
+        return inside
+    # An edge straddles a ray if min_y <= y < max_y, so points outside [bottom, top) can't be inside.
+    edge_min_y, edge_max_y = np.minimum(y1, y2), np.maximum(y1, y2)
+    bottom, top = float(edge_min_y.min()), float(edge_max_y.max())
+    bands = max(1, min(len(x1) // _EDGES_PER_BAND, _MAX_BANDS))
+    height = (top - bottom) / bands
+    candidates = np.flatnonzero((y >= bottom) & (y < top))
+    # Figure out which band each candidate point falls in, and which bands each edge overlaps.
+    point_bands = np.minimum(((y[candidates] - bottom) / height).astype(np.int64), bands - 1)
+    first_bands = np.minimum(((edge_min_y - bottom) / height).astype(np.int64), bands - 1)
+    last_bands = np.minimum(((edge_max_y - bottom) / height).astype(np.int64), bands - 1)
+    # File the edges under their bands (sorted by band).
+    edge_bands = _expand_ranges(first_bands, last_bands + 1)
+    band_edges = np.repeat(np.arange(len(x1), dtype=np.int64), last_bands - first_bands + 1)
+    order = np.argsort(edge_bands, kind='stable')
+    band_edges = band_edges[order]
+    band_offsets = np.searchsorted(edge_bands[order], np.arange(bands + 1))
+    # Each candidate is paired with the edges in its band.
+    pair_starts, pair_ends = band_offsets[point_bands], band_offsets[point_bands + 1]
+    # Test the pairs in blocks (of whole points) so we don't use too much memory.
+    cumulative = np.cumsum(pair_ends - pair_starts)
+    total = int(cumulative[-1]) if len(cumulative) != 0 else 0
+    splits = np.searchsorted(cumulative, np.arange(_MAX_BLOCK_SIZE, total, _MAX_BLOCK_SIZE))
+    breaks = np.unique(np.concatenate([[0], splits, [len(candidates)]]).astype(np.int64))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for first, last in zip(breaks[:-1], breaks[1:]):
+            counts = pair_ends[first:last] - pair_starts[first:last]
+            pair_points = np.repeat(candidates[first:last], counts)
+            e = band_edges[_expand_ranges(pair_starts[first:last], pair_ends[first:last])]
+            px, py = x[pair_points], y[pair_points]
+            straddles = (y1[e] > py) != (y2[e] > py)
+            crossing_x = x1[e] + (py - y1[e]) * (x2[e] - x1[e]) / (y2[e] - y1[e])
+            crossed = straddles & (px < crossing_x)
+            crossings = np.bincount(np.repeat(np.arange(last - first), counts), weights=crossed,
+                                    minlength=last - first)
+            inside[candidates[first:last]] = (crossings.astype(np.int64) % 2) == 1
+    return inside
+
+
+def _join_chunk(coordinates: np.ndarray,
+                offset: int,
+                srid: int,
+                polygon_rings: Sequence[List[np.ndarray]],
+                polygon_envelopes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Join a chunk of points to a set of polygons.  (This is the unit of work handed to worker processes.)
+
+    :param coordinates: the (x, y) coordinates of the points in the chunk
+    :param offset: the index of the chunk's first point within the whole collection
+    :param srid: the spatial reference ID of the points and polygons
+    :param polygon_rings: the rings of each polygon
+    :param polygon_envelopes: the envelope of each polygon
+    :return: the point indexes and polygon indexes of the matching pairs
+    """
+    point_indexes: List[np.ndarray] = []
+    polygon_indexes: List[np.ndarray] = []
+    # Index the points so we can quickly find the ones that fall inside each polygon's envelope.
+    index = SpatialIndex.from_envelopes(np.hstack([coordinates, coordinates]), spatial_reference=srid)
+    for p, envelope in enumerate(polygon_envelopes):
+        # (Empty polygons don't have envelopes, and they don't contain anything.)
+        if not np.all(np.isfinite(envelope)):
+            continue
+        candidates = index.query(envelope)
+        if len(candidates) == 0:
+            continue
+        inside = candidates[_contains_points(polygon_rings[p], coordinates[candidates, 0], coordinates[candidates, 1])]
+        point_indexes.append(inside + offset)
+        polygon_indexes.append(np.full(len(inside), p, dtype=np.int64))
+    if len(point_indexes) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(point_indexes), np.concatenate(polygon_indexes)
+
+
+def join_points_to_polygons(points: np.ndarray or GeometryArray or Iterable[Point],
+                            polygons: Sequence[Polygon],
+                            spatial_reference: SpatialReference or int = None,
+                            chunk_size: int = 1000000,
+                            processes: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Figure out which points fall within which polygons.
+
+    The polygons' envelopes are used to pick out candidate points from an envelope index, and the candidates are
+    tested against each polygon with a vectorized point-in-polygon test (which only tests each point against the
+    edges near it).  Polygons that aren't in the points' spatial reference are projected (by the
+    :py:class:`djio.geometry.Projector`) before the join.
+
+    :param points: an (N, 2) array of coordinates, a geometry array of points, or point geometries (Empty points, and
+        points with NaN coordinates, never fall within a polygon.)
+    :param polygons: the polygons
+    :param spatial_reference: the spatial reference of the points (This is required for plain arrays.)
+    :param chunk_size: the number of points to join at a time
+    :param processes: the number of worker processes that should join chunks in parallel (If you don't supply a
+        number, the join happens in this process.)
+    :return: the point indexes and polygon indexes of every (point, polygon) pair, ordered by point index and then
+        polygon index
+    """
+    coordinates, sr = _point_coordinates(points, spatial_reference)
+    _polygons = [_conform(polygon, sr) for polygon in polygons]
+    polygon_rings = [_rings(polygon) for polygon in _polygons]
+    polygon_envelopes = np.array([polygon.shapely_geometry.bounds or (np.nan,) * 4 for polygon in _polygons],
+                                 dtype=np.float64).reshape(-1, 4)
+    chunks = [(coordinates[i:i + chunk_size], i) for i in range(0, len(coordinates), chunk_size)]
+    if processes is not None and processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(_join_chunk, chunk, offset, sr.srid, polygon_rings, polygon_envelopes)
+                for chunk, offset in chunks
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [_join_chunk(chunk, offset, sr.srid, polygon_rings, polygon_envelopes) for chunk, offset in chunks]
+    if len(results) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    point_indexes = np.concatenate([r[0] for r in results])
+    polygon_indexes = np.concatenate([r[1] for r in results])
+    order = np.lexsort((polygon_indexes, point_indexes))
+    return point_indexes[order], polygon_indexes[order]
+
+
+def join_polygons(left: Sequence[Polygon],
+                  right: Sequence[Polygon],
+                  predicate: str = 'intersects') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Figure out which polygons in one collection intersect (or contain) which polygons in another.  The right-hand
+    polygons are indexed by their envelopes and each left-hand polygon is prepared before its candidates are tested.
+    Right-hand polygons that aren't in the spatial reference of the first left-hand polygon are projected (by the
+    :py:class:`djio.geometry.Projector`) before the join.
+
+    :param left: the left-hand polygons
+    :param right: the right-hand polygons
+    :param predicate: the test to apply (`intersects`, `contains`, `within`, `overlaps`, `touches`, `crosses` or
+        `covers`)
+    :return: the left-hand indexes and right-hand indexes of every pair that satisfies the predicate
+    """
+    if predicate not in ('intersects', 'contains', 'within', 'overlaps', 'touches', 'crosses', 'covers'):
+        raise ValueError('Unsupported predicate: {predicate}.'.format(predicate=predicate))
+    _left = list(left)
+    if len(_left) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    sr = _left[0].spatial_reference
+    _left = [_conform(polygon, sr) for polygon in _left]
+    _right = [_conform(polygon, sr) for polygon in right]
+    index = SpatialIndex.from_geometries(_right, spatial_reference=sr)
+    left_indexes: List[int] = []
+    right_indexes: List[int] = []
+    for i, polygon in enumerate(_left):
+        candidates = index.query(polygon.shapely_geometry.bounds)
+        if len(candidates) == 0:
+            continue
+        test = getattr(prep(polygon.shapely_geometry), predicate)
+        for j in candidates:
+            if test(_right[j].shapely_geometry):
+                left_indexes.append(i)
+                right_indexes.append(int(j))
+    return np.array(left_indexes, dtype=np.int64), np.array(right_indexes, dtype=np.int64)
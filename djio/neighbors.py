@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.neighbors
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Where's the closest hydrant?  Ask your neighbors.
+"""
+
+from .arrays import GeometryArray, _point_coordinates
+from .geometry import Geometry, GeometryException, Point, Projector, SpatialReference, SpatialReferenceException
+import numpy as np
+from scipy.spatial import cKDTree
+from shapely.geometry import box
+from typing import Iterable, Tuple
+import warnings
+
+
+EARTH_RADIUS: float = 6371008.8  #: the mean radius of the earth (in meters)
+
+
+def _to_unit_vectors(lonlat: np.ndarray) -> np.ndarray:
+    """
+    Convert longitudes and latitudes to points on the unit sphere.
+
+    :param lonlat: an (N, 2) array of (longitude, latitude) coordinates in degrees
+    :return: an (N, 3) array of unit vectors
+    """
+    lon = np.radians(lonlat[:, 0])
+    lat = np.radians(lonlat[:, 1])
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+class NearestNeighbors(object):
+    """
+    Use a nearest-neighbors object to find the `k` points (from a fixed collection) nearest to each of a batch of
+    other points.  The points are kept in a KD-tree in a metric space which is picked automatically:
+
+    * In haversine mode (the default for geographic spatial references) the points are placed on a sphere and
+      distances are great-circle distances.
+    * Otherwise, points in a projected metric spatial reference are used as they are and other points are transformed
+      into the metric spatial reference the :py:class:`djio.geometry.Projector` picks for them (the UTM zone for
+      the points, or the fallback).  If it has to fall back, you get a warning:  the fallback's units may not be
+      true meters.  (EPSG:3857, for example, stretches distances more and more the farther you get from the equator.)
+
+    Empty points can't be indexed, and empty query points have no neighbors.
+
+    Either way, distances are returned in meters.
+    """
+
+    def __init__(self,
+                 points: np.ndarray or GeometryArray or Iterable[Point],
+                 spatial_reference: SpatialReference or int = None,
+                 haversine: bool = None,
+                 metric_spatial_reference: SpatialReference or int = None,
+                 fallback_spatial_reference: SpatialReference or int = 3857,
+                 leafsize: int = 16):
+        """
+
+        :param points: an (N, 2) array of coordinates, a geometry array of points, or point geometries
+        :param spatial_reference: the spatial reference of the points (This is required for plain arrays.)
+        :param haversine: `True` to measure great-circle distances on the sphere, `False` to measure distances in a
+            projected metric spatial reference (If you don't say, geographic spatial references use great-circle
+            distances.)
+        :param metric_spatial_reference: the projected metric spatial reference in which distances are measured
+            (when not in haversine mode) if the points aren't already in one
+        :param fallback_spatial_reference: the projected metric spatial reference we fall back to if no UTM zone suits
+            the points
+        :param leafsize: the number of points at which the KD-tree stops splitting
+        :raises GeometryException: if any of the points is empty
+        """
+        coordinates, sr = _point_coordinates(points, spatial_reference)
+        if np.isnan(coordinates).any():
+            raise GeometryException('Empty points cannot be indexed.')
+        self._spatial_reference: SpatialReference = sr
+        self._haversine: bool = haversine if haversine is not None else sr.is_geographic
+        if self._haversine:
+            self._space: SpatialReference = SpatialReference.from_srid(4326)
+        else:
+            self._space: SpatialReference = self._pick_metric_space(coordinates,
+                                                                    metric_spatial_reference,
+                                                                    fallback_spatial_reference)
+        self._tree: cKDTree = cKDTree(self._to_space(coordinates, sr), leafsize=leafsize)
+
+    def __len__(self) -> int:
+        return self._tree.n
+
+    @property
+    def spatial_reference(self) -> SpatialReference:
+        """
+        Get the spatial reference of the indexed points.
+
+        :return: the spatial reference
+        """
+        return self._spatial_reference
+
+    @property
+    def metric_spatial_reference(self) -> SpatialReference or None:
+        """
+        Get the projected metric spatial reference in which distances are measured.
+
+        :return: the metric spatial reference (or `None` in haversine mode)
+        """
+        return self._space if not self._haversine else None
+
+    @property
+    def haversine(self) -> bool:
+        """
+        Are distances measured along great circles?
+
+        :return: `True` in haversine mode, otherwise `False`
+        """
+        return self._haversine
+
+    def _pick_metric_space(self,
+                           coordinates: np.ndarray,
+                           metric_spatial_reference: SpatialReference or int or None,
+                           fallback_spatial_reference: SpatialReference or int) -> SpatialReference:
+        """
+        Pick the metric spatial reference in which distances are measured.
+
+        :param coordinates: the indexed coordinates
+        :param metric_spatial_reference: the caller's preferred metric spatial reference
+        :param fallback_spatial_reference: the fallback metric spatial reference
+        :return: the metric spatial reference
+        """
+        if metric_spatial_reference is not None:
+            sr = (metric_spatial_reference if isinstance(metric_spatial_reference, SpatialReference)
+                  else SpatialReference.from_srid(srid=metric_spatial_reference))
+        elif self._spatial_reference.is_metric:
+            return self._spatial_reference
+        else:
+            fallback = (fallback_spatial_reference if isinstance(fallback_spatial_reference, SpatialReference)
+                        else SpatialReference.from_srid(srid=fallback_spatial_reference))
+            if len(coordinates) == 0:
+                return fallback
+            # Let the projector pick a spatial reference for the points' envelope (just as it would for a geometry).
+            envelope = Geometry.from_shapely(shapely_geometry=box(*coordinates.min(axis=0), *coordinates.max(axis=0)),
+                                             spatial_reference=self._spatial_reference)
+            sr = Projector.get_instance().project(geometry=envelope,
+                                                  fallback_spatial_reference=fallback).spatial_reference
+            if not sr.is_utm:
+                warnings.warn('No UTM zone suits the points, so distances are measured in EPSG:{srid} (and may not '
+                              'be true meters).'.format(srid=sr.srid), stacklevel=3)
+        if not sr.is_metric:
+            raise SpatialReferenceException('The spatial reference is not projected, or is not metric.')
+        return sr
+
+    def _to_space(self, coordinates: np.ndarray, spatial_reference: SpatialReference) -> np.ndarray:
+        """
+        Move coordinates into the space in which the tree lives.
+
+        :param coordinates: the coordinates
+        :param spatial_reference: the spatial reference of the coordinates
+        :return: the coordinates in the tree's space
+        """
+        transformed = spatial_reference.transform_coordinates(coordinates, self._space)
+        return _to_unit_vectors(transformed) if self._haversine else transformed
+
+    def query(self,
+              points: np.ndarray or GeometryArray or Iterable[Point],
+              k: int = 1,
+              spatial_reference: SpatialReference or int = None,
+              max_distance: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest neighbors of a batch of points.
+
+        :param points: an (M, 2) array of coordinates, a geometry array of points, or point geometries
+        :param k: the number of neighbors to find for each point
+        :param spatial_reference: the spatial reference of the query points (If you don't supply one for an array of
+            coordinates, they're assumed to be in the same spatial reference as the indexed points.)
+        :param max_distance: the greatest distance (in meters) at which a neighbor may be found
+        :return: an (M, k) array of distances in meters, and an (M, k) array of the neighbors' indexes (Missing
+            neighbors have infinite distances and indexes of -1.)
+        """
+        sr = spatial_reference
+        if sr is None and isinstance(points, np.ndarray):
+            sr = self._spatial_reference
+        coordinates, sr = _point_coordinates(points, sr)
+        # Empty query points have no neighbors (so we don't ask the tree about them).
+        present = ~np.isnan(coordinates).any(axis=1)
+        upper_bound = np.inf
+        if max_distance is not None:
+            # In haversine mode the tree measures chords, not arcs.
+            upper_bound = (max_distance if not self._haversine
+                           else 2.0 * np.sin(min(max_distance / EARTH_RADIUS, np.pi) / 2.0))
+        distances = np.full((len(coordinates), k), np.inf, dtype=np.float64)
+        indexes = np.full((len(coordinates), k), self._tree.n, dtype=np.int64)
+        if present.any():
+            found_distances, found_indexes = self._tree.query(self._to_space(coordinates[present], sr), k=k,
+                                                              distance_upper_bound=upper_bound)
+            distances[present] = np.asarray(found_distances, dtype=np.float64).reshape(-1, k)
+            indexes[present] = np.asarray(found_indexes, dtype=np.int64).reshape(-1, k)
+        # The tree reports missing neighbors with an index just past the end.
+        indexes[indexes >= self._tree.n] = -1
+        if self._haversine:
+            # Convert the chord lengths to great-circle distances.  (Missing neighbors stay infinitely far away.)
+            with np.errstate(invalid='ignore'):
+                distances = np.where(np.isfinite(distances),
+                                     2.0 * EARTH_RADIUS * np.arcsin(np.minimum(distances / 2.0, 1.0)), np.inf)
+        return distances, indexes
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.serialization
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Need to send geometries somewhere else?  Pack them up here.
+"""
+
+from .geometry import Geometry, GeometryException, _unpickle_geometry
+from io import BytesIO
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+
+
+_MAGIC: bytes = b'DJIO'  #: the bytes that mark the beginning of a framed collection of geometries
+_VERSION: int = 1  #: the version of the framing format
+_HEADER: struct.Struct = struct.Struct('<4sBI')  #: magic, version, geometry count
+_FRAME: struct.Struct = struct.Struct('<iI')  #: SRID, WKB length
+
+
+def _type_names() -> Dict[str, type]:
+    """
+    Get a mapping of geometry type names to the types (including any subclasses that have been defined so far).
+
+    :return: the mapping
+    """
+    names: Dict[str, type] = {}
+    pending = [Geometry]
+    while len(pending) != 0:
+        cls = pending.pop()
+        names[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return names
+
+
+def _frame(geometry: Geometry) -> bytes:
+    """
+    Encode a geometry as a frame:  its type name, SRID and well-known binary (WKB).
+
+    :param geometry: the geometry
+    :return: the frame
+    """
+    type_name = type(geometry).__name__.encode('ascii')
+    wkb = geometry.shapely_geometry.wkb
+    return b''.join([bytes([len(type_name)]), type_name, _FRAME.pack(geometry.spatial_reference.srid, len(wkb)), wkb])
+
+
+def _is_seekable(stream: BinaryIO) -> bool:
+    """
+    Can we go back and rewrite part of a stream?
+
+    :param stream: the stream
+    :return: `True` if the stream is seekable
+    """
+    try:
+        return stream.seekable()
+    except AttributeError:
+        return False
+
+
+def write_many(stream: BinaryIO, geometries: Iterable[Geometry], count: int = None):
+    """
+    Write a framed collection of geometries to a binary stream.  Each geometry is written as its type name, SRID and
+    well-known binary (WKB).  The frames are written as the geometries arrive, so the collection never has to fit in
+    memory.
+
+    * If you supply the count, it goes straight into the header.  (If it turns out to be wrong you get an exception,
+      and what's been written so far isn't a valid collection.)
+    * Otherwise, the header starts out with a count of zero and we go back and fill in the real count at the end.
+    * If you don't supply the count and the stream isn't seekable, we have no choice but to hold on to the frames
+      until we know how many there are.
+
+    :param stream: the binary stream
+    :param geometries: the geometries
+    :param count: the number of geometries (If you supply it, it must match the number of geometries.)
+    :raises GeometryException: if the count doesn't match the number of geometries
+    """
+    if count is None and not _is_seekable(stream):
+        frames: List[bytes] = [_frame(geometry) for geometry in geometries]
+        stream.write(_HEADER.pack(_MAGIC, _VERSION, len(frames)))
+        for frame in frames:
+            stream.write(frame)
+        return
+    header_position = stream.tell() if count is None else None
+    stream.write(_HEADER.pack(_MAGIC, _VERSION, count if count is not None else 0))
+    written = 0
+    for geometry in geometries:
+        if count is not None and written == count:
+            raise GeometryException('Expected {count} geometries, but there are more.'.format(count=count))
+        stream.write(_frame(geometry))
+        written += 1
+    if count is None:
+        # Now that we know how many geometries there are, we can fix the header.
+        end_position = stream.tell()
+        stream.seek(header_position)
+        stream.write(_HEADER.pack(_MAGIC, _VERSION, written))
+        stream.seek(end_position)
+    elif written != count:
+        raise GeometryException('Expected {count} geometries, but there are {actual}.'.format(count=count,
+                                                                                              actual=written))
+
+
+def read_many(stream: BinaryIO) -> Iterator[Geometry]:
+    """
+    Read a framed collection of geometries from a binary stream, one geometry at a time.
+
+    :param stream: the binary stream
+    :return: an iteration of the geometries
+    :raises GeometryException: if the stream doesn't contain a framed collection of geometries
+    """
+    magic, version, count = _HEADER.unpack(stream.read(_HEADER.size))
+    if magic != _MAGIC:
+        raise GeometryException('The stream does not contain framed djio geometries.')
+    if version != _VERSION:
+        raise GeometryException('Unsupported framing version: {version}.'.format(version=version))
+    types = _type_names()
+    for _ in range(count):
+        type_name = stream.read(stream.read(1)[0]).decode('ascii')
+        srid, length = _FRAME.unpack(stream.read(_FRAME.size))
+        wkb = stream.read(length)
+        try:
+            cls = types[type_name]
+        except KeyError:
+            raise GeometryException('Unknown geometry type: {type_name}.'.format(type_name=type_name))
+        # Note that unpickling a geometry retrieves the spatial reference from the registry.
+        yield _unpickle_geometry(cls, srid, wkb)
+
+
+def dumps_many(geometries: Iterable[Geometry]) -> bytes:
+    """
+    Pack a collection of geometries into a compact binary frame.
+
+    :param geometries: the geometries
+    :return: the framed geometries
+    """
+    stream = BytesIO()
+    write_many(stream, geometries)
+    return stream.getvalue()
+
+
+def loads_many(data: bytes) -> List[Geometry]:
+    """
+    Unpack a collection of geometries from a compact binary frame.
+
+    :param data: the framed geometries
+    :return: the geometries
+    """
+    return list(read_many(BytesIO(data)))
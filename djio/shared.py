@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.shared
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Fanning geometries out to a bunch of worker processes?  Share them instead of copying them.
+
+.. note::
+
+    This module relies on :py:mod:`multiprocessing.shared_memory` which requires Python 3.8 or later.
+"""
+
+from .arrays import GeometryArray, _buffer_sections, _read_buffer, _write_buffer
+from .geometry import GeometryException
+from multiprocessing import shared_memory
+import weakref
+
+
+_MAGIC: bytes = b'DJSM'  #: the bytes that identify a shared geometry segment
+
+
+def _release(shm: shared_memory.SharedMemory, unlink: bool):
+    """
+    Close (and possibly unlink) a shared memory segment, ignoring segments that are already gone.  This is the
+    finalizer for :py:class:`SharedGeometryArray` instances.
+
+    :param shm: the shared memory segment
+    :param unlink: `True` to unlink (destroy) the segment
+    """
+    try:
+        shm.close()
+    except BufferError:
+        pass  # Somebody is still holding views into the segment.  The OS will clean up when they let go.
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass  # It's already gone, which is what we wanted.
+
+
+class SharedGeometryArray(object):
+    """
+    A shared geometry array publishes a :py:class:`djio.arrays.GeometryArray` (coordinates, offsets, SRID, envelopes
+    and hash values) into a block of shared memory so that other processes can attach to it without copying it.
+
+    The process that publishes the array owns the segment and unlinks it when the array is closed, when it's used as a
+    context manager and the block exits, or (at the latest) when the owning object is garbage-collected or the
+    process exits.  Processes that attach only ever close their own handle.  Instances can be pickled (which is how
+    they're typically handed to workers started by :py:mod:`multiprocessing` or :py:mod:`concurrent.futures`) in which
+    case only the segment name travels and the receiver attaches.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+
+        :param shm: the shared memory segment
+        :param owner: `True` if this instance owns (and should eventually unlink) the segment
+        """
+        self._shm: shared_memory.SharedMemory = shm
+        self._owner: bool = owner
+        self._array: GeometryArray = None
+        # Make sure the segment is released even if nobody remembers to close it.
+        self._finalizer = weakref.finalize(self, _release, shm, owner)
+        # Create read-only views of all the columns.
+        self._array = _read_buffer(shm.buf, magic=_MAGIC)
+
+    def __reduce__(self):
+        """
+        Pickle the shared array as the name of its segment.  (The receiver attaches to the segment.)
+        """
+        return SharedGeometryArray.attach, (self.name,)
+
+    def __enter__(self) -> 'SharedGeometryArray':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._array) if self._array is not None else 0
+
+    @property
+    def name(self) -> str:
+        """
+        Get the name of the shared memory segment.
+
+        :return: the segment name
+        """
+        return self._shm.name
+
+    @property
+    def owner(self) -> bool:
+        """
+        Does this instance own the shared memory segment?
+
+        :return: `True` if this instance published the array and will unlink the segment when it's closed
+        """
+        return self._owner
+
+    @property
+    def closed(self) -> bool:
+        """
+        Has this shared array been closed?
+
+        :return: `True` if the shared array has been closed
+        """
+        return not self._finalizer.alive
+
+    @property
+    def array(self) -> GeometryArray:
+        """
+        Get the read-only geometry array backed by the shared memory segment.
+
+        :return: the geometry array
+        :raises GeometryException: if the shared array has been closed
+        """
+        if self.closed:
+            raise GeometryException('The shared array is closed.')
+        return self._array
+
+    def close(self):
+        """
+        Release this process's handle on the shared memory segment, and (if this instance owns it) destroy the
+        segment.  Views obtained through :py:attr:`array` are no longer valid after the shared array is closed.
+        """
+        # Let go of our own views before we close the segment.
+        self._array = None
+        self._finalizer()
+
+    @staticmethod
+    def publish(array: GeometryArray, name: str = None) -> 'SharedGeometryArray':
+        """
+        Copy a geometry array into a new shared memory segment.
+
+        :param array: the geometry array
+        :param name: the name of the segment (If no name is supplied, a unique name is generated.)
+        :return: the shared array (which owns the new segment)
+        """
+        _, _, size = _buffer_sections(array, magic=_MAGIC)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        try:
+            _write_buffer(shm.buf, array, magic=_MAGIC)
+        except BaseException:
+            _release(shm, unlink=True)
+            raise
+        return SharedGeometryArray(shm=shm, owner=True)
+
+    @staticmethod
+    def attach(name: str) -> 'SharedGeometryArray':
+        """
+        Attach to a shared geometry array that was published by another process.
+
+        :param name: the name of the shared memory segment
+        :return: the shared array
+        """
+        try:
+            # As of Python 3.13 we can tell the resource tracker to leave the segment alone.
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before that, the segment is registered with the resource tracker.  Processes started by
+            # multiprocessing share the publisher's tracker (so this is harmless) but the tracker of an unrelated
+            # process would unlink the segment when that process exits.
+            shm = shared_memory.SharedMemory(name=name)
+        return SharedGeometryArray(shm=shm, owner=False)
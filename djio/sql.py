@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.sql
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Pulling millions of geometries out of a spatial database?  Stream them, and only decode the ones you use.
+"""
+
+from .arrays import GeometryArray, _geometry_wkb, _read_wkb_header, _wkb_geom_type_map, _WKB_GEOMETRYCOLLECTION
+from .geometry import (Geometry, GeometryException, GeometryType, SpatialReference, SpatialReferenceException,
+                       _spatial_element_srid)
+from collections import namedtuple
+from contextlib import contextmanager
+from geoalchemy2.elements import WKBElement, WKTElement
+from geoalchemy2.types import Geometry as GeoAlchemyGeometry
+from sqlalchemy import func
+from sqlalchemy.engine import Connection, Engine, Result
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.types import TypeDecorator
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class LazyGeometry(object):
+    """
+    A lazy geometry holds a geometry's well-known binary (WKB) and spatial reference, and doesn't decode the WKB into
+    a :py:class:`djio.geometry.Geometry` until something needs it.  Anything you ask of a lazy geometry that it can't
+    answer from the WKB itself (its SRID and geometry type) is handed to the decoded geometry, so you can use it as
+    though it were one.  (If you need the real thing, use :py:attr:`LazyGeometry.geometry`.)
+    """
+    __slots__ = ['_wkb', '_srid', '_geometry']
+
+    def __init__(self, wkb: bytes, srid: int):
+        """
+
+        :param wkb: the well-known binary (WKB) or extended well-known binary (EWKB)
+        :param srid: the spatial reference ID
+        """
+        self._wkb: bytes = wkb
+        self._srid: int = srid
+        self._geometry: Optional[Geometry] = None
+
+    def __reduce__(self):
+        """
+        Pickle the lazy geometry as its WKB and SRID.  (The decoded geometry isn't pickled.)
+        """
+        return LazyGeometry, (self._wkb, self._srid)
+
+    def __getattr__(self, name: str) -> Any:
+        # (This is only called for names the lazy geometry doesn't have itself.)
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.geometry, name)
+
+    def __repr__(self) -> str:
+        return '<LazyGeometry {type} srid={srid}{decoded}>'.format(
+            type=self.geometry_type.name, srid=self._srid, decoded=' (decoded)' if self.is_decoded else '')
+
+    @property
+    def wkb(self) -> bytes:
+        """
+        Get the geometry's well-known binary (just as it came from the database).
+
+        :return: the WKB (or EWKB)
+        """
+        return self._wkb
+
+    @property
+    def srid(self) -> int:
+        """
+        Get the geometry's spatial reference ID.
+
+        :return: the SRID
+        """
+        return self._srid
+
+    @property
+    def spatial_reference(self) -> SpatialReference:
+        """
+        Get the geometry's spatial reference.
+
+        :return: the spatial reference
+        """
+        return SpatialReference.from_srid(srid=self._srid)
+
+    @property
+    def geometry_type(self) -> GeometryType:
+        """
+        Get the geometry's type.  (This is read from the WKB header, so the geometry isn't decoded.)
+
+        :return: the geometry type
+        """
+        _, type_code, _, _, _ = _read_wkb_header(self._wkb, 0)
+        if type_code == _WKB_GEOMETRYCOLLECTION:
+            return GeometryType.COLLECTION
+        return _wkb_geom_type_map.get(type_code, GeometryType.UNKNOWN)
+
+    @property
+    def is_decoded(self) -> bool:
+        """
+        Has the WKB been decoded yet?
+
+        :return: `True` if the geometry has been decoded
+        """
+        return self._geometry is not None
+
+    @property
+    def geometry(self) -> Geometry:
+        """
+        Get the djio geometry.  (The WKB is decoded the first time you ask.)
+
+        :return: the geometry
+        """
+        if self._geometry is None:
+            self._geometry = Geometry.from_wkb(wkb=self._wkb, spatial_reference=self._srid)
+        return self._geometry
+
+    @staticmethod
+    def from_element(spatial_element: WKBElement or bytes,
+                     spatial_reference: SpatialReference or int = None) -> 'LazyGeometry':
+        """
+        Create a lazy geometry from a GeoAlchemy2 WKB element (or plain WKB).
+
+        :param spatial_element: the WKB element (or the WKB)
+        :param spatial_reference: the spatial reference (If you don't supply one, the element's SRID is used.)
+        :return: the lazy geometry
+        :raises SpatialReferenceException: if there's no SRID to be found and none is supplied
+        """
+        if isinstance(spatial_element, WKBElement):
+            data = spatial_element.data
+            wkb = bytes.fromhex(data) if isinstance(data, str) else bytes(data)  # (SpatiaLite hands us hex.)
+            srid = _spatial_element_srid(spatial_element)
+        else:
+            wkb = bytes(spatial_element)
+            srid = None
+        if spatial_reference is not None:
+            srid = spatial_reference.srid if isinstance(spatial_reference, SpatialReference) else spatial_reference
+        elif srid is None:
+            # It may be EWKB that carries its own SRID.
+            srid = _read_wkb_header(wkb, 0)[3]
+            if srid is None:
+                raise SpatialReferenceException('The geometry has no SRID, and no SRID was supplied.')
+        return LazyGeometry(wkb=wkb, srid=srid)
+
+
+def _convert(value: Any, spatial_reference: SpatialReference or int or None) -> Any:
+    """
+    Convert a value from a result row.  (GeoAlchemy2 elements become djio geometries.  Anything else is left alone.)
+
+    :param value: the value
+    :param spatial_reference: the spatial reference of geometries that don't carry their own SRID
+    :return: the converted value
+    """
+    if isinstance(value, WKBElement):
+        return LazyGeometry.from_element(value, spatial_reference=spatial_reference)
+    elif isinstance(value, WKTElement):
+        return Geometry.from_geoalchemy2(value, spatial_reference=spatial_reference)
+    return value
+
+
+@contextmanager
+def _streaming_result(bind: Engine or Connection or Session, statement: Any, chunk_size: int) -> Iterator[Result]:
+    """
+    Execute a statement so that the results are streamed (with a server-side cursor, if the database has them)
+    and fetched `chunk_size` rows at a time.
+
+    :param bind: the engine, connection or session
+    :param statement: the statement
+    :param chunk_size: the number of rows fetched at a time
+    :return: the result
+    """
+    options = {'stream_results': True, 'yield_per': chunk_size}
+    if isinstance(bind, Session):
+        result = bind.execute(statement, execution_options=options)
+        try:
+            yield result
+        finally:
+            result.close()
+    elif isinstance(bind, Engine):
+        with bind.connect() as connection:
+            result = connection.execution_options(**options).execute(statement)
+            try:
+                yield result
+            finally:
+                result.close()
+    else:
+        result = bind.execution_options(**options).execute(statement)
+        try:
+            yield result
+        finally:
+            result.close()
+
+
+def _iter_rows(bind: Engine or Connection or Session or None,
+               statement: Any,
+               chunk_size: int) -> Iterator[List[Any]]:
+    """
+    Stream the rows a statement (or an ORM query) returns, a chunk at a time.
+
+    :param bind: the engine, connection or session (This isn't needed for an ORM query.)
+    :param statement: the statement (or query)
+    :param chunk_size: the number of rows fetched at a time
+    :return: an iteration of the column names followed by chunks of rows
+    """
+    if isinstance(statement, Query):
+        yield [column['name'] for column in statement.column_descriptions]
+        chunk: List[Any] = []
+        for row in statement.yield_per(chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if len(chunk) != 0:
+            yield chunk
+        return
+    with _streaming_result(bind, statement, chunk_size) as result:
+        yield list(result.keys())
+        for partition in result.partitions():
+            yield partition
+
+
+def stream_rows(bind: Engine or Connection or Session or None,
+                statement: Any,
+                chunk_size: int = 1000,
+                spatial_reference: SpatialReference or int = None) -> Iterator[tuple]:
+    """
+    Stream the rows a query returns.  The rows are fetched `chunk_size` at a time (with a server-side cursor if the
+    database has them), and every GeoAlchemy2 WKB element becomes a :py:class:`LazyGeometry` (with the element's SRID)
+    which isn't decoded until it's used.  So large spatial queries stream through in constant memory.
+
+    :param bind: the engine, connection or session (If the statement is an ORM query, this isn't needed.)
+    :param statement: the statement (like a `select()`) or ORM query
+    :param chunk_size: the number of rows fetched at a time
+    :param spatial_reference: the spatial reference of geometries (If you don't supply one, each element's SRID is
+        used.)
+    :return: an iteration of rows (named tuples)
+    """
+    rows = _iter_rows(bind, statement, chunk_size)
+    row_type = namedtuple('Row', next(rows), rename=True)
+    for chunk in rows:
+        for row in chunk:
+            yield row_type(*[_convert(value, spatial_reference) for value in row])
+
+
+def stream_geometries(bind: Engine or Connection or Session or None,
+                      statement: Any,
+                      chunk_size: int = 1000,
+                      spatial_reference: SpatialReference or int = None) -> Iterator[Optional[LazyGeometry]]:
+    """
+    Stream the geometries in the first column a query returns.  (See :py:func:`stream_rows`.)  The column may hold
+    GeoAlchemy2 WKB elements or plain WKB (or EWKB).
+
+    :param bind: the engine, connection or session (If the statement is an ORM query, this isn't needed.)
+    :param statement: the statement (like a `select()`) or ORM query
+    :param chunk_size: the number of rows fetched at a time
+    :param spatial_reference: the spatial reference of geometries (If you don't supply one, each element's SRID is
+        used.)
+    :return: an iteration of lazy geometries (or `None` for null values)
+    """
+    rows = _iter_rows(bind, statement, chunk_size)
+    next(rows)  # (We don't need the column names.)
+    for chunk in rows:
+        for row in chunk:
+            yield LazyGeometry.from_element(row[0], spatial_reference) if row[0] is not None else None
+
+
+def stream_arrays(bind: Engine or Connection or Session or None,
+                  statement: Any,
+                  chunk_size: int = 10000,
+                  spatial_reference: SpatialReference or int = None) -> Iterator[GeometryArray]:
+    """
+    Stream the geometries in the first column a query returns as columnar geometry arrays, one for each chunk of
+    rows.  The WKB is decoded straight into each array's coordinates (so no Shapely geometries are created).  Null
+    values are left out.
+
+    :param bind: the engine, connection or session (If the statement is an ORM query, this isn't needed.)
+    :param statement: the statement (like a `select()`) or ORM query
+    :param chunk_size: the number of rows fetched at a time
+    :param spatial_reference: the spatial reference of geometries (If you don't supply one, the SRID of the first
+        element in each chunk is used.)
+    :return: an iteration of geometry arrays
+    :raises SpatialReferenceException: if the geometries in a chunk don't share a spatial reference
+    """
+    rows = _iter_rows(bind, statement, chunk_size)
+    next(rows)  # (We don't need the column names.)
+    for chunk in rows:
+        geometries = [LazyGeometry.from_element(row[0], spatial_reference) for row in chunk if row[0] is not None]
+        if len(geometries) == 0:
+            continue
+        srid = geometries[0].srid
+        if any(geometry.srid != srid for geometry in geometries):
+            raise SpatialReferenceException('The geometries in an array must share a spatial reference.')
+        yield GeometryArray.from_wkb(wkbs=[geometry.wkb for geometry in geometries], spatial_reference=srid)
+
+
+class DjioGeometry(TypeDecorator):
+    """
+    This is a column type for djio geometries.  Values read from the column come back as :py:class:`LazyGeometry`
+    objects (so the EWKB isn't decoded until it's used), and djio geometries bound to the column are written as
+    EWKB straight from their coordinate blocks (so no Shapely geometries are created along the way, which makes bulk
+    `executemany` inserts a lot cheaper).  The constructor takes the same arguments as
+    :py:class:`geoalchemy2.types.Geometry`.
+
+    .. code-block:: python
+
+        class Place(Base):
+            __tablename__ = 'places'
+            id = Column(Integer, primary_key=True)
+            geom = Column(DjioGeometry(geometry_type='POINT', srid=4326))
+    """
+    impl = GeoAlchemyGeometry
+    cache_ok = True
+
+    @property
+    def srid(self) -> int or None:
+        """
+        Get the column's spatial reference ID (if it has one).
+
+        :return: the SRID (or `None`)
+        """
+        return self.impl.srid if self.impl.srid > 0 else None
+
+    def bind_expression(self, bindvalue):
+        # We hand the database EWKB (rather than the EWKT GeoAlchemy2 would use).
+        return func.ST_GeomFromEWKB(bindvalue, type_=self)
+
+    def column_expression(self, col):
+        # (GeoAlchemy2 does the same, but it types the expression with its own type, and then our result processor
+        # wouldn't be called.)
+        return func.ST_AsEWKB(col, type_=self)
+
+    def process_bind_param(self, value: Any, dialect) -> bytes or str or None:
+        """
+        Convert a value to EWKB for the database.
+
+        :param value: a djio geometry, lazy geometry, GeoAlchemy2 spatial element or EWKB
+        :param dialect: the database dialect
+        :return: the EWKB (SpatiaLite gets it as a hex string)
+        :raises GeometryException: if the value can't be converted to a geometry
+        """
+        if value is None:
+            return None
+        ewkb = self._to_ewkb(value)
+        # SpatiaLite's GeomFromEWKB() wants a hex string.
+        return ewkb.hex() if dialect.name == 'sqlite' else ewkb
+
+    def _to_ewkb(self, value: Any) -> bytes:
+        """
+        Convert a value to EWKB.
+
+        :param value: a djio geometry, lazy geometry, GeoAlchemy2 spatial element or EWKB
+        :return: the EWKB
+        """
+        # Lazy geometries that haven't been decoded (and carry their SRID) can go back just as they came.
+        if isinstance(value, LazyGeometry):
+            if not value.is_decoded and _read_wkb_header(value.wkb, 0)[3] == value.srid:
+                return self._check_srid(value.wkb, value.srid)
+            value = value.geometry
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            wkb = bytes(value)
+            srid = _read_wkb_header(wkb, 0)[3]
+            if srid is None:
+                raise GeometryException('Binary values must be EWKB with an SRID.')
+            return self._check_srid(wkb, srid)
+        elif isinstance(value, (WKBElement, WKTElement)):
+            value = Geometry.from_geoalchemy2(value, spatial_reference=(
+                self.srid if _spatial_element_srid(value) is None else None))
+        if not isinstance(value, Geometry):
+            raise GeometryException('{} cannot be bound to a geometry column.'.format(type(value).__name__))
+        # If the column has a spatial reference and the geometry is in another one, transform it.
+        if self.srid is not None and value.spatial_reference.srid != self.srid:
+            value = value.transform(spatial_reference=self.srid)
+        return _geometry_wkb(value, srid=value.spatial_reference.srid)
+
+    def _check_srid(self, ewkb: bytes, srid: int) -> bytes:
+        """
+        Make sure EWKB that's going straight to the database is in the column's spatial reference.
+
+        :param ewkb: the EWKB
+        :param srid: the EWKB's SRID
+        :return: the EWKB
+        :raises SpatialReferenceException: if the SRID isn't the column's
+        """
+        if self.srid is not None and srid != self.srid:
+            raise SpatialReferenceException(
+                'The EWKB has SRID {} but the column has SRID {}.'.format(srid, self.srid))
+        return ewkb
+
+    def process_result_value(self, value: Optional[WKBElement], dialect) -> Optional[LazyGeometry]:
+        """
+        Convert the GeoAlchemy2 element that comes back from the database to a lazy djio geometry.
+
+        :param value: the WKB element
+        :param dialect: the database dialect
+        :return: the lazy geometry
+        """
+        if value is None:
+            return None
+        return LazyGeometry.from_element(value, spatial_reference=(
+            self.srid if _spatial_element_srid(value) is None else None))
+
+
+def array_parameters(array: GeometryArray,
+                     name: str = 'geom',
+                     values: Iterable[Dict[str, Any]] = None,
+                     spatial_reference: SpatialReference or int = None) -> List[Dict[str, Any]]:
+    """
+    Create the parameters for a bulk (`executemany`) insert of a geometry array into a :py:class:`DjioGeometry`
+    column.  The EWKB is written straight from the array's coordinates, so neither djio nor Shapely geometries are
+    created.
+
+    .. code-block:: python
+
+        connection.execute(places.insert(), array_parameters(array, 'geom', ({'name': n} for n in names)))
+
+    :param array: the geometry array
+    :param name: the name of the geometry parameter (usually the column name)
+    :param values: the other parameters for each geometry
+    :param spatial_reference: the column's spatial reference (If you don't supply one, the geometries are written in
+        the array's spatial reference.)
+    :return: the parameters (one dictionary for each geometry)
+    """
+    wkbs = array.iter_wkb(ewkb=True, spatial_reference=spatial_reference)
+    if values is None:
+        return [{name: wkb} for wkb in wkbs]
+    parameters = []
+    for wkb, _values in zip(wkbs, values):
+        _parameters = dict(_values)
+        _parameters[name] = wkb
+        parameters.append(_parameters)
+    return parameters
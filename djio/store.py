@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.store
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Parsing the same reference layers over and over again?  Store them once and map them in.
+"""
+
+from .arrays import GeometryArray, _buffer_sections, _read_buffer
+from .geometry import Geometry, GeometryException, SpatialReference
+import mmap
+import numpy as np
+from typing import Iterable, Iterator
+
+
+_MAGIC: bytes = b'DJGS'  #: the bytes that identify a djio geometry store file
+
+
+class GeometryStore(object):
+    """
+    A geometry store is a file that holds a :py:class:`djio.arrays.GeometryArray` (a header with the SRID, the
+    coordinate block, the offsets, precomputed envelopes and hash values) laid out so that it can be memory-mapped.
+    Opening a store doesn't read (or parse) any geometries: the columns are read-only views into the mapped file and
+    geometries are only decoded when they're requested.
+    """
+
+    def __init__(self, path: str):
+        """
+
+        :param path: the path to the store file
+        """
+        self._path: str = path
+        with open(path, 'rb') as f:
+            self._mmap: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._array: GeometryArray = _read_buffer(memoryview(self._mmap), magic=_MAGIC)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def __enter__(self) -> 'GeometryStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, index: int) -> Geometry:
+        """
+        Decode a single geometry from the store.
+
+        :param index: the index of the geometry
+        :return: the geometry
+        """
+        return self.array[index]
+
+    def __iter__(self) -> Iterator[Geometry]:
+        return iter(self.array)
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path to the store file.
+
+        :return: the path
+        """
+        return self._path
+
+    @property
+    def array(self) -> GeometryArray:
+        """
+        Get the read-only geometry array backed by the store file.
+
+        :return: the geometry array
+        :raises GeometryException: if the store has been closed
+        """
+        if self._array is None:
+            raise GeometryException('The store is closed.')
+        return self._array
+
+    @property
+    def spatial_reference(self) -> SpatialReference:
+        """
+        Get the spatial reference shared by all of the geometries in the store.
+
+        :return: the spatial reference
+        """
+        return self.array.spatial_reference
+
+    @property
+    def envelopes(self) -> np.ndarray:
+        """
+        Get the precomputed envelopes of all the geometries in the store.
+
+        :return: a (G, 4) array in which each row is the (min_x, min_y, max_x, max_y) of a geometry
+        """
+        return self.array.envelopes()
+
+    @property
+    def djiohashes(self) -> np.ndarray:
+        """
+        Get the precomputed hash values of all the geometries in the store.
+
+        :return: a (G, 15) array of bytes in which each row is the hash value of a geometry
+        """
+        return self.array.djiohashes()
+
+    def intersecting(self, min_x: float, min_y: float, max_x: float, max_y: float) -> np.ndarray:
+        """
+        Find the geometries whose envelopes intersect a bounding box (without decoding any geometries).
+
+        :param min_x: the minimum X coordinate of the bounding box
+        :param min_y: the minimum Y coordinate of the bounding box
+        :param max_x: the maximum X coordinate of the bounding box
+        :param max_y: the maximum Y coordinate of the bounding box
+        :return: the indexes of the geometries whose envelopes intersect the bounding box
+        """
+        envelopes = self.envelopes
+        return np.flatnonzero(
+            (envelopes[:, 0] <= max_x) & (envelopes[:, 2] >= min_x) &
+            (envelopes[:, 1] <= max_y) & (envelopes[:, 3] >= min_y)
+        )
+
+    def close(self):
+        """
+        Close the store.  Views obtained through :py:attr:`array` are no longer valid after the store is closed.
+        """
+        if self._array is None:
+            return
+        self._array = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Somebody is still holding views into the file.  It'll be unmapped when they let go.
+
+    @staticmethod
+    def open(path: str) -> 'GeometryStore':
+        """
+        Open a geometry store file.
+
+        :param path: the path to the store file
+        :return: the geometry store
+        """
+        return GeometryStore(path=path)
+
+    @staticmethod
+    def write(path: str,
+              geometries: GeometryArray or Iterable[Geometry],
+              spatial_reference: SpatialReference or int = None):
+        """
+        Write a geometry store file.
+
+        :param path: the path to the store file
+        :param geometries: a geometry array, or the geometries to put in the store
+        :param spatial_reference: the spatial reference of the store (This is only used when the geometries aren't
+            already in a geometry array.  Geometries in other spatial references are transformed.)
+        """
+        array = (geometries if isinstance(geometries, GeometryArray)
+                 else GeometryArray.from_geometries(geometries, spatial_reference=spatial_reference))
+        header, sections, size = _buffer_sections(array, magic=_MAGIC)
+        with open(path, 'wb') as f:
+            f.write(header)
+            for column, offset, dtype in sections:
+                # Pad up to the column's (aligned) offset, then write the column without making another copy.
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(np.ascontiguousarray(column, dtype=dtype).reshape(-1).view(np.uint8).data)
+            f.write(b'\0' * (size - f.tell()))
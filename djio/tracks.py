@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: djio.tracks
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Following something around for hours?  Build the track as you go.
+"""
+
+from .geodesy import geodesic_distances
+from .geometry import (EnvelopeTuple, Geometry, GeometryException, GeometryType, Polyline, Projector, ProtoGeometry,
+                       SpatialReference)
+from .hashing import DjiohashV1Accumulator
+import math
+import numpy as np
+from shapely.geometry import LineString
+from shapely.geometry.base import BaseGeometry
+from typing import Callable, List
+
+
+class TrackBuilder(ProtoGeometry):
+    """
+    A track builder is a proto-geometry for polylines that arrive one point (or one batch of points) at a time and
+    may never end.  As points arrive it
+
+    * decimates them:  a point is only kept if it's at least `min_distance` from the last point that was kept and
+      the track turns by at least `min_angle` there (The most recent point is always kept, so the track always ends
+      where the last point was.);
+    * keeps a running envelope, length and hash value for the current segment (so you don't need to build a
+      :py:class:`djio.geometry.Polyline` to know them); and
+    * emits the current segment as a :py:class:`djio.geometry.Polyline` whenever it reaches `max_vertices` (or when
+      you call :py:func:`TrackBuilder.flush`) and starts a new segment at the end of the last one, so memory use
+      stays bounded.
+
+    A track only ever has one part (and no interior rings), so it can only become a polyline.
+    """
+
+    def __init__(self,
+                 spatial_reference: SpatialReference or int = 4326,
+                 min_distance: float = 0.0,
+                 min_angle: float = 0.0,
+                 max_vertices: int = None,
+                 on_segment: Callable[[Polyline], None] = None,
+                 projector: Projector = None,
+                 capacity: int = 1024):
+        """
+        Create a track builder with an empty first segment.
+
+        :param spatial_reference: the spatial reference of the track (Points in other spatial references are
+            transformed as they're added.)
+        :param min_distance: the smallest distance (in meters if the spatial reference is geographic, otherwise in
+            the units of the spatial reference) a kept point may be from the previous kept point
+        :param min_angle: the smallest change in heading (in degrees) at a kept point
+        :param max_vertices: the number of vertices at which a segment is emitted (If you don't supply a number,
+            segments are only emitted when you call :py:func:`TrackBuilder.flush`.)
+        :param on_segment: a function that receives each segment as it's emitted (If you don't supply one, segments
+            wait for you to call :py:func:`TrackBuilder.pop_segments`.)
+        :param projector: the projector
+        :param capacity: the number of coordinates for which room is set aside up front
+        """
+        if max_vertices is not None and max_vertices < 2:
+            raise ValueError('A segment needs at least two vertices.')
+        super().__init__(spatial_reference=spatial_reference, projector=projector, capacity=capacity)
+        self._min_distance: float = min_distance
+        self._min_angle: float = math.radians(min_angle)
+        self._max_vertices: int or None = max_vertices
+        self._on_segment: Callable[[Polyline], None] or None = on_segment
+        self._geodesic: bool = self._spatial_reference.is_geographic  #: Are distances measured on the ellipsoid?
+        self._segments: List[Polyline] = []  #: the segments waiting to be popped
+        self._pending: np.ndarray or None = None  #: the most recent (not yet committed) point
+        self._received_count: int = 0  #: the number of points received
+        self._total_length: float = 0.0  #: the length of the track (through the last committed point)
+        # These are the running metrics for the current segment.
+        self._length: float = 0.0
+        self._bounds: List[float] = [math.inf, math.inf, -math.inf, -math.inf]
+        self._hash_xy: DjiohashV1Accumulator = DjiohashV1Accumulator()
+        self._hash_xyz: DjiohashV1Accumulator = DjiohashV1Accumulator()
+        self._all_z: bool = True
+
+    def __len__(self) -> int:
+        return self.vertex_count
+
+    def clear(self):
+        """
+        Clear the current contents (including any segments that haven't been popped).
+        """
+        super().clear()
+        self._segments = []
+        self._pending = None
+        self._received_count = 0
+        self._total_length = 0.0
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        """
+        Reset the running metrics for the current segment.
+        """
+        self._length = 0.0
+        self._bounds = [math.inf, math.inf, -math.inf, -math.inf]
+        self._hash_xy = DjiohashV1Accumulator()
+        self._hash_xyz = DjiohashV1Accumulator()
+        self._all_z = True
+
+    @property
+    def received_count(self) -> int:
+        """
+        Get the number of points the track builder has received.
+
+        :return: the number of points
+        """
+        return self._received_count
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        Get the number of vertices in the current segment (after decimation).
+
+        :return: the number of vertices
+        """
+        return self._count + (1 if self._pending is not None else 0)
+
+    @property
+    def length(self) -> float:
+        """
+        Get the length of the current segment.
+
+        :return: the length (in meters if the spatial reference is geographic, otherwise in the units of the spatial
+            reference)
+        """
+        return self._length + self._pending_length()
+
+    @property
+    def total_length(self) -> float:
+        """
+        Get the length of the whole track (every segment since the track builder was created or cleared).
+
+        :return: the length (in meters if the spatial reference is geographic, otherwise in the units of the spatial
+            reference)
+        """
+        return self._total_length + self._pending_length()
+
+    @property
+    def envelope_tuple(self) -> EnvelopeTuple:
+        """
+        Get the envelope of the current segment.
+
+        :return: the envelope tuple
+        """
+        min_x, min_y, max_x, max_y = self._bounds
+        if self._pending is not None:
+            min_x, min_y = min(min_x, self._pending[0]), min(min_y, self._pending[1])
+            max_x, max_y = max(max_x, self._pending[0]), max(max_y, self._pending[1])
+        if math.isinf(min_x):
+            min_x = min_y = max_x = max_y = math.nan
+        return EnvelopeTuple(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y, srid=self._spatial_reference.srid)
+
+    def djiohash(self) -> bytearray:
+        """
+        Get the hash value of the current segment.  (This is the same value you'd get from the
+        :py:class:`djio.geometry.Polyline` returned by :py:func:`TrackBuilder.to_polyline`.)
+
+        :return: the hash value
+        """
+        has_z = self._all_z and (self._pending is None or not math.isnan(self._pending[2]))
+        accumulator = (self._hash_xyz if has_z else self._hash_xy).copy()
+        if self._pending is not None:
+            accumulator.update(self._pending if has_z else self._pending[0:2])
+        return accumulator.digest(geometry_type_code=GeometryType.POLYLINE, srid=self._spatial_reference.srid)
+
+    def _distance(self, a: np.ndarray, b: np.ndarray) -> float:
+        """
+        Measure the distance between two coordinates.
+
+        :param a: the first coordinate
+        :param b: the second coordinate
+        :return: the distance
+        """
+        if self._geodesic:
+            return float(geodesic_distances(a[0], a[1], b[0], b[1]))
+        return math.hypot(b[0] - a[0], b[1] - a[1])
+
+    def _distances(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Measure the distances between two blocks of coordinates (all at once).
+
+        :param a: an (N, 3) array of the first coordinates
+        :param b: an (N, 3) array of the second coordinates
+        :return: the distances
+        """
+        if self._geodesic:
+            return np.asarray(geodesic_distances(a[:, 0], a[:, 1], b[:, 0], b[:, 1]), dtype=np.float64)
+        return np.hypot(b[:, 0] - a[:, 0], b[:, 1] - a[:, 1])
+
+    def _pending_length(self) -> float:
+        """
+        Get the length of the segment between the last committed point and the pending point.
+
+        :return: the length
+        """
+        if self._pending is None or self._count == 0:
+            return 0.0
+        return self._distance(self._buffer[self._count - 1], self._pending)
+
+    def _keep(self, candidate: np.ndarray, following: np.ndarray) -> bool:
+        """
+        Decide whether or not a candidate point should be kept, now that we know the point that follows it.
+
+        :param candidate: the candidate point
+        :param following: the point that follows it
+        :return: `True` if the candidate should be kept
+        """
+        previous = self._buffer[self._count - 1]
+        if self._min_distance > 0.0 and self._distance(previous, candidate) < self._min_distance:
+            return False
+        if self._min_angle > 0.0:
+            heading_in = math.atan2(candidate[1] - previous[1], candidate[0] - previous[0])
+            heading_out = math.atan2(following[1] - candidate[1], following[0] - candidate[0])
+            turn = abs((heading_out - heading_in + math.pi) % (2.0 * math.pi) - math.pi)
+            if turn < self._min_angle:
+                return False
+        return True
+
+    def _append_one(self, x: float, y: float, z: float):
+        """
+        Receive a single coordinate (which already conforms to the track).
+
+        :param x: the X coordinate
+        :param y: the Y coordinate
+        :param z: the Z coordinate (or NaN)
+        """
+        self._received_count += 1
+        point = np.array([x, y, z], dtype=np.float64)
+        # The very first point is always kept.
+        if self._count == 0 and self._pending is None:
+            self._commit(point)
+            return
+        # Now that we know where the track goes next, we can decide about the pending point.
+        if self._pending is not None and self._keep(self._pending, point):
+            self._commit(self._pending)
+        self._pending = point
+
+    def _append(self, coordinates: np.ndarray):
+        """
+        Receive a block of (x, y, z) coordinates (which already conform to the track).
+
+        :param coordinates: an (N, 3) array of coordinates
+        """
+        if len(coordinates) == 0:
+            return
+        self._received_count += len(coordinates)
+        # The very first point is always kept.
+        if self._count == 0 and self._pending is None:
+            self._commit(coordinates[0])
+            coordinates = coordinates[1:]
+            if len(coordinates) == 0:
+                return
+        # The candidates are the pending point followed by the new points.  Each candidate is decided when the point
+        # after it arrives, so the last one becomes the new pending point.
+        candidates = coordinates if self._pending is None else np.vstack([self._pending, coordinates])
+        last = len(candidates) - 1
+        # A candidate can't be kept if it's closer than the minimum distance to the last kept point, and it can't be
+        # that far away unless the path to it is at least that long.  So we measure the path once (for the whole
+        # batch) and skip straight past the candidates that are too close to bother with.  (The tolerance makes sure
+        # rounding in the running sum never skips a candidate that would have been kept.)
+        path: np.ndarray or None = None
+        reach = 0.0  # the path length to the last kept point
+        threshold = 0.0
+        if self._min_distance > 0.0:
+            previous = self._buffer[self._count - 1:self._count]
+            steps = self._distances(np.vstack([previous, candidates[:-1]]), candidates)
+            path = np.cumsum(steps)
+            threshold = self._min_distance - 1e-9 * (self._min_distance + path[-1])
+        i = 0
+        while i < last:
+            if path is not None:
+                i = min(max(i, int(np.searchsorted(path, reach + threshold, side='left'))), last)
+                if i == last:
+                    break
+            if self._keep(candidates[i], candidates[i + 1]):
+                self._commit(candidates[i])
+                if path is not None:
+                    reach = path[i]
+            i += 1
+        self._pending = candidates[last].copy()
+
+    def _commit(self, point: np.ndarray, emit: bool = True):
+        """
+        Add a point to the current segment and update the running metrics.
+
+        :param point: the (x, y, z) coordinate
+        :param emit: `True` to emit the segment if the point fills it
+        """
+        if self._count > 0:
+            distance = self._distance(self._buffer[self._count - 1], point)
+            self._length += distance
+            self._total_length += distance
+        super()._append_one(point[0], point[1], point[2])
+        self._bounds = [min(self._bounds[0], point[0]), min(self._bounds[1], point[1]),
+                        max(self._bounds[2], point[0]), max(self._bounds[3], point[1])]
+        self._hash_xy.update(point[0:2])
+        if math.isnan(point[2]):
+            self._all_z = False
+        else:
+            self._hash_xyz.update(point)
+        # If the segment is full, it's time to send it on its way.
+        if emit and self._max_vertices is not None and self._count >= self._max_vertices:
+            self._emit()
+
+    def _emit(self, deliver: bool = True) -> Polyline or None:
+        """
+        Emit the committed part of the current segment and start a new segment where it ended.
+
+        :param deliver: `True` to hand the segment to the `on_segment` function (or queue it)
+        :return: the segment (or `None` if there weren't enough vertices to make one)
+        """
+        if self._count < 2:
+            return None
+        segment: Polyline = Geometry.from_shapely(shapely_geometry=LineString(self._get_coordinates(pending=False)),
+                                                  spatial_reference=self._spatial_reference)
+        # The next segment starts where this one ended.
+        last = self._buffer[self._count - 1].copy()
+        self._count = 0
+        self._ring_starts = [0]
+        self._part_starts = [0]
+        self._reset_metrics()
+        self._commit(last)
+        if not deliver:
+            return segment
+        if self._on_segment is not None:
+            self._on_segment(segment)
+        else:
+            self._segments.append(segment)
+        return segment
+
+    def flush(self) -> Polyline or None:
+        """
+        Finish the current segment (including the most recent point) now and start a new segment where it ended.
+        (The segment is returned to you rather than handed to the `on_segment` function or queued.)
+
+        :return: the segment (or `None` if there weren't enough vertices to make one)
+        """
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._commit(pending, emit=False)
+        return self._emit(deliver=False)
+
+    def pop_segments(self) -> List[Polyline]:
+        """
+        Take the segments that have been emitted (and not yet taken).
+
+        :return: the segments
+        """
+        segments, self._segments = self._segments, []
+        return segments
+
+    def _get_coordinates(self, pending: bool = True) -> np.ndarray:
+        """
+        Get the coordinates of the current segment.  (They only have Z values if every point had one.)
+
+        :param pending: `True` to include the most recent point
+        :return: an (N, 2) or (N, 3) array of coordinates
+        """
+        coordinates = self._buffer[:self._count]
+        if pending and self._pending is not None:
+            coordinates = np.vstack([coordinates, self._pending])
+        return coordinates if not np.isnan(coordinates[:, 2]).any() else coordinates[:, 0:2]
+
+    def to_shapely(self, geometry_type: GeometryType = GeometryType.POLYLINE) -> BaseGeometry:
+        """
+        Create a Shapely line string from the current segment (including the most recent point).
+
+        :param geometry_type: the geometry type (which must be :py:attr:`GeometryType.POLYLINE`)
+        :return: the Shapely geometry
+        :raises GeometryException: if the geometry type isn't a polyline, or the segment is empty
+        """
+        if geometry_type != GeometryType.POLYLINE:
+            raise GeometryException('A track can only be a polyline.')
+        return self.to_polyline().shapely_geometry
+
+    def start_part(self):
+        """
+        A track has only one part.
+
+        :raises GeometryException: always
+        """
+        raise GeometryException('A track has only one part.')
+
+    def start_interior(self):
+        """
+        A track has no interior rings.
+
+        :raises GeometryException: always
+        """
+        raise GeometryException('A track has no interior rings.')
+
+    def to_polygon(self):
+        """
+        A track can only be a polyline.
+
+        :raises GeometryException: always
+        """
+        raise GeometryException('A track can only be a polyline.')
+
+    def to_multipolyline(self):
+        """
+        A track can only be a polyline.  (Use :py:func:`TrackBuilder.to_polyline`.)
+
+        :raises GeometryException: always
+        """
+        raise GeometryException('A track can only be a polyline.')
+
+    def to_multipolygon(self):
+        """
+        A track can only be a polyline.
+
+        :raises GeometryException: always
+        """
+        raise GeometryException('A track can only be a polyline.')
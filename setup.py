@@ -37,13 +37,14 @@ setup(
   install_requires=[
     'CaseInsensitiveDict>=1.0.0,<2',
     'GDAL>=2.1.0,<3',
-    'GeoAlchemy2>=0.4.0,<1'
-    'SQLAlchemy>=1.1.14,<2'
+    'GeoAlchemy2>=0.4.0,<1',
+    'SQLAlchemy>=1.4.40,<2',
     'measurement>=1.8.0,<2',
     'numpy>=1.13.3,<2',
+    'scipy>=1.0.0,<2',
     'Shapely>=1.6.1,<2'
   ],
-  python_requires=">=3.6.1",
+  python_requires=">=3.8",
   license='MIT',
   author='Pat Daburu',
   author_email='pat@daburu.net',
@@ -67,6 +68,6 @@ setup(
 
     # Specify the Python versions you support here. In particular, ensure
     # that you indicate whether you support Python 2, Python 3 or both.
-    'Programming Language :: Python :: 3.6',
+    'Programming Language :: Python :: 3.8',
   ],
 )
\ No newline at end of file
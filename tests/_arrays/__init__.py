@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: __init__.py
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+Let's test the arrays module!
+"""
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_GeometryArray
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.arrays import GeometryArray, _geometry_wkb
+from djio.geometry import Geometry, GeometryException, GeometryType
+from shapely.wkt import loads as loads_wkt
+
+
+class TestGeometryArraySuite(unittest.TestCase):
+
+    wkts = [
+        'POINT(-94.1 46.5)',
+        'LINESTRING(0 0, 1 1, 2 1)',
+        'POLYGON((0 0, 4 0, 4 4, 0 4, 0 0), (1 1, 2 1, 2 2, 1 1))'
+    ]
+
+    def test_fromWkb_geometryTypesAndOffsets(self):
+        wkbs = [loads_wkt(wkt).wkb for wkt in self.wkts]
+        arr: GeometryArray = GeometryArray.from_wkb(wkbs=wkbs, spatial_reference=4326)
+        self.assertEqual(3, len(arr))
+        self.assertEqual(
+            [GeometryType.POINT, GeometryType.POLYLINE, GeometryType.POLYGON],
+            list(arr.geometry_types)
+        )
+        self.assertEqual((13, 2), arr.coordinates.shape)
+        self.assertEqual([0, 1, 4, 13], list(arr.vertex_offsets))
+        self.assertEqual(4326, arr.spatial_reference.srid)
+
+    def test_fromWkb_getItem_matchesWkt(self):
+        wkbs = [loads_wkt(wkt).wkb for wkt in self.wkts]
+        arr: GeometryArray = GeometryArray.from_wkb(wkbs=wkbs, spatial_reference=4326)
+        for wkt, geometry in zip(self.wkts, arr):
+            self.assertTrue(loads_wkt(wkt).equals(geometry.shapely_geometry))
+            self.assertEqual(4326, geometry.spatial_reference.srid)
+
+    def test_fromWkbMany_listAndColumnar(self):
+        wkbs = [loads_wkt(wkt).wkb for wkt in self.wkts]
+        geometries = Geometry.from_wkb_many(wkbs=wkbs, spatial_reference=4326)
+        self.assertEqual(
+            [GeometryType.POINT, GeometryType.POLYLINE, GeometryType.POLYGON],
+            [g.geometry_type for g in geometries]
+        )
+        arr = Geometry.from_wkb_many(wkbs=wkbs, spatial_reference=4326, columnar=True)
+        self.assertEqual(len(geometries), len(arr))
+
+    def test_fromWktMany_sharesSpatialReference(self):
+        geometries = Geometry.from_wkt_many(wkts=self.wkts, spatial_reference=3857)
+        self.assertEqual(3, len(geometries))
+        self.assertTrue(geometries[0].spatial_reference is geometries[2].spatial_reference)
+
+    def test_lengthsAndAreas_matchShapely(self):
+        wkts = self.wkts + ['POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (2 2, 4 2, 4 4, 2 4, 2 2))']
+        arr: GeometryArray = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=3857)
+        np.testing.assert_allclose([loads_wkt(wkt).length for wkt in wkts], arr.lengths())
+        np.testing.assert_allclose([loads_wkt(wkt).area for wkt in wkts], arr.areas())
+
+    def test_flipCoordinates_swapsColumns(self):
+        arr: GeometryArray = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in self.wkts], spatial_reference=3857)
+        flipped = arr.flip_coordinates()
+        self.assertEqual(arr.coordinates[:, ::-1].tolist(), flipped.coordinates.tolist())
+        self.assertEqual(arr.ring_offsets.tolist(), flipped.ring_offsets.tolist())
+        self.assertEqual(1, len(flipped[2].shapely_geometry.interiors))
+
+    def test_fromWkb_multiPart_matchesFromShapely(self):
+        wkts = ['MULTIPOLYGON(((0 0, 4 0, 4 4, 0 4, 0 0), (1 1, 2 1, 2 2, 1 1)), ((10 10, 12 10, 12 12, 10 10)))',
+                'MULTILINESTRING((0 0, 1 1), (2 2, 3 3, 4 4))',
+                'MULTIPOINT(1 2, 3 4)',
+                'POINT(5 5)']
+        arr: GeometryArray = GeometryArray.from_wkb([loads_wkt(wkt).wkb for wkt in wkts], spatial_reference=3857)
+        self.assertEqual([GeometryType.MULTIPOLYGON, GeometryType.MULTIPOLYLINE, GeometryType.MULTIPOINT,
+                          GeometryType.POINT], arr.geometry_types.tolist())
+        self.assertEqual([0, 2, 4, 6, 7], arr.geometry_offsets.tolist())
+        for wkt, geometry in zip(wkts, arr):
+            self.assertTrue(loads_wkt(wkt).equals(geometry.shapely_geometry))
+        other = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=3857)
+        self.assertEqual(arr.part_offsets.tolist(), other.part_offsets.tolist())
+        np.testing.assert_array_equal(arr.djiohashes(), other.djiohashes())
+        np.testing.assert_allclose([loads_wkt(wkt).area for wkt in wkts], arr.areas())
+        np.testing.assert_allclose([loads_wkt(wkt).length for wkt in wkts], arr.lengths())
+
+    def test_fromShapely_geometryCollection_raises(self):
+        with self.assertRaises(GeometryException):
+            GeometryArray.from_shapely([loads_wkt('GEOMETRYCOLLECTION(POINT(1 2))')], spatial_reference=3857)
+
+    def test_iterWkb_matchesShapely(self):
+        wkts = self.wkts + ['LINESTRING Z(0 0 1, 1 1 2)',
+                            'MULTIPOLYGON(((0 0, 4 0, 4 4, 0 0)), ((9 9, 8 9, 8 8, 9 9)))',
+                            'MULTILINESTRING((0 0, 1 1), (2 2, 3 3, 4 4))',
+                            'MULTIPOINT(1 2, 3 4)']
+        for wkt in wkts:
+            self.assertEqual(loads_wkt(wkt).wkb, _geometry_wkb(Geometry.from_wkt(wkt=wkt, spatial_reference=3857)))
+        collection = 'GEOMETRYCOLLECTION(POINT(1 2), LINESTRING(0 0, 1 1), POLYGON((0 0, 4 0, 4 4, 0 0)))'
+        self.assertEqual(loads_wkt(collection).wkb,
+                         _geometry_wkb(Geometry.from_wkt(wkt=collection, spatial_reference=3857)))
+        wkts = [wkt for wkt in wkts if ' Z' not in wkt]
+        arr: GeometryArray = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=3857)
+        self.assertEqual([loads_wkt(wkt).wkb for wkt in wkts], list(arr.iter_wkb()))
+        # EWKB carries the SRID, and reads back into the same array.
+        ewkbs = list(arr.iter_wkb(ewkb=True))
+        self.assertEqual(0x20000000, int.from_bytes(ewkbs[0][1:5], 'little') & 0x20000000)
+        self.assertEqual(3857, int.from_bytes(ewkbs[0][5:9], 'little'))
+        np.testing.assert_array_equal(arr.djiohashes(),
+                                      GeometryArray.from_wkb(ewkbs, spatial_reference=3857).djiohashes())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_geodesy
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.geodesy import geodesic_areas, geodesic_distances, geodesic_lengths
+from djio.geometry import Geometry, Point
+
+
+class TestGeodesySuite(unittest.TestCase):
+
+    def test_geodesicDistances_flindersPeakToBuninyong(self):
+        # This is the worked example from Vincenty's paper.
+        distance = geodesic_distances(144.42486788888888, -37.95103341666667, 143.92649552777777, -37.65282113888889)
+        self.assertAlmostEqual(54972.271, float(distance), places=3)
+
+    def test_geodesicDistances_batch_returnsArray(self):
+        distances = geodesic_distances([0.0, 0.0, 10.0], [0.0, 0.0, 45.0], [0.0, 1.0, 10.0], [0.0, 0.0, 45.0])
+        self.assertEqual((3,), distances.shape)
+        self.assertEqual(0.0, distances[0])
+        self.assertAlmostEqual(111319.491, distances[1], places=3)
+        self.assertEqual(0.0, distances[2])
+
+    def test_geodesicDistances_nearlyAntipodal_fallsBack(self):
+        distance = float(geodesic_distances(0.0, 0.0, 179.7, 0.0))
+        self.assertTrue(19900000.0 < distance < 20100000.0)
+
+    def test_geodesicAreas_oneDegreeSquare(self):
+        polygons = Geometry.from_wkt_many([
+            'POLYGON((0 0, 1 0, 1 1, 0 1, 0 0))',
+            'POLYGON((0 0, 1 0, 1 1, 0 1, 0 0), (0.25 0.25, 0.75 0.25, 0.75 0.75, 0.25 0.75, 0.25 0.25))',
+            'LINESTRING(0 0, 1 0, 1 1)',
+            'POINT(1 2)'
+        ], spatial_reference=4326)
+        areas = geodesic_areas(polygons)
+        self.assertEqual(np.float64, areas.dtype)
+        # The reference value (12308778361.469 square meters) is for a polygon with geodesic edges.
+        self.assertAlmostEqual(1.0, areas[0] / 12308778361.469, places=5)
+        self.assertTrue(areas[0] * 0.74 < areas[1] < areas[0] * 0.76)
+        self.assertEqual([0.0, 0.0], areas[2:].tolist())
+
+    def test_geodesicLengths_lineAndPerimeter(self):
+        geometries = Geometry.from_wkt_many([
+            'LINESTRING(0 0, 1 0)',
+            'POLYGON((0 0, 1 0, 1 1, 0 1, 0 0))',
+            'POINT(1 2)'
+        ], spatial_reference=4326)
+        lengths = geodesic_lengths(geometries)
+        self.assertAlmostEqual(111319.491, lengths[0], places=3)
+        self.assertAlmostEqual(443770.917, lengths[1], places=3)
+        self.assertEqual(0.0, lengths[2])
+
+    def test_getGeodesicLength_polyline(self):
+        polyline = Geometry.from_wkt('LINESTRING(0 0, 1 0)', spatial_reference=4326)
+        self.assertAlmostEqual(111319.491, polyline.get_geodesic_length(), places=3)
+
+    def test_getGeodesicArea_polygon(self):
+        polygon = Geometry.from_wkt('POLYGON((0 0, 1 0, 1 1, 0 1, 0 0))', spatial_reference=4326)
+        self.assertAlmostEqual(1.0, polygon.get_geodesic_area() / 12308778361.469, places=5)
+
+    def test_getGeodesicDistance_points(self):
+        p1 = Point.from_coordinates(x=0.0, y=0.0, spatial_reference=4326)
+        p2 = Point.from_coordinates(x=1.0, y=0.0, spatial_reference=4326)
+        self.assertAlmostEqual(111319.491, p1.get_geodesic_distance(p2), places=3)
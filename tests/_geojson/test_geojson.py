@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_geojson
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+from io import StringIO
+import json
+import unittest
+from djio.arrays import GeometryArray
+from djio.geojson import Feature, FeatureCollectionWriter, loads_features, read_features
+from djio.geometry import Geometry, GeometryException, GeometryType
+from shapely.wkt import loads as loads_wkt
+
+
+class TestGeoJsonSuite(unittest.TestCase):
+
+    wkts = [
+        'POINT(-93.25 44.975)',
+        'LINESTRING(-93.5 45, -93 45.125)',
+        'POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (1 1, 2 1, 2 2, 1 2, 1 1))',
+        'MULTIPOINT(1 2, 3 4)',
+        'MULTILINESTRING((0 0, 1 1), (2 2, 3 3, 4 4))',
+        'MULTIPOLYGON(((0 0, 10 0, 10 10, 0 10, 0 0)), ((20 20, 22 20, 22 22, 20 20)))',
+        'GEOMETRYCOLLECTION(POINT(1 2), LINESTRING(0 0, 1 1), POLYGON((0 0, 4 0, 4 4, 0 0)))'
+    ]
+
+    def test_toGeoJson_fromGeoJson_roundTrips(self):
+        for wkt in self.wkts:
+            geometry = Geometry.from_wkt(wkt=wkt, spatial_reference=4326)
+            geojson = geometry.to_geojson()
+            # Whatever we write, the standard library must be able to read.
+            mapping = json.loads(geojson)
+            self.assertEqual(loads_wkt(wkt).geom_type, mapping['type'])
+            copy = Geometry.from_geojson(geojson)
+            self.assertEqual(geometry.geometry_type, copy.geometry_type)
+            self.assertTrue(copy.shapely_geometry.equals(geometry.shapely_geometry), wkt)
+
+    def test_toGeoJson_precision_trimsZeros(self):
+        geometry = Geometry.from_wkt(wkt='LINESTRING(-93.123456789 45, 1.5 -0.000001)', spatial_reference=4326)
+        self.assertEqual('{"type":"LineString","coordinates":[[-93.123457,45],[1.5,-0.000001]]}',
+                         geometry.to_geojson())
+        self.assertEqual('{"type":"LineString","coordinates":[[-93.12,45],[1.5,-0]]}',
+                         geometry.to_geojson(precision=2))
+        self.assertEqual('{"type":"LineString","coordinates":[[-93,45],[2,-0]]}',
+                         geometry.to_geojson(precision=0))
+
+    def test_fromGeoJson_notGeometry_raises(self):
+        with self.assertRaises(GeometryException):
+            Geometry.from_geojson('{"type":"Feature","properties":{},"geometry":null}')
+
+    def test_featureCollectionWriter_readFeatures_roundTrips(self):
+        geometries = [Geometry.from_wkt(wkt=wkt, spatial_reference=4326) for wkt in self.wkts]
+        stream = StringIO()
+        with FeatureCollectionWriter(stream) as writer:
+            writer.write_many(Feature(geometry=g, properties={'index': i, 'name': 'g"{}]'.format(i)}, id=i)
+                              for i, g in enumerate(geometries))
+            writer.write(None, properties={'empty': True})
+        self.assertEqual(len(geometries) + 1, len(writer))
+        text = stream.getvalue()
+        self.assertEqual(len(geometries) + 1, len(json.loads(text)['features']))
+        # Read the features back in tiny chunks to make sure nothing depends on where the chunks fall.
+        for chunk_size in [1, 7, 65536]:
+            features = list(read_features(StringIO(text), chunk_size=chunk_size))
+            self.assertEqual(len(geometries) + 1, len(features))
+            for i, (feature, geometry) in enumerate(zip(features, geometries)):
+                self.assertEqual(i, feature.id)
+                self.assertEqual({'index': i, 'name': 'g"{}]'.format(i)}, feature.properties)
+                self.assertEqual(4326, feature.geometry.spatial_reference.srid)
+                self.assertTrue(feature.geometry.shapely_geometry.equals(geometry.shapely_geometry))
+            self.assertIsNone(features[-1].geometry)
+            self.assertEqual({'empty': True}, features[-1].properties)
+
+    def test_writeArray_matchesWrite(self):
+        wkts = self.wkts[:-1]  # Geometry arrays don't hold mixed collections.
+        array = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=4326)
+        stream1, stream2 = StringIO(), StringIO()
+        with FeatureCollectionWriter(stream1, precision=3) as writer:
+            writer.write_array(array, properties=({'i': i} for i in range(len(wkts))))
+        with FeatureCollectionWriter(stream2, precision=3) as writer:
+            for i, wkt in enumerate(wkts):
+                writer.write(Geometry.from_wkt(wkt=wkt, spatial_reference=4326), properties={'i': i})
+        self.assertEqual(stream2.getvalue(), stream1.getvalue())
+
+    def test_readFeatures_crs_setsSpatialReference(self):
+        text = ('{"type":"FeatureCollection","features":[{"type":"Feature","properties":{},'
+                '"geometry":{"type":"Point","coordinates":[500000,5000000]}}],'
+                '"crs":{"type":"name","properties":{"name":"urn:ogc:def:crs:EPSG::26915"}}}')
+        # The CRS comes after the features here, so it can't apply to them...
+        feature = list(read_features(StringIO(text)))[0]
+        self.assertEqual(4326, feature.geometry.spatial_reference.srid)
+        # ...but when it comes first, it does.
+        text = ('{"type":"FeatureCollection",'
+                '"crs":{"type":"name","properties":{"name":"urn:ogc:def:crs:EPSG::26915"}},"features":[{'
+                '"type":"Feature","properties":{},"geometry":{"type":"Point","coordinates":[500000,5000000]}}]}')
+        feature = loads_features(text)[0]
+        self.assertEqual(GeometryType.POINT, feature.geometry.geometry_type)
+        self.assertEqual(26915, feature.geometry.spatial_reference.srid)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_Envelope
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import math
+import pickle
+import unittest
+from djio.arrays import GeometryArray
+from djio.geometry import Envelope, EnvelopeTuple, Geometry, PointTuple, SpatialReferenceException
+
+
+class TestEnvelopeSuite(unittest.TestCase):
+
+    def test_envelopeTuple_setOperations(self):
+        e1 = EnvelopeTuple(min_x=0.0, min_y=0.0, max_x=10.0, max_y=5.0, srid=3857)
+        e2 = EnvelopeTuple(min_x=8.0, min_y=4.0, max_x=12.0, max_y=9.0, srid=3857)
+        e3 = EnvelopeTuple(min_x=20.0, min_y=20.0, max_x=21.0, max_y=21.0, srid=3857)
+        self.assertEqual(50.0, e1.area)
+        self.assertTrue(e1.intersects(e2))
+        self.assertFalse(e1.intersects(e3))
+        self.assertFalse(e1.contains(e2))
+        self.assertTrue(e1.contains(PointTuple(x=1.0, y=1.0, z=None, srid=3857)))
+        self.assertEqual((0.0, 0.0, 12.0, 9.0, 3857), e1.union(e2))
+        self.assertEqual((-1.0, -2.0, 11.0, 7.0, 3857), e1.expand(1.0, 2.0))
+        self.assertTrue(e1.expand(1.0).contains(e1))
+
+    def test_envelopeTuple_isSlotted(self):
+        e1 = EnvelopeTuple(min_x=0.0, min_y=0.0, max_x=10.0, max_y=5.0, srid=3857)
+        with self.assertRaises(AttributeError):
+            e1.extra = 1
+
+    def test_fromGeometries_reducesBounds(self):
+        geometries = Geometry.from_wkt_many(['POINT(1 2)', 'LINESTRING(-3 4, 5 6)', 'POLYGON((0 -1, 2 -1, 2 0, 0 -1))'],
+                                            spatial_reference=3857)
+        self.assertEqual((-3.0, -1.0, 5.0, 6.0, 3857), EnvelopeTuple.from_geometries(geometries))
+        self.assertEqual((-3.0, -1.0, 5.0, 6.0, 3857),
+                         GeometryArray.from_geometries(geometries).envelope_tuple())
+
+    def test_fromGeometries_mixedSpatialReferences_raisesSpatialReferenceException(self):
+        geometries = (Geometry.from_wkt_many(['POINT(1 2)'], spatial_reference=3857) +
+                      Geometry.from_wkt_many(['POINT(1 2)'], spatial_reference=4326))
+        with self.assertRaises(SpatialReferenceException):
+            EnvelopeTuple.from_geometries(geometries)
+
+    def test_fromBoundsMany_empty_isNan(self):
+        self.assertTrue(math.isnan(EnvelopeTuple.from_bounds_many([], srid=3857).min_x))
+
+    def test_envelope_shapelyGeometryIsLazy(self):
+        envelope = Envelope(min_x=0.0, min_y=0.0, max_x=10.0, max_y=5.0, spatial_reference=3857)
+        self.assertEqual((0.0, 0.0, 10.0, 5.0), envelope.bounds)
+        self.assertTrue(envelope.intersects(Envelope(min_x=9.0, min_y=4.0, max_x=11.0, max_y=6.0,
+                                                     spatial_reference=3857)))
+        self.assertIsNone(envelope.__dict__.get('_box'))
+        self.assertEqual(50.0, envelope.shapely_geometry.area)
+        self.assertIsNotNone(envelope.__dict__.get('_box'))
+
+    def test_envelope_pickle_keepsBounds(self):
+        envelope = pickle.loads(pickle.dumps(Envelope(min_x=0.0, min_y=0.0, max_x=10.0, max_y=5.0,
+                                                      spatial_reference=3857)))
+        self.assertEqual((0.0, 0.0, 10.0, 5.0, 3857), envelope.envelope_tuple)
+
+    def test_geometry_envelope_matchesBounds(self):
+        polygon = Geometry.from_wkt('POLYGON((0 -1, 2 -1, 2 3, 0 -1))', spatial_reference=3857)
+        self.assertEqual((0.0, -1.0, 2.0, 3.0, 3857), polygon.envelope_tuple)
+        self.assertEqual((0.0, -1.0, 2.0, 3.0), polygon.envelope.bounds)
+
+    def test_geometry_emptyEnvelopeTuple_isNan(self):
+        for wkt in ['POLYGON EMPTY', 'LINESTRING EMPTY', 'POINT EMPTY']:
+            envelope_tuple = Geometry.from_wkt(wkt, spatial_reference=3857).envelope_tuple
+            self.assertTrue(all(math.isnan(value) for value in envelope_tuple[0:4]))
+            self.assertEqual(3857, envelope_tuple.srid)
+
+    def test_envelope_flipCoordinates_swapsBounds(self):
+        envelope = Envelope(min_x=0.0, min_y=1.0, max_x=10.0, max_y=5.0, spatial_reference=3857)
+        self.assertEqual((1.0, 0.0, 5.0, 10.0), envelope.flip_coordinates().bounds)
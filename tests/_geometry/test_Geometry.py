@@ -68,10 +68,33 @@ class TestGeometrySuite(unittest.TestCase):
         with pytest.raises(NotImplementedError):
             test_geom.flip_coordinates()
 
-
-
-
-
-
-
+    def test_predicates_verify(self):
+        polygon, inside, outside = Geometry.from_wkt_many(
+            ['POLYGON((0 0, 10 0, 10 10, 0 10, 0 0))', 'POINT(1 1)', 'POINT(13 14)'],
+            spatial_reference=3857
+        )
+        # Test more than once so that the polygon prepares itself along the way.
+        for _ in range(0, 4):
+            self.assertTrue(polygon.intersects(inside))
+            self.assertTrue(polygon.contains(inside))
+            self.assertTrue(inside.within(polygon))
+            self.assertFalse(polygon.intersects(outside))
+            self.assertFalse(outside.within(polygon))
+            self.assertEqual(0.0, polygon.distance(inside))
+            self.assertEqual(5.0, polygon.distance(outside))
+        self.assertTrue('prepared_geometry' in polygon._caches)
+
+    def test_predicates_otherSpatialReference_transforms(self):
+        polygon = Geometry.from_wkt('POLYGON((-95 45, -93 45, -93 47, -95 47, -95 45))', spatial_reference=4326)
+        point = Geometry.from_wkt('POINT(-10475164.0836 5860000.0)', spatial_reference=3857)
+        self.assertTrue(polygon.contains(point))
+
+    def test_predicates_emptyGeometries_false(self):
+        empty, polygon = Geometry.from_wkt_many(['POLYGON EMPTY', 'POLYGON((0 0, 10 0, 10 10, 0 10, 0 0))'],
+                                                spatial_reference=3857)
+        for a, b in [(empty, polygon), (polygon, empty), (empty, empty)]:
+            self.assertFalse(a.intersects(b))
+            self.assertFalse(a.contains(b))
+            self.assertFalse(a.within(b))
+            self.assertEqual(b.shapely_geometry.distance(a.shapely_geometry), a.distance(b))
 
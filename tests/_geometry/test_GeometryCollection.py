@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_GeometryCollection
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.geometry import (Geometry, GeometryCollection, GeometryException, GeometryType, MultiPoint, MultiPolygon,
+                           MultiPolyline, Polygon)
+from djio.hashing import djiohash_v1
+from shapely.wkt import loads as loads_wkt
+
+
+class TestGeometryCollectionSuite(unittest.TestCase):
+
+    multipolygon_wkt = ('MULTIPOLYGON(((0 0, 10 0, 10 10, 0 10, 0 0), (1 1, 2 1, 2 2, 1 2, 1 1)), '
+                        '((20 20, 22 20, 22 22, 20 20)))')
+    collection_wkt = 'GEOMETRYCOLLECTION(POINT(1 2), LINESTRING(0 0, 1 1), POLYGON((0 0, 4 0, 4 4, 0 0)))'
+
+    def test_fromWkt_types(self):
+        for wkt, cls, geometry_type, dimensions in [
+            ('MULTIPOINT(1 2, 3 4)', MultiPoint, GeometryType.MULTIPOINT, 0),
+            ('MULTILINESTRING((0 0, 1 1), (2 2, 3 3, 4 4))', MultiPolyline, GeometryType.MULTIPOLYLINE, 1),
+            (self.multipolygon_wkt, MultiPolygon, GeometryType.MULTIPOLYGON, 2),
+            (self.collection_wkt, GeometryCollection, GeometryType.COLLECTION, 2)
+        ]:
+            geometry = Geometry.from_wkt(wkt, spatial_reference=3857)
+            self.assertIsInstance(geometry, cls)
+            self.assertEqual(geometry_type, geometry.geometry_type)
+            self.assertEqual(dimensions, geometry.dimensions)
+
+    def test_coordsArray_offsetsCoverAllParts(self):
+        multipolygon = Geometry.from_wkt(self.multipolygon_wkt, spatial_reference=3857)
+        self.assertEqual(2, multipolygon.part_count)
+        self.assertEqual([0, 5, 10, 14], multipolygon.ring_offsets.tolist())
+        self.assertEqual([0, 2, 3], multipolygon.part_offsets.tolist())
+        self.assertEqual((14, 2), multipolygon.coords_array.shape)
+        self.assertEqual((0.0, 0.0, 22.0, 22.0), multipolygon.bounds)
+        self.assertEqual((0.0, 0.0, 22.0, 22.0), tuple(multipolygon.envelope_tuple[0:4]))
+
+    def test_partTypes_iterParts(self):
+        collection = Geometry.from_wkt(self.collection_wkt, spatial_reference=3857)
+        self.assertEqual([GeometryType.POINT, GeometryType.POLYLINE, GeometryType.POLYGON],
+                         collection.part_types.tolist())
+        self.assertEqual([GeometryType.POINT, GeometryType.POLYLINE, GeometryType.POLYGON],
+                         [part.geometry_type for part in collection.iter_parts()])
+
+    def test_getArea_sumsPolygonParts(self):
+        multipolygon = Geometry.from_wkt(self.multipolygon_wkt, spatial_reference=3857)
+        self.assertEqual(101.0, multipolygon.get_area().sq_m)
+        collection = Geometry.from_wkt(self.collection_wkt, spatial_reference=3857)
+        self.assertEqual(8.0, collection.get_area().sq_m)
+
+    def test_djiohash_setsCollectionBit(self):
+        multipolygon = Geometry.from_wkt(self.multipolygon_wkt, spatial_reference=3857)
+        hash_value = multipolygon.djiohash()
+        self.assertEqual((GeometryType.POLYGON << 4) | 8, hash_value[0])
+        self.assertEqual(hash_value, multipolygon.djiohash(chunk_size=3))
+        self.assertEqual(hash_value, djiohash_v1(geometry_type_code=GeometryType.MULTIPOLYGON, srid=3857,
+                                                 coordinates=multipolygon.iter_coords()))
+        # A single polygon with the same coordinates isn't the same geometry.
+        polygon = Geometry.from_wkt('POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (1 1, 2 1, 2 2, 1 2, 1 1), '
+                                    '(20 20, 22 20, 22 22, 20 20))', spatial_reference=3857)
+        self.assertNotEqual(hash_value, polygon.djiohash())
+
+    def test_flipCoordinates_keepsParts(self):
+        collection = Geometry.from_wkt(self.collection_wkt, spatial_reference=3857)
+        flipped = collection.flip_coordinates()
+        self.assertIsInstance(flipped, GeometryCollection)
+        self.assertTrue(loads_wkt('GEOMETRYCOLLECTION(POINT(2 1), LINESTRING(0 0, 1 1), POLYGON((0 0, 0 4, 4 4, 0 0)))')
+                        .equals(flipped.shapely_geometry))
+        multipolygon = Geometry.from_wkt(self.multipolygon_wkt, spatial_reference=3857).flip_coordinates()
+        self.assertIsInstance(multipolygon, MultiPolygon)
+        self.assertEqual(1, len(multipolygon.shapely_geometry.geoms[0].interiors))
+
+    def test_transform_transformsAllParts(self):
+        multipolygon = Geometry.from_wkt(self.multipolygon_wkt, spatial_reference=3857)
+        transformed = multipolygon.transform(spatial_reference=4326)
+        self.assertIsInstance(transformed, MultiPolygon)
+        self.assertEqual(multipolygon.part_offsets.tolist(), transformed.part_offsets.tolist())
+        np.testing.assert_allclose(multipolygon.spatial_reference.transform_coordinates(multipolygon.coords_array, 4326),
+                                   transformed.coords_array)
+
+    def test_empty_hasNoParts(self):
+        multipolygon = Geometry.from_wkt('MULTIPOLYGON EMPTY', spatial_reference=3857)
+        self.assertEqual(0, multipolygon.part_count)
+        self.assertEqual([0], multipolygon.part_offsets.tolist())
+        self.assertTrue(np.isnan(multipolygon.bounds[0]))
+
+    def test_nestedCollection_raises(self):
+        collection = Geometry.from_wkt('GEOMETRYCOLLECTION(MULTIPOINT(1 2, 3 4))', spatial_reference=3857)
+        with self.assertRaises(GeometryException):
+            collection.coords_array
+
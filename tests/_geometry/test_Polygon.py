@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_Polygon
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.geometry import Geometry, GeometryException, Polygon, Polyline
+from djio.hashing import djiohash_v1
+
+
+class TestPolygonSuite(unittest.TestCase):
+
+    wkts = [
+        'POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (2 2, 4 2, 4 4, 2 4, 2 2))',
+        'POLYGON((0 0, 3 0, 0 4, 0 0))'
+    ]
+
+    def test_getAreaMany_matchesGetArea(self):
+        polygons = Geometry.from_wkt_many(self.wkts, spatial_reference=3857)
+        areas = Polygon.get_area_many(polygons)
+        self.assertEqual(np.float64, areas.dtype)
+        self.assertEqual([96.0, 6.0], areas.tolist())
+        self.assertEqual([polygon.get_area().sq_m for polygon in polygons], areas.tolist())
+
+    def test_getAreaMany_leavesCachesAlone(self):
+        polygons = Geometry.from_wkt_many(self.wkts, spatial_reference=3857)
+        caches = [dict(polygon._caches) for polygon in polygons]
+        Polygon.get_area_many(polygons)
+        self.assertEqual(caches, [polygon._caches for polygon in polygons])
+
+    def test_getAreaMany_mixedSpatialReferences_transformsInGroups(self):
+        polygons = (Geometry.from_wkt_many(self.wkts, spatial_reference=4326) +
+                    Geometry.from_wkt_many(self.wkts, spatial_reference=3857))
+        areas = Polygon.get_area_many(polygons, spatial_reference=3857)
+        expected = [polygon.get_area(spatial_reference=3857).sq_m for polygon in polygons]
+        np.testing.assert_allclose(expected, areas)
+
+    def test_getAreaMany_notMetric_raisesGeometryException(self):
+        polygons = Geometry.from_wkt_many(self.wkts, spatial_reference=3857)
+        with self.assertRaises(GeometryException):
+            Polygon.get_area_many(polygons, spatial_reference=4326)
+
+    def test_getLengthMany_linesAndPerimeters(self):
+        geometries = Geometry.from_wkt_many(self.wkts + ['LINESTRING(0 0, 3 4, 3 10)'], spatial_reference=3857)
+        lengths = Polyline.get_length_many(geometries)
+        self.assertEqual([48.0, 12.0, 11.0], lengths.tolist())
+
+    def test_coordsArray_ringAndPartOffsets(self):
+        polygon = Geometry.from_wkt(self.wkts[0], spatial_reference=3857)
+        self.assertEqual((10, 2), polygon.coords_array.shape)
+        self.assertEqual([0, 5, 10], polygon.ring_offsets.tolist())
+        self.assertEqual([0, 2], polygon.part_offsets.tolist())
+        self.assertEqual(list(polygon.iter_coords()), [tuple(c) for c in polygon.coords_array.tolist()])
+
+    def test_coordsArray_isReadOnly(self):
+        polygon = Geometry.from_wkt(self.wkts[0], spatial_reference=3857)
+        with self.assertRaises(ValueError):
+            polygon.coords_array[0, 0] = 1.0
+
+    def test_djiohash_matchesIterCoords(self):
+        for wkt in self.wkts + ['POLYGON Z((0 0 1, 3 0 2, 0 4 3, 0 0 1))']:
+            polygon = Geometry.from_wkt(wkt, spatial_reference=3857)
+            expected = djiohash_v1(geometry_type_code=polygon.geometry_type, srid=3857,
+                                   coordinates=polygon.iter_coords())
+            self.assertEqual(expected, polygon.djiohash())
+
+    def test_transform_keepsInteriorRings(self):
+        polygon = Geometry.from_wkt(self.wkts[0], spatial_reference=3857)
+        transformed = polygon.transform(spatial_reference=4326)
+        self.assertEqual(4326, transformed.spatial_reference.srid)
+        self.assertTrue(isinstance(transformed, Polygon))
+        self.assertEqual(polygon.ring_offsets.tolist(), transformed.ring_offsets.tolist())
+
+    def test_transform_emptyGeometries_stayEmpty(self):
+        for wkt, cls in [('LINESTRING EMPTY', Polyline), ('POLYGON EMPTY', Polygon)]:
+            transformed = Geometry.from_wkt(wkt, spatial_reference=3857).transform(spatial_reference=4326)
+            self.assertTrue(isinstance(transformed, cls))
+            self.assertTrue(transformed.shapely_geometry.is_empty)
+
+    def test_flipCoordinates_keepsInteriorRings(self):
+        polygon = Geometry.from_wkt(self.wkts[0].replace('10 10', '10 20'), spatial_reference=3857)
+        flipped = polygon.flip_coordinates()
+        self.assertTrue(isinstance(flipped, Polygon))
+        self.assertEqual(1, len(flipped.shapely_geometry.interiors))
+        self.assertEqual(polygon.coords_array[:, ::-1].tolist(), flipped.coords_array.tolist())
+        self.assertTrue(polygon.shapely_geometry.equals(flipped.flip_coordinates().shapely_geometry))
@@ -8,8 +8,9 @@
 This is a unit test module.
 """
 
+import numpy as np
 import unittest
-from djio.geometry import GeometryType, ProtoGeometry, PointTuple, Polyline, Point, LatLonTuple
+from djio.geometry import GeometryException, GeometryType, ProtoGeometry, PointTuple, Polyline, Point, LatLonTuple
 
 
 class TestProtoGeometrySuite(unittest.TestCase):
@@ -55,4 +56,95 @@ class TestProtoGeometrySuite(unittest.TestCase):
         #     '415595.186865569 5150191.11554508 952676.147829255 5166538.99156226 414060.603356157 5039084.94282137' +
         #     ' 415595.186865569 5150191.11554508</gml:posList></gml:LinearRing></gml:exterior></gml:Polygon>',
         #     p.to_gml()
-        # )
\ No newline at end of file
+        # )
+
+    def test_addMany_array_growsBuffer(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=3857, capacity=2)
+        coordinates = np.column_stack([np.arange(50000, dtype=np.float64), np.zeros(50000)])
+        proto.add_many(coordinates)
+        proto.add(PointTuple(x=50000.0, y=1.0, z=None, srid=3857))
+        self.assertEqual(50001, len(proto))
+        p: Polyline = proto.to_polyline()
+        self.assertEqual(50001, len(p.coords_array))
+        self.assertEqual((50000.0, 1.0), tuple(p.coords_array[-1]))
+
+    def test_addMany_mixedTuples_keepsOrder(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=4326)
+        proto.add_many([
+            LatLonTuple(latitude=46.5, longitude=-94.1),
+            PointTuple(x=-94.0, y=46.6, z=None, srid=4326),
+            Point.from_coordinates(x=-93.9, y=46.7, spatial_reference=4326)
+        ])
+        p: Polyline = proto.to_polyline()
+        self.assertEqual([(-94.1, 46.5), (-94.0, 46.6), (-93.9, 46.7)], list(p.iter_coords()))
+
+    def test_addMany_foreignSpatialReference_matchesAdd(self):
+        points = [LatLonTuple(latitude=46.5 + i / 100.0, longitude=-94.1 + i / 100.0) for i in range(10)]
+        proto1: ProtoGeometry = ProtoGeometry(spatial_reference=26915)
+        for point in points:
+            proto1.add(point)
+        proto2: ProtoGeometry = ProtoGeometry(spatial_reference=26915)
+        proto2.add_many(points)
+        np.testing.assert_allclose(proto1.to_polyline().coords_array, proto2.to_polyline().coords_array)
+
+    def test_startInterior_toPolygon_hasHoles(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=3857)
+        proto.add_many(np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]]))
+        proto.start_interior()
+        proto.add_many(np.array([[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 2.0]]))
+        proto.start_interior()
+        proto.add_many(np.array([[5.0, 5.0], [6.0, 5.0], [6.0, 6.0]]))
+        self.assertEqual([0, 4, 8, 11], proto.ring_offsets.tolist())
+        self.assertEqual([0, 3], proto.part_offsets.tolist())
+        polygon = proto.to_polygon()
+        self.assertEqual(2, len(polygon.shapely_geometry.interiors))
+        self.assertEqual(100.0 - 1.0 - 0.5, polygon.shapely_geometry.area)
+
+    def test_startPart_toShapely_isMultiPart(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=3857)
+        proto.add_many(np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]]))
+        proto.start_part()
+        proto.start_part()  # An empty part doesn't count.
+        proto.add_many(np.array([[5.0, 5.0], [7.0, 5.0], [7.0, 7.0], [5.0, 7.0]]))
+        proto.start_interior()
+        proto.add_many(np.array([[5.5, 5.5], [6.0, 5.5], [6.0, 6.0]]))
+        proto.start_part()  # ...and neither does one at the end.
+        self.assertEqual(2, proto.part_count)
+        self.assertEqual(3, proto.ring_count)
+        self.assertEqual([0, 1, 3], proto.part_offsets.tolist())
+        multipolygon = proto.to_shapely()
+        self.assertEqual('MultiPolygon', multipolygon.geom_type)
+        self.assertEqual(0.5 + 4.0 - 0.125, multipolygon.area)
+        multilinestring = proto.to_shapely(GeometryType.POLYLINE)
+        self.assertEqual('MultiLineString', multilinestring.geom_type)
+        self.assertEqual(2, len(multilinestring.geoms))
+
+    def test_startInterior_withoutExterior_raises(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=3857)
+        with self.assertRaises(GeometryException):
+            proto.start_interior()
+
+    def test_toPolygon_multiplePartsRaises(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=3857)
+        proto.add_many(np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]]))
+        proto.start_part()
+        proto.add_many(np.array([[5.0, 5.0], [7.0, 5.0], [7.0, 7.0]]))
+        with self.assertRaises(GeometryException):
+            proto.to_polygon()
+        proto.clear()
+        self.assertEqual(0, proto.part_count)
+
+    def test_toMultipolygon_keepsPartsAndHoles(self):
+        proto: ProtoGeometry = ProtoGeometry(spatial_reference=3857)
+        proto.add_many(np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]]))
+        proto.start_part()
+        proto.add_many(np.array([[5.0, 5.0], [7.0, 5.0], [7.0, 7.0], [5.0, 7.0]]))
+        proto.start_interior()
+        proto.add_many(np.array([[5.5, 5.5], [6.0, 5.5], [6.0, 6.0]]))
+        multipolygon = proto.to_multipolygon()
+        self.assertEqual(GeometryType.MULTIPOLYGON, multipolygon.geometry_type)
+        self.assertEqual([0, 4, 9, 13], multipolygon.ring_offsets.tolist())  # (Shapely closes the rings.)
+        self.assertEqual(0.5 + 4.0 - 0.125, multipolygon.shapely_geometry.area)
+        self.assertEqual(proto.part_offsets.tolist(), multipolygon.part_offsets.tolist())
+        with self.assertRaises(GeometryException):
+            proto.to_multipolyline()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_gml
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+from io import BytesIO, StringIO
+import unittest
+from djio.arrays import GeometryArray
+from djio.geojson import Feature
+from djio.geometry import Geometry, GeometryException, GeometryType, SpatialReferenceException
+from djio.gml import FeatureCollectionWriter, dumps_geometry, parse_srs_name, read_features
+from shapely.wkt import loads as loads_wkt
+
+
+class TestGmlSuite(unittest.TestCase):
+
+    wkts = [
+        'POINT(-93.25 44.975)',
+        'LINESTRING(-93.5 45, -93 45.125)',
+        'POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (1 1, 2 1, 2 2, 1 2, 1 1))',
+        'MULTIPOINT(1 2, 3 4)',
+        'MULTILINESTRING((0 0, 1 1), (2 2, 3 3, 4 4))',
+        'MULTIPOLYGON(((0 0, 10 0, 10 10, 0 10, 0 0)), ((20 20, 22 20, 22 22, 20 20)))',
+        'GEOMETRYCOLLECTION(POINT(1 2), LINESTRING(0 0, 1 1), POLYGON((0 0, 4 0, 4 4, 0 0)))'
+    ]
+
+    def test_fromGml_ogrPoint_axisOrder(self):
+        # These are the strings OGR writes for the same point (see test_Point).
+        gml2 = '<gml:Point srsName="EPSG:4326"><gml:coordinates>91.5,-46.1</gml:coordinates></gml:Point>'
+        gml3 = '<gml:Point srsName="urn:ogc:def:crs:EPSG::4326"><gml:pos>-46.1 91.5</gml:pos></gml:Point>'
+        for gml in [gml2, gml3]:
+            p = Geometry.from_gml(gml)
+            self.assertEqual(GeometryType.POINT, p.geometry_type)
+            self.assertEqual(4326, p.spatial_reference.srid)
+            self.assertEqual((91.5, -46.1), (p.x, p.y))
+
+    def test_fromGml_projectedPolygon_3d(self):
+        gml = ('<gml:Polygon srsName="urn:ogc:def:crs:EPSG::26915"><gml:exterior><gml:LinearRing>'
+               '<gml:posList srsDimension="3">0 0 1 10 0 1 10 10 1 0 0 1</gml:posList></gml:LinearRing></gml:exterior>'
+               '</gml:Polygon>')
+        p = Geometry.from_gml(gml)
+        self.assertEqual(26915, p.spatial_reference.srid)
+        self.assertEqual([(0.0, 0.0, 1.0), (10.0, 0.0, 1.0), (10.0, 10.0, 1.0), (0.0, 0.0, 1.0)],
+                         list(p.iter_coords()))
+
+    def test_fromGml_noSrsName_raises(self):
+        gml = '<gml:Point><gml:pos>1 2</gml:pos></gml:Point>'
+        with self.assertRaises(SpatialReferenceException):
+            Geometry.from_gml(gml)
+        self.assertEqual(3857, Geometry.from_gml(gml, spatial_reference=3857).spatial_reference.srid)
+        with self.assertRaises(GeometryException):
+            Geometry.from_gml('<gml:Point')
+
+    def test_parseSrsName(self):
+        self.assertEqual((4326, False), parse_srs_name('EPSG:4326'))
+        self.assertEqual((4326, False), parse_srs_name('http://www.opengis.net/gml/srs/epsg.xml#4326'))
+        self.assertEqual((4326, True), parse_srs_name('urn:ogc:def:crs:EPSG::4326'))
+        self.assertEqual((26915, True), parse_srs_name('http://www.opengis.net/def/crs/EPSG/0/26915'))
+        self.assertEqual((4326, False), parse_srs_name('urn:ogc:def:crs:OGC:1.3:CRS84'))
+
+    def test_dumpsGeometry_fromGml_roundTrips(self):
+        for version in [2, 3, 32]:
+            for wkt in self.wkts:
+                geometry = Geometry.from_wkt(wkt=wkt, spatial_reference=4326)
+                copy = Geometry.from_gml(dumps_geometry(geometry, version=version))
+                self.assertEqual(geometry.geometry_type, copy.geometry_type)
+                self.assertTrue(copy.shapely_geometry.equals(geometry.shapely_geometry), (version, wkt))
+        with self.assertRaises(GeometryException):
+            dumps_geometry(Geometry.from_wkt(wkt=self.wkts[0], spatial_reference=4326), version=4)
+
+    def test_featureCollectionWriter_readFeatures_roundTrips(self):
+        geometries = [Geometry.from_wkt(wkt=wkt, spatial_reference=4326) for wkt in self.wkts]
+        for version in [2, 3, 32]:
+            stream = StringIO()
+            with FeatureCollectionWriter(stream, version=version) as writer:
+                writer.write_many(Feature(geometry=g, properties={'name': '<g{}> & co.'.format(i)}, id='f{}'.format(i))
+                                  for i, g in enumerate(geometries))
+                writer.write(None, properties={'empty': 'yes'})
+            self.assertEqual(len(geometries) + 1, len(writer))
+            features = list(read_features(BytesIO(stream.getvalue().encode('utf-8'))))
+            self.assertEqual(len(geometries) + 1, len(features))
+            for i, (feature, geometry) in enumerate(zip(features, geometries)):
+                self.assertEqual('f{}'.format(i), feature.id)
+                self.assertEqual({'name': '<g{}> & co.'.format(i)}, feature.properties)
+                self.assertEqual(4326, feature.geometry.spatial_reference.srid)
+                self.assertTrue(feature.geometry.shapely_geometry.equals(geometry.shapely_geometry))
+            self.assertIsNone(features[-1].geometry)
+            self.assertEqual({'empty': 'yes'}, features[-1].properties)
+
+    def test_writeArray_matchesWrite(self):
+        wkts = self.wkts[:-1]  # Geometry arrays don't hold mixed collections.
+        array = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=4326)
+        stream1, stream2 = StringIO(), StringIO()
+        with FeatureCollectionWriter(stream1) as writer:
+            writer.write_array(array, properties=({'i': i} for i in range(len(wkts))), ids=range(len(wkts)))
+        with FeatureCollectionWriter(stream2) as writer:
+            for i, wkt in enumerate(wkts):
+                writer.write(Geometry.from_wkt(wkt=wkt, spatial_reference=4326), properties={'i': i}, id=i)
+        self.assertEqual(stream2.getvalue(), stream1.getvalue())
+
+    def test_readFeatures_wfs_envelopeSrs(self):
+        wfs = (b'<?xml version="1.0" encoding="UTF-8"?>'
+               b'<wfs:FeatureCollection xmlns:wfs="http://www.opengis.net/wfs" '
+               b'xmlns:gml="http://www.opengis.net/gml" xmlns:topp="http://www.openplans.org/topp">'
+               b'<gml:boundedBy><gml:Envelope srsName="EPSG:26915"><gml:lowerCorner>0 0</gml:lowerCorner>'
+               b'<gml:upperCorner>10 10</gml:upperCorner></gml:Envelope></gml:boundedBy>'
+               b'<gml:featureMembers>'
+               b'<topp:roads gml:id="roads.1"><topp:the_geom><gml:MultiCurve><gml:curveMember><gml:LineString>'
+               b'<gml:posList>0 0 5 5</gml:posList></gml:LineString></gml:curveMember></gml:MultiCurve>'
+               b'</topp:the_geom><topp:name>Main St</topp:name></topp:roads>'
+               b'<topp:roads gml:id="roads.2"><topp:the_geom><gml:MultiCurve><gml:curveMember><gml:LineString>'
+               b'<gml:posList>5 5 10 10</gml:posList></gml:LineString></gml:curveMember></gml:MultiCurve>'
+               b'</topp:the_geom><topp:name>Elm St</topp:name></topp:roads>'
+               b'</gml:featureMembers></wfs:FeatureCollection>')
+        features = list(read_features(BytesIO(wfs)))
+        self.assertEqual(['roads.1', 'roads.2'], [feature.id for feature in features])
+        self.assertEqual(['Main St', 'Elm St'], [feature.properties['name'] for feature in features])
+        self.assertEqual(GeometryType.MULTIPOLYLINE, features[1].geometry.geometry_type)
+        self.assertEqual(26915, features[1].geometry.spatial_reference.srid)
+        self.assertEqual([(5.0, 5.0), (10.0, 10.0)], list(features[1].geometry.iter_coords()))
@@ -8,8 +8,10 @@
 This is a unit test module.
 """
 
+import numpy as np
 import unittest
-from djio.geometry import Point
+from djio.geometry import Geometry, Point
+from djio.hashing import djiohash_v1, djiohash_v1_many, djiohash_v1_stream
 
 
 class TestGeometrySuite(unittest.TestCase):
@@ -39,4 +41,37 @@ class TestGeometrySuite(unittest.TestCase):
         self.assertEqual(h1, h2)
         self.assertNotEqual(h1, h3)
         self.assertNotEqual(h1, h4)
-        self.assertNotEqual(h1, h5)
\ No newline at end of file
+        self.assertNotEqual(h1, h5)
+
+    def test_hashMany_matchesHashV1(self):
+        coordinates = np.array([
+            [91.5, -46.1],
+            [0.0, 0.0], [1.12345, -1.5], [-2.25, 300000.75],
+            [-94.1, 46.5]
+        ])
+        types = [1, 2, 1]
+        offsets = [0, 1, 4, 5]
+        hashes = djiohash_v1_many(geometry_type_codes=types, srid=4326,
+                                  coordinates=coordinates, vertex_offsets=offsets)
+        for i in range(len(types)):
+            expected = djiohash_v1(geometry_type_code=types[i], srid=4326,
+                                   coordinates=[tuple(c) for c in coordinates[offsets[i]:offsets[i + 1]]])
+            self.assertEqual(bytes(expected), bytes(hashes[i]))
+
+    def test_hashStream_matchesHashV1(self):
+        coordinates = np.random.RandomState(3).uniform(-180.0, 180.0, (1000, 3))
+        expected = djiohash_v1(geometry_type_code=2, srid=4326, coordinates=[tuple(c) for c in coordinates])
+        for chunk_size in (1, 7, 64, 1000):
+            blocks = (coordinates[i:i + chunk_size] for i in range(0, len(coordinates), chunk_size))
+            self.assertEqual(expected, djiohash_v1_stream(geometry_type_code=2, srid=4326, blocks=blocks))
+
+    def test_djiohash_chunked_matchesCached(self):
+        polygon = Geometry.from_wkt('POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (2 2, 4 2, 4 4, 2 4, 2 2))',
+                                    spatial_reference=3857)
+        streamed = polygon.djiohash(chunk_size=3)
+        self.assertNotIn('coords_arrays', polygon._caches)
+        self.assertNotIn('iter_coords', polygon._caches)
+        self.assertEqual(polygon.djiohash(), streamed)
+        # Once the coordinates are cached, the chunks are views of them.
+        self.assertEqual(streamed, polygon.djiohash(chunk_size=4))
+        self.assertEqual([4, 4, 2], [len(chunk) for chunk in polygon.iter_coords_chunks(chunk_size=4)])
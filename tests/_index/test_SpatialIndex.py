@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_SpatialIndex
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import os
+import pytest
+import tempfile
+import unittest
+from djio.arrays import GeometryArray
+from djio.geometry import Geometry, Point, SpatialReferenceException
+from djio.index import SpatialIndex
+from shapely.wkt import loads as loads_wkt
+
+
+class TestSpatialIndexSuite(unittest.TestCase):
+
+    @staticmethod
+    def _envelopes(count: int = 1000) -> np.ndarray:
+        rng = np.random.RandomState(42)
+        lower_left = rng.uniform(0.0, 1000.0, (count, 2))
+        return np.hstack([lower_left, lower_left + rng.uniform(0.0, 20.0, (count, 2))])
+
+    def test_query_matchesLinearScan(self):
+        envelopes = self._envelopes()
+        index = SpatialIndex.from_envelopes(envelopes, spatial_reference=3857, node_capacity=8)
+        self.assertEqual(1000, len(index))
+        for bounds in [(0, 0, 100, 100), (450.5, 10, 460, 990), (-10, -10, -5, -5), (0, 0, 1000, 1000)]:
+            expected = np.flatnonzero((envelopes[:, 0] <= bounds[2]) & (envelopes[:, 2] >= bounds[0]) &
+                                      (envelopes[:, 1] <= bounds[3]) & (envelopes[:, 3] >= bounds[1]))
+            self.assertTrue(np.array_equal(expected, index.query(bounds)))
+
+    def test_nearest_matchesLinearScan(self):
+        envelopes = self._envelopes()
+        index = SpatialIndex.from_envelopes(envelopes, spatial_reference=3857)
+        x, y = 500.0, 250.0
+        dx = np.maximum(np.maximum(envelopes[:, 0] - x, x - envelopes[:, 2]), 0.0)
+        dy = np.maximum(np.maximum(envelopes[:, 1] - y, y - envelopes[:, 3]), 0.0)
+        _, distances = index.nearest((x, y), k=5)
+        self.assertTrue(np.allclose(np.sort(np.hypot(dx, dy))[:5], distances))
+
+    def test_fromGeometries_queryPointAndNearest(self):
+        geometries = Geometry.from_wkt_many(['POINT(1 1)', 'LINESTRING(0 5, 10 5)', 'POINT(9 9)'],
+                                            spatial_reference=3857)
+        index = SpatialIndex.from_geometries(geometries)
+        self.assertEqual([0], list(index.query_point((1.0, 1.0))))
+        found, distances = index.nearest(Point.from_coordinates(x=5.0, y=4.0, spatial_reference=3857), k=2,
+                                         as_geometries=True)
+        self.assertTrue(found[0] is geometries[1])
+        self.assertEqual([1.0, 5.0], list(distances))
+
+    def test_emptyGeometry_findsNothing(self):
+        geometries = Geometry.from_wkt_many(['POINT(1 1)', 'LINESTRING(0 5, 10 5)'], spatial_reference=3857)
+        index = SpatialIndex.from_geometries(geometries)
+        empty_point = Geometry.from_wkt('POINT EMPTY', spatial_reference=3857)
+        empty_polygon = Geometry.from_wkt('POLYGON EMPTY', spatial_reference=3857)
+        self.assertEqual(0, len(index.query(empty_polygon)))
+        self.assertEqual(0, len(index.query_point(empty_point)))
+        found, distances = index.nearest(empty_point, k=2)
+        self.assertEqual(0, len(found))
+        self.assertEqual(0, len(distances))
+
+    def test_fromGeometries_mixedSrids_raisesSpatialReferenceException(self):
+        geometries = [Point.from_coordinates(x=1.0, y=1.0, spatial_reference=3857),
+                      Point.from_lat_lon(latitude=46.5, longitude=-94.1)]
+        with pytest.raises(SpatialReferenceException):
+            SpatialIndex.from_geometries(geometries)
+
+    def test_save_load_sameResults(self):
+        index = SpatialIndex.from_envelopes(self._envelopes(), spatial_reference=3857)
+        fd, path = tempfile.mkstemp(suffix='.npz')
+        os.close(fd)
+        try:
+            index.save(path)
+            loaded = SpatialIndex.load(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(3857, loaded.spatial_reference.srid)
+        self.assertTrue(np.array_equal(index.query((100, 100, 300, 300)), loaded.query((100, 100, 300, 300))))
+
+    def test_query_nonFiniteEnvelopes_skipped(self):
+        envelopes = self._envelopes(40) / 10.0
+        envelopes[7] = np.nan
+        envelopes[23, 2] = np.inf
+        index = SpatialIndex.from_envelopes(envelopes, spatial_reference=3857, node_capacity=4)
+        self.assertEqual(40, len(index))
+        expected = [i for i in range(40) if i not in (7, 23)]
+        self.assertEqual(expected, list(index.query((0, 0, 100, 100))))
+        self.assertTrue(np.all(np.isnan(index.envelopes[[7, 23]])))
+        self.assertEqual(38, len(index.nearest((50.0, 50.0), k=40)[0]))
+
+    def test_fromGeometries_emptyGeometries_skipped(self):
+        wkts = ['POINT(1 1)', 'POLYGON EMPTY', 'LINESTRING(0 5, 10 5)', 'POINT(9 9)']
+        geometries = Geometry.from_wkt_many(wkts, spatial_reference=3857)
+        array = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=3857)
+        for index in [SpatialIndex.from_geometries(geometries), SpatialIndex.from_geometries(array)]:
+            self.assertEqual(4, len(index))
+            self.assertEqual([0, 2, 3], list(index.query((0, 0, 10, 10))))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_OgrReader
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+from osgeo import ogr, osr
+import os
+import shutil
+import tempfile
+import unittest
+from djio.arrays import GeometryArray
+from djio.geometry import EnvelopeTuple, GeometryType
+from djio.io import DataSourceException, OgrReader
+
+
+class TestOgrReaderSuite(unittest.TestCase):
+
+    count = 25
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'points.gpkg')
+        datasource = ogr.GetDriverByName('GPKG').CreateDataSource(self.path)
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(26915)
+        layer = datasource.CreateLayer('points', srs=srs, geom_type=ogr.wkbPoint)
+        layer.CreateField(ogr.FieldDefn('name', ogr.OFTString))
+        layer.CreateField(ogr.FieldDefn('value', ogr.OFTInteger))
+        for i in range(self.count):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField('name', 'point {}'.format(i))
+            feature.SetField('value', i)
+            # Every fifth feature has no geometry.
+            if i % 5 != 4:
+                feature.SetGeometry(ogr.CreateGeometryFromWkt('POINT({x} {y})'.format(x=500000 + i, y=5000000 + i)))
+            layer.CreateFeature(feature)
+        datasource = None
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_iterChunks_geometries_chunked(self):
+        with OgrReader(self.path, chunk_size=10) as reader:
+            self.assertEqual(26915, reader.spatial_reference.srid)
+            self.assertEqual(['name', 'value'], reader.field_names)
+            chunks = list(reader.iter_chunks())
+        self.assertEqual([10, 10, 5], [len(chunk.fids) for chunk in chunks])
+        geometries = [g for chunk in chunks for g in chunk.geometries]
+        self.assertIsNone(geometries[4])
+        self.assertEqual(GeometryType.POINT, geometries[3].geometry_type)
+        self.assertEqual(26915, geometries[3].spatial_reference.srid)
+        self.assertEqual((500003.0, 5000003.0), (geometries[3].x, geometries[3].y))
+        self.assertEqual(list(range(10, 20)), chunks[1].attributes['value'])
+
+    def test_iterChunks_columnar_skipsNulls(self):
+        with OgrReader(self.path, chunk_size=10, fields=['value']) as reader:
+            chunks = list(reader.iter_chunks(columnar=True))
+        self.assertIsInstance(chunks[0].geometries, GeometryArray)
+        self.assertEqual([8, 8, 4], [len(chunk.geometries) for chunk in chunks])
+        self.assertEqual(['value'], list(chunks[0].attributes.keys()))
+        self.assertEqual([0, 1, 2, 3, 5, 6, 7, 8], chunks[0].attributes['value'])
+        self.assertEqual(len(chunks[0].fids), len(chunks[0].geometries))
+
+    def test_filters_pushedDown(self):
+        with OgrReader(self.path, attribute_filter='value < 10',
+                       spatial_filter=EnvelopeTuple(min_x=500001.5, min_y=0, max_x=600000, max_y=6000000,
+                                                    srid=26915)) as reader:
+            self.assertEqual([2, 3, 5, 6, 7, 8], [feature.properties['value'] for feature in reader])
+        with self.assertRaises(DataSourceException):
+            OgrReader(self.path, attribute_filter='no_such_field = 1')
+
+    def test_open_missing_raises(self):
+        with self.assertRaises(DataSourceException):
+            OgrReader(os.path.join(self.directory, 'missing.gpkg'))
+        with self.assertRaises(DataSourceException):
+            OgrReader(self.path, layer='missing')
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_OgrWriter
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from djio.arrays import GeometryArray
+from djio.geometry import Geometry, GeometryType
+from djio.io import OgrReader, OgrWriter
+from shapely.wkt import loads as loads_wkt
+
+
+class TestOgrWriterSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write_gpkg_roundTrips(self):
+        path = os.path.join(self.directory, 'points.gpkg')
+        with OgrWriter(path, layer='points', batch_size=7) as writer:
+            for i in range(20):
+                writer.write(Geometry.from_wkt(wkt='POINT({x} {y})'.format(x=500000 + i, y=5000000 + i),
+                                               spatial_reference=26915),
+                             properties={'name': 'point {}'.format(i), 'value': i, 'ratio': i / 2.0})
+            writer.write(None, properties={'name': 'nowhere', 'value': None, 'ratio': None})
+        self.assertEqual(21, len(writer))
+        with OgrReader(path, layer='points') as reader:
+            self.assertEqual(26915, reader.spatial_reference.srid)
+            self.assertEqual(['name', 'value', 'ratio'], reader.field_names)
+            features = list(reader)
+        self.assertEqual(21, len(features))
+        self.assertEqual((500003.0, 5000003.0), (features[3].geometry.x, features[3].geometry.y))
+        self.assertEqual({'name': 'point 3', 'value': 3, 'ratio': 1.5}, features[3].properties)
+        self.assertIsNone(features[-1].geometry)
+        self.assertIsNone(features[-1].properties['value'])
+
+    def test_writeArray_transformsAndRoundTrips(self):
+        path = os.path.join(self.directory, 'polygons.gpkg')
+        wkts = ['POLYGON((-94 46, -93 46, -93 47, -94 46))', 'POLYGON((-92 46, -91 46, -91 47, -92 46))']
+        array = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in wkts], spatial_reference=4326)
+        with OgrWriter(path, spatial_reference=26915) as writer:
+            writer.write_array(array, attributes={'value': [1, 2]})
+        with OgrReader(path) as reader:
+            chunks = list(reader.iter_chunks(columnar=True))
+        self.assertEqual(26915, chunks[0].geometries.spatial_reference.srid)
+        self.assertEqual([GeometryType.POLYGON] * 2, chunks[0].geometries.geometry_types.tolist())
+        self.assertEqual([1, 2], chunks[0].attributes['value'])
+
+    def test_writeChunk_shapefile_copiesLayer(self):
+        source = os.path.join(self.directory, 'lines.gpkg')
+        with OgrWriter(source) as writer:
+            writer.write_many(Geometry.from_wkt(wkt='LINESTRING(0 {i}, 1 {i})'.format(i=i), spatial_reference=3857)
+                              for i in range(10))
+        target = os.path.join(self.directory, 'lines.shp')
+        with OgrReader(source, chunk_size=3) as reader, OgrWriter(target) as writer:
+            for chunk in reader.iter_chunks(columnar=True):
+                writer.write_chunk(chunk)
+        self.assertEqual(10, len(writer))
+        with OgrReader(target) as reader:
+            self.assertEqual(3857, reader.spatial_reference.srid)
+            self.assertEqual(10, len(reader))
+
+    def test_exception_rollsBackBatch(self):
+        path = os.path.join(self.directory, 'points.gpkg')
+        with self.assertRaises(RuntimeError):
+            with OgrWriter(path, batch_size=5) as writer:
+                for i in range(8):
+                    writer.write(Geometry.from_wkt(wkt='POINT({i} {i})'.format(i=i), spatial_reference=3857))
+                raise RuntimeError('Something went wrong.')
+        with OgrReader(path) as reader:
+            self.assertEqual(5, len(reader))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_read_parallel
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+from osgeo import ogr, osr
+import numpy as np
+import os
+import shutil
+import tempfile
+import unittest
+from djio.io import partition_extent, partition_fids, read_parallel
+
+
+class TestReadParallelSuite(unittest.TestCase):
+
+    count = 100
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'grid.gpkg')
+        datasource = ogr.GetDriverByName('GPKG').CreateDataSource(self.path)
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(26915)
+        layer = datasource.CreateLayer('grid', srs=srs, geom_type=ogr.wkbLineString)
+        layer.CreateField(ogr.FieldDefn('value', ogr.OFTInteger))
+        layer.StartTransaction()
+        for i in range(self.count):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField('value', i)
+            # Each line crosses into the next cell, so tiles have to agree on who owns it.
+            x, y = 500000 + (i % 10) * 10, 5000000 + (i // 10) * 10
+            feature.SetGeometry(ogr.CreateGeometryFromWkt(
+                'LINESTRING({x} {y}, {x2} {y2})'.format(x=x, y=y, x2=x + 15, y2=y + 15)))
+            layer.CreateFeature(feature)
+        layer.CommitTransaction()
+        datasource = None
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_partitionFids_coversLayer(self):
+        ranges = partition_fids(self.path, partitions=3)
+        self.assertEqual(3, len(ranges))
+        self.assertEqual(1, ranges[0][0])  # GeoPackage FIDs start at one.
+        self.assertEqual(self.count + 1, ranges[-1][1])
+        self.assertEqual([r[1] for r in ranges[:-1]], [r[0] for r in ranges[1:]])
+
+    def test_partitionExtent_grid(self):
+        tiles = partition_extent(self.path, partitions=4)
+        self.assertEqual(4, len(tiles))
+        self.assertEqual((500000.0, 5000000.0), (tiles[0].min_x, tiles[0].min_y))
+        self.assertEqual((500105.0, 5000105.0), (tiles[-1].max_x, tiles[-1].max_y))
+
+    def test_readParallel_deterministicAndComplete(self):
+        for partition_by in ['fid', 'extent']:
+            expected = None
+            for processes in [None, 2, 3]:
+                chunks = list(read_parallel(self.path, processes=processes, partition_by=partition_by,
+                                            partitions=6, chunk_size=7))
+                values = [v for chunk in chunks for v in chunk.attributes['value']]
+                # Every feature is read exactly once...
+                self.assertEqual(list(range(self.count)), sorted(values))
+                self.assertEqual(26915, chunks[0].geometries.spatial_reference.srid)
+                self.assertEqual(sum(len(chunk.fids) for chunk in chunks),
+                                 sum(len(chunk.geometries) for chunk in chunks))
+                # ...and in the same order no matter how many workers there are.
+                if expected is None:
+                    expected = values
+                self.assertEqual(expected, values)
+            if partition_by == 'fid':
+                self.assertTrue(np.all(np.diff(expected) > 0))
+
+    def test_readParallel_attributeFilter(self):
+        chunks = read_parallel(self.path, processes=2, attribute_filter='value >= 90', fields=['value'])
+        self.assertEqual(list(range(90, 100)), [v for chunk in chunks for v in chunk.attributes['value']])
+
+    def test_readParallel_extent_featuresMissingTheirEnvelopeCorner(self):
+        path = os.path.join(self.directory, 'shapes.gpkg')
+        datasource = ogr.GetDriverByName('GPKG').CreateDataSource(path)
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(26915)
+        layer = datasource.CreateLayer('shapes', srs=srs, geom_type=ogr.wkbUnknown)
+        # An L-shaped line and an anti-diagonal line whose envelopes start in the lower-left tile of a 2x2 grid,
+        # though neither line ever touches it.  (The points just stretch the extent.)
+        for wkt in ['POINT(0 0)', 'LINESTRING(1 19, 19 19, 19 1)', 'LINESTRING(3 19, 19 3)', 'POINT(20 20)']:
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetGeometry(ogr.CreateGeometryFromWkt(wkt))
+            layer.CreateFeature(feature)
+        datasource = None
+        chunks = list(read_parallel(path, processes=2, partition_by='extent', partitions=4))
+        self.assertEqual([1, 2, 3, 4], sorted(fid for chunk in chunks for fid in chunk.fids))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_join
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.arrays import GeometryArray
+from djio.geometry import Geometry, Point
+from djio.join import join_points_to_polygons, join_polygons
+from shapely.geometry import Point as ShapelyPoint
+from shapely.prepared import prep
+
+
+class TestJoinSuite(unittest.TestCase):
+
+    polygon_wkts = [
+        'POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (2 2, 4 2, 4 4, 2 4, 2 2))',
+        'POLYGON((5 5, 15 5, 15 15, 5 5))',
+        'POLYGON((20 20, 30 20, 25 30, 20 20))'
+    ]
+
+    def test_joinPointsToPolygons_matchesShapely(self):
+        polygons = Geometry.from_wkt_many(self.polygon_wkts, spatial_reference=3857)
+        points = np.random.RandomState(7).uniform(-1.0, 31.0, (5000, 2))
+        point_indexes, polygon_indexes = join_points_to_polygons(points, polygons, spatial_reference=3857,
+                                                                 chunk_size=1500)
+        expected = [
+            (i, j) for i, p in enumerate(points) for j, polygon in enumerate(polygons)
+            if polygon.shapely_geometry.contains(ShapelyPoint(p[0], p[1]))
+        ]
+        self.assertEqual(expected, list(zip(point_indexes.tolist(), polygon_indexes.tolist())))
+
+    def test_joinPointsToPolygons_holesAreExcluded(self):
+        polygons = Geometry.from_wkt_many(self.polygon_wkts[0:1], spatial_reference=3857)
+        points = [Point.from_coordinates(x=3.0, y=3.0, spatial_reference=3857),
+                  Point.from_coordinates(x=1.0, y=1.0, spatial_reference=3857)]
+        point_indexes, polygon_indexes = join_points_to_polygons(points, polygons)
+        self.assertEqual([1], point_indexes.tolist())
+        self.assertEqual([0], polygon_indexes.tolist())
+
+    def test_joinPointsToPolygons_manyVertices_matchesShapely(self):
+        # Stars with thousands of vertices (and a hole) are cut into bands or, if they're big enough, prepared.
+        points = np.random.RandomState(5).uniform(-110.0, 110.0, (3000, 2))
+        for vertices in [4000, 10000]:
+            angles = np.linspace(0.0, 2.0 * np.pi, vertices + 1)[:-1]
+            radii = np.where(np.arange(len(angles)) % 2 == 0, 100.0, 60.0)
+            exterior = ', '.join('{} {}'.format(r * np.cos(a), r * np.sin(a)) for r, a in zip(radii, angles))
+            wkt = 'POLYGON(({exterior}, {first}), (-10 -10, 10 -10, 10 10, -10 10, -10 -10))'.format(
+                exterior=exterior, first=exterior.split(',')[0])
+            polygons = Geometry.from_wkt_many([wkt], spatial_reference=3857)
+            point_indexes, _ = join_points_to_polygons(points, polygons, spatial_reference=3857)
+            prepared = prep(polygons[0].shapely_geometry)
+            expected = [i for i, p in enumerate(points) if prepared.contains(ShapelyPoint(p[0], p[1]))]
+            self.assertEqual(expected, point_indexes.tolist())
+
+    def test_joinPointsToPolygons_emptyGeometries_skipped(self):
+        polygons = Geometry.from_wkt_many(['POLYGON EMPTY'] + self.polygon_wkts[0:1], spatial_reference=3857)
+        points = Geometry.from_wkt_many(['POINT(1 1)', 'POINT EMPTY', 'POINT(9 9)'], spatial_reference=3857)
+        array = GeometryArray.from_shapely([point.shapely_geometry for point in points], spatial_reference=3857)
+        for _points in [points, array]:
+            point_indexes, polygon_indexes = join_points_to_polygons(_points, polygons)
+            self.assertEqual([0, 2], point_indexes.tolist())
+            self.assertEqual([1, 1], polygon_indexes.tolist())
+
+    def test_joinPointsToPolygons_projectsPolygons(self):
+        polygons = Geometry.from_wkt_many(['POLYGON((-95 45, -93 45, -93 47, -95 47, -95 45))'],
+                                          spatial_reference=4326)
+        points = Geometry.from_wkt_many(['POINT(-10475164.0836 5860000.0)', 'POINT(0 0)'], spatial_reference=3857)
+        point_indexes, _ = join_points_to_polygons(points, polygons)
+        self.assertEqual([0], point_indexes.tolist())
+
+    def test_joinPolygons_intersects(self):
+        polygons = Geometry.from_wkt_many(self.polygon_wkts, spatial_reference=3857)
+        left_indexes, right_indexes = join_polygons(polygons, polygons)
+        self.assertEqual([(0, 0), (0, 1), (1, 0), (1, 1), (2, 2)],
+                         list(zip(left_indexes.tolist(), right_indexes.tolist())))
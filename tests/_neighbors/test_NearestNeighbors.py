@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_NearestNeighbors
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.geometry import GeometryException, Point
+from djio.neighbors import EARTH_RADIUS, NearestNeighbors
+
+
+def _haversine(lonlat1: np.ndarray, lonlat2: np.ndarray) -> np.ndarray:
+    lon1, lat1 = np.radians(lonlat1[..., 0]), np.radians(lonlat1[..., 1])
+    lon2, lat2 = np.radians(lonlat2[..., 0]), np.radians(lonlat2[..., 1])
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+class TestNearestNeighborsSuite(unittest.TestCase):
+
+    def test_query_metric_matchesBruteForce(self):
+        random = np.random.RandomState(11)
+        points = random.uniform(0.0, 10000.0, (2000, 2))
+        queries = random.uniform(0.0, 10000.0, (50, 2))
+        neighbors = NearestNeighbors(points, spatial_reference=3857)
+        self.assertFalse(neighbors.haversine)
+        self.assertEqual(3857, neighbors.metric_spatial_reference.srid)
+        distances, indexes = neighbors.query(queries, k=3)
+        self.assertEqual((50, 3), distances.shape)
+        self.assertEqual(np.int64, indexes.dtype)
+        expected = np.sqrt(((queries[:, np.newaxis, :] - points[np.newaxis, :, :]) ** 2).sum(axis=2))
+        np.testing.assert_array_equal(np.argsort(expected, axis=1)[:, 0:3], indexes)
+        np.testing.assert_allclose(np.sort(expected, axis=1)[:, 0:3], distances)
+
+    def test_query_geographic_usesHaversine(self):
+        random = np.random.RandomState(13)
+        points = np.column_stack([random.uniform(-10.0, 10.0, 1000), random.uniform(40.0, 60.0, 1000)])
+        queries = np.column_stack([random.uniform(-10.0, 10.0, 20), random.uniform(40.0, 60.0, 20)])
+        neighbors = NearestNeighbors(points, spatial_reference=4326)
+        self.assertTrue(neighbors.haversine)
+        distances, indexes = neighbors.query(queries, k=2)
+        expected = _haversine(queries[:, np.newaxis, :], points[np.newaxis, :, :])
+        np.testing.assert_array_equal(np.argsort(expected, axis=1)[:, 0:2], indexes)
+        np.testing.assert_allclose(np.sort(expected, axis=1)[:, 0:2], distances, rtol=1e-6)
+
+    def test_query_maxDistance_missingNeighborsAreFlagged(self):
+        points = np.array([[0.0, 0.0], [100.0, 0.0]])
+        neighbors = NearestNeighbors(points, spatial_reference=3857)
+        distances, indexes = neighbors.query(np.array([[10.0, 0.0], [5000.0, 0.0]]), k=2, max_distance=50.0)
+        self.assertEqual([[0, -1], [-1, -1]], indexes.tolist())
+        self.assertEqual(10.0, distances[0, 0])
+        self.assertTrue(np.isinf(distances[0, 1]))
+
+    def test_query_geographic_maxDistance_missingNeighborsAreInfinite(self):
+        points = np.array([[0.0, 0.0], [1.0, 0.0]])
+        neighbors = NearestNeighbors(points, spatial_reference=4326)
+        distances, indexes = neighbors.query(np.array([[0.1, 0.0], [90.0, 0.0]]), k=2, max_distance=50000.0)
+        self.assertEqual([[0, -1], [-1, -1]], indexes.tolist())
+        self.assertAlmostEqual(np.radians(0.1) * EARTH_RADIUS, distances[0, 0], delta=1.0)
+        self.assertTrue(np.all(np.isinf(distances[[0, 1, 1], [1, 0, 1]])))
+
+    def test_query_pointGeometries_indexesPoints(self):
+        points = [Point.from_coordinates(x=x, y=0.0, spatial_reference=3857) for x in (0.0, 10.0, 20.0)]
+        neighbors = NearestNeighbors(points)
+        self.assertEqual(3, len(neighbors))
+        distances, indexes = neighbors.query([Point.from_coordinates(x=12.0, y=0.0, spatial_reference=3857)])
+        self.assertEqual([[1]], indexes.tolist())
+        self.assertEqual([[2.0]], distances.tolist())
+
+    def test_init_emptyPoint_raisesGeometryException(self):
+        with self.assertRaises(GeometryException):
+            NearestNeighbors(np.array([[0.0, 0.0], [np.nan, np.nan]]), spatial_reference=3857)
+
+    def test_query_emptyPoint_hasNoNeighbors(self):
+        neighbors = NearestNeighbors(np.array([[0.0, 0.0], [5.0, 0.0]]), spatial_reference=3857)
+        distances, indexes = neighbors.query(np.array([[1.0, 0.0], [np.nan, np.nan]]), k=2)
+        self.assertEqual([[0, 1], [-1, -1]], indexes.tolist())
+        self.assertEqual([1.0, 4.0], distances[0].tolist())
+        self.assertTrue(np.all(np.isinf(distances[1])))
+
+    def test_init_noSuitableUtmZone_warns(self):
+        # There's no preferred UTM zone for central Europe, so the projector falls back to Web Mercator.
+        points = np.array([[10.0, 50.0], [10.1, 50.1]])
+        with self.assertWarns(UserWarning):
+            neighbors = NearestNeighbors(points, spatial_reference=4326, haversine=False)
+        self.assertEqual(3857, neighbors.metric_spatial_reference.srid)
+
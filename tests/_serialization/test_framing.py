@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_framing
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+from io import BytesIO, UnsupportedOperation
+import pickle
+import unittest
+from djio.geometry import Envelope, Geometry, GeometryException, GeometryType, Point, Polygon, SpatialReference
+from djio.serialization import dumps_many, loads_many, write_many
+from djio.errors import DjioException
+
+
+class TestFramingSuite(unittest.TestCase):
+
+    def test_pickle_point_roundTrip(self):
+        p1 = Point.from_coordinates(x=91.5, y=-46.1, z=1.0, spatial_reference=4326)
+        p1.djiohash()  # Make sure there's something in the caches.
+        p2: Point = pickle.loads(pickle.dumps(p1))
+        self.assertTrue(isinstance(p2, Point))
+        self.assertEqual((91.5, -46.1, 1.0), (p2.x, p2.y, p2.z))
+        self.assertTrue(p1.spatial_reference is p2.spatial_reference)
+        self.assertEqual(p1.djiohash(), p2.djiohash())
+
+    def test_pickle_envelope_keepsType(self):
+        e1 = Envelope(min_x=0.0, min_y=0.0, max_x=1.0, max_y=2.0, spatial_reference=3857)
+        e2 = pickle.loads(pickle.dumps(e1))
+        self.assertTrue(isinstance(e2, Envelope))
+        self.assertTrue(e1.shapely_geometry.equals(e2.shapely_geometry))
+
+    def test_pickle_spatialReference_usesRegistry(self):
+        sr = SpatialReference.from_srid(26915)
+        self.assertTrue(sr is pickle.loads(pickle.dumps(sr)))
+
+    def test_dumpsMany_loadsMany_roundTrip(self):
+        geometries = Geometry.from_wkt_many(
+            wkts=['POINT(-94.1 46.5)', 'LINESTRING(0 0, 1 1)', 'POLYGON((0 0, 1 0, 1 1, 0 0))'],
+            spatial_reference=4326
+        )
+        loaded = loads_many(dumps_many(geometries))
+        self.assertEqual(
+            [GeometryType.POINT, GeometryType.POLYLINE, GeometryType.POLYGON],
+            [g.geometry_type for g in loaded]
+        )
+        self.assertTrue(isinstance(loaded[2], Polygon))
+        for original, copy in zip(geometries, loaded):
+            self.assertTrue(original.shapely_geometry.equals(copy.shapely_geometry))
+
+    def test_loadsMany_notFramed_raisesDjioException(self):
+        with self.assertRaises(DjioException):
+            loads_many(b'NOPE' + b'\x00' * 8)
+
+    def test_writeMany_wrongCount_raisesGeometryException(self):
+        geometries = Geometry.from_wkt_many(wkts=['POINT(1 2)', 'POINT(3 4)'], spatial_reference=4326)
+        with self.assertRaises(GeometryException):
+            write_many(BytesIO(), iter(geometries), count=3)
+        with self.assertRaises(GeometryException):
+            write_many(BytesIO(), iter(geometries), count=1)
+        stream = BytesIO()
+        write_many(stream, iter(geometries), count=2)
+        self.assertEqual(2, len(loads_many(stream.getvalue())))
+
+    def test_writeMany_withCount_streamsFrames(self):
+        geometries = Geometry.from_wkt_many(wkts=['POINT(1 2)', 'POINT(3 4)'], spatial_reference=4326)
+        stream = BytesIO()
+        sizes = []
+
+        def generate():
+            for geometry in geometries:
+                sizes.append(len(stream.getvalue()))
+                yield geometry
+
+        write_many(stream, generate(), count=2)
+        # The header (and the first frame) were written before the second geometry was requested.
+        self.assertTrue(0 < sizes[0] < sizes[1])
+        self.assertEqual(2, len(loads_many(stream.getvalue())))
+
+    def test_writeMany_seekableWithoutCount_patchesHeader(self):
+        geometries = Geometry.from_wkt_many(wkts=['POINT(1 2)', 'POINT(3 4)', 'POINT(5 6)'], spatial_reference=4326)
+        stream = BytesIO()
+        stream.write(b'prefix')
+        write_many(stream, iter(geometries))
+        stream.write(b'suffix')
+        data = stream.getvalue()
+        self.assertTrue(data.endswith(b'suffix'))
+        self.assertEqual(3, len(loads_many(data[len(b'prefix'):-len(b'suffix')])))
+
+    def test_writeMany_notSeekableWithoutCount_buffersFrames(self):
+        class _Unseekable(BytesIO):
+            def seekable(self):
+                return False
+
+            def seek(self, *args):
+                raise UnsupportedOperation('seek')
+
+            def tell(self):
+                raise UnsupportedOperation('tell')
+
+        geometries = Geometry.from_wkt_many(wkts=['POINT(1 2)', 'POINT(3 4)'], spatial_reference=4326)
+        stream = _Unseekable()
+        write_many(stream, iter(geometries))
+        self.assertEqual(2, len(loads_many(stream.getvalue())))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_SharedGeometryArray
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pickle
+import pytest
+import unittest
+from djio.arrays import GeometryArray
+from djio.errors import DjioException
+from djio.shared import SharedGeometryArray
+
+
+def _count_vertices(shared: SharedGeometryArray) -> int:
+    with shared:
+        return len(shared.array.coordinates)
+
+
+class TestSharedGeometryArraySuite(unittest.TestCase):
+
+    wkts = [
+        'POINT(-94.1 46.5)',
+        'LINESTRING(0 0, 1 1, 2 1)',
+        'POLYGON((0 0, 4 0, 4 4, 0 4, 0 0), (1 1, 2 1, 2 2, 1 1))'
+    ]
+
+    def _array(self) -> GeometryArray:
+        from shapely.wkt import loads as loads_wkt
+        return GeometryArray.from_wkb([loads_wkt(wkt).wkb for wkt in self.wkts], spatial_reference=4326)
+
+    def test_publish_attach_sameContents(self):
+        arr = self._array()
+        with SharedGeometryArray.publish(arr) as published:
+            attached = SharedGeometryArray.attach(published.name)
+            self.assertFalse(attached.owner)
+            self.assertTrue(np.array_equal(arr.coordinates, attached.array.coordinates))
+            self.assertTrue(np.array_equal(arr.djiohashes(), attached.array.djiohashes()))
+            self.assertEqual(4326, attached.array.spatial_reference.srid)
+            self.assertTrue(arr[2].shapely_geometry.equals(attached.array[2].shapely_geometry))
+            attached.close()
+
+    def test_attach_arraysAreReadOnly(self):
+        with SharedGeometryArray.publish(self._array()) as published:
+            with pytest.raises(ValueError):
+                published.array.coordinates[0, 0] = 1.0
+
+    def test_close_owner_unlinksSegment(self):
+        published = SharedGeometryArray.publish(self._array())
+        name = published.name
+        published.close()
+        self.assertTrue(published.closed)
+        with pytest.raises(DjioException):
+            _ = published.array
+        with pytest.raises(FileNotFoundError):
+            SharedGeometryArray.attach(name)
+
+    def test_pickle_attachesByName(self):
+        with SharedGeometryArray.publish(self._array()) as published:
+            copy: SharedGeometryArray = pickle.loads(pickle.dumps(published))
+            self.assertEqual(published.name, copy.name)
+            self.assertEqual(3, len(copy))
+            copy.close()
+
+    def test_worker_attaches(self):
+        with SharedGeometryArray.publish(self._array()) as published:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(13, executor.submit(_count_vertices, published).result())
+            # The worker closing its handle must not destroy the segment.
+            self.assertEqual(13, len(published.array.coordinates))
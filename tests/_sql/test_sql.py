@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_sql
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import pickle
+import unittest
+from djio.arrays import GeometryArray, _geometry_wkb
+from djio.geometry import Geometry, GeometryType, SpatialReferenceException
+from djio.sql import DjioGeometry, LazyGeometry, array_parameters, stream_arrays, stream_geometries, stream_rows
+from geoalchemy2.elements import WKBElement, WKTElement
+from shapely.wkt import loads as loads_wkt
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, String, Table, create_engine, event, select
+from sqlalchemy.exc import StatementError
+from sqlalchemy.orm import Session
+from sqlalchemy.types import TypeDecorator
+
+
+class _EwkbColumn(TypeDecorator):
+    # (SpatiaLite isn't always around, so the tests hand back EWKB from a plain binary column the way GeoAlchemy2
+    # would.)
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return WKBElement(value, extended=True) if value is not None else None
+
+
+class TestSqlSuite(unittest.TestCase):
+
+    wkts = [
+        'POINT(-93.25 44.975)',
+        'LINESTRING(-93.5 45, -93 45.125)',
+        'POLYGON((-93 45, -92 45, -92 46, -93 45))',
+        'MULTIPOINT(-93 45, -92 46)'
+    ]
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        metadata = MetaData()
+        self.table = Table('places', metadata,
+                           Column('id', Integer, primary_key=True),
+                           Column('name', String),
+                           Column('geom', _EwkbColumn))
+        metadata.create_all(self.engine)
+        self.geometries = [Geometry.from_wkt(wkt=wkt, spatial_reference=4326) for wkt in self.wkts * 5]
+        with self.engine.begin() as connection:
+            connection.execute(self.table.insert(), [
+                {'id': i, 'name': 'p{}'.format(i), 'geom': _geometry_wkb(g, srid=4326)}
+                for i, g in enumerate(self.geometries)
+            ])
+            connection.execute(self.table.insert(), [{'id': len(self.geometries), 'name': 'null', 'geom': None}])
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_fromGeoalchemy2_elementSrid(self):
+        wkb = _geometry_wkb(self.geometries[0], srid=4326)
+        self.assertEqual(4326, Geometry.from_geoalchemy2(WKBElement(wkb, extended=True)).spatial_reference.srid)
+        self.assertEqual(3857, Geometry.from_geoalchemy2(WKTElement('POINT(1 2)', srid=3857)).spatial_reference.srid)
+        with self.assertRaises(SpatialReferenceException):
+            Geometry.from_geoalchemy2(WKTElement('POINT(1 2)'))
+
+    def test_lazyGeometry_decodesOnDemand(self):
+        lazy = LazyGeometry.from_element(WKBElement(_geometry_wkb(self.geometries[2], srid=4326), extended=True))
+        self.assertEqual(4326, lazy.srid)
+        self.assertEqual(GeometryType.POLYGON, lazy.geometry_type)
+        self.assertFalse(lazy.is_decoded)
+        self.assertTrue(lazy.shapely_geometry.equals(self.geometries[2].shapely_geometry))
+        self.assertTrue(lazy.is_decoded)
+        copy = pickle.loads(pickle.dumps(lazy))
+        self.assertFalse(copy.is_decoded)
+        self.assertEqual(lazy.wkb, copy.wkb)
+        with self.assertRaises(SpatialReferenceException):
+            LazyGeometry.from_element(self.geometries[0].shapely_geometry.wkb)
+
+    def test_streamRows_engineAndSession(self):
+        statement = select(self.table.c.id, self.table.c.name, self.table.c.geom).order_by(self.table.c.id)
+        with Session(self.engine) as session:
+            for bind in [self.engine, session]:
+                rows = list(stream_rows(bind, statement, chunk_size=3))
+                self.assertEqual(len(self.geometries) + 1, len(rows))
+                for row, geometry in zip(rows, self.geometries):
+                    self.assertEqual('p{}'.format(row.id), row.name)
+                    self.assertIsInstance(row.geom, LazyGeometry)
+                    self.assertFalse(row.geom.is_decoded)
+                    self.assertEqual(4326, row.geom.spatial_reference.srid)
+                    self.assertTrue(row.geom.geometry.shapely_geometry.equals(geometry.shapely_geometry))
+                self.assertIsNone(rows[-1].geom)
+
+    def test_streamGeometries_streamArrays(self):
+        statement = select(self.table.c.geom).order_by(self.table.c.id)
+        geometries = list(stream_geometries(self.engine, statement, chunk_size=7))
+        self.assertEqual([g.geometry_type for g in self.geometries] + [None],
+                         [g.geometry_type if g is not None else None for g in geometries])
+        statement = select(self.table.c.geom).where(self.table.c.id % 4 == 1).order_by(self.table.c.id)
+        arrays = list(stream_arrays(self.engine, statement, chunk_size=2))
+        self.assertEqual([2, 2, 1], [len(array) for array in arrays])
+        for array in arrays:
+            self.assertEqual(4326, array.spatial_reference.srid)
+            self.assertTrue(all(t == GeometryType.POLYLINE for t in array.geometry_types))
+
+
+class TestDjioGeometrySuite(unittest.TestCase):
+
+    def setUp(self):
+        # (SpatiaLite isn't always around, so we stand in for the two functions the column type uses.)
+        self.calls = []
+        self.engine = create_engine('sqlite://')
+
+        @event.listens_for(self.engine, 'connect')
+        def connect(dbapi_connection, _):
+            def geom_from_ewkb(value):
+                if value is None:
+                    return None
+                self.calls.append(value)
+                return bytes.fromhex(value)
+            dbapi_connection.create_function('GeomFromEWKB', 1, geom_from_ewkb)
+            dbapi_connection.create_function('AsEWKB', 1, lambda value: value.hex() if value is not None else None)
+
+        metadata = MetaData()
+        self.table = Table('places', metadata,
+                           Column('id', Integer, primary_key=True),
+                           Column('name', String),
+                           Column('geom', DjioGeometry(srid=4326, spatial_index=False)))
+        # (Without SpatiaLite, there's no geometry column type to create.)
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql('CREATE TABLE places (id INTEGER PRIMARY KEY, name VARCHAR, geom BLOB)')
+        self.wkts = TestSqlSuite.wkts
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_executemany_lazyResults(self):
+        geometries = [Geometry.from_wkt(wkt=wkt, spatial_reference=4326) for wkt in self.wkts]
+        with self.engine.begin() as connection:
+            connection.execute(self.table.insert(), [
+                {'id': i, 'name': 'p{}'.format(i), 'geom': g} for i, g in enumerate(geometries)
+            ])
+            connection.execute(self.table.insert(), {'id': len(geometries), 'name': 'null', 'geom': None})
+        self.assertEqual([_geometry_wkb(g, srid=4326).hex() for g in geometries], self.calls)
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(self.table).order_by(self.table.c.id)).fetchall()
+        for row, geometry in zip(rows, geometries):
+            self.assertIsInstance(row.geom, LazyGeometry)
+            self.assertFalse(row.geom.is_decoded)
+            self.assertEqual(4326, row.geom.srid)
+            self.assertTrue(row.geom.shapely_geometry.equals(geometry.shapely_geometry))
+        self.assertIsNone(rows[-1].geom)
+
+    def test_arrayParameters_bindsEwkb(self):
+        array = GeometryArray.from_shapely([loads_wkt(wkt) for wkt in self.wkts], spatial_reference=4326)
+        parameters = array_parameters(array, 'geom', ({'name': 'p{}'.format(i)} for i in range(len(array))))
+        self.assertEqual(['p0', 'p1', 'p2', 'p3'], [p['name'] for p in parameters])
+        with self.engine.begin() as connection:
+            connection.execute(self.table.insert(), parameters)
+        self.assertEqual([wkb.hex() for wkb in array.iter_wkb(ewkb=True)], self.calls)
+        # Lazy geometries that come back go back out just as they came in.
+        with self.engine.begin() as connection:
+            rows = connection.execute(select(self.table.c.name, self.table.c.geom)).fetchall()
+            connection.execute(self.table.insert(), [{'name': row.name, 'geom': row.geom} for row in rows])
+        self.assertEqual(self.calls[:4], self.calls[4:])
+        with self.engine.begin() as connection:
+            with self.assertRaises(StatementError):
+                connection.execute(self.table.insert(), {'name': 'bad', 'geom': 'POINT(1 2)'})
+            with self.assertRaises(StatementError):
+                connection.execute(self.table.insert(), {'name': 'bad', 'geom': _geometry_wkb(array[0], srid=3857)})
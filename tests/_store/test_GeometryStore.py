@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_GeometryStore
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import os
+import tempfile
+import unittest
+from djio.geometry import Geometry, GeometryType
+from djio.store import GeometryStore
+
+
+class TestGeometryStoreSuite(unittest.TestCase):
+
+    wkts = [
+        'POINT(-94.1 46.5)',
+        'LINESTRING(0 0, 1 1, 2 1)',
+        'POLYGON((10 10, 14 10, 14 14, 10 14, 10 10), (11 11, 12 11, 12 12, 11 11))'
+    ]
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.djgs')
+        os.close(fd)
+        GeometryStore.write(self.path, Geometry.from_wkt_many(self.wkts, spatial_reference=4326))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_open_headerAndLength(self):
+        with GeometryStore.open(self.path) as store:
+            self.assertEqual(3, len(store))
+            self.assertEqual(4326, store.spatial_reference.srid)
+            self.assertEqual(GeometryType.POLYGON, store[2].geometry_type)
+
+    def test_open_envelopesArePrecomputed(self):
+        with GeometryStore.open(self.path) as store:
+            self.assertTrue(np.array_equal(
+                np.array([[-94.1, 46.5, -94.1, 46.5], [0, 0, 2, 1], [10, 10, 14, 14]]),
+                store.envelopes
+            ))
+            self.assertFalse(store.envelopes.flags.writeable)
+
+    def test_intersecting_prefilters(self):
+        with GeometryStore.open(self.path) as store:
+            self.assertEqual([1], list(store.intersecting(0.5, 0.5, 3.0, 3.0)))
+            self.assertEqual([1, 2], list(store.intersecting(1.5, 0.5, 11.0, 11.0)))
+
+    def test_open_geometriesAndHashesMatch(self):
+        with GeometryStore.open(self.path) as store:
+            originals = Geometry.from_wkt_many(self.wkts, spatial_reference=4326)
+            for i, stored in enumerate(store):
+                self.assertTrue(originals[i].shapely_geometry.equals(stored.shapely_geometry))
+                self.assertEqual(bytes(originals[i].djiohash()), bytes(store.djiohashes[i]))
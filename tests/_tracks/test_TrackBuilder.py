@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. currentmodule:: test_TrackBuilder
+.. moduleauthor:: Pat Daburu <pat@daburu.net>
+
+This is a unit test module.
+"""
+
+import numpy as np
+import unittest
+from djio.geometry import GeometryException, PointTuple
+from djio.tracks import TrackBuilder
+
+
+class TestTrackBuilderSuite(unittest.TestCase):
+
+    def test_add_runningMetricsMatchPolyline(self):
+        track = TrackBuilder(spatial_reference=3857)
+        track.add_many(np.array([[0.0, 0.0], [3.0, 4.0], [3.0, 10.0]]))
+        track.add(PointTuple(x=-1.0, y=10.0, z=None, srid=3857))
+        polyline = track.to_polyline()
+        self.assertEqual(4, track.vertex_count)
+        self.assertEqual(15.0, track.length)
+        self.assertEqual(polyline.shapely_geometry.length, track.length)
+        self.assertEqual((-1.0, 0.0, 3.0, 10.0), track.envelope_tuple[0:4])
+        self.assertEqual(polyline.djiohash(), track.djiohash())
+
+    def test_add_decimatesByDistanceAndAngle(self):
+        track = TrackBuilder(spatial_reference=3857, min_distance=5.0, min_angle=10.0)
+        # A straight line with close-together points, then a right-angle turn.
+        track.add_many(np.array([[float(x), 0.0] for x in range(0, 101)] + [[100.0, 50.0]]))
+        self.assertEqual(102, track.received_count)
+        self.assertEqual([(0.0, 0.0), (100.0, 0.0), (100.0, 50.0)], list(track.to_polyline().iter_coords()))
+        self.assertEqual(150.0, track.length)
+
+    def test_maxVertices_emitsSegments(self):
+        segments = []
+        track = TrackBuilder(spatial_reference=3857, max_vertices=4, on_segment=segments.append)
+        track.add_many(np.array([[float(x), 0.0] for x in range(10)]))
+        tail = track.flush()
+        self.assertEqual([[0, 1, 2, 3], [3, 4, 5, 6]],
+                         [[int(c[0]) for c in segment.iter_coords()] for segment in segments])
+        self.assertEqual([6, 7, 8, 9], [int(c[0]) for c in tail.iter_coords()])
+        self.assertEqual(9.0, track.total_length)
+        self.assertEqual(1, track.vertex_count)
+
+    def test_maxVertices_queuesSegmentsWithoutCallback(self):
+        track = TrackBuilder(spatial_reference=3857, max_vertices=3)
+        track.add_many(np.array([[float(x), float(x)] for x in range(6)]))
+        self.assertEqual(2, len(track.pop_segments()))
+        self.assertEqual([], track.pop_segments())
+
+    def test_djiohash_3d_matchesPolyline(self):
+        track = TrackBuilder(spatial_reference=3857)
+        track.add_many(np.array([[0.0, 0.0, 1.0], [3.0, 4.0, 2.0], [5.0, 4.0, 3.0]]))
+        self.assertEqual(track.to_polyline().djiohash(), track.djiohash())
+
+    def test_add_many_decimatesLikeAdd(self):
+        points = np.array([[0.0, 0.0], [1.0, 0.0], [7.0, 0.0], [8.0, 1.0], [8.0, 9.0], [8.5, 9.5], [20.0, 9.5]])
+        batched = TrackBuilder(spatial_reference=3857, min_distance=5.0, min_angle=10.0)
+        batched.add_many(points[0:3])
+        batched.add_many(points[3:])
+        single = TrackBuilder(spatial_reference=3857, min_distance=5.0, min_angle=10.0)
+        for x, y in points:
+            single.add(PointTuple(x=x, y=y, z=None, srid=3857))
+        self.assertEqual(list(single.to_polyline().iter_coords()), list(batched.to_polyline().iter_coords()))
+        self.assertEqual(single.length, batched.length)
+
+    def test_len_matchesVertexCount(self):
+        track = TrackBuilder(spatial_reference=3857, max_vertices=4)
+        track.add_many(np.array([[float(x), 0.0] for x in range(5)]))
+        self.assertEqual(track.vertex_count, len(track))
+
+    def test_startPart_raisesGeometryException(self):
+        track = TrackBuilder(spatial_reference=3857, max_vertices=4)
+        track.add_many(np.array([[float(x), 0.0] for x in range(5)]))
+        with self.assertRaises(GeometryException):
+            track.start_part()
+        with self.assertRaises(GeometryException):
+            track.start_interior()
+        for method in (track.to_polygon, track.to_multipolyline, track.to_multipolygon):
+            with self.assertRaises(GeometryException):
+                method()
+        # The track is still a single line.
+        track.add_many(np.array([[float(x), 0.0] for x in range(10, 16)]))
+        self.assertEqual([[0, 1, 2, 3], [3, 4, 10, 11], [11, 12, 13, 14]],
+                         [[int(c[0]) for c in segment.iter_coords()] for segment in track.pop_segments()])
+        self.assertEqual(1, track.ring_count)
+